@@ -0,0 +1,155 @@
+"""
+Benchmark de los codificadores AAC disponibles y de los presets de velocidad.
+
+Convierte un archivo del corpus sintético con cada combinación de codificador y perfil que admite el ffmpeg instalado (aac nativo, libfdk_aac y AudioToolbox; AAC-LC, HE-AAC y HE-AAC v2) y cada preset (fast, balanced, quality) a los bitrates pedidos, siempre recodificando (`TranscodeMode.ALWAYS`), y registra el tiempo real, el tiempo de CPU, el factor de tiempo real y el tamaño del resultado. Las combinaciones que el ffmpeg no admite se listan en `skipped` con el motivo.
+
+Uso:
+    python benchmarks/encoder_bench.py --duration 10m --bitrates 32k 64k 128k -o encoders.json
+    python benchmarks/encoder_bench.py --source sine --channels 2
+    python benchmarks/encoder_bench.py --format mp3 --duration 10m --bitrates 64k --channels 1 --profiles aac_low
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Tuple
+from argparse import ArgumentParser
+
+import synthetic_corpus
+from m4b_converter.enums import AudioProfile, Bitrate, TranscodeMode, EncoderPreset
+from m4b_converter.managers import WorkflowManager
+from m4b_converter.services import EncoderProbeService
+
+PROFILES = [AudioProfile.AAC_LOW, AudioProfile.AAC_HE, AudioProfile.AAC_HE_V2]
+
+
+def cpu_seconds() -> float:
+    """
+    Tiempo de CPU consumido por este proceso y por los hijos ya terminados (ffmpeg).
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def measure(action: Callable[[], Any]) -> Tuple[Any, float, float]:
+    """
+    Ejecuta `action` y devuelve su resultado, el tiempo real y el tiempo de CPU.
+    """
+    cpu_start = cpu_seconds()
+    start = time.perf_counter()
+    value = action()
+    wall = time.perf_counter() - start
+    return value, wall, cpu_seconds() - cpu_start
+
+
+def run(
+    corpus_dir: Path,
+    source: str,
+    fmt: str,
+    duration: int,
+    bitrates: List[Bitrate],
+    channels: int,
+    profiles: List[AudioProfile],
+    presets: List[EncoderPreset]
+) -> Dict[str, Any]:
+    """
+    Genera el archivo de prueba y lo convierte con cada codificador, perfil y preset disponibles.
+
+    Returns:
+        Dict[str, Any]: Entorno, parámetros, resultados por combinación y combinaciones omitidas.
+    """
+    print("Generando corpus...", file=sys.stderr)
+    (item, path), = synthetic_corpus.build(corpus_dir, [source], [fmt], [duration])
+    probe = EncoderProbeService()
+    caps = probe.capabilities()
+    rows = []
+    skipped = []
+
+    with tempfile.TemporaryDirectory(prefix="m4b_encoder_bench_") as tmp:
+        output_dir = Path(tmp)
+        for encoder in EncoderProbeService.ENCODER_PREFERENCE:
+            for profile in profiles:
+                for bitrate in bitrates:
+                    try:
+                        probe.select(bitrate, channels, encoder, profile)
+                    except ValueError as e:
+                        skipped.append({"encoder": encoder.value, "profile": profile.value, "bitrate": bitrate.value, "reason": str(e)})
+                        continue
+
+                    manager = WorkflowManager(
+                        use_probe_cache=False,
+                        transcode=TranscodeMode.ALWAYS,
+                        encoder=encoder,
+                        audio_profile=profile
+                    )
+                    for preset in presets:
+                        name = f"{encoder}/{profile}/{bitrate}/{preset}"
+                        result, wall, cpu = measure(
+                            lambda: manager.process_file(path, bitrate=bitrate, channels=channels, output_dir=output_dir, preset=preset)
+                        )
+                        if not result:
+                            raise RuntimeError(f"La conversión {name} falló (ver log)")
+
+                        rows.append({
+                            "encoder": encoder.value,
+                            "profile": profile.value,
+                            "bitrate": bitrate.value,
+                            "preset": preset.value,
+                            "output_bytes": result.size_final_bytes,
+                            "wall_seconds": round(wall, 3),
+                            "cpu_seconds": round(cpu, 3),
+                            "realtime_factor": round(item.duration_seconds / wall, 2),
+                        })
+                        print(f"{name:<40} {wall:8.2f} s  x{item.duration_seconds / wall:.1f}  {result.size_final_bytes} B", file=sys.stderr)
+                        shutil.rmtree(output_dir)
+                        output_dir.mkdir()
+
+    return {
+        "benchmark": "encoders",
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "ffmpeg": caps.version or "desconocida",
+        "cpu_count": os.cpu_count(),
+        "input": {"file": path.name, "duration_seconds": item.duration_seconds, "channels": channels},
+        "available_encoders": [e.value for e in EncoderProbeService.ENCODER_PREFERENCE if caps.has(e.value)],
+        "results": rows,
+        "skipped": skipped,
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Velocidad y tamaño de cada codificador y perfil AAC del ffmpeg instalado.")
+    parser.add_argument("--duration", default="1m", choices=list(synthetic_corpus.DURATIONS), help="Duración del archivo de prueba, 1m por default.")
+    parser.add_argument("--source", default="speech", choices=list(synthetic_corpus.SOURCES))
+    parser.add_argument("--format", default="wav", choices=list(synthetic_corpus.FORMATS), help="Formato del archivo de prueba, wav por default para no medir la decodificación de MP3.")
+    parser.add_argument("--corpus-dir", type=Path, default=Path(tempfile.gettempdir()) / "m4b_bench_corpus", help="Directorio donde se guarda y reutiliza el corpus.")
+    parser.add_argument("--bitrates", nargs="+", default=["32k", "64k", "128k"], choices=[b.value for b in Bitrate], help="Bitrates medidos, 32k, 64k y 128k por default.")
+    parser.add_argument("-c", "--channels", type=int, default=2, choices=[1, 2], help="Canales de salida, 2 por default (HE-AAC v2 solo admite estéreo).")
+    parser.add_argument("--profiles", nargs="+", default=[p.value for p in PROFILES], choices=[p.value for p in PROFILES], help="Perfiles AAC medidos, todos por default.")
+    parser.add_argument("--presets", nargs="+", default=[p.value for p in EncoderPreset], choices=[p.value for p in EncoderPreset], help="Presets de velocidad medidos, todos por default.")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Archivo JSON de resultados (por defecto stdout).")
+    args = parser.parse_args()
+
+    report = run(
+        corpus_dir=args.corpus_dir,
+        source=args.source,
+        fmt=args.format,
+        duration=synthetic_corpus.DURATIONS[args.duration],
+        bitrates=[Bitrate(b) for b in args.bitrates],
+        channels=args.channels,
+        profiles=[AudioProfile(p) for p in args.profiles],
+        presets=[EncoderPreset(p) for p in args.presets]
+    )
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark de extremo a extremo del flujo de conversión (WorkflowManager).
+
+Convierte el corpus sintético de `synthetic_corpus.py` primero archivo a archivo con WorkflowManager.process_file y después como lote con WorkflowManager.process_directory, y registra para cada caso el tiempo real, el tiempo de CPU (proceso actual más ffmpeg y trabajadores), el factor de tiempo real (segundos de audio por segundo de reloj) y el tamaño del resultado.
+
+El resultado es un JSON pensado para guardarse junto a cada versión y compararse entre ellas.
+
+Uso:
+    python benchmarks/end_to_end_bench.py --durations 1m 10m 1h --corpus-dir ~/.cache/m4b_bench -o base.json
+    python benchmarks/end_to_end_bench.py --durations 20h --sources speech --formats mp3 --skip-directory
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, Callable, Tuple
+from argparse import ArgumentParser
+
+import synthetic_corpus
+from m4b_converter.enums import Bitrate
+from m4b_converter.managers import WorkflowManager
+
+
+def cpu_seconds() -> float:
+    """
+    Tiempo de CPU consumido por este proceso y por los hijos ya terminados (ffmpeg, trabajadores del pool).
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def measure(action: Callable[[], Any]) -> Tuple[Any, float, float]:
+    """
+    Ejecuta `action` y devuelve su resultado, el tiempo real y el tiempo de CPU.
+    """
+    cpu_start = cpu_seconds()
+    start = time.perf_counter()
+    value = action()
+    wall = time.perf_counter() - start
+    return value, wall, cpu_seconds() - cpu_start
+
+
+def ffmpeg_version() -> str:
+    output = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True, stdin=subprocess.DEVNULL).stdout
+    return output.splitlines()[0] if output else "desconocida"
+
+
+def directory_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*.m4b"))
+
+
+def run(
+    corpus_dir: Path,
+    sources: list,
+    formats: list,
+    durations: list,
+    bitrate: Bitrate,
+    jobs: int,
+    skip_directory: bool
+) -> Dict[str, Any]:
+    """
+    Genera el corpus y mide las conversiones.
+
+    Returns:
+        Dict[str, Any]: Entorno, parámetros y resultados de process_file y process_directory.
+    """
+    print("Generando corpus...", file=sys.stderr)
+    corpus = synthetic_corpus.build(corpus_dir, sources, formats, durations)
+    manager = WorkflowManager(use_probe_cache=False)
+    file_rows = []
+
+    with tempfile.TemporaryDirectory(prefix="m4b_bench_") as tmp:
+        tmp_dir = Path(tmp)
+
+        for item, path in corpus:
+            output_dir = tmp_dir / "file"
+            result, wall, cpu = measure(
+                lambda: manager.process_file(path, bitrate=bitrate, channels=1, output_dir=output_dir)
+            )
+            if not result:
+                raise RuntimeError(f"La conversión de {path.name} falló (ver log)")
+
+            file_rows.append({
+                "file": path.name,
+                "source": item.source,
+                "format": item.fmt,
+                "duration_seconds": item.duration_seconds,
+                "input_bytes": result.size_original_bytes,
+                "output_bytes": result.size_final_bytes,
+                "wall_seconds": round(wall, 3),
+                "cpu_seconds": round(cpu, 3),
+                "realtime_factor": round(item.duration_seconds / wall, 2),
+            })
+            print(f"{path.name:<40} {wall:8.2f} s  x{item.duration_seconds / wall:.1f}", file=sys.stderr)
+            shutil.rmtree(output_dir)
+
+        directory_row = None
+        if not skip_directory:
+            # Enlaces al corpus seleccionado, para no convertir otros archivos guardados en corpus_dir
+            input_dir = tmp_dir / "lote"
+            input_dir.mkdir()
+            for _, path in corpus:
+                (input_dir / path.name).symlink_to(path.resolve())
+
+            output_dir = tmp_dir / "lote_salida"
+            results, wall, cpu = measure(
+                lambda: manager.process_directory(input_dir, bitrate=bitrate, channels=1, output_dir=output_dir, jobs=jobs)
+            )
+            audio_seconds = sum(item.duration_seconds for item, _ in corpus)
+            directory_row = {
+                "files": len(corpus),
+                "converted": len(results),
+                "jobs": jobs,
+                "audio_seconds": audio_seconds,
+                "output_bytes": directory_size(output_dir),
+                "wall_seconds": round(wall, 3),
+                "cpu_seconds": round(cpu, 3),
+                "realtime_factor": round(audio_seconds / wall, 2),
+            }
+            print(f"{'process_directory':<40} {wall:8.2f} s  x{audio_seconds / wall:.1f}", file=sys.stderr)
+
+    return {
+        "benchmark": "end_to_end",
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "ffmpeg": ffmpeg_version(),
+        "cpu_count": os.cpu_count(),
+        "bitrate": bitrate.value,
+        "process_file": file_rows,
+        "process_directory": directory_row,
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Rendimiento de extremo a extremo de la conversión a M4B sobre un corpus sintético.")
+    parser.add_argument("--durations", nargs="+", default=["1m", "10m"], choices=list(synthetic_corpus.DURATIONS), help="Duraciones del corpus, 1m y 10m por default.")
+    parser.add_argument("--sources", nargs="+", default=list(synthetic_corpus.SOURCES), choices=list(synthetic_corpus.SOURCES))
+    parser.add_argument("--formats", nargs="+", default=list(synthetic_corpus.FORMATS), choices=list(synthetic_corpus.FORMATS))
+    parser.add_argument("--corpus-dir", type=Path, default=Path(tempfile.gettempdir()) / "m4b_bench_corpus", help="Directorio donde se guarda y reutiliza el corpus.")
+    parser.add_argument("-b", "--bitrate", type=str, default="64k", choices=[b.value for b in Bitrate])
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Trabajos de process_directory, el número de núcleos por default.")
+    parser.add_argument("--skip-directory", action="store_true", help="Mide solo process_file.")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Archivo JSON de resultados (por defecto stdout).")
+    args = parser.parse_args()
+
+    report = run(
+        corpus_dir=args.corpus_dir,
+        sources=args.sources,
+        formats=args.formats,
+        durations=[synthetic_corpus.DURATIONS[d] for d in args.durations],
+        bitrate=Bitrate(args.bitrate),
+        jobs=args.jobs,
+        skip_directory=args.skip_directory
+    )
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
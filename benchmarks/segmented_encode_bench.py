@@ -0,0 +1,113 @@
+"""
+Benchmark de la codificación segmentada (M4bConverterService.convert_segmented).
+
+Genera con lavfi un audio sintético parecido a voz (ruido rosa filtrado), lo convierte a M4B con distinto número de segmentos y mide el tiempo, la aceleración frente a la codificación en un solo proceso y la diferencia de duración del resultado respecto al origen.
+
+Uso:
+    python benchmarks/segmented_encode_bench.py --duration 3600 --segments 1 2 4 8 --output segmentos.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from argparse import ArgumentParser
+
+from m4b_converter.enums import Bitrate
+from m4b_converter.services import AudioAnalyzerService, M4bConverterService
+
+
+def generate_source(path: Path, duration: float, sample_rate: int) -> None:
+    """
+    Genera el audio de prueba en MP3 con lavfi.
+
+    Args:
+        path (Path): Archivo de salida.
+        duration (float): Duración en segundos.
+        sample_rate (int): Frecuencia de muestreo en Hz.
+    """
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "lavfi", "-i", f"anoisesrc=d={duration}:c=pink:seed=7,lowpass=3000",
+            "-ar", str(sample_rate), "-ac", "1",
+            "-c:a", "libmp3lame", "-b:a", "128k",
+            str(path)
+        ],
+        check=True,
+        stdin=subprocess.DEVNULL
+    )
+
+
+def run(duration: float, segment_counts: list, bitrate: Bitrate, sample_rate: int) -> dict:
+    """
+    Ejecuta el benchmark para cada número de segmentos.
+
+    Returns:
+        dict: Entorno, parámetros y una fila de resultados por número de segmentos.
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix="m4b_bench_") as tmp:
+        tmp_dir = Path(tmp)
+        source = tmp_dir / "fuente.mp3"
+        generate_source(source, duration, sample_rate)
+        audio_info = AudioAnalyzerService(source, use_cache=False).analyze()
+
+        baseline = None
+        for segments in segment_counts:
+            output_dir = tmp_dir / f"seg_{segments}"
+            converter = M4bConverterService(audio_info, output_dir=output_dir)
+
+            start = time.perf_counter()
+            result = converter.convert_segmented(bitrate=bitrate, channels=1, segments=segments)
+            wall = time.perf_counter() - start
+
+            output_info = AudioAnalyzerService(result.output_path, use_cache=False).analyze()
+            baseline = baseline or wall
+            results.append({
+                "segments": segments,
+                "wall_seconds": round(wall, 3),
+                "speedup": round(baseline / wall, 3),
+                "realtime_factor": round(audio_info.duration_seconds / wall, 2),
+                "size_bytes": result.size_final_bytes,
+                "duration_delta_seconds": round(output_info.duration_seconds - audio_info.duration_seconds, 4),
+            })
+            print(f"{segments:>3} segmentos: {wall:8.2f} s  x{baseline / wall:.2f}", file=sys.stderr)
+
+    return {
+        "benchmark": "segmented_encode",
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "duration_seconds": duration,
+        "sample_rate": sample_rate,
+        "bitrate": bitrate.value,
+        "results": results,
+    }
+
+
+def main() -> None:
+    cpu_count = os.cpu_count() or 1
+    default_segments = sorted({1, 2, 4, cpu_count})
+
+    parser = ArgumentParser(description="Aceleración de la codificación segmentada según el número de segmentos.")
+    parser.add_argument("--duration", type=float, default=1800, help="Duración del audio sintético en segundos, 1800 por default.")
+    parser.add_argument("--segments", type=int, nargs="+", default=default_segments, help="Números de segmentos a medir (el primero es la referencia).")
+    parser.add_argument("-b", "--bitrate", type=str, default="64k", choices=[b.value for b in Bitrate])
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Archivo JSON de resultados (por defecto stdout).")
+    args = parser.parse_args()
+
+    report = run(args.duration, args.segments, Bitrate(args.bitrate), args.sample_rate)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
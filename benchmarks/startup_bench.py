@@ -0,0 +1,141 @@
+"""
+Benchmark del arranque en frío de la CLI.
+
+Ejecuta `python -X importtime -m m4b_converter <comando>` en un proceso nuevo con un HOME temporal y suma el tiempo acumulado de sus imports. Cada comando tiene un presupuesto en milisegundos: si algún comando lo supera, o si arrancar crea directorios de la aplicación cuando no le corresponde, el script termina con código 1, de modo que puede usarse como comprobación en CI para que un import pesado no vuelva a colarse en el arranque.
+
+Uso:
+    python benchmarks/startup_bench.py
+    python benchmarks/startup_bench.py --repeat 10 --budget-version 150 --top 15 -o startup.json
+    python benchmarks/startup_bench.py --analyze-file libro.mp3 --budget-analyze-file 350
+"""
+import os
+import re
+import sys
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+from argparse import ArgumentParser
+from typing import Any, Dict, List, Tuple
+
+# "import time:   self [us] | cumulative | imported package"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Comandos medidos: (nombre, argumentos, ¿puede crear ~/.m4b_converter?)
+COMMANDS: List[Tuple[str, List[str], bool]] = [
+    ("version", ["version"], False),
+    ("analyze --help", ["analyze", "--help"], False),
+]
+
+
+def parse_importtime(stderr: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Extrae de la salida de `-X importtime` el tiempo total de los imports de primer nivel y el acumulado de cada módulo.
+
+    Returns:
+        Tuple[float, List[Tuple[str, float]]]: Milisegundos de todos los imports de primer nivel y (módulo, milisegundos acumulados) de cada módulo.
+    """
+    total_us = 0
+    modules: List[Tuple[str, float]] = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative_us = int(match.group(2))
+        # Los imports de primer nivel no tienen sangría; sus hijos ya están incluidos en su acumulado
+        if len(match.group(3)) == 1:
+            total_us += cumulative_us
+        modules.append((match.group(4), cumulative_us / 1000))
+    return total_us / 1000, modules
+
+
+def measure(args: List[str], repeat: int) -> Dict[str, Any]:
+    """
+    Arranca la CLI `repeat` veces y mide los imports de cada arranque.
+
+    Returns:
+        Dict[str, Any]: Mediana y mínimo del tiempo de imports, los módulos del paquete más costosos de la ejecución mediana y si se creó el directorio de la aplicación.
+    """
+    runs = []
+    created_app_dir = False
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="m4b_startup_") as home:
+            env = {**os.environ, "HOME": home, "USERPROFILE": home}
+            process = subprocess.run(
+                [sys.executable, "-X", "importtime", "-m", "m4b_converter", *args],
+                capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL
+            )
+            if process.returncode != 0:
+                raise RuntimeError(f"`m4b {' '.join(args)}` terminó con código {process.returncode}:\n{process.stderr[-2000:]}")
+            created_app_dir = created_app_dir or (Path(home) / ".m4b_converter").exists()
+            runs.append(parse_importtime(process.stderr))
+
+    runs.sort(key=lambda run: run[0])
+    _, median_modules = runs[len(runs) // 2]
+    # `-m` importa cli.main dos veces (como paquete y como __main__); se conserva la entrada más costosa
+    package_ms: Dict[str, float] = {}
+    for name, ms in median_modules:
+        if name.startswith("m4b_converter"):
+            package_ms[name] = max(ms, package_ms.get(name, 0.0))
+    package_modules = sorted(package_ms.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "import_ms_median": round(statistics.median(run[0] for run in runs), 1),
+        "import_ms_min": round(runs[0][0], 1),
+        "slowest_modules": [{"module": name, "cumulative_ms": round(ms, 1)} for name, ms in package_modules],
+        "created_app_dir": created_app_dir,
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Tiempo de arranque en frío de la CLI con un presupuesto por comando.")
+    parser.add_argument("--repeat", type=int, default=5, help="Arranques por comando; se informa la mediana. 5 por default.")
+    parser.add_argument("--budget-version", type=float, default=200.0, help="Presupuesto en ms de los imports de `m4b version`. 200 por default.")
+    parser.add_argument("--budget-analyze", type=float, default=200.0, help="Presupuesto en ms de los imports de `m4b analyze --help`. 200 por default.")
+    parser.add_argument("--analyze-file", type=Path, default=None, help="Audio con el que medir también un `m4b analyze --no-probe-cache` completo (necesita ffprobe).")
+    parser.add_argument("--budget-analyze-file", type=float, default=400.0, help="Presupuesto en ms de los imports de `m4b analyze <archivo>`. 400 por default.")
+    parser.add_argument("--top", type=int, default=10, help="Módulos del paquete más costosos que se listan. 10 por default.")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Archivo JSON de resultados (por defecto stdout).")
+    args = parser.parse_args()
+
+    budgets = {"version": args.budget_version, "analyze --help": args.budget_analyze, "analyze": args.budget_analyze_file}
+    commands = list(COMMANDS)
+    if args.analyze_file:
+        commands.append(("analyze", ["analyze", "--no-probe-cache", str(args.analyze_file.resolve())], False))
+
+    failures = []
+    rows = []
+    for name, command_args, may_create_dirs in commands:
+        row = {"command": name, "budget_ms": budgets[name], **measure(command_args, args.repeat)}
+        row["slowest_modules"] = row["slowest_modules"][:args.top]
+        rows.append(row)
+
+        status = "OK" if row["import_ms_median"] <= row["budget_ms"] else "EXCEDIDO"
+        print(f"m4b {name:<16} {row['import_ms_median']:8.1f} ms (presupuesto {row['budget_ms']:.0f} ms)  {status}", file=sys.stderr)
+        if status != "OK":
+            failures.append(f"`m4b {name}` tarda {row['import_ms_median']} ms en importar (presupuesto {row['budget_ms']} ms)")
+        if row["created_app_dir"] and not may_create_dirs:
+            failures.append(f"`m4b {name}` crea ~/.m4b_converter al arrancar")
+
+    report = {
+        "benchmark": "startup",
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "commands": rows,
+        "failures": failures,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    for failure in failures:
+        print(f"ERROR: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Corpus sintético y determinista para los benchmarks.
+
+Genera audiolibros de prueba sin conexión con las fuentes `lavfi` de ffmpeg: ruido rosa filtrado y modulado que imita la voz, un tono senoidal y silencio, en MP3, FLAC o WAV. Las semillas y las opciones `bitexact` son fijas, así que el mismo corpus se obtiene en cualquier máquina con la misma versión de ffmpeg.
+
+Los archivos se guardan con un nombre que codifica sus parámetros y se reutilizan si ya existen: generar 20 horas de audio cuesta varios minutos.
+"""
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+# Fuentes lavfi; {d} es la duración en segundos y {sr} la frecuencia de muestreo
+SOURCES = {
+    "speech": "anoisesrc=d={d}:c=pink:r={sr}:a=0.3:seed=7,lowpass=3400,highpass=120,tremolo=f=4:d=0.7",
+    "sine": "sine=frequency=220:sample_rate={sr}:duration={d}",
+    "silence": "anullsrc=r={sr}:cl=mono,atrim=duration={d}",
+}
+
+# Códec y opciones de cada formato contenedor
+FORMATS = {
+    "mp3": ["-c:a", "libmp3lame", "-b:a", "128k"],
+    "flac": ["-c:a", "flac"],
+    "wav": ["-c:a", "pcm_s16le"],
+}
+
+# Duraciones por defecto: de 1 minuto a 20 horas
+DURATIONS = {
+    "1m": 60,
+    "10m": 600,
+    "1h": 3600,
+    "5h": 18000,
+    "20h": 72000,
+}
+
+
+@dataclass(frozen=True)
+class CorpusItem:
+    """
+    Un archivo del corpus sintético.
+
+    Attributes:
+        source (str): Tipo de señal ("speech", "sine" o "silence").
+        fmt (str): Formato del archivo ("mp3", "flac" o "wav").
+        duration_seconds (int): Duración en segundos.
+        sample_rate (int): Frecuencia de muestreo en Hz.
+    """
+    source: str
+    fmt: str
+    duration_seconds: int
+    sample_rate: int = 44100
+
+    @property
+    def filename(self) -> str:
+        return f"{self.source}_{self.duration_seconds}s_{self.sample_rate}hz.{self.fmt}"
+
+
+def generate(item: CorpusItem, corpus_dir: Path) -> Path:
+    """
+    Genera un archivo del corpus si no existe todavía.
+
+    Args:
+        item (CorpusItem): Archivo a generar.
+        corpus_dir (Path): Directorio del corpus.
+
+    Returns:
+        Path: Ruta del archivo generado o reutilizado.
+    """
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    path = corpus_dir / item.filename
+    if path.exists():
+        return path
+
+    partial = path.with_name(f".{path.name}.partial")
+    lavfi = SOURCES[item.source].format(d=item.duration_seconds, sr=item.sample_rate)
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "lavfi", "-i", lavfi,
+            "-ac", "1", "-ar", str(item.sample_rate),
+            *FORMATS[item.fmt],
+            "-map_metadata", "-1", "-fflags", "+bitexact", "-flags:a", "+bitexact",
+            "-f", "wav" if item.fmt == "wav" else item.fmt,
+            str(partial)
+        ],
+        check=True,
+        stdin=subprocess.DEVNULL
+    )
+    partial.replace(path)
+    return path
+
+
+def build(
+    corpus_dir: Path,
+    sources: Iterable[str] = SOURCES,
+    formats: Iterable[str] = FORMATS,
+    durations: Iterable[int] = (60,),
+    sample_rate: int = 44100
+) -> List[Tuple[CorpusItem, Path]]:
+    """
+    Genera (o reutiliza) el producto cartesiano de señales, formatos y duraciones.
+
+    Returns:
+        List[Tuple[CorpusItem, Path]]: Cada archivo del corpus con su ruta, ordenados por duración.
+    """
+    items = [
+        CorpusItem(source, fmt, duration, sample_rate)
+        for duration in sorted(durations)
+        for source in sources
+        for fmt in formats
+    ]
+    return [(item, generate(item, corpus_dir)) for item in items]
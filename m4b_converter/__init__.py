@@ -1,11 +1,25 @@
-from m4b_converter.core.m4b import M4bConverter
-from m4b_converter.core.mp3_merger import Mp3Merger
-from m4b_converter.cli.main import main
+from importlib import import_module
+from typing import Any
+
 from m4b_converter.settings.app_settings import __version__
 
+# Los objetos públicos se importan al primer acceso: `m4b version` no necesita cargar pydantic ni los servicios
+_LAZY_IMPORTS = {
+    "M4bConverter": "m4b_converter.core.m4b",
+    "Mp3Merger": "m4b_converter.core.mp3_merger",
+    "main": "m4b_converter.cli.main",
+}
+
 __all__ = [
     "M4bConverter",
     "Mp3Merger",
     "main",
     "__version__"
-]
\ No newline at end of file
+]
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,26 @@
-from m4b_converter.cli.commands.analyze import analyze_audiobook
-from m4b_converter.cli.commands.clean import clean_directories
-from m4b_converter.cli.commands.convert import handle_convert
-from m4b_converter.cli.commands.version import show_version
-from m4b_converter.cli.commands.cover import handle_cover
-from m4b_converter.cli.commands.batch import handle_batch
\ No newline at end of file
+from importlib import import_module
+from typing import Any
+
+# Cada comando arrastra sus propias dependencias (pydantic, servicios, asyncio...), así que solo se importa el que se ejecuta
+_LAZY_IMPORTS = {
+    "analyze_audiobook": "m4b_converter.cli.commands.analyze",
+    "clean_directories": "m4b_converter.cli.commands.clean",
+    "handle_convert": "m4b_converter.cli.commands.convert",
+    "show_version": "m4b_converter.cli.commands.version",
+    "show_encoders": "m4b_converter.cli.commands.encoders",
+    "handle_cover": "m4b_converter.cli.commands.cover",
+    "handle_batch": "m4b_converter.cli.commands.batch",
+    "handle_merge": "m4b_converter.cli.commands.merge",
+    "handle_enqueue": "m4b_converter.cli.commands.queue",
+    "handle_worker": "m4b_converter.cli.commands.queue",
+    "handle_watch": "m4b_converter.cli.commands.watch",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,23 +1,32 @@
 """
 Analyze command for audio files.
 """
+import asyncio
 from pathlib import Path
+from typing import List
 from rich.table import Table
 from rich.console import Console
 
+from m4b_converter.enums import Format
 from m4b_converter.services import AudioAnalyzerService
 from m4b_converter.schemas import AudioFileSchema, AudioMetadata
 from m4b_converter.cli.utils import convert_bytes_to_mb, parse_seconds
 
-def analyze_audiobook(file_path: Path, console: Console) -> None:
+def analyze_audiobook(file_path: Path, console: Console, use_cache: bool = True, concurrency: int = 8) -> None:
     """
-    Analyze an audiobook file.
+    Analyze an audiobook file, or every audio file in a directory.
     
     Args:
-        file_path(Path): Path to audiofile
+        file_path(Path): Path to audiofile or directory
         console(Console): Console object
+        use_cache(bool): Use the persistent ffprobe cache
+        concurrency(int): Max ffprobe processes in flight when analyzing a directory
     """
-    service = AudioAnalyzerService(file_path=file_path)
+    if file_path.is_dir():
+        analyze_directory(file_path, console, use_cache=use_cache, concurrency=concurrency)
+        return
+
+    service = AudioAnalyzerService(file_path=file_path, use_cache=use_cache)
     info: AudioFileSchema = service.analyze()
 
     if not info:
@@ -40,4 +49,50 @@ def analyze_audiobook(file_path: Path, console: Console) -> None:
     table.add_row("Frecuencia de muestreo", f"{info.sample_rate} Hz")
     table.add_row("Canales", f"{info.channels}")
 
-    console.print(table)
\ No newline at end of file
+    console.print(table)
+
+def analyze_directory(directory: Path, console: Console, use_cache: bool = True, concurrency: int = 8) -> None:
+    """
+    Analyze every audio file in a directory with concurrent ffprobe processes.
+    
+    Args:
+        directory(Path): Directory with audio files
+        console(Console): Console object
+        use_cache(bool): Use the persistent ffprobe cache
+        concurrency(int): Max ffprobe processes in flight
+    """
+    valid_extensions = {f".{fmt.value}" for fmt in Format}
+    files = (f for f in directory.rglob("*") if f.suffix.lower() in valid_extensions)
+
+    async def collect() -> List[AudioFileSchema]:
+        return [info async for info in AudioAnalyzerService.analyze_many(files, concurrency=concurrency, use_cache=use_cache)]
+
+    with console.status(f"[cyan]Analizando {directory}..."):
+        infos = sorted(asyncio.run(collect()), key=lambda info: info.path)
+
+    if not infos:
+        console.print(f"[yellow]No se encontraron archivos de audio analizables en {directory}[/yellow]")
+        return
+
+    table = Table(title=f"[bold magenta]Análisis de directorio[/bold magenta]: {directory}", border_style="blue")
+    table.add_column("Archivo", style="cyan")
+    table.add_column("Duración", justify="right")
+    table.add_column("Codec")
+    table.add_column("Bitrate", justify="right")
+    table.add_column("Tamaño", justify="right")
+
+    for info in infos:
+        table.add_row(
+            str(info.path.relative_to(directory)),
+            parse_seconds(info.duration_seconds),
+            info.codec,
+            f"{info.bitrate_kbps} kbps",
+            f"{convert_bytes_to_mb(info.size_bytes):.2f} MB"
+        )
+
+    total_duration = sum(info.duration_seconds for info in infos)
+    total_size = sum(info.size_bytes for info in infos)
+    table.add_section()
+    table.add_row(f"[bold]{len(infos)} archivos[/bold]", parse_seconds(total_duration), "", "", f"{convert_bytes_to_mb(total_size):.2f} MB")
+
+    console.print(table)
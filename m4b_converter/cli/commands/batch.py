@@ -2,20 +2,61 @@ from pathlib import Path
 from rich.table import Table
 from argparse import Namespace
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
+from typing import Dict, Optional
+from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TaskID
 
-from m4b_converter.enums import Bitrate
+from m4b_converter.enums import Bitrate, TranscodeDecision, TranscodeMode, EncoderPreset
 from m4b_converter.managers import WorkflowManager
-from m4b_converter.cli.utils import convert_bytes_to_mb
+from m4b_converter.services import ProbeCacheService, MetricsService, EncoderProbeService
+from m4b_converter.schemas import ConversionResult, ProgressEvent
+from m4b_converter.cli.utils import convert_bytes_to_mb, parse_encoder_options, parse_sample_rate, parse_silence_chapters, parse_renditions
 
 def handle_batch(args: Namespace, console: Console):
-    manager = WorkflowManager()
+    encoder, audio_profile = parse_encoder_options(args)
+    try:
+        silence_chapters = parse_silence_chapters(args)
+        renditions = parse_renditions(args.rendition)
+        targets = [(r.bitrate, r.channels) for r in renditions] if renditions else [(Bitrate(args.bitrate), args.channels)]
+        for bitrate, channels in targets:
+            EncoderProbeService().select(bitrate, channels, encoder, audio_profile)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        return
+
+    profile_dir = None
+    if args.profile:
+        # Con --jobs > 1 cada trabajador guarda su propio perfil junto al del proceso principal
+        profile_path = Path(args.profile_output)
+        profile_dir = profile_path.with_name(f"{profile_path.stem}-workers")
+    manager = WorkflowManager(
+        use_probe_cache=not args.no_probe_cache,
+        benchmark=args.profile,
+        profile_dir=profile_dir,
+        transcode=TranscodeMode(args.transcode),
+        encoder=encoder,
+        audio_profile=audio_profile
+    )
     input_dir = Path(args.input_dir)
     
     if not input_dir.is_dir():
         console.print(f"[bold red]Error:[/bold red] {input_dir} no es un directorio válido.")
         return
 
+    # Los contadores acumulados incluyen a todos los trabajadores
+    probe_cache = ProbeCacheService() if manager.use_probe_cache else None
+    cache_before = probe_cache.stats() if probe_cache else None
+
+    failed = []
+
+    metrics = None
+    if args.metrics_file or args.status_file:
+        metrics = MetricsService(
+            textfile_path=Path(args.metrics_file) if args.metrics_file else None,
+            json_path=Path(args.status_file) if args.status_file else None,
+            interval=args.metrics_interval
+        )
+        metrics.start()
+
     # Usamos Progress de Rich para el lote completo
     with Progress(
         SpinnerColumn(),
@@ -25,47 +66,110 @@ def handle_batch(args: Namespace, console: Console):
         console=console
     ) as progress:
         
-        # Encontramos archivos (puedes usar tu util count_files o glob aquí)
-        files = list(input_dir.glob("*.mp3")) # Simplificado, podrías usar varias extensiones
-        overall_task = progress.add_task(f"[yellow]Procesando lote...", total=len(files))
-        
-        results = []
-        
-        for file_path in files:
-            progress.update(overall_task, description=f"[cyan]Convirtiendo: {file_path.name}")
-            
-            # El callback aquí podría actualizar una sub-barra si quisieras
-            res = manager.process_file(
-                input_path=file_path,
+        overall_task = progress.add_task(f"[yellow]Procesando lote...", total=None)
+        # Una sub-barra por cada archivo en curso (una por trabajador)
+        file_tasks: Dict[Path, TaskID] = {}
+
+        def update_file_progress(file_path: Path, event: ProgressEvent) -> None:
+            if file_path not in file_tasks:
+                file_tasks[file_path] = progress.add_task(f"[cyan]Convirtiendo: {file_path.name}", total=100)
+            progress.update(file_tasks[file_path], completed=event.percent)
+
+        def finish_file(file_path: Path, result: Optional[ConversionResult]) -> None:
+            if file_path in file_tasks:
+                progress.remove_task(file_tasks.pop(file_path))
+            if not result:
+                failed.append(file_path)
+            progress.advance(overall_task)
+
+        try:
+            results = manager.process_directory(
+                input_dir=input_dir,
                 bitrate=Bitrate(args.bitrate),
                 channels=args.channels,
-                output_dir=Path(args.output_dir) if args.output_dir else None
+                recursive=args.recursive,
+                output_dir=Path(args.output_dir) if args.output_dir else None,
+                jobs=args.jobs,
+                single_pass_cover=args.single_pass_cover,
+                file_progress_callback=update_file_progress,
+                file_done_callback=finish_file,
+                metrics=metrics,
+                preset=EncoderPreset(args.preset),
+                sample_rate=parse_sample_rate(args.sample_rate),
+                silence_chapters=silence_chapters,
+                renditions=renditions,
+                min_free_bytes=args.min_free_space * 1024 * 1024
             )
-            if res:
-                results.append(res)
-            progress.advance(overall_task)
+        finally:
+            if metrics:
+                metrics.stop()
+        progress.update(overall_task, total=len(results) + len(failed), description="[green]Lote completado")
 
     # Mostrar tabla resumen
-    if results:
+    if results or failed:
         summary_table = Table(title="[bold green]Resumen de Procesamiento por Lote[/bold green]")
         summary_table.add_column("Archivo", style="cyan")
         summary_table.add_column("Original", justify="right")
         summary_table.add_column("Final", justify="right")
         summary_table.add_column("Ahorro %", style="green", justify="right")
+        summary_table.add_column("Etapas (s)", justify="right")
+        summary_table.add_column("CPU ffmpeg", justify="right")
+        summary_table.add_column("Velocidad", style="magenta", justify="right")
 
         total_saved = 0
-        for r in results:
+        for result in results:
+            # Con varias versiones el ahorro compara el original con la suma de todas ellas
+            outputs = [r for r in result.all_renditions if r.transcode_decision != TranscodeDecision.SKIP]
+            if outputs:
+                total_saved += convert_bytes_to_mb(result.size_original_bytes - sum(r.size_final_bytes for r in outputs))
+
+        for r in (output for result in results for output in result.all_renditions):
             orig_mb = convert_bytes_to_mb(r.size_original_bytes)
             final_mb = convert_bytes_to_mb(r.size_final_bytes)
+            if r.transcode_decision == TranscodeDecision.SKIP:
+                summary_table.add_row(f"[yellow]{r.output_path.name}[/yellow]", f"{orig_mb:.2f} MB", "-", "[yellow]Omitido[/yellow]", "-", "-", "-")
+                continue
+            saving = f"{r.compression_ratio*100:.1f}%"
+            if r.transcode_decision == TranscodeDecision.REMUX:
+                saving += " [dim](remux)[/dim]"
             summary_table.add_row(
                 r.output_path.name,
                 f"{orig_mb:.2f} MB",
                 f"{final_mb:.2f} MB",
-                f"{r.compression_ratio*100:.1f}%"
+                saving,
+                f"{r.analyze_seconds:.1f}/{r.cover_seconds:.1f}/{r.encode_seconds:.1f}/{r.finalize_seconds:.1f}",
+                f"{r.child_usage.cpu_seconds:.2f}s" if r.child_usage else "-",
+                f"{r.realtime_factor:.1f}x" if r.realtime_factor else "-"
+            )
+
+        for file_path in failed:
+            orig_mb = convert_bytes_to_mb(file_path.stat().st_size) if file_path.exists() else 0
+            summary_table.add_row(
+                f"[red]{file_path.name}[/red]",
+                f"{orig_mb:.2f} MB",
+                "-",
+                "[red]Falló[/red]",
+                "-", "-", "-"
             )
-            total_saved += r.space_saved_mb
 
         console.print(summary_table)
+        console.print("[dim]Etapas: análisis / portada / codificación / finalización[/dim]")
+        benchmarks = [r.ffmpeg_benchmark for r in results if r.ffmpeg_benchmark]
+        if benchmarks:
+            ffmpeg_seconds = sum(b.rtime_seconds for b in benchmarks)
+            codec_seconds = sum(b.codec_seconds for b in benchmarks)
+            total_seconds = sum(r.total_seconds for r in results)
+            console.print(
+                f"[dim]ffmpeg: {ffmpeg_seconds:.2f}s de reloj ({codec_seconds:.2f}s en el códec) · "
+                f"fuera de ffmpeg: {max(0.0, total_seconds - ffmpeg_seconds):.2f}s[/dim]"
+            )
         console.print(f"\n[bold gold1]Ahorro total de espacio: {total_saved:.2f} MB[/bold gold1]")
+        if failed:
+            console.print(f"[bold red]{len(failed)} archivo(s) fallaron. Revisa el log para más detalles.[/bold red]")
+        if probe_cache:
+            cache_after = probe_cache.stats()
+            hits = cache_after["total_hits"] - cache_before["total_hits"]
+            misses = cache_after["total_misses"] - cache_before["total_misses"]
+            console.print(f"[dim]Caché de ffprobe: {hits} aciertos, {misses} fallos[/dim]")
     else:
-        console.print("[yellow]No se procesó ningún archivo con éxito.[/yellow]")
\ No newline at end of file
+        console.print("[yellow]No se procesó ningún archivo con éxito.[/yellow]")
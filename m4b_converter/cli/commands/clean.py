@@ -15,6 +15,7 @@ def clean_directories(args: Namespace, console: Console) -> None:
     """
     if not AppSettings.APP_DIR.exists():
         console.print(f"[bold red]Error:[/bold red] {AppSettings.APP_DIR} no existe.")
+        return
     
     temp_files = count_files_in_directory(AppSettings.TEMP_DIR)
     output_files = count_files_in_directory(AppSettings.OUTPUT_DIR)
@@ -4,35 +4,67 @@ from argparse import Namespace
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
 
-from m4b_converter.enums import Bitrate
+from m4b_converter.enums import Bitrate, TranscodeDecision, TranscodeMode, EncoderPreset
 from m4b_converter.managers import WorkflowManager
-from m4b_converter.schemas import ConversionResult
-from m4b_converter.cli.utils import convert_bytes_to_mb, parse_seconds
+from m4b_converter.services import EncoderProbeService
+from m4b_converter.schemas import ConversionResult, ProgressEvent
+from m4b_converter.cli.utils import convert_bytes_to_mb, parse_seconds, parse_encoder_options, parse_sample_rate, parse_silence_chapters, parse_renditions
 
 def handle_convert(args: Namespace, console: Console):
-    manager = WorkflowManager()
+    encoder, audio_profile = parse_encoder_options(args)
+    try:
+        silence_chapters = parse_silence_chapters(args)
+        renditions = parse_renditions(args.rendition)
+        targets = [(r.bitrate, r.channels) for r in renditions] if renditions else [(Bitrate(args.bitrate), args.channels)]
+        for bitrate, channels in targets:
+            EncoderProbeService().select(bitrate, channels, encoder, audio_profile)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        return
+
+    manager = WorkflowManager(
+        use_probe_cache=not args.no_probe_cache,
+        benchmark=args.profile,
+        transcode=TranscodeMode(args.transcode),
+        encoder=encoder,
+        audio_profile=audio_profile
+    )
     
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
         TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        TextColumn("[dim]{task.fields[speed]}"),
     ) as progress:
         
-        task_id = progress.add_task(f"[cyan]Procesando {args.input.name}...", total=100)
+        task_id = progress.add_task(f"[cyan]Procesando {args.input.name}...", total=100, speed="")
         
-        def update_progress(percent: float):
-            progress.update(task_id, completed=percent)
+        def update_progress(event: ProgressEvent):
+            speed = f"{event.speed:.1f}x" if event.speed else ""
+            progress.update(task_id, completed=event.percent, speed=speed)
 
         result: ConversionResult = manager.process_file(
             input_path=args.input,
             bitrate=Bitrate(args.bitrate),
             channels=args.channels,
             output_dir=Path(args.output_dir) if args.output_dir else None,
-            progress_callback=update_progress
+            progress_callback=update_progress,
+            single_pass_cover=args.single_pass_cover,
+            segments=args.segments,
+            preset=EncoderPreset(args.preset),
+            sample_rate=parse_sample_rate(args.sample_rate),
+            silence_chapters=silence_chapters,
+            renditions=renditions
+        )
+
+    if result and result.transcode_decision == TranscodeDecision.SKIP:
+        console.print(
+            f"[bold yellow]Omitido:[/bold yellow] {args.input.name} ya es {result.codec_final} a {result.bitrate_final}, "
+            f"por debajo de {args.bitrate}; recodificarlo no reduciría su tamaño. Usa --transcode auto para convertirlo."
         )
 
-    if result:
+    elif result:
         # Convertimos bytes a MB
         size_original_mb = convert_bytes_to_mb(result.size_original_bytes)
         size_final_mb = convert_bytes_to_mb(result.size_final_bytes)
@@ -52,16 +84,60 @@ def handle_convert(args: Namespace, console: Console):
         table.add_row("Tiempo de inicio", f"{result.timestamp_start}")
         table.add_row("Tiempo de finalización", f"{result.timestamp_end}")
         table.add_row("Tiempo de conversión", conversion_duration)
+        table.add_row("Etapas", (
+            f"análisis {result.analyze_seconds:.2f}s · portada {result.cover_seconds:.2f}s · "
+            f"codificación {result.encode_seconds:.2f}s · finalización {result.finalize_seconds:.2f}s"
+        ))
+        if result.realtime_factor:
+            table.add_row("Velocidad", f"{result.realtime_factor:.1f}x tiempo real")
+        if result.child_usage:
+            table.add_row("CPU de ffmpeg", f"{result.child_usage.user_seconds:.2f}s usuario · {result.child_usage.system_seconds:.2f}s sistema")
+            table.add_row("Memoria pico de ffmpeg", f"{convert_bytes_to_mb(result.child_usage.max_rss_bytes):.1f} MB")
+        if result.ffmpeg_benchmark:
+            bench = result.ffmpeg_benchmark
+            stages = " · ".join(f"{stage} {seconds:.2f}s" for stage, seconds in sorted(bench.stage_seconds.items()))
+            table.add_row("ffmpeg (benchmark)", f"{bench.rtime_seconds:.2f}s de reloj · códec {bench.codec_seconds:.2f}s")
+            table.add_row("Etapas de ffmpeg", stages or "-")
+            table.add_row("Fuera de ffmpeg", f"{max(0.0, result.total_seconds - bench.rtime_seconds):.2f}s (análisis, portada, orquestación y finalización)")
         table.add_row("Duracón del archivo", file_duration)
         table.add_row("Tamaño original", f"{size_original_mb:.2f} MB")
         table.add_row("Tamaño final", f"{size_final_mb:.2f} MB")
         table.add_row("Formato final", f"{result.output_path.suffix[1:]}")
         table.add_row("Bitrate final", f"{result.bitrate_final}")
         table.add_row("Codec final", f"{result.codec_final}")
+        if result.sample_rate_final:
+            table.add_row("Frecuencia final", f"{result.sample_rate_final} Hz")
+        if result.encoder_final:
+            table.add_row("Codificador", f"{result.encoder_final} ({result.profile_final}, preset {result.preset_final})")
+        table.add_row("Tratamiento", "remux (audio copiado sin recodificar)" if result.transcode_decision == TranscodeDecision.REMUX else "recodificado")
+        if silence_chapters:
+            table.add_row("Capítulos", f"{result.chapter_count} (por silencios)" if result.chapter_count else "ninguno: no hay silencios que respeten --chapter-min-spacing")
         table.add_row("Ratio de compresión", f"{result.compression_ratio*100:.1f}%")
         table.add_row("Espacio ahorrado", f"{result.space_saved_mb} MB")
 
         console.print(table)
 
     else:
-        console.print("[bold red]Error durante la conversión.[/bold red]")
\ No newline at end of file
+        console.print("[bold red]Error durante la conversión.[/bold red]")
+    if result and result.renditions:
+        # Una fila por versión: la tabla anterior describe solo la primera
+        versions = Table(title="[bold magenta]Versiones[/bold magenta]", border_style="blue")
+        versions.add_column("Archivo", style="cyan")
+        versions.add_column("Bitrate", justify="right")
+        versions.add_column("Frecuencia", justify="right")
+        versions.add_column("Tamaño", justify="right")
+        versions.add_column("Tratamiento")
+        versions.add_column("Capítulos", justify="right")
+        for r in result.all_renditions:
+            if r.transcode_decision == TranscodeDecision.SKIP:
+                versions.add_row(f"[yellow]{r.output_path.name}[/yellow]", "-", "-", "-", "[yellow]omitido[/yellow]", "-")
+                continue
+            versions.add_row(
+                r.output_path.name,
+                f"{r.bitrate_final}",
+                f"{r.sample_rate_final} Hz" if r.sample_rate_final else "origen",
+                f"{convert_bytes_to_mb(r.size_final_bytes):.2f} MB",
+                "remux" if r.transcode_decision == TranscodeDecision.REMUX else "recodificado",
+                f"{r.chapter_count}" if silence_chapters else "-"
+            )
+        console.print(versions)
@@ -7,15 +7,16 @@ from rich.console import Console
 
 from m4b_converter.services import ExtractCoverService, AudioAnalyzerService
 
-def handle_cover(file_path: Path, console: Console) -> None:
+def handle_cover(file_path: Path, console: Console, use_cache: bool = True) -> None:
     """
     Extrae la imagen incrustada del archivo de audio.
     
     Args:
         file_path(Path): Path to audiofile
         console(Console): Console object
+        use_cache(bool): Use the persistent ffprobe cache
     """
-    analyer = AudioAnalyzerService(file_path=file_path)
+    analyer = AudioAnalyzerService(file_path=file_path, use_cache=use_cache)
     service = ExtractCoverService(file_path=file_path)
     cover_path = service.extract_cover(analyer.raw_data, output_dir=file_path.parent)
 
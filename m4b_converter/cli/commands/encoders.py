@@ -0,0 +1,48 @@
+"""
+Encoders command: show the AAC encoders available in the local ffmpeg.
+"""
+from argparse import Namespace
+from rich.console import Console
+from rich.table import Table
+
+from m4b_converter.enums import Bitrate
+from m4b_converter.services import EncoderProbeService
+
+def show_encoders(args: Namespace, console: Console) -> None:
+    """
+    Muestra la versión de ffmpeg, los codificadores AAC que incluye y el codificador y perfil que se eligen automáticamente para cada bitrate.
+
+    Args:
+        args (Namespace): Argumentos del comando.
+        console (Console): Objeto Console.
+    """
+    probe = EncoderProbeService()
+    if args.refresh and probe.cache_path.exists():
+        probe.cache_path.unlink()
+    caps = probe.capabilities()
+
+    if not caps.ffmpeg_path:
+        console.print("[bold red]Error:[/bold red] no se encontró ffmpeg en el PATH.")
+        return
+
+    console.print(f"[cyan]ffmpeg:[/cyan] {caps.ffmpeg_path}")
+    console.print(f"[dim]{caps.version}[/dim]")
+
+    table = Table(title="[bold magenta]Codificadores AAC[/bold magenta]", border_style="blue", padding=(0, 2))
+    table.add_column("Codificador", style="cyan")
+    table.add_column("Disponible")
+    table.add_column("HE-AAC")
+    for encoder in EncoderProbeService.ENCODER_PREFERENCE:
+        available = "[green]sí[/green]" if caps.has(encoder.value) else "[dim]no[/dim]"
+        he_aac = "sí" if encoder in EncoderProbeService.HE_AAC_ENCODERS else "no"
+        table.add_row(encoder.value, available, he_aac)
+    console.print(table)
+
+    auto_table = Table(title="[bold magenta]Selección automática[/bold magenta]", border_style="blue", padding=(0, 2))
+    auto_table.add_column("Bitrate", style="cyan", justify="right")
+    auto_table.add_column("Mono")
+    auto_table.add_column("Estéreo")
+    for bitrate in Bitrate:
+        choices = [" · ".join(map(str, probe.select(bitrate, channels))) for channels in (1, 2)]
+        auto_table.add_row(bitrate.value, *choices)
+    console.print(auto_table)
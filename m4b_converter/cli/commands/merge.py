@@ -0,0 +1,144 @@
+"""
+Merge command: join a folder of MP3 files into a single audiobook.
+"""
+from pathlib import Path
+from rich.table import Table
+from argparse import Namespace
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
+
+from m4b_converter.enums import Bitrate
+from m4b_converter.core import Mp3Merger
+from m4b_converter.schemas import ConcatPlan, ProgressEvent
+from m4b_converter.settings import AppSettings
+from m4b_converter.cli.utils import convert_bytes_to_mb, parse_seconds
+
+def handle_merge(args: Namespace, console: Console) -> None:
+    """
+    Fusiona los MP3 de un directorio y, por defecto, los codifica a M4B en una sola pasada.
+
+    Args:
+        args (Namespace): Argumentos del subcomando merge.
+        console (Console): Objeto Console.
+    """
+    input_dir = Path(args.input_dir)
+    if not input_dir.is_dir():
+        console.print(f"[bold red]Error:[/bold red] {input_dir} no es un directorio válido.")
+        return
+
+    metadata = {}
+    if args.title:
+        metadata["title"] = args.title
+    if args.author:
+        metadata["artist"] = args.author
+
+    try:
+        merger = Mp3Merger(
+            input_dir,
+            output_dir=args.output_dir or AppSettings.OUTPUT_DIR,
+            temp_dir=AppSettings.TEMP_DIR
+        )
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        return
+
+    if args.dry_run:
+        try:
+            with console.status(f"[cyan]Analizando {len(merger.mp3_files)} archivos..."):
+                plan = merger.plan(copy_output=args.mp3)
+        except Exception as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            return
+        _print_plan(plan, console)
+        return
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        console=console
+    ) as progress:
+        task_id = progress.add_task(f"[cyan]Fusionando {len(merger.mp3_files)} archivos...", total=100)
+
+        def update_progress(event: ProgressEvent) -> None:
+            progress.update(task_id, completed=event.percent)
+
+        try:
+            if args.mp3:
+                output_path = merger.merge(metadata=metadata or None, progress_callback=update_progress, chapters=not args.no_chapters)
+            else:
+                result = merger.merge_to_m4b(
+                    bitrate=Bitrate(args.bitrate),
+                    channels=args.channels,
+                    metadata=metadata,
+                    progress_callback=update_progress,
+                    chapters=not args.no_chapters
+                )
+        except Exception as e:
+            console.print(f"[bold red]Error durante la fusión:[/bold red] {e}")
+            return
+        progress.update(task_id, completed=100)
+
+    if args.mp3:
+        console.print(f"[green]MP3 fusionado:[/green] {output_path}")
+        return
+
+    table = Table(title=f"[bold magenta]Audiolibro fusionado[/bold magenta]: {result.output_path.name}", border_style="blue")
+    table.add_column("Atributo", style="cyan", justify="right")
+    table.add_column("Valor", style="green")
+
+    table.add_row("Archivos fusionados", f"{len(merger.mp3_files)}")
+    table.add_row("Capítulos", "no" if args.no_chapters else f"{len(merger.mp3_files)}")
+    table.add_row("Duración", parse_seconds(result.duration_seconds))
+    table.add_row("Tamaño original", f"{convert_bytes_to_mb(result.size_original_bytes):.2f} MB")
+    table.add_row("Tamaño final", f"{convert_bytes_to_mb(result.size_final_bytes):.2f} MB")
+    table.add_row("Ruta", f"{result.output_path}")
+
+    console.print(table)
+
+
+def _print_plan(plan: ConcatPlan, console: Console) -> None:
+    """
+    Muestra el plan de fusión de `m4b merge --dry-run`: la estrategia elegida y los tramos de archivos con los mismos parámetros.
+
+    Args:
+        plan (ConcatPlan): Plan de la fusión.
+        console (Console): Objeto Console.
+    """
+    file_count = sum(len(run.files) for run in plan.runs)
+
+    table = Table(title="[bold magenta]Plan de fusión[/bold magenta]", border_style="blue")
+    table.add_column("Atributo", style="cyan", justify="right")
+    table.add_column("Valor", style="green")
+
+    table.add_row("Estrategia", f"{plan.strategy}")
+    table.add_row("Motivo", plan.reason)
+    table.add_row("Referencia", f"{plan.codec} a {plan.sample_rate} Hz y {plan.channels} canal(es)")
+    table.add_row("Archivos", f"{file_count} ({len(plan.outliers)} a normalizar)")
+    table.add_row("Duración", parse_seconds(plan.duration_seconds))
+    console.print(table)
+
+    runs = Table(title="[bold magenta]Tramos[/bold magenta]", border_style="blue")
+    runs.add_column("#", justify="right", style="cyan")
+    runs.add_column("Archivos", style="white")
+    runs.add_column("Códec", style="green")
+    runs.add_column("Frecuencia", justify="right", style="green")
+    runs.add_column("Canales", justify="right", style="green")
+    runs.add_column("Duración", justify="right", style="green")
+    runs.add_column("Tratamiento", style="yellow")
+
+    for index, run in enumerate(plan.runs, start=1):
+        names = run.files[0].path.name
+        if len(run.files) > 1:
+            names += f" … {run.files[-1].path.name} ({len(run.files)})"
+        runs.add_row(
+            f"{index}",
+            names,
+            run.codec,
+            f"{run.sample_rate} Hz",
+            f"{run.channels}",
+            parse_seconds(run.duration_seconds),
+            "se normaliza" if run.normalize else "sin cambios"
+        )
+    console.print(runs)
@@ -0,0 +1,75 @@
+"""
+Queue commands: enqueue conversions and run workers that drain the persistent job queue.
+"""
+from pathlib import Path
+from typing import List
+from rich.table import Table
+from argparse import Namespace
+from rich.console import Console
+
+from m4b_converter.enums import Bitrate, JobStatus, TranscodeMode
+from m4b_converter.managers import WorkflowManager, QueueWorkerManager
+from m4b_converter.services import JobQueueService
+
+def _print_queue_counts(queue: JobQueueService, console: Console) -> None:
+    counts = queue.counts()
+    table = Table(title="[bold magenta]Estado de la cola[/bold magenta]", border_style="blue")
+    table.add_column("Estado", style="cyan")
+    table.add_column("Trabajos", style="green", justify="right")
+    for status in JobStatus:
+        table.add_row(status.value, str(counts[status]))
+    console.print(table)
+
+def handle_enqueue(args: Namespace, console: Console) -> None:
+    manager = WorkflowManager()
+    files: List[Path] = []
+
+    for input_path in map(Path, args.inputs):
+        if input_path.is_dir():
+            files.extend(manager._find_audio_files(input_path, args.recursive))
+        elif input_path.is_file():
+            files.append(input_path)
+        else:
+            console.print(f"[yellow]Se ignora {input_path}: no existe.[/yellow]")
+
+    if not files:
+        console.print("[bold red]Error:[/bold red] no se encontraron archivos compatibles para encolar.")
+        return
+
+    queue = JobQueueService()
+    queue.enqueue_many(
+        files,
+        bitrate=Bitrate(args.bitrate),
+        channels=args.channels,
+        output_dir=Path(args.output_dir) if args.output_dir else None,
+        priority=args.priority,
+        max_attempts=args.max_attempts
+    )
+    console.print(f"[bold green]{len(files)} trabajo(s) encolados[/bold green] con prioridad {args.priority}.")
+    _print_queue_counts(queue, console)
+
+def handle_worker(args: Namespace, console: Console) -> None:
+    workers = QueueWorkerManager(
+        concurrency=args.concurrency,
+        use_probe_cache=not args.no_probe_cache,
+        lease_seconds=args.lease_seconds,
+        poll_interval=args.poll_interval,
+        transcode=TranscodeMode(args.transcode)
+    )
+    console.print(f"[cyan]Iniciando {workers.concurrency} worker(s)...[/cyan] (Ctrl+C para detener)")
+
+    styles = {"done": "green", "retry": "yellow", "failed": "red"}
+
+    def report(event: dict) -> None:
+        style = styles[event["status"]]
+        name = Path(event["input_path"]).name
+        console.print(f"[{style}]{event['status']:>6}[/{style}] {name} [dim](intento {event['attempts']}, {event['worker_id']})[/dim]")
+
+    totals = workers.run(follow=args.follow, job_callback=report)
+
+    console.print(
+        f"\n[bold]Completados:[/bold] {totals['done']}  "
+        f"[bold]Reintentos:[/bold] {totals['retry']}  "
+        f"[bold]Fallidos:[/bold] {totals['failed']}"
+    )
+    _print_queue_counts(JobQueueService(), console)
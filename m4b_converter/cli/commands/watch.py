@@ -0,0 +1,56 @@
+"""
+Watch command: convert audio files as they land in a directory.
+"""
+from pathlib import Path
+from typing import Optional
+from argparse import Namespace
+from rich.console import Console
+
+from m4b_converter.enums import Bitrate, TranscodeDecision, TranscodeMode
+from m4b_converter.managers import WatchManager
+from m4b_converter.schemas import ConversionResult
+from m4b_converter.cli.utils import convert_bytes_to_mb
+
+def handle_watch(args: Namespace, console: Console) -> None:
+    watch_dir = Path(args.watch_dir)
+
+    if not watch_dir.is_dir():
+        console.print(f"[bold red]Error:[/bold red] {watch_dir} no es un directorio válido.")
+        return
+
+    watcher = WatchManager(
+        watch_dir,
+        recursive=args.recursive,
+        settle_seconds=args.settle_seconds,
+        interval=args.interval,
+        use_probe_cache=not args.no_probe_cache,
+        transcode=TranscodeMode(args.transcode)
+    )
+
+    if args.ignore_existing:
+        skipped = watcher.mark_existing()
+        console.print(f"[dim]Se ignoran {skipped} archivo(s) existentes.[/dim]")
+
+    def report(kind: str, file_path: Path, result: Optional[ConversionResult]) -> None:
+        if kind == "queued":
+            console.print(f"[cyan]  queued[/cyan] {file_path.name}")
+        elif kind == "done" and result.transcode_decision == TranscodeDecision.SKIP:
+            console.print(f"[yellow] skipped[/yellow] {file_path.name} [dim](ya está por debajo del bitrate objetivo)[/dim]")
+        elif kind == "done":
+            console.print(
+                f"[green]    done[/green] {file_path.name} → {result.output_path.name} "
+                f"[dim]({convert_bytes_to_mb(result.size_final_bytes):.2f} MB, reducción {result.compression_ratio * 100:.0f}%)[/dim]"
+            )
+        else:
+            console.print(f"[red]  failed[/red] {file_path.name} [dim](ver log)[/dim]")
+
+    console.print(f"[bold cyan]Vigilando {watch_dir}[/bold cyan] (Ctrl+C para detener)")
+    results = watcher.run(
+        bitrate=Bitrate(args.bitrate),
+        channels=args.channels,
+        output_dir=Path(args.output_dir) if args.output_dir else None,
+        jobs=args.jobs,
+        single_pass_cover=args.single_pass_cover,
+        event_callback=report
+    )
+    console.print(f"\n[bold]Convertidos durante la vigilancia:[/bold] {len(results)}")
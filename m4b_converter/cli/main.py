@@ -1,28 +1,76 @@
+import os
 import sys
+import pstats
+import cProfile
 from pathlib import Path
+from datetime import datetime
+from argparse import Namespace
 from rich.console import Console
 
+from m4b_converter.settings import AppSettings
 from m4b_converter.cli.parser import create_parser
-from m4b_converter.cli.commands import analyze_audiobook, handle_convert, handle_cover, show_version, handle_batch, clean_directories
-
-def main() -> None:
-    parser = create_parser()
-    args = parser.parse_args()
-
-    console = Console()
+from m4b_converter.cli import commands
 
+def dispatch(args: Namespace, console: Console) -> None:
+    # `commands` resuelve cada manejador al usarlo, así que solo se importa el módulo del comando pedido
     if args.command == "version":
-        show_version(console)
+        commands.show_version(console)
+    elif args.command == "encoders":
+        commands.show_encoders(args, console)
     elif args.command == "analyze":
-        analyze_audiobook(Path(args.file), console)
+        commands.analyze_audiobook(Path(args.file), console, use_cache=not args.no_probe_cache, concurrency=args.concurrency)
     elif args.command == "convert":
-        handle_convert(args, console)
+        commands.handle_convert(args, console)
     elif args.command == "cover":
-        handle_cover(Path(args.file), console)
+        commands.handle_cover(Path(args.file), console, use_cache=not args.no_probe_cache)
     elif args.command == "batch":
-        handle_batch(args, console)
+        commands.handle_batch(args, console)
+    elif args.command == "merge":
+        commands.handle_merge(args, console)
+    elif args.command == "enqueue":
+        commands.handle_enqueue(args, console)
+    elif args.command == "worker":
+        commands.handle_worker(args, console)
+    elif args.command == "watch":
+        commands.handle_watch(args, console)
     elif args.command == "clean":
-        clean_directories(args, console)
+        commands.clean_directories(args, console)
+
+def profile_path(args: Namespace) -> Path:
+    if args.profile_output:
+        return Path(args.profile_output)
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return AppSettings.PROFILES_DIR / f"{args.command or 'm4b'}-{timestamp}.prof"
+
+def run_profiled(args: Namespace, console: Console) -> None:
+    output = profile_path(args)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Los comandos leen la ruta final para situar los perfiles de sus trabajadores junto a ella
+    args.profile_output = str(output)
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(dispatch, args, console)
+    finally:
+        profiler.dump_stats(output)
+        stats = pstats.Stats(profiler)
+        console.print(f"\n[bold cyan]Perfil guardado en:[/bold cyan] {output} [dim]({stats.total_tt:.2f} s de Python)[/dim]")
+        console.print(f"[dim]Explóralo con: python -m pstats {output}  (o snakeviz {output})[/dim]")
+
+def main() -> None:
+    parser = create_parser()
+    args = parser.parse_args()
+
+    console = Console()
+
+    if args.scratch_dir:
+        # Por el entorno también lo ven los trabajadores de `batch --jobs`
+        os.environ["M4B_SCRATCH_DIR"] = args.scratch_dir
+        AppSettings.SCRATCH_DIR = Path(args.scratch_dir).expanduser()
+
+    if args.profile:
+        run_profiled(args, console)
+    else:
+        dispatch(args, console)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
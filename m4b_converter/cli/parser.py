@@ -1,7 +1,8 @@
 from pathlib import Path
 from argparse import ArgumentParser
 
-from m4b_converter.enums import Bitrate
+from m4b_converter.enums import Bitrate, TranscodeMode, AudioProfile, EncoderPreset, SampleRate, SampleRateMode
+from m4b_converter.settings import AppSettings
 
 def create_parser() -> ArgumentParser:
     """
@@ -19,42 +20,138 @@ def create_parser() -> ArgumentParser:
         exit_on_error=True
         )
     
+    parser.add_argument("--profile", action="store_true", help="Perfila la ejecución con cProfile, guarda un .prof y pide a ffmpeg sus tiempos internos.")
+    parser.add_argument("--profile-output", type=str, default=None, help=f"Ruta del .prof generado con --profile. Por defecto, un archivo con fecha en {AppSettings.PROFILES_DIR}.")
+    parser.add_argument("--scratch-dir", type=str, default=None, help="Directorio rápido (SSD, tmpfs) donde se escriben los M4B en curso. Equivale a la variable de entorno M4B_SCRATCH_DIR.")
+
     subparsers = parser.add_subparsers(dest="command", help="Comandos disponibles")
+
+    # Opciones compartidas por los comandos que analizan archivos con ffprobe
+    probe_parent = ArgumentParser(add_help=False)
+    probe_parent.add_argument("--no-probe-cache", action="store_true", help="No usa la caché persistente de ffprobe (fuerza un nuevo análisis).")
+
+    # Opciones compartidas por los comandos que convierten archivos sueltos
+    transcode_parent = ArgumentParser(add_help=False)
+    transcode_parent.add_argument("--transcode", type=str, default="auto", choices=[m.value for m in TranscodeMode], help="auto: remuxa el AAC que ya cumple el objetivo y recodifica el resto; skip: además omite los MP3 por debajo del bitrate; always: recodifica siempre. auto por default.")
     
+    # Opciones de codificador AAC
+    encoder_parent = ArgumentParser(add_help=False)
+    encoder_parent.add_argument("--encoder", type=str, default="auto", choices=["auto", AudioProfile.AAC.value, AudioProfile.LIBFDK_AAC.value, AudioProfile.AAC_AT.value], help="Codificador AAC. auto elige el más rápido que incluya el ffmpeg instalado (ver `m4b encoders`). auto por default.")
+    encoder_parent.add_argument("--aac-profile", type=str, default="auto", choices=["auto", AudioProfile.AAC_LOW.value, AudioProfile.AAC_HE.value, AudioProfile.AAC_HE_V2.value], help="Perfil AAC. auto usa HE-AAC hasta 48k si el codificador lo admite y AAC-LC en el resto. auto por default.")
+    encoder_parent.add_argument("--preset", type=str, default=EncoderPreset.BALANCED.value, choices=[p.value for p in EncoderPreset], help="Velocidad frente a calidad: fast para ingestas masivas (hasta 2x más rápido con el AAC nativo), quality para másteres. balanced por default.")
+    encoder_parent.add_argument("--sample-rate", type=str, default=SampleRateMode.AUTO.value, choices=[m.value for m in SampleRateMode] + [str(sr) for sr in SampleRate], help="Frecuencia de muestreo de salida en Hz. auto baja la voz a bitrates bajos a 22050/24000; source conserva la del origen. auto por default.")
+
+    # Capítulos a partir de los silencios, detectados durante la propia codificación
+    silence_parent = ArgumentParser(add_help=False)
+    silence_parent.add_argument("--silence-chapters", action="store_true", help="Crea capítulos en los silencios largos del audio, detectados en la misma pasada de ffmpeg que codifica.")
+    silence_parent.add_argument("--silence-duration", type=float, default=2.0, help="Segundos mínimos de silencio para marcar un posible capítulo, 2 por default.")
+    silence_parent.add_argument("--silence-noise", type=float, default=-35.0, help="Nivel en dB por debajo del cual el audio se considera silencio, -35 por default.")
+    silence_parent.add_argument("--chapter-min-spacing", type=float, default=300.0, help="Duración mínima en segundos de cada capítulo detectado, 300 por default.")
+
+    # Varias versiones del mismo libro desde una sola decodificación
+    rendition_parent = ArgumentParser(add_help=False)
+    rendition_parent.add_argument("--rendition", type=str, action="append", default=None, metavar="BITRATE:CANALES[:FRECUENCIA]", help="Versión a generar, p. ej. 64k:1 o 128k:2:44100. Repetible: todas se escriben desde un único proceso ffmpeg y sustituyen a --bitrate, --channels y --sample-rate.")
+
     # -------------------------------------------
     # Subcommand: version
     # -------------------------------------------
     subparsers.add_parser("version", help="Muestra la versión de la CLI.")
 
+    # -------------------------------------------
+    # Subcommand: encoders
+    # -------------------------------------------
+    encoders_parser = subparsers.add_parser("encoders", help="Muestra los codificadores AAC del ffmpeg instalado y la selección automática.")
+    encoders_parser.add_argument("--refresh", action="store_true", help="Vuelve a consultar ffmpeg aunque haya caché.")
+
     # -------------------------------------------
     # Subcommand: analyze
     # -------------------------------------------
-    analyze_parser = subparsers.add_parser("analyze", help="Analiza el archivo de un audiolibro.")
-    analyze_parser.add_argument("file", type=str, help="Ruta hacia el archivo de audio a analizar.")
+    analyze_parser = subparsers.add_parser("analyze", parents=[probe_parent], help="Analiza el archivo de un audiolibro.")
+    analyze_parser.add_argument("file", type=str, help="Ruta hacia el archivo de audio (o directorio) a analizar.")
+    analyze_parser.add_argument("--concurrency", type=int, default=8, help="Procesos ffprobe simultáneos al analizar un directorio, 8 por default.")
     
     # -------------------------------------------
     # Subcommand: convert
     # -------------------------------------------
-    convert_parser = subparsers.add_parser("convert", help="Convierte un archivo de audio a m4b")
+    convert_parser = subparsers.add_parser("convert", parents=[probe_parent, transcode_parent, encoder_parent, silence_parent, rendition_parent], help="Convierte un archivo de audio a m4b")
     convert_parser.add_argument("input", type=Path, help="Ruta al archivo de audio")
     convert_parser.add_argument("-b", "--bitrate", type=str, default="64k", choices=[b.value for b in Bitrate])
     convert_parser.add_argument("-c", "--channels", type=int, default=2, choices=[1, 2], help="Cantidad de canales, 1 0 2, 2 por default.")
     convert_parser.add_argument("-o","--output-dir", type=str, default=None, help="Directorio de salida para la conversión")
+    convert_parser.add_argument("--single-pass-cover", action="store_true", help="Incrusta y guarda la portada desde el mismo proceso ffmpeg de la conversión, sin archivos temporales.")
+    convert_parser.add_argument("--segments", type=int, default=1, help="Divide el audio en N segmentos que se codifican en paralelo (0 = automático según núcleos y duración), 1 por default.")
 
     # -------------------------------------------
     # Subcommand: cover
     # -------------------------------------------
-    cover_parser = subparsers.add_parser("cover", help="Extrae el cover/portada del archivo de audio de un audiolibro.")
+    cover_parser = subparsers.add_parser("cover", parents=[probe_parent], help="Extrae el cover/portada del archivo de audio de un audiolibro.")
     cover_parser.add_argument("file", type=str, help="Ruta al archivo de audio al que extraer el cover.")
 
     # -------------------------------------------
     # Subcommand: batch
     # -------------------------------------------
-    batch_parser = subparsers.add_parser("batch", help="Convierte a m4b todos los archivos de audio que hay en un directorio.")
+    batch_parser = subparsers.add_parser("batch", parents=[probe_parent, transcode_parent, encoder_parent, silence_parent, rendition_parent], help="Convierte a m4b todos los archivos de audio que hay en un directorio.")
     batch_parser.add_argument("input_dir", type=str, help="Directorio con archivos de audio")
     batch_parser.add_argument("-b", "--bitrate", type=str, default="64k", choices=[b.value for b in Bitrate])
     batch_parser.add_argument("-c", "--channels", type=int, default=1, choices=[1, 2])
     batch_parser.add_argument("-o", "--output-dir", type=str, default=None, help="Directorio de salida para la conversión")
+    batch_parser.add_argument("-r", "--recursive", action="store_true", help="Busca archivos también en subdirectorios.")
+    batch_parser.add_argument("--single-pass-cover", action="store_true", help="Incrusta y guarda la portada desde el mismo proceso ffmpeg de la conversión, sin archivos temporales.")
+    batch_parser.add_argument("-j", "--jobs", type=int, default=1, help="Conversiones simultáneas. Los núcleos se reparten entre los trabajos, 1 por default.")
+    batch_parser.add_argument("--metrics-file", type=str, default=None, help="Escribe métricas en formato Prometheus (textfile collector) en esta ruta durante el lote.")
+    batch_parser.add_argument("--status-file", type=str, default=None, help="Escribe un JSON con el estado del lote en esta ruta durante el lote.")
+    batch_parser.add_argument("--metrics-interval", type=float, default=15.0, help="Segundos entre escrituras de métricas y estado, 15 por default.")
+    batch_parser.add_argument("--min-free-space", type=int, default=AppSettings.MIN_FREE_BYTES // (1024 * 1024), help="MB que deben quedar libres en los discos de salida y temporal; los archivos que no quepan esperan a que terminen otros. 0 desactiva la comprobación. 1024 por default.")
+
+    # -------------------------------------------
+    # Subcommand: merge
+    # -------------------------------------------
+    merge_parser = subparsers.add_parser("merge", help="Fusiona los MP3 de un directorio en un único audiolibro m4b.")
+    merge_parser.add_argument("input_dir", type=str, help="Directorio con los archivos MP3 (se ordenan por número de pista si todos lo tienen, o en orden natural por nombre).")
+    merge_parser.add_argument("-b", "--bitrate", type=str, default="64k", choices=[b.value for b in Bitrate])
+    merge_parser.add_argument("-c", "--channels", type=int, default=1, choices=[1, 2])
+    merge_parser.add_argument("-o", "--output-dir", type=str, default=None, help="Directorio de salida")
+    merge_parser.add_argument("--title", type=str, default=None, help="Título del audiolibro.")
+    merge_parser.add_argument("--author", type=str, default=None, help="Autor o narrador del audiolibro.")
+    merge_parser.add_argument("--mp3", action="store_true", help="Solo concatena a un MP3 (copia sin recodificar) en lugar de generar el m4b.")
+    merge_parser.add_argument("--no-chapters", action="store_true", help="No genera un capítulo por archivo.")
+    merge_parser.add_argument("--dry-run", action="store_true", help="Analiza los MP3 y muestra cómo se unirían (tramos y archivos a normalizar) sin ejecutar ffmpeg.")
+
+    # -------------------------------------------
+    # Subcommand: enqueue
+    # -------------------------------------------
+    enqueue_parser = subparsers.add_parser("enqueue", help="Añade archivos a la cola persistente de conversiones.")
+    enqueue_parser.add_argument("inputs", type=str, nargs="+", help="Archivos de audio o directorios a encolar.")
+    enqueue_parser.add_argument("-b", "--bitrate", type=str, default="64k", choices=[b.value for b in Bitrate])
+    enqueue_parser.add_argument("-c", "--channels", type=int, default=1, choices=[1, 2])
+    enqueue_parser.add_argument("-o", "--output-dir", type=str, default=None, help="Directorio de salida para la conversión")
+    enqueue_parser.add_argument("-r", "--recursive", action="store_true", help="Busca archivos también en subdirectorios.")
+    enqueue_parser.add_argument("-p", "--priority", type=int, default=0, help="Prioridad de los trabajos (mayor se procesa antes), 0 por default.")
+    enqueue_parser.add_argument("--max-attempts", type=int, default=3, help="Intentos antes de marcar un trabajo como fallido, 3 por default.")
+
+    # -------------------------------------------
+    # Subcommand: worker
+    # -------------------------------------------
+    worker_parser = subparsers.add_parser("worker", parents=[probe_parent, transcode_parent], help="Procesa los trabajos de la cola persistente.")
+    worker_parser.add_argument("-j", "--concurrency", type=int, default=1, help="Procesos worker simultáneos, 1 por default.")
+    worker_parser.add_argument("-f", "--follow", action="store_true", help="Sigue esperando trabajos nuevos en lugar de terminar cuando la cola se vacía.")
+    worker_parser.add_argument("--poll-interval", type=float, default=5.0, help="Segundos entre consultas con la cola vacía (con --follow), 5 por default.")
+    worker_parser.add_argument("--lease-seconds", type=int, default=AppSettings.JOB_LEASE_SECONDS, help=f"Validez del lease de cada trabajo, {AppSettings.JOB_LEASE_SECONDS} por default.")
+
+    # -------------------------------------------
+    # Subcommand: watch
+    # -------------------------------------------
+    watch_parser = subparsers.add_parser("watch", parents=[probe_parent, transcode_parent], help="Vigila un directorio y convierte los archivos de audio que van llegando.")
+    watch_parser.add_argument("watch_dir", type=str, help="Directorio a vigilar")
+    watch_parser.add_argument("-b", "--bitrate", type=str, default="64k", choices=[b.value for b in Bitrate])
+    watch_parser.add_argument("-c", "--channels", type=int, default=1, choices=[1, 2])
+    watch_parser.add_argument("-o", "--output-dir", type=str, default=None, help="Directorio de salida para la conversión")
+    watch_parser.add_argument("-r", "--recursive", action="store_true", help="Vigila también los subdirectorios.")
+    watch_parser.add_argument("-j", "--jobs", type=int, default=1, help="Conversiones simultáneas. Los núcleos se reparten entre los trabajos, 1 por default.")
+    watch_parser.add_argument("--single-pass-cover", action="store_true", help="Incrusta y guarda la portada desde el mismo proceso ffmpeg de la conversión, sin archivos temporales.")
+    watch_parser.add_argument("--settle-seconds", type=float, default=5.0, help="Segundos sin cambios de tamaño ni fecha para dar un archivo por copiado, 5 por default.")
+    watch_parser.add_argument("--interval", type=float, default=2.0, help="Segundos entre escaneos, 2 por default.")
+    watch_parser.add_argument("--ignore-existing", action="store_true", help="No convierte los archivos que ya estaban en el directorio al empezar.")
 
     # -------------------------------------------
     # Subcommand: clean
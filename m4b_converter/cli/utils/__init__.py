@@ -2,3 +2,7 @@ from m4b_converter.cli.utils.remove_files import remove_file
 from m4b_converter.cli.utils.seconds_parser import parse_seconds
 from m4b_converter.cli.utils.bytes_to_mb import convert_bytes_to_mb
 from m4b_converter.cli.utils.count_files import count_files_in_directory
+from m4b_converter.cli.utils.encoder_options import parse_encoder_options
+from m4b_converter.cli.utils.sample_rate_parser import parse_sample_rate
+from m4b_converter.cli.utils.silence_options import parse_silence_chapters
+from m4b_converter.cli.utils.rendition_parser import parse_renditions
@@ -0,0 +1,18 @@
+from argparse import Namespace
+from typing import Optional, Tuple
+
+from m4b_converter.enums import AudioProfile
+
+def parse_encoder_options(args: Namespace) -> Tuple[Optional[AudioProfile], Optional[AudioProfile]]:
+    """
+    Convierte las opciones `--encoder` y `--aac-profile` de la CLI.
+
+    Args:
+        args (Namespace): Argumentos del comando.
+
+    Returns:
+        Tuple[Optional[AudioProfile], Optional[AudioProfile]]: Codificador y perfil; None cuando se pidió "auto".
+    """
+    encoder = None if args.encoder == "auto" else AudioProfile(args.encoder)
+    profile = None if args.aac_profile == "auto" else AudioProfile(args.aac_profile)
+    return encoder, profile
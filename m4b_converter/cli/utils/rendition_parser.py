@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from m4b_converter.enums import Bitrate, SampleRateMode
+from m4b_converter.schemas import Rendition
+from m4b_converter.cli.utils.sample_rate_parser import parse_sample_rate
+
+def parse_renditions(values: Optional[List[str]]) -> Optional[List[Rendition]]:
+    """
+    Convierte las opciones `--rendition` de la CLI.
+
+    Args:
+        values (Optional[List[str]]): Valores "BITRATE:CANALES[:FRECUENCIA]" (ej: "64k:1", "128k:2:44100"). La frecuencia admite los mismos valores que `--sample-rate`.
+
+    Returns:
+        Optional[List[Rendition]]: Las versiones en el orden dado, o None si no se pidió ninguna.
+
+    Raises:
+        ValueError: Si un valor no tiene el formato esperado, usa un bitrate o una frecuencia no admitidos, o repite otra versión.
+    """
+    if not values:
+        return None
+
+    renditions = []
+    for value in values:
+        parts = value.split(":")
+        if len(parts) not in (2, 3):
+            raise ValueError(f"Versión no válida '{value}': usa BITRATE:CANALES[:FRECUENCIA], p. ej. 64k:1")
+        if parts[1] not in ("1", "2"):
+            raise ValueError(f"Versión no válida '{value}': los canales deben ser 1 o 2")
+        try:
+            rendition = Rendition(
+                bitrate=Bitrate(parts[0]),
+                channels=int(parts[1]),
+                sample_rate=parse_sample_rate(parts[2]) if len(parts) == 3 else SampleRateMode.AUTO
+            )
+        except ValueError as e:
+            raise ValueError(f"Versión no válida '{value}': {e}") from e
+        if any(r.label == rendition.label for r in renditions):
+            raise ValueError(f"La versión '{value}' está repetida")
+        renditions.append(rendition)
+    return renditions
@@ -0,0 +1,17 @@
+from typing import Union
+
+from m4b_converter.enums import SampleRate, SampleRateMode
+
+def parse_sample_rate(value: str) -> Union[SampleRate, SampleRateMode]:
+    """
+    Convierte la opción `--sample-rate` de la CLI.
+
+    Args:
+        value (str): "auto", "source" o una frecuencia en Hz (ej: "22050").
+
+    Returns:
+        Union[SampleRate, SampleRateMode]: La política o la frecuencia pedida.
+    """
+    if value in (SampleRateMode.AUTO.value, SampleRateMode.SOURCE.value):
+        return SampleRateMode(value)
+    return SampleRate(int(value))
@@ -0,0 +1,25 @@
+from typing import Optional
+from argparse import Namespace
+
+from m4b_converter.schemas import SilenceChapterOptions
+
+def parse_silence_chapters(args: Namespace) -> Optional[SilenceChapterOptions]:
+    """
+    Convierte las opciones `--silence-*` y `--chapter-min-spacing` de la CLI.
+
+    Args:
+        args (Namespace): Argumentos del comando.
+
+    Returns:
+        Optional[SilenceChapterOptions]: Parámetros de la detección, o None si no se pidió `--silence-chapters`.
+
+    Raises:
+        ValueError: Si algún valor está fuera de rango (p. ej. un umbral de ruido positivo).
+    """
+    if not args.silence_chapters:
+        return None
+    return SilenceChapterOptions(
+        min_silence_seconds=args.silence_duration,
+        noise_db=args.silence_noise,
+        min_chapter_seconds=args.chapter_min_spacing
+    )
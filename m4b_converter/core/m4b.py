@@ -1,11 +1,12 @@
 import shutil
 import logging
-import subprocess
 from pathlib import Path
 from typing import Optional, Dict, Callable
 
 from m4b_converter.enums import Format, Bitrate, AudioProfile
 from m4b_converter.settings import AppSettings
+from m4b_converter.schemas import ProgressEvent
+from m4b_converter.services import FfmpegProgressService
 
 class M4bConverter:
     def __init__(
@@ -22,8 +23,8 @@ class M4bConverter:
         self.metadata = metadata or {}
 
         # Crear directorios si no existen
-        self.output_dir.mkdir(exist_ok=True)
-        self.temp_dir.mkdir(exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
 
         # Generar nombres de archivos
         self.output_filename = self._generate_output_filename()
@@ -79,14 +80,14 @@ class M4bConverter:
         audio_profile: AudioProfile = AudioProfile.AAC_LOW,
         channels: int = 1,
         threads: int = 1,
-        progress_callback: Optional[Callable] = None,
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
         remove_temp: bool = True
     ) -> Path:
         """
         Convierte el archivo a M4B.
         
         Args:
-            progress_callback: Función para reportar progreso (ej: lambda p: print(f"{p}%")).
+            progress_callback: Función que recibe cada ProgressEvent de ffmpeg (ej: lambda e: print(e.out_time_seconds, e.speed)).
         """
         try:
             # Paso 1: Convertir a archivo temporal
@@ -98,19 +99,7 @@ class M4bConverter:
                 threads=threads
             )
 
-            process = subprocess.Popen(
-                command,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-
-            for line in process.stderr:
-                if progress_callback and "time=" in line:
-                    time_str = line.split("time=")[1].split()[0]
-                    progress_callback(time_str)
-
-            if process.wait() != 0:
-                raise subprocess.CalledProcessError(process.returncode, command)
+            FfmpegProgressService().run(command, progress_callback)
 
             # Paso 2: Mover a output_dir
             self._move_to_output(self.temp_path)
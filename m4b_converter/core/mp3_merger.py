@@ -1,34 +1,44 @@
 import os
-import subprocess
-import shutil
+import re
+import asyncio
+import logging
 from pathlib import Path
-from typing import List, Optional, Dict, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Dict, Callable, Tuple, Union
+
+from m4b_converter.enums import Bitrate, ConcatStrategy
+from m4b_converter.schemas import AudioFileSchema, AudioMetadata, ConcatPlan, ConversionResult, ProgressEvent
+from m4b_converter.services import AudioAnalyzerService, ExtractCoverService, M4bConverterService, ChapterService, ConcatPlannerService, FfmpegProgressService
 
 class Mp3Merger:
     def __init__(self, input_path: str, output_dir: str = "output", temp_dir: str = "temp"):
+        self.logger = logging.getLogger(self.__class__.__name__)
         self.input_path = Path(input_path)
         self.output_dir = Path(output_dir)
         self.temp_dir = Path(temp_dir)
 
         # Crear directorios si no existen
-        self.output_dir.mkdir(exist_ok=True)
-        self.temp_dir.mkdir(exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
 
         self.output_filename = "merged.mp3"
         self.output_path = self.output_dir / self.output_filename
         self.temp_list_path = self.temp_dir / "mp3_list.txt"
+        self.temp_chapters_path = self.temp_dir / "chapters.txt"
 
         self.mp3_files = self._collect_mp3_files()
 
+    # Trozos numéricos y no numéricos de un nombre, para el orden natural
+    _NATURAL_CHUNKS = re.compile(r"(\d+)")
+
     def _collect_mp3_files(self) -> List[Path]:
-        """Recoge archivos MP3 recursivamente, ordenados por nombre."""
+        """
+        Recoge archivos MP3 recursivamente, en orden natural (ver `iter_mp3_files`).
+
+        El recorrido es perezoso, pero aquí se materializa en una lista de rutas: el orden por número de pista, el plan de concatenación y los capítulos necesitan los esquemas de todos los archivos antes de lanzar ffmpeg. Son unos cientos de bytes por archivo (y otro tanto por su AudioFileSchema), así que la memoria crece con el número de archivos, no con la duración del audio.
+        """
         try:
-            mp3_files = sorted(
-                [Path(root) / Path(file) 
-                 for root, _, files in os.walk(self.input_path) 
-                 for file in files 
-                 if file.lower().endswith('.mp3')]
-            )
+            mp3_files = list(self.iter_mp3_files(self.input_path))
             if not mp3_files:
                 raise Exception(f"No se encontraron archivos MP3 en {self.input_path}")
             
@@ -37,80 +47,379 @@ class Mp3Merger:
         except Exception as e:
             raise Exception(f"Error al buscar MP3: {e}")
 
-    def _build_ffmpeg_command(self) -> list:
-        return [
+    @classmethod
+    def natural_key(cls, name: str) -> List[Union[int, str]]:
+        """
+        Clave de orden natural: los números se comparan por su valor ("Pista 2" antes que "Pista 10") y el texto sin distinguir mayúsculas.
+
+        Args:
+            name (str): Nombre de archivo o directorio.
+
+        Returns:
+            List[Union[int, str]]: Trozos alternos de texto y número.
+        """
+        return [int(chunk) if chunk.isdigit() else chunk.casefold() for chunk in cls._NATURAL_CHUNKS.split(name)]
+
+    @classmethod
+    def iter_mp3_files(cls, directory: Path) -> Iterator[Path]:
+        """
+        Recorre un directorio y sus subdirectorios entregando los MP3 en orden natural.
+
+        Cada directorio se lee con `os.scandir` y se ordena por separado, y los subdirectorios se recorren en su posición dentro de ese orden ("CD 2" antes que "CD 10"). El generador solo mantiene en memoria las entradas de los directorios que se están recorriendo; quien necesite la lista completa (como `_collect_mp3_files`) la materializa.
+
+        Args:
+            directory (Path): Directorio de entrada.
+
+        Yields:
+            Path: Cada archivo `.mp3` (sin distinguir mayúsculas en la extensión).
+        """
+        with os.scandir(directory) as scan:
+            entries = sorted(scan, key=lambda entry: cls.natural_key(entry.name))
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from cls.iter_mp3_files(Path(entry.path))
+            elif entry.name.lower().endswith(".mp3"):
+                yield Path(entry.path)
+
+    def _write_concat_list(self, paths: Optional[List[Path]] = None, list_path: Optional[Path] = None) -> Path:
+        """Escribe una lista del demuxer concat, una línea `file '<ruta>'` por archivo (por defecto, todos los MP3 en `temp_list_path`)."""
+        list_path = list_path or self.temp_list_path
+        with open(list_path, "w", encoding="utf-8") as temp_file:
+            for mp3 in self.mp3_files if paths is None else paths:
+                # Las comillas simples se escapan como '\'' según la sintaxis del demuxer concat
+                escaped = mp3.absolute().as_posix().replace("'", "'\\''")
+                temp_file.write(f"file '{escaped}'\n")
+        return list_path
+
+    @staticmethod
+    def _concat_input(list_path: Path) -> List[str]:
+        return ["-f", "concat", "-safe", "0", "-i", str(list_path.absolute())]
+
+    def plan(self, copy_output: bool = False) -> ConcatPlan:
+        """
+        Analiza los MP3 y elige cómo unirlos, sin ejecutar ffmpeg (lo usa `m4b merge --dry-run`).
+
+        Args:
+            copy_output (bool): True para planificar `merge` (MP3 copiado), False para `merge_to_m4b`. Por defecto False.
+
+        Returns:
+            ConcatPlan: Estrategia, parámetros de referencia y tramos (ver ConcatPlannerService).
+
+        Raises:
+            ValueError: Si no hay archivos MP3 o si los atípicos no se pueden normalizar.
+            RuntimeError: Si algún archivo no se pudo analizar.
+        """
+        if not self.mp3_files:
+            raise ValueError("No hay archivos MP3 para fusionar.")
+        return ConcatPlannerService.plan(self._order_files(self._probe_files()), copy_output)
+
+    def _normalize_outliers(self, plan: ConcatPlan) -> Dict[Path, Path]:
+        """
+        Recodifica los archivos atípicos de un plan NORMALIZE a los parámetros de referencia, uno por núcleo a la vez.
+
+        Args:
+            plan (ConcatPlan): Plan de la fusión.
+
+        Returns:
+            Dict[Path, Path]: Temporal normalizado de cada archivo atípico. Si alguno falla se eliminan todos y se relanza el error.
+        """
+        outliers = plan.outliers
+        normalized = {info.path: self.temp_dir / f"normalized_{index:05d}.{plan.codec}" for index, info in enumerate(outliers)}
+        self.logger.info(f"Normalizando {len(outliers)} archivo(s) a {plan.codec} a {plan.sample_rate} Hz y {plan.channels} canal(es)")
+
+        def normalize(info: AudioFileSchema) -> None:
+            FfmpegProgressService().run(ConcatPlannerService.normalize_command(info, plan, normalized[info.path]))
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(len(outliers), os.cpu_count() or 1)) as executor:
+                list(executor.map(normalize, outliers))
+        except Exception:
+            for path in normalized.values():
+                path.unlink(missing_ok=True)
+            raise
+        return normalized
+
+    def _prepare_inputs(self, plan: ConcatPlan) -> Tuple[List[str], Optional[str], List[Path]]:
+        """
+        Escribe las listas concat (y los atípicos normalizados) de un plan.
+
+        Args:
+            plan (ConcatPlan): Plan de la fusión.
+
+        Returns:
+            Tuple[List[str], Optional[str], List[Path]]: Argumentos de entrada de ffmpeg, grafo que une las entradas (solo FILTERGRAPH, con salida `[M4bConverterService.INPUT_GRAPH_LABEL]`) y temporales que hay que eliminar al terminar.
+        """
+        self.logger.info(f"Estrategia de fusión: {plan.strategy} ({plan.reason})")
+
+        if plan.strategy == ConcatStrategy.FILTERGRAPH:
+            input_args, temp_paths = [], []
+            for index, run in enumerate(plan.runs):
+                list_path = self._write_concat_list([info.path for info in run.files], self.temp_dir / f"mp3_list_{index}.txt")
+                input_args.extend(self._concat_input(list_path))
+                temp_paths.append(list_path)
+            return input_args, ConcatPlannerService.filtergraph(plan, M4bConverterService.INPUT_GRAPH_LABEL), temp_paths
+
+        normalized = self._normalize_outliers(plan) if plan.strategy == ConcatStrategy.NORMALIZE else {}
+        list_path = self._write_concat_list([normalized.get(mp3, mp3) for mp3 in self.mp3_files])
+        return self._concat_input(list_path), None, [list_path, *normalized.values()]
+
+    def _build_ffmpeg_command(self, input_args: List[str], metadata: Optional[Dict[str, str]] = None, chapters: bool = False) -> list:
+        command = [
             "ffmpeg",
             "-hide_banner",
+            "-y",
             "-loglevel", "error",
-            "-f", "concat",
-            "-safe", "0",
-            "-i", str(self.temp_list_path.absolute()),
-            "-c", "copy",
-            str(self.output_path)
+            *input_args,
         ]
+        if chapters:
+            # Capítulos en ID3v2 (CHAP), escritos en la misma pasada que la concatenación
+            command.extend(["-f", "ffmetadata", "-i", str(self.temp_chapters_path.absolute())])
+            command.extend(["-map", "0", "-map_chapters", "1"])
+        command.extend(["-c", "copy"])
+        for key, value in (metadata or {}).items():
+            command.extend(["-metadata", f"{key}={value}"])
+        command.append(str(self.output_path))
+        return command
 
     def merge(
         self,
         metadata: Optional[Dict[str, str]] = None,
-        progress_callback: Optional[Callable[[str], None]] = None
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        chapters: bool = True
     ) -> Path:
-        """Fusiona MP3s en un solo archivo y opcionalmente añade metadatos."""
+        """
+        Fusiona los MP3 en un solo MP3 sin recodificar, con los metadatos y un capítulo por archivo en la misma pasada.
+
+        Los archivos se analizan con una pasada concurrente de ffprobe (ver `_probe_files`), que da el orden por número de pista, los capítulos y la duración total. El progreso se lee del canal `-progress` de ffmpeg a medida que se escribe (ver FfmpegProgressService) y stderr solo conserva sus últimas líneas para el mensaje de error, así que la memoria no crece con la duración del libro. Sí crece, en unos cientos de bytes por archivo, con el número de MP3: sus rutas y esquemas se guardan para ordenar, planificar y generar los capítulos (ver `_collect_mp3_files`).
+
+        Si algún MP3 no tiene la frecuencia o los canales del resto, el demuxer concat copiaría un stream incoherente. Con los mismos esquemas de ffprobe se elige un plan (ver ConcatPlannerService): los archivos atípicos se recodifican antes a los parámetros de referencia y todo lo demás se sigue copiando.
+
+        Args:
+            metadata (Optional[Dict[str, str]]): Metadatos del MP3 fusionado (title, artist...).
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Callback con los ProgressEvent de la copia; su porcentaje se calcula sobre la duración total.
+            chapters (bool): Si es True, cada MP3 se convierte en un capítulo ID3v2. Por defecto True.
+
+        Returns:
+            Path: Ruta del MP3 fusionado.
+
+        Raises:
+            ValueError: Si no hay archivos MP3 para fusionar o si los atípicos no se pueden normalizar.
+            RuntimeError: Si algún archivo no se pudo analizar o si ffmpeg falla. Ante un error se elimina la salida incompleta.
+        """
         if not self.mp3_files:
             raise ValueError("No hay archivos MP3 para fusionar.")
 
+        temp_paths: List[Path] = []
         try:
-            # Crear archivo temporal con la lista de archivos
-            with open(self.temp_list_path, "w") as temp_file:
-                for mp3 in self.mp3_files:
-                    temp_file.write(f"file {mp3.absolute().as_posix()}\n")
-                    
-            
-            if not self.temp_list_path.exists():
-                raise RuntimeError("El archivo de lista de MP3 no fue generado correctamente.")
-            
-            with open(self.temp_list_path, "r") as temp_file:
-                print("Contenido del archivo de concatenación:")
-                print(temp_file.read())
+            infos = self._order_files(self._probe_files())
+            plan = ConcatPlannerService.plan(infos, copy_output=True)
+            if chapters:
+                self._write_chapters(infos)
+            input_args, _, temp_paths = self._prepare_inputs(plan)
 
-            command = self._build_ffmpeg_command()
+            runner = FfmpegProgressService(duration_seconds=plan.duration_seconds)
+            runner.run(self._build_ffmpeg_command(input_args, metadata, chapters), progress_callback)
+            self.logger.info(f"{len(infos)} archivos fusionados en {self.output_path}")
+            return self.output_path
 
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-            stdout, stderr = process.communicate()
-            print("Salida de FFmpeg:")
-            print(stdout)
-            print("Errores de FFmpeg:")
-            print(stderr)
+        except Exception:
+            if self.output_path.exists():
+                self.output_path.unlink()
+            raise
 
-            if process.returncode != 0:
-                raise RuntimeError(f"Error al fusionar MP3s:\n{stderr}")
+        finally:
+            for temp_path in temp_paths:
+                temp_path.unlink(missing_ok=True)
+            if self.temp_chapters_path.exists():
+                self.temp_chapters_path.unlink()
 
-            
-            for line in process.stdout:
-                if progress_callback:
-                    progress_callback(line.strip())
+    def _probe_files(self, concurrency: int = 8) -> List[AudioFileSchema]:
+        """
+        Analiza todos los MP3 con una sola pasada concurrente de ffprobe.
 
-            if process.wait() != 0:
-                raise subprocess.CalledProcessError(process.returncode, command)
+        Args:
+            concurrency (int): Número máximo de procesos ffprobe simultáneos.
 
-            # **Agregar metadatos después de la fusión**
-            if metadata:
-                self._add_metadata(self.output_path, metadata)
+        Returns:
+            List[AudioFileSchema]: Esquemas en el mismo orden que `self.mp3_files`.
 
-            if progress_callback:
-                progress_callback("Fusión completada!")
+        Raises:
+            RuntimeError: Si algún archivo no se pudo analizar.
+        """
+        async def collect() -> Dict[Path, AudioFileSchema]:
+            return {
+                info.path: info
+                async for info in AudioAnalyzerService.analyze_many(self.mp3_files, concurrency=concurrency)
+            }
 
-            return self.output_path
+        probed = asyncio.run(collect())
+        missing = [mp3.name for mp3 in self.mp3_files if mp3 not in probed]
+        if missing:
+            raise RuntimeError(f"No se pudieron analizar: {', '.join(missing)}")
+        return [probed[mp3] for mp3 in self.mp3_files]
 
-        except subprocess.CalledProcessError as e:
-            if self.output_path.exists():
-                self.output_path.unlink()
-            raise RuntimeError(f"Error al fusionar MP3s: {e}")
+    @staticmethod
+    def _track_number(info: AudioFileSchema) -> Optional[int]:
+        """
+        Número de pista de la etiqueta `track` ("3" o "3/12"), o None si no tiene o no es un número.
+        """
+        track = (info.metadata.track or "").split("/")[0].strip()
+        return int(track) if track.isdigit() else None
+
+    def _order_files(self, infos: List[AudioFileSchema]) -> List[AudioFileSchema]:
+        """
+        Ordena los archivos analizados por su número de pista y actualiza `self.mp3_files` con ese orden.
+
+        Solo se usa la etiqueta `track` si todos los archivos la tienen y no se repite (un libro en varios discos suele reiniciar la numeración); si no, se conserva el orden natural por nombre.
+
+        Args:
+            infos (List[AudioFileSchema]): Esquemas en el orden de `self.mp3_files`.
+
+        Returns:
+            List[AudioFileSchema]: Esquemas en el orden de fusión.
+        """
+        tracks = [self._track_number(info) for info in infos]
+        if None not in tracks and len(set(tracks)) == len(tracks):
+            infos = [info for _, info in sorted(zip(tracks, infos), key=lambda pair: pair[0])]
+        self.mp3_files = [info.path for info in infos]
+        return infos
+
+    def _write_chapters(self, infos: List[AudioFileSchema]) -> Path:
+        """
+        Escribe el archivo ffmetadata con un capítulo por archivo, a partir de las duraciones ya analizadas.
+
+        Args:
+            infos (List[AudioFileSchema]): Esquemas en el orden de fusión.
+
+        Returns:
+            Path: Ruta del archivo de capítulos en el directorio temporal.
+        """
+        chapters = ChapterService.from_files(infos)
+        self.logger.info(f"{len(chapters)} capítulos generados a partir de los archivos fusionados")
+        return ChapterService.write_ffmetadata(chapters, self.temp_chapters_path)
+
+    def _build_merged_info(self, infos: List[AudioFileSchema], metadata: Optional[Dict[str, str]]) -> AudioFileSchema:
+        """
+        Describe el audio resultante de la fusión como un único AudioFileSchema.
+
+        La duración y el tamaño son la suma de los archivos; los parámetros técnicos y los metadatos se toman del primero, sobrescritos por `metadata`. La ruta es el directorio de entrada, de modo que el M4B se llama como la carpeta.
+
+        Args:
+            infos (List[AudioFileSchema]): Esquemas de los MP3 en orden de fusión.
+            metadata (Optional[Dict[str, str]]): Metadatos que sobrescriben a los del primer archivo (title, artist, album...).
+
+        Returns:
+            AudioFileSchema: Esquema del audio fusionado.
+        """
+        first = infos[0]
+        merged_metadata = first.metadata.model_dump()
+        merged_metadata.update({k: v for k, v in (metadata or {}).items() if k in AudioMetadata.model_fields})
+
+        return first.model_copy(update={
+            "path": self.input_path,
+            "size_bytes": sum(info.size_bytes for info in infos),
+            "duration_seconds": sum(info.duration_seconds for info in infos),
+            "metadata": AudioMetadata(**merged_metadata)
+        })
+
+    def merge_to_m4b(
+        self,
+        bitrate: Bitrate = Bitrate.B_64K,
+        channels: int = 1,
+        metadata: Optional[Dict[str, str]] = None,
+        cover_path: Optional[Path] = None,
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        threads: int = 0,
+        chapters: bool = True
+    ) -> ConversionResult:
+        """
+        Fusiona los MP3 y los codifica a M4B en una sola pasada de ffmpeg.
+
+        La lista del demuxer concat alimenta directamente al codificador AAC, así que no se escribe ningún MP3 intermedio: se lee cada archivo una sola vez y se escribe solo el M4B final. Los metadatos y la portada se tratan igual que en M4bConverterService.
+
+        Todos los MP3 se analizan en una sola pasada concurrente de ffprobe, y esas duraciones sirven para todo: el orden (por número de pista, ver `_order_files`), el total sobre el que se calcula el progreso y un capítulo por archivo, que se incrusta en la misma invocación de ffmpeg.
+
+        Esos esquemas deciden también cómo se unen los archivos (ver ConcatPlannerService). Si todos comparten códec, frecuencia y canales basta una lista concat; si no, cada tramo homogéneo es una entrada concat propia y un grafo de filtros convierte solo los tramos atípicos antes de unirlos, sin temporales.
+
+        Args:
+            bitrate (Bitrate): Bitrate objetivo. Por defecto Bitrate.B_64K.
+            channels (int): Número de canales de salida (1=mono, 2=estéreo). Por defecto 1.
+            metadata (Optional[Dict[str, str]]): Metadatos que sobrescriben a los del primer MP3 (title, artist, album...).
+            cover_path (Optional[Path]): Imagen de portada a incrustar. Si no se indica, se usa la portada del primer MP3 que tenga una.
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Callback con los ProgressEvent de la codificación; su porcentaje se calcula sobre la duración total.
+            threads (int): Hilos de ffmpeg (0 = auto).
+            chapters (bool): Si es True, cada MP3 se convierte en un capítulo titulado con su etiqueta `title` o su nombre de archivo (ver ChapterService). Por defecto True.
+
+        Returns:
+            ConversionResult: Resultado de la conversión del libro completo, guardado en `output_dir` como "<carpeta>.m4b".
+
+        Raises:
+            ValueError: Si no hay archivos MP3 para fusionar o si los atípicos no se pueden normalizar.
+            RuntimeError: Si algún archivo no se pudo analizar.
+            Exception: Cualquier error de ffmpeg durante la conversión.
+
+        Example:
+            >>> merger = Mp3Merger("./El Principito/", output_dir="./audiolibros")
+            >>> result = merger.merge_to_m4b(
+            ...     bitrate=Bitrate.B_64K,
+            ...     metadata={"title": "El Principito", "artist": "Saint-Exupéry"}
+            ... )
+            >>> print(result.output_path)  # audiolibros/El Principito.m4b
+        """
+        if not self.mp3_files:
+            raise ValueError("No hay archivos MP3 para fusionar.")
+
+        infos = self._order_files(self._probe_files())
+        plan = ConcatPlannerService.plan(infos, copy_output=False)
+        # El audio unido tiene los parámetros de referencia del plan, no necesariamente los del primer MP3
+        merged_info = self._build_merged_info(infos, metadata).model_copy(update={
+            "codec": plan.codec,
+            "sample_rate": plan.sample_rate,
+            "channels": plan.channels
+        })
+        temp_cover_path = None
+        temp_paths: List[Path] = []
+
+        try:
+            input_args, input_graph, temp_paths = self._prepare_inputs(plan)
+            chapters_path = self._write_chapters(infos) if chapters else None
+
+            if cover_path is None:
+                temp_cover_path = self._extract_first_cover()
+                cover_path = temp_cover_path
+
+            converter = M4bConverterService(
+                merged_info,
+                output_dir=self.output_dir,
+                input_args=input_args,
+                input_graph=input_graph
+            )
+            return converter.convert(
+                bitrate=bitrate,
+                channels=channels,
+                cover_path=cover_path,
+                progress_callback=progress_callback,
+                threads=threads,
+                chapters_path=chapters_path
+            )
 
         finally:
-            if self.temp_list_path.exists():
-                self.temp_list_path.unlink()
\ No newline at end of file
+            for temp_path in temp_paths:
+                temp_path.unlink(missing_ok=True)
+            if self.temp_chapters_path.exists():
+                self.temp_chapters_path.unlink()
+            if temp_cover_path and temp_cover_path.exists():
+                temp_cover_path.unlink()
+
+    def _extract_first_cover(self) -> Optional[Path]:
+        """
+        Extrae al directorio temporal la portada del primer MP3 que tenga una.
+
+        Returns:
+            Optional[Path]: Ruta a la imagen extraída, o None si ningún archivo tiene portada.
+        """
+        for mp3 in self.mp3_files:
+            raw_data = AudioAnalyzerService(mp3).raw_data
+            if ExtractCoverService.find_cover_stream(raw_data):
+                return ExtractCoverService(mp3).extract_cover(raw_data, output_dir=self.temp_dir)
+        return None
@@ -6,13 +6,25 @@ Este paquete contiene todas las enumeraciones utilizadas en la aplicación para
 from m4b_converter.enums.formats_enum import Format
 from m4b_converter.enums.bitrates_enum import Bitrate
 from m4b_converter.enums.sample_rates_enum import SampleRate
+from m4b_converter.enums.sample_rate_mode_enum import SampleRateMode
 from m4b_converter.enums.audio_profiles_enum import AudioProfile
 from m4b_converter.enums.audio_channels_enum import AudioChannels
+from m4b_converter.enums.job_status_enum import JobStatus
+from m4b_converter.enums.transcode_mode_enum import TranscodeMode
+from m4b_converter.enums.transcode_decision_enum import TranscodeDecision
+from m4b_converter.enums.encoder_preset_enum import EncoderPreset
+from m4b_converter.enums.concat_strategy_enum import ConcatStrategy
 
 __all__ = [
     "Format",
     "Bitrate", 
     "SampleRate",
+    "SampleRateMode",
     "AudioProfile",
-    "AudioChannels"
+    "AudioChannels",
+    "JobStatus",
+    "TranscodeMode",
+    "TranscodeDecision",
+    "EncoderPreset",
+    "ConcatStrategy"
 ]
\ No newline at end of file
@@ -2,12 +2,15 @@ from enum import StrEnum
 
 class AudioProfile(StrEnum):
     """
-    Codecs de audio de un archivo de audio.
+    Codecs de audio de un archivo de audio, codificadores de ffmpeg y perfiles AAC.
+
+    Los codificadores AAC (`AAC`, `LIBFDK_AAC`, `AAC_AT`) se pasan a ffmpeg con `-c:a` y los perfiles (`AAC_LOW`, `AAC_HE`, `AAC_HE_V2`) con `-profile:a`. Qué codificadores hay depende de cómo se compiló ffmpeg (ver EncoderProbeService).
 
     Attributes:
         AAC (str): Advanced Audio Coding, codec de audio con buena calidad a bajas tasas de bits.
         AAC_LOW (str): Variante de AAC con perfil de baja complejidad (LC-AAC).
         AAC_HE (str): High-Efficiency AAC, optimizado para bajas tasas de bits (HE-AAC v1).
+        AAC_HE_V2 (str): HE-AAC v2, añade estéreo paramétrico; solo para salidas estéreo a bitrates muy bajos.
         AC3 (str): Audio Coding 3, codec de audio Dolby Digital usado en DVD y cine.
         EAC3 (str): Enhanced AC-3, versión mejorada de Dolby Digital Plus.
         MP3 (str): MPEG-1 Audio Layer III, codec de audio muy popular y ampliamente usado.
@@ -15,13 +18,15 @@ class AudioProfile(StrEnum):
         LIBOPUS (str): Implementación de referencia de Opus a través de la biblioteca libopus.
         VORBIS (str): Codec de audio libre, abierto y sin patentes, frecuente en Ogg containers.
         LIBVORBIS (str): Implementación de referencia de Vorbis a través de libvorbis.
-        LIBFDK_AAC (str): Implementación del codec AAC usando la biblioteca FDK (alta calidad).
+        LIBFDK_AAC (str): Implementación del codec AAC usando la biblioteca FDK (alta calidad). Soporta HE-AAC.
+        AAC_AT (str): Codificador AAC de AudioToolbox, disponible en ffmpeg para macOS. Soporta HE-AAC.
         FLAC (str): Free Lossless Audio Codec, codec sin pérdida de calidad.
         LIBFLAC (str): Implementación de referencia de FLAC a través de libflac.
     """
     AAC = "aac"
     AAC_LOW = "aac_low"
     AAC_HE = "aac_he"
+    AAC_HE_V2 = "aac_he_v2"
     AC3 = "ac3"
     EAC3 = "eac3"
     MP3 = "mp3"
@@ -29,7 +34,8 @@ class AudioProfile(StrEnum):
     LIBOPUS = "libopus"
     VORBIS = "vorbis"
     LIBVORBIS = "libvorbis"
-    LIBFDK_AAC = "libfaac"
+    LIBFDK_AAC = "libfdk_aac"
+    AAC_AT = "aac_at"
     FLAC = "flac"
     LIBFLAC = "libflac"
 
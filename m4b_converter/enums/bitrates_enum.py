@@ -5,6 +5,8 @@ class Bitrate(StrEnum):
     Enum para los bitrates de audio optimizados para audiolibros en formato M4B.
 
     Attributes:
+        B_32K (str): 32 kbps - Solo para voz en mono con HE-AAC (libfdk_aac o AudioToolbox); con AAC-LC suena apagado.
+        B_48K (str): 48 kbps - Voz en mono con HE-AAC, o AAC-LC aceptable para narraciones sin música.
         B_64K (str): 64 kbps - Bitrate ideal para audiolibros narrados con voz clara, excelente relación calidad/tamaño para largas duraciones.
         B_96K (str): 96 kbps - Calidad mejorada para audiolibros con efectos de sonido o música incidental, manteniendo un tamaño moderado.
         B_128K (str): 128 kbps - Estándar recomendado para audiolibros con música de fondo o contenido musical, buena fidelidad en M4B.
@@ -12,6 +14,8 @@ class Bitrate(StrEnum):
         B_256K (str): 256 kbps - Alta fidelidad para audiolibros premium, ideal cuando el contenido incluye material musical extenso.
         B_320K (str): 320 kbps - Calidad máxima para audiolibros de referencia, usado en producciones donde la calidad de audio es crítica.
     """
+    B_32K = "32k"
+    B_48K = "48k"
     B_64K = "64k"
     B_96K = "96k"
     B_128K = "128k"
@@ -0,0 +1,20 @@
+from enum import StrEnum
+
+class ConcatStrategy(StrEnum):
+    """
+    Cómo se unen los archivos de una fusión (ver ConcatPlannerService).
+
+    Attributes:
+        DEMUXER (str): Todos los archivos comparten códec, frecuencia y canales: una sola lista del demuxer concat, copiada tal cual o decodificada una vez.
+        FILTERGRAPH (str): Cada tramo de archivos compatibles es una entrada concat propia; los tramos atípicos se remuestrean dentro del grafo y el filtro `concat` los une antes del codificador. Solo cuando la salida se recodifica.
+        NORMALIZE (str): Los archivos atípicos se recodifican antes a los parámetros de referencia en temporales, y después todo se une con el demuxer concat.
+    """
+    DEMUXER = "demuxer"
+    FILTERGRAPH = "filtergraph"
+    NORMALIZE = "normalize"
+
+    def __str__(self):
+        return self.value
+    
+    def __repr__(self):
+        return self.value
@@ -0,0 +1,20 @@
+from enum import StrEnum
+
+class EncoderPreset(StrEnum):
+    """
+    Compromiso entre velocidad de codificación y calidad (ver M4bConverterService.preset_args).
+
+    Attributes:
+        FAST (str): Máxima velocidad: coder AAC rápido, ancho de banda de voz y remuestreo barato. Pensado para la ingesta masiva inicial.
+        BALANCED (str): Opciones por defecto de cada codificador.
+        QUALITY (str): Máxima calidad, para los másteres definitivos.
+    """
+    FAST = "fast"
+    BALANCED = "balanced"
+    QUALITY = "quality"
+
+    def __str__(self):
+        return self.value
+    
+    def __repr__(self):
+        return self.value
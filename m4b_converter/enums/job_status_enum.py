@@ -0,0 +1,22 @@
+from enum import StrEnum
+
+class JobStatus(StrEnum):
+    """
+    Estados de un trabajo en la cola persistente de conversiones.
+
+    Attributes:
+        PENDING (str): En espera de que un worker lo tome.
+        LEASED (str): Tomado por un worker, que debe renovar su lease mientras lo procesa.
+        DONE (str): Conversión completada.
+        FAILED (str): Falló tras agotar los intentos permitidos.
+    """
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __str__(self):
+        return self.value
+    
+    def __repr__(self):
+        return self.value
@@ -0,0 +1,18 @@
+from enum import StrEnum
+
+class SampleRateMode(StrEnum):
+    """
+    Política de frecuencia de muestreo cuando no se pide una SampleRate concreta.
+
+    Attributes:
+        AUTO (str): Bajar la voz a bitrates bajos a 22,05 o 24 kHz (ver TranscodePlannerService.sample_rate).
+        SOURCE (str): Conservar siempre la frecuencia del origen.
+    """
+    AUTO = "auto"
+    SOURCE = "source"
+
+    def __str__(self):
+        return self.value
+    
+    def __repr__(self):
+        return self.value
@@ -6,12 +6,14 @@ class SampleRate(IntEnum):
 
     Attributes:
         SR_22050 (int): 22 KHz
+        SR_24000 (int): 24 KHz
         SR_44100 (int): 44 KHz
         SR_48000 (int): 48 KHz
     """
     SR_22050 = 22050
+    SR_24000 = 24000
     SR_44100 = 44100
     SR_48000 = 48000
 
     def __str__(self):
-        return self.value
\ No newline at end of file
+        return str(self.value)
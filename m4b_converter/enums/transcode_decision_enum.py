@@ -0,0 +1,20 @@
+from enum import StrEnum
+
+class TranscodeDecision(StrEnum):
+    """
+    Tratamiento que recibe el audio de un archivo al convertirlo a M4B.
+
+    Attributes:
+        ENCODE (str): Decodificar y volver a codificar en AAC con el bitrate y los canales pedidos.
+        REMUX (str): Copiar el stream de audio tal cual a un contenedor M4B, sin recodificar.
+        SKIP (str): No generar M4B: recodificar no reduciría el tamaño ni mejoraría la calidad.
+    """
+    ENCODE = "encode"
+    REMUX = "remux"
+    SKIP = "skip"
+
+    def __str__(self):
+        return self.value
+    
+    def __repr__(self):
+        return self.value
@@ -0,0 +1,20 @@
+from enum import StrEnum
+
+class TranscodeMode(StrEnum):
+    """
+    Política para decidir si un archivo se recodifica.
+
+    Attributes:
+        ALWAYS (str): Recodificar siempre a AAC, aunque el origen ya cumpla el objetivo.
+        AUTO (str): Remuxar los archivos AAC que ya cumplen el objetivo y recodificar el resto (ver TranscodePlannerService).
+        SKIP (str): Como AUTO, pero además no generar M4B de los MP3 por debajo del bitrate objetivo.
+    """
+    ALWAYS = "always"
+    AUTO = "auto"
+    SKIP = "skip"
+
+    def __str__(self):
+        return self.value
+    
+    def __repr__(self):
+        return self.value
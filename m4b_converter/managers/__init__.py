@@ -4,7 +4,13 @@ Gestores y orquestadores del flujo de trabajo de conversión.
 Este paquete contiene los orquestadores que coordinan los diferentes servicios para ejecutar el flujo completo de conversión de archivos de audio a M4B.
 """
 from m4b_converter.managers.workflow_manager import WorkflowManager
+from m4b_converter.managers.async_workflow_manager import AsyncWorkflowManager
+from m4b_converter.managers.queue_worker_manager import QueueWorkerManager
+from m4b_converter.managers.watch_manager import WatchManager
 
 __all__ = [
-    "WorkflowManager"
+    "WorkflowManager",
+    "AsyncWorkflowManager",
+    "QueueWorkerManager",
+    "WatchManager"
 ]
\ No newline at end of file
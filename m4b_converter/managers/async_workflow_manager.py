@@ -0,0 +1,297 @@
+import os
+import time
+import uuid
+import shutil
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional, Callable, Iterable, AsyncIterator, Union, Tuple
+
+from m4b_converter.services import AudioAnalyzerService, ExtractCoverService, M4bConverterService
+from m4b_converter.schemas import ConversionResult, ConversionTask, ProgressEvent, Rendition
+from m4b_converter.enums import Bitrate, TranscodeMode, TranscodeDecision, AudioProfile, EncoderPreset, SampleRate, SampleRateMode
+from m4b_converter.settings import AppSettings
+from m4b_converter.managers.workflow_manager import WorkflowManager
+
+
+class AsyncWorkflowManager:
+    """
+    Orquestador asíncrono del flujo de conversión, pensado para aplicaciones basadas en asyncio.
+
+    Ejecuta el mismo flujo que WorkflowManager (análisis, decisión de tratamiento, portada, conversión y persistencia de la portada) pero con procesos lanzados mediante asyncio.create_subprocess_exec, de modo que nunca bloquea el bucle de eventos. La decisión de recodificar, remuxar u omitir, el codificador, el perfil y la frecuencia de muestreo salen de WorkflowManager.plan_rendition, y el comando ffmpeg del mismo `_build_ffmpeg_command` que la conversión síncrona: un archivo da la misma salida por las dos vías. El progreso se consume como un iterador asíncrono y cada conversión puede cancelarse con `task.cancel()`: el proceso ffmpeg se mata y se eliminan los temporales.
+
+    Un semáforo limita cuántos ffmpeg corren a la vez, así que se pueden crear cientos de tareas desde un mismo bucle sin saturar la máquina. Los núcleos se reparten entre esas conversiones como en WorkflowManager.process_directory (ver WorkflowManager.budget_threads).
+
+    Attributes:
+        logger (logging.Logger): Logger para registrar eventos y errores.
+        use_probe_cache (bool): Si el análisis consulta la caché persistente de ffprobe.
+        max_concurrency (int): Número máximo de conversiones ejecutándose a la vez.
+        threads (int): Hilos de ffmpeg por conversión cuando no se indican (0 = auto con una sola conversión a la vez).
+        planner (WorkflowManager): Orquestador síncrono cuya política de tratamiento (transcode, encoder, audio_profile) se aplica a cada archivo.
+
+    Example:
+        >>> import asyncio
+        >>> from pathlib import Path
+        >>> from m4b_converter.managers import AsyncWorkflowManager
+        >>> from m4b_converter.schemas import ProgressEvent
+        >>>
+        >>> async def main():
+        ...     manager = AsyncWorkflowManager(max_concurrency=4)
+        ...     async for item in manager.stream_file(Path("audiolibro.mp3")):
+        ...         if isinstance(item, ProgressEvent):
+        ...             print(f"{item.percent}% ({item.speed}x)")
+        ...         else:
+        ...             print(f"✅ {item.output_path}")
+        >>>
+        >>> asyncio.run(main())
+        >>>
+        >>> # Cancelación
+        >>> async def cancelar():
+        ...     manager = AsyncWorkflowManager()
+        ...     task = asyncio.create_task(manager.process_file(Path("libro_40h.mp3")))
+        ...     await asyncio.sleep(5)
+        ...     task.cancel()  # mata ffmpeg y limpia el temporal
+    """
+
+    def __init__(
+        self,
+        use_probe_cache: bool = True,
+        max_concurrency: Optional[int] = None,
+        transcode: TranscodeMode = TranscodeMode.AUTO,
+        encoder: Optional[AudioProfile] = None,
+        audio_profile: Optional[AudioProfile] = None
+    ):
+        """
+        Inicializa el orquestador asíncrono.
+
+        Args:
+            use_probe_cache (bool): Si es True, el análisis reutiliza los resultados guardados en la caché persistente de ffprobe. Por defecto True.
+            max_concurrency (Optional[int]): Conversiones simultáneas como máximo. Por defecto, el número de núcleos.
+            transcode (TranscodeMode): Política de recodificación (ver WorkflowManager). Por defecto TranscodeMode.AUTO.
+            encoder (Optional[AudioProfile]): Codificador AAC forzado, o None para elegir el más rápido disponible. Por defecto None.
+            audio_profile (Optional[AudioProfile]): Perfil AAC forzado, o None para elegirlo según el bitrate. Por defecto None.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.use_probe_cache = use_probe_cache
+        self.max_concurrency = max(1, max_concurrency or os.cpu_count() or 1)
+        _, self.threads = WorkflowManager.budget_threads(self.max_concurrency)
+        self.planner = WorkflowManager(use_probe_cache, transcode=transcode, encoder=encoder, audio_profile=audio_profile)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def stream_file(
+        self,
+        input_path: Path,
+        bitrate: Bitrate = Bitrate.B_64K,
+        channels: int = 1,
+        output_dir: Optional[Path] = AppSettings.OUTPUT_DIR,
+        threads: Optional[int] = None,
+        single_pass_cover: bool = False,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        sample_rate: Union[SampleRate, SampleRateMode] = SampleRateMode.AUTO
+    ) -> AsyncIterator[Union[ProgressEvent, ConversionResult]]:
+        """
+        Convierte un archivo entregando su progreso como iterador asíncrono.
+
+        Args:
+            input_path (Path): Ruta del archivo de audio a procesar.
+            bitrate (Bitrate): Bitrate objetivo. Por defecto Bitrate.B_64K.
+            channels (int): Número de canales de audio. Por defecto 1 (mono).
+            output_dir (Optional[Path]): Directorio de salida. Por defecto AppSettings.OUTPUT_DIR.
+            threads (Optional[int]): Hilos que ffmpeg puede usar (0 = auto). Por defecto `self.threads`, el reparto de núcleos entre `max_concurrency` conversiones.
+            single_pass_cover (bool): Si es True, la portada se copia desde el origen en el mismo proceso de conversión. Por defecto False.
+            preset (EncoderPreset): Preset de velocidad (ver WorkflowManager.process_file). Por defecto EncoderPreset.BALANCED.
+            sample_rate (Union[SampleRate, SampleRateMode]): Frecuencia de muestreo de salida (ver WorkflowManager.process_file). Por defecto SampleRateMode.AUTO.
+
+        Yields:
+            Union[ProgressEvent, ConversionResult]: Eventos de progreso y, como último elemento, el resultado. Un archivo que la política de tratamiento omite solo entrega su resultado (TranscodeDecision.SKIP), sin M4B ni portada.
+
+        Raises:
+            ValueError: Si el archivo no se puede analizar.
+            RuntimeError: Si ffmpeg falla.
+            asyncio.CancelledError: Si se cancela la tarea que consume el iterador (tras matar ffmpeg y limpiar temporales).
+        """
+        output_dir = output_dir or AppSettings.OUTPUT_DIR
+        output_dir.mkdir(parents=True, exist_ok=True)
+        task = ConversionTask(
+            id=uuid.uuid4(),
+            input_path=input_path,
+            bitrate_target=bitrate.value,
+            channels_target=channels
+        )
+
+        async with self._semaphore:
+            self.logger.info(f"--- [TASK {task.id}] Procesando: {input_path.name} ---")
+
+            # 1. Analizar el archivo
+            stage_start = time.perf_counter()
+            raw_data, audio_info = await AudioAnalyzerService.probe_async(input_path, use_cache=self.use_probe_cache)
+            if not audio_info:
+                raise ValueError(f"No se pudo analizar el archivo: {input_path}")
+            analyze_seconds = time.perf_counter() - stage_start
+
+            # La misma decisión que en WorkflowManager; puede sondear los codificadores de ffmpeg, así que va en un hilo
+            plan = await asyncio.to_thread(
+                self.planner.plan_rendition, audio_info, Rendition(bitrate=bitrate, channels=channels, sample_rate=sample_rate), task
+            )
+            converter = M4bConverterService(audio_info, output_dir=output_dir)
+            if plan.decision == TranscodeDecision.SKIP:
+                yield converter.skip(bitrate=bitrate, channels=channels, task=plan.task).model_copy(
+                    update={"analyze_seconds": round(analyze_seconds, 3)}
+                )
+                return
+
+            # 2. Portada
+            stage_start = time.perf_counter()
+            cover_seconds = 0.0
+            temp_cover_path = None
+            source_cover_stream = None
+            final_cover_path = None
+
+            if single_pass_cover:
+                cover_stream = ExtractCoverService.find_cover_stream(raw_data)
+                if cover_stream:
+                    source_cover_stream = cover_stream["index"]
+                    extension = ExtractCoverService.cover_extension(cover_stream)
+                    final_cover_path = output_dir / f"{input_path.stem}.{extension}"
+
+            try:
+                if not single_pass_cover:
+                    extractor = ExtractCoverService(input_path)
+                    temp_cover_path = await extractor.extract_cover_async(
+                        raw_data, output_dir=AppSettings.TEMP_DIR, output_name=f"{task.id}_cover.jpg"
+                    )
+                cover_seconds = time.perf_counter() - stage_start
+
+                # 3. Convertir
+                async for item in converter.convert_async(
+                    bitrate=bitrate,
+                    channels=channels,
+                    cover_path=temp_cover_path,
+                    task=plan.task,
+                    threads=self.threads if threads is None else threads,
+                    source_cover_stream=source_cover_stream,
+                    cover_output_path=final_cover_path,
+                    remux=plan.decision == TranscodeDecision.REMUX,
+                    encoder=plan.encoder,
+                    profile=plan.profile,
+                    preset=preset
+                ):
+                    if isinstance(item, ConversionResult):
+                        result = item
+                    else:
+                        yield item
+
+                # 4. Persistencia de la portada
+                stage_start = time.perf_counter()
+                if temp_cover_path and temp_cover_path.exists():
+                    final_cover_path = output_dir / f"{input_path.stem}.jpg"
+                    shutil.copy2(temp_cover_path, final_cover_path)
+                if final_cover_path:
+                    self.logger.info(f"Portada guardada en: {final_cover_path}")
+
+                result = result.model_copy(update={
+                    "analyze_seconds": round(analyze_seconds, 3),
+                    "cover_seconds": round(cover_seconds, 3),
+                    "finalize_seconds": round(result.finalize_seconds + time.perf_counter() - stage_start, 3)
+                })
+
+            finally:
+                if temp_cover_path and temp_cover_path.exists():
+                    temp_cover_path.unlink()
+
+        self.logger.info(
+            f"Éxito: {result.output_path.name} | "
+            f"Reducción: {result.compression_ratio * 100}%"
+        )
+        yield result
+
+    async def process_file(
+        self,
+        input_path: Path,
+        bitrate: Bitrate = Bitrate.B_64K,
+        channels: int = 1,
+        output_dir: Optional[Path] = AppSettings.OUTPUT_DIR,
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        threads: Optional[int] = None,
+        single_pass_cover: bool = False,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        sample_rate: Union[SampleRate, SampleRateMode] = SampleRateMode.AUTO
+    ) -> Optional[ConversionResult]:
+        """
+        Convierte un archivo y devuelve su resultado, como WorkflowManager.process_file pero sin bloquear.
+
+        Args:
+            input_path (Path): Ruta del archivo de audio a procesar.
+            bitrate (Bitrate): Bitrate objetivo. Por defecto Bitrate.B_64K.
+            channels (int): Número de canales de audio. Por defecto 1 (mono).
+            output_dir (Optional[Path]): Directorio de salida. Por defecto AppSettings.OUTPUT_DIR.
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Función que recibe cada ProgressEvent.
+            threads (Optional[int]): Hilos que ffmpeg puede usar (0 = auto). Por defecto `self.threads`.
+            single_pass_cover (bool): Si es True, la portada se copia desde el origen en el mismo proceso de conversión.
+            preset (EncoderPreset): Preset de velocidad. Por defecto EncoderPreset.BALANCED.
+            sample_rate (Union[SampleRate, SampleRateMode]): Frecuencia de muestreo de salida. Por defecto SampleRateMode.AUTO.
+
+        Returns:
+            Optional[ConversionResult]: Resultado de la conversión, o None si falla (el error queda en el log).
+
+        Raises:
+            asyncio.CancelledError: Si la tarea se cancela. La cancelación nunca se convierte en None.
+        """
+        try:
+            async for item in self.stream_file(
+                input_path, bitrate, channels, output_dir, threads, single_pass_cover, preset=preset, sample_rate=sample_rate
+            ):
+                if isinstance(item, ConversionResult):
+                    return item
+                if progress_callback:
+                    progress_callback(item)
+        except Exception as e:
+            self.logger.critical(f"Error en workflow para {input_path.name}: {e}")
+        return None
+
+    async def process_many(
+        self,
+        paths: Iterable[Path],
+        bitrate: Bitrate = Bitrate.B_64K,
+        channels: int = 1,
+        output_dir: Optional[Path] = AppSettings.OUTPUT_DIR,
+        progress_callback: Optional[Callable[[Path, ProgressEvent], None]] = None,
+        single_pass_cover: bool = False,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        sample_rate: Union[SampleRate, SampleRateMode] = SampleRateMode.AUTO
+    ) -> AsyncIterator[Tuple[Path, Optional[ConversionResult]]]:
+        """
+        Convierte muchos archivos desde el mismo bucle, con `max_concurrency` ffmpeg a la vez.
+
+        Args:
+            paths (Iterable[Path]): Archivos a convertir.
+            bitrate (Bitrate): Bitrate objetivo. Por defecto Bitrate.B_64K.
+            channels (int): Número de canales de audio. Por defecto 1 (mono).
+            output_dir (Optional[Path]): Directorio de salida. Por defecto AppSettings.OUTPUT_DIR.
+            progress_callback (Optional[Callable[[Path, ProgressEvent], None]]): Función que recibe el archivo y cada uno de sus ProgressEvent.
+            single_pass_cover (bool): Si es True, la portada se copia desde el origen en el mismo proceso de conversión.
+            preset (EncoderPreset): Preset de velocidad. Por defecto EncoderPreset.BALANCED.
+            sample_rate (Union[SampleRate, SampleRateMode]): Frecuencia de muestreo de salida. Por defecto SampleRateMode.AUTO.
+
+        Yields:
+            Tuple[Path, Optional[ConversionResult]]: Cada archivo con su resultado (None si falló), en orden de finalización.
+
+        Note:
+            - Si el consumidor deja de iterar o se cancela, las conversiones pendientes se cancelan y limpian sus temporales.
+            - Cada ffmpeg recibe `self.threads` hilos, igual que el reparto de WorkflowManager.process_directory.
+        """
+        async def run(file_path: Path) -> Tuple[Path, Optional[ConversionResult]]:
+            callback = (lambda event: progress_callback(file_path, event)) if progress_callback else None
+            result = await self.process_file(
+                file_path, bitrate, channels, output_dir, callback, single_pass_cover=single_pass_cover, preset=preset, sample_rate=sample_rate
+            )
+            return file_path, result
+
+        tasks = [asyncio.create_task(run(file_path)) for file_path in paths]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
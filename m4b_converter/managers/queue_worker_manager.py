@@ -0,0 +1,206 @@
+import os
+import queue
+import signal
+import socket
+import logging
+import threading
+import multiprocessing
+from pathlib import Path
+from typing import Optional, Callable, Dict, Any
+
+from m4b_converter.enums import Bitrate, JobStatus, TranscodeMode
+from m4b_converter.settings import AppSettings
+from m4b_converter.services import JobQueueService
+from m4b_converter.managers.workflow_manager import WorkflowManager
+
+
+class QueueWorkerManager:
+    """
+    Ejecuta procesos worker que vacían la cola persistente de conversiones (JobQueueService).
+
+    Cada worker es un proceso independiente que repite el ciclo lease → WorkflowManager.process_file → complete/fail, renovando el lease desde un hilo mientras dura la conversión. Como la toma de trabajos es atómica en la base de datos, se pueden lanzar varios `m4b worker` a la vez en el mismo equipo, cada uno con su propia concurrencia.
+
+    Attributes:
+        logger (logging.Logger): Logger para registrar eventos y errores.
+        concurrency (int): Número de procesos worker.
+        use_probe_cache (bool): Si el análisis consulta la caché persistente de ffprobe.
+        transcode (TranscodeMode): Política de recodificación de cada trabajo (ver WorkflowManager).
+        lease_seconds (int): Validez de cada lease; el heartbeat lo renueva cada tercio de este tiempo.
+        poll_interval (float): Segundos de espera entre consultas cuando la cola está vacía (solo con `follow`).
+        queue_path (Path): Base de datos de la cola.
+
+    Example:
+        >>> from m4b_converter.managers import QueueWorkerManager
+        >>>
+        >>> workers = QueueWorkerManager(concurrency=4)
+        >>> totals = workers.run(job_callback=lambda event: print(event["status"], event["input_path"]))
+        >>> print(totals)  # {"done": 120, "failed": 2, "retry": 1}
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        use_probe_cache: bool = True,
+        lease_seconds: int = AppSettings.JOB_LEASE_SECONDS,
+        poll_interval: float = 5.0,
+        queue_path: Path = AppSettings.JOB_QUEUE_PATH,
+        transcode: TranscodeMode = TranscodeMode.AUTO
+    ):
+        """
+        Inicializa el gestor de workers.
+
+        Args:
+            concurrency (int): Número de procesos worker. Se limita al número de núcleos.
+            use_probe_cache (bool): Si es True, el análisis reutiliza la caché persistente de ffprobe. Por defecto True.
+            lease_seconds (int): Validez de cada lease en segundos. Por defecto AppSettings.JOB_LEASE_SECONDS.
+            poll_interval (float): Espera entre consultas cuando la cola está vacía. Por defecto 5 segundos.
+            queue_path (Path): Base de datos de la cola. Por defecto AppSettings.JOB_QUEUE_PATH.
+            transcode (TranscodeMode): Política de recodificación. Por defecto TranscodeMode.AUTO.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.concurrency, self._threads = WorkflowManager.budget_threads(max(1, concurrency))
+        self.use_probe_cache = use_probe_cache
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.queue_path = queue_path
+        self.transcode = transcode
+
+    def _worker_config(self, follow: bool) -> Dict[str, Any]:
+        """
+        Configuración que recibe cada proceso worker.
+        """
+        return {
+            "use_probe_cache": self.use_probe_cache,
+            "transcode": self.transcode,
+            "lease_seconds": self.lease_seconds,
+            "poll_interval": self.poll_interval,
+            "queue_path": self.queue_path,
+            "threads": self._threads,
+            "follow": follow,
+        }
+
+    def run(
+        self,
+        follow: bool = False,
+        job_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, int]:
+        """
+        Lanza los workers y espera a que terminen.
+
+        Args:
+            follow (bool): Si es False, cada worker termina cuando la cola no tiene trabajos disponibles. Si es True, siguen esperando trabajos nuevos hasta que se interrumpa (Ctrl+C).
+            job_callback (Optional[Callable[[Dict[str, Any]], None]]): Función que recibe un diccionario por cada trabajo terminado, con las claves `job_id`, `input_path`, `status` ("done", "retry" o "failed"), `output_path`, `attempts` y `worker_id`.
+
+        Returns:
+            Dict[str, int]: Totales de trabajos por resultado ("done", "retry", "failed").
+
+        Note:
+            - Con Ctrl+C los workers terminan la conversión en curso y dejan de tomar trabajos nuevos. Si un worker muere a mitad de un trabajo, su lease vence y otro worker lo retoma.
+        """
+        totals = {"done": 0, "retry": 0, "failed": 0}
+        stop_event = multiprocessing.Event()
+        events = multiprocessing.Queue()
+        config = self._worker_config(follow)
+
+        processes = [
+            multiprocessing.Process(target=_run_worker, args=(config, stop_event, events), daemon=False)
+            for _ in range(self.concurrency)
+        ]
+        for process in processes:
+            process.start()
+
+        self.logger.info(f"{len(processes)} workers iniciados sobre {self.queue_path}")
+
+        def drain(timeout: float) -> None:
+            try:
+                event = events.get(timeout=timeout)
+            except queue.Empty:
+                return
+            totals[event["status"]] += 1
+            if job_callback:
+                job_callback(event)
+
+        # La cola de eventos se vacía mientras los workers viven: un hijo con datos sin leer no puede terminar
+        try:
+            while any(process.is_alive() for process in processes):
+                drain(0.5)
+        except KeyboardInterrupt:
+            self.logger.warning("Interrupción recibida: los workers terminan el trabajo en curso y se detienen.")
+            stop_event.set()
+            while any(process.is_alive() for process in processes):
+                drain(0.5)
+        finally:
+            while not events.empty():
+                drain(0)
+            for process in processes:
+                process.join()
+
+        return totals
+
+
+def _run_worker(config: Dict[str, Any], stop_event: Any, events: Any) -> None:
+    """
+    Bucle de un proceso worker: toma trabajos de la cola y los convierte hasta vaciarla o recibir la señal de parada.
+
+    Se define a nivel de módulo para que pueda ejecutarse en un proceso hijo.
+
+    Args:
+        config (Dict[str, Any]): Configuración generada por QueueWorkerManager._worker_config.
+        stop_event (Any): multiprocessing.Event que detiene el bucle.
+        events (Any): multiprocessing.Queue donde se publica el resultado de cada trabajo.
+    """
+    # Ctrl+C lo gestiona el proceso principal con stop_event; ffmpeg hereda el SIG_IGN y termina el trabajo en curso
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logger = logging.getLogger("QueueWorker")
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    job_queue = JobQueueService(config["queue_path"])
+    manager = WorkflowManager(use_probe_cache=config["use_probe_cache"], transcode=config["transcode"])
+    lease_seconds = config["lease_seconds"]
+
+    while not stop_event.is_set():
+        job = job_queue.lease(worker_id, lease_seconds)
+        if job is None:
+            if not config["follow"]:
+                break
+            stop_event.wait(config["poll_interval"])
+            continue
+
+        # El heartbeat renueva el lease mientras dura la conversión
+        finished = threading.Event()
+
+        def heartbeat() -> None:
+            while not finished.wait(lease_seconds / 3):
+                if not job_queue.heartbeat(job.id, worker_id, lease_seconds):
+                    logger.warning(f"Lease perdido para el trabajo {job.id}")
+                    return
+
+        heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+        heartbeat_thread.start()
+        try:
+            result = manager.process_file(
+                input_path=job.input_path,
+                bitrate=Bitrate(job.bitrate_target),
+                channels=job.channels_target,
+                output_dir=job.output_dir,
+                threads=config["threads"],
+                task=job.to_task()
+            )
+        finally:
+            finished.set()
+            heartbeat_thread.join()
+
+        if result:
+            job_queue.complete(job.id, worker_id, result.output_path)
+            status = "done"
+        else:
+            new_status = job_queue.fail(job.id, worker_id, f"La conversión de {job.input_path.name} falló (ver log)")
+            status = "failed" if new_status == JobStatus.FAILED else "retry"
+
+        events.put({
+            "job_id": str(job.id),
+            "input_path": str(job.input_path),
+            "status": status,
+            "output_path": str(result.output_path) if result else None,
+            "attempts": job.attempts,
+            "worker_id": worker_id,
+        })
@@ -0,0 +1,323 @@
+import os
+import time
+import signal
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Optional, Callable, Dict, Set, List, Tuple, Any
+
+from m4b_converter.enums import Bitrate, Format, TranscodeMode
+from m4b_converter.schemas import ConversionResult
+from m4b_converter.settings import AppSettings
+from m4b_converter.managers.workflow_manager import WorkflowManager, _process_file_job
+
+
+@dataclass
+class _Candidate:
+    """
+    Archivo detectado que espera a que su tamaño y mtime se estabilicen.
+    """
+    signature: Tuple[int, int]
+    stable_since: float
+
+
+class WatchManager:
+    """
+    Vigila un directorio de entrada y convierte los archivos de audio nuevos o modificados cuando terminan de copiarse.
+
+    El escaneo es incremental: en cada ciclo solo se hace `stat` de los directorios conocidos y únicamente se recorren con `os.scandir` aquellos cuyo mtime cambió (crear, borrar o renombrar una entrada cambia el mtime del directorio). De las entradas de un directorio recorrido solo se consulta el tamaño de las nuevas, así que un directorio con 100k archivos no cuesta 100k `stat` por ciclo.
+
+    Un archivo detectado no se convierte hasta que su tamaño y mtime permanecen iguales durante `settle_seconds`, lo que evita procesar descargas o copias a medias. Las conversiones se ejecutan en un pool de procesos con el mismo punto de entrada que WorkflowManager.process_directory.
+
+    Attributes:
+        logger (logging.Logger): Logger para registrar eventos y errores.
+        watch_dir (Path): Directorio vigilado.
+        recursive (bool): Si también se vigilan los subdirectorios.
+        settle_seconds (float): Segundos que un archivo debe permanecer sin cambios antes de convertirse.
+        interval (float): Segundos entre ciclos de escaneo.
+        full_rescan_every (int): Cada cuántos ciclos se recorre todo y se hace `stat` de cada archivo, para detectar archivos reescritos en el mismo lugar (que no cambian el mtime del directorio). 0 lo desactiva.
+        use_probe_cache (bool): Si el análisis consulta la caché persistente de ffprobe.
+
+    Example:
+        >>> from pathlib import Path
+        >>> from m4b_converter.managers import WatchManager
+        >>>
+        >>> watcher = WatchManager(Path("./inbox"), recursive=True, settle_seconds=10)
+        >>> watcher.run(
+        ...     output_dir=Path("./audiolibros"),
+        ...     jobs=2,
+        ...     event_callback=lambda kind, path, result: print(kind, path.name)
+        ... )
+    """
+
+    # Margen para sistemas de archivos con mtime de baja resolución
+    _RACY_MTIME_NS = 2_000_000_000
+
+    def __init__(
+        self,
+        watch_dir: Path,
+        recursive: bool = False,
+        settle_seconds: float = 5.0,
+        interval: float = 2.0,
+        full_rescan_every: int = 150,
+        use_probe_cache: bool = True,
+        transcode: TranscodeMode = TranscodeMode.AUTO
+    ):
+        """
+        Inicializa el vigilante.
+
+        Args:
+            watch_dir (Path): Directorio a vigilar.
+            recursive (bool): Si es True, vigila también los subdirectorios. Por defecto False.
+            settle_seconds (float): Tiempo sin cambios de tamaño ni mtime para dar un archivo por completo. Por defecto 5 segundos.
+            interval (float): Segundos entre ciclos de escaneo. Por defecto 2 segundos.
+            full_rescan_every (int): Ciclos entre recorridos completos (0 = nunca). Por defecto 150 (5 minutos con el intervalo por defecto).
+            use_probe_cache (bool): Si es True, el análisis reutiliza la caché persistente de ffprobe. Por defecto True.
+            transcode (TranscodeMode): Política de recodificación de cada archivo (ver WorkflowManager). Por defecto TranscodeMode.AUTO.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.watch_dir = watch_dir
+        self.recursive = recursive
+        self.settle_seconds = settle_seconds
+        self.interval = interval
+        self.full_rescan_every = full_rescan_every
+        self.use_probe_cache = use_probe_cache
+        self.transcode = transcode
+
+        self._extensions = {f".{fmt.value}" for fmt in Format if fmt != Format.M4B}
+        self._dir_mtimes: Dict[Path, Optional[int]] = {}
+        self._dir_entries: Dict[Path, Set[str]] = {}
+        self._candidates: Dict[Path, _Candidate] = {}
+        self._processed: Dict[Path, Tuple[int, int]] = {}
+        self._in_flight: Set[Path] = set()
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Tuple[int, int]:
+        """
+        Firma de un archivo para detectar cambios: (tamaño, mtime_ns).
+        """
+        return stat.st_size, stat.st_mtime_ns
+
+    def _is_audio(self, name: str) -> bool:
+        """
+        Indica si un nombre de archivo tiene una extensión de audio compatible (sin M4B ni archivos ocultos).
+        """
+        return not name.startswith(".") and os.path.splitext(name)[1].lower() in self._extensions
+
+    def _track(self, file_path: Path, signature: Tuple[int, int]) -> None:
+        """
+        Registra un archivo como candidato si es nuevo o cambió desde que se procesó.
+        """
+        if file_path in self._in_flight or self._processed.get(file_path) == signature:
+            return
+        candidate = self._candidates.get(file_path)
+        if candidate is None:
+            self.logger.debug(f"Archivo detectado: {file_path}")
+            self._candidates[file_path] = _Candidate(signature, time.monotonic())
+
+    def _forget(self, file_path: Path) -> None:
+        """
+        Olvida un archivo que ya no existe.
+        """
+        self._candidates.pop(file_path, None)
+        self._processed.pop(file_path, None)
+
+    def _scan_dir(self, directory: Path, full: bool) -> List[Path]:
+        """
+        Recorre un directorio si cambió desde el último ciclo (o siempre, en un recorrido completo).
+
+        Args:
+            directory (Path): Directorio a revisar.
+            full (bool): Si es True, recorre el directorio aunque su mtime no haya cambiado y hace `stat` de todos sus archivos.
+
+        Returns:
+            List[Path]: Subdirectorios nuevos encontrados (solo en modo recursivo).
+        """
+        try:
+            dir_stat = os.stat(directory)
+        except OSError:
+            # El directorio desapareció: olvidamos todo lo que contenía
+            for name in self._dir_entries.pop(directory, set()):
+                self._forget(directory / name)
+            self._dir_mtimes.pop(directory, None)
+            return []
+
+        mtime_ns = dir_stat.st_mtime_ns
+        if not full and self._dir_mtimes.get(directory) == mtime_ns:
+            return []
+
+        # Un mtime muy reciente puede no reflejar aún todos los cambios: se vuelve a recorrer en el siguiente ciclo
+        recent = time.time_ns() - mtime_ns < self._RACY_MTIME_NS
+        self._dir_mtimes[directory] = None if recent else mtime_ns
+
+        previous = self._dir_entries.get(directory, set())
+        current: Set[str] = set()
+        new_dirs: List[Path] = []
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    current.add(entry.name)
+                    is_new = entry.name not in previous
+                    if not (is_new or full):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            sub_dir = Path(entry.path)
+                            if self.recursive and sub_dir not in self._dir_mtimes:
+                                new_dirs.append(sub_dir)
+                        elif self._is_audio(entry.name) and entry.is_file():
+                            self._track(Path(entry.path), self._signature(entry.stat()))
+                    except OSError:
+                        continue
+        except OSError as e:
+            self.logger.warning(f"No se pudo leer {directory}: {e}")
+            return []
+
+        for name in previous - current:
+            self._forget(directory / name)
+        self._dir_entries[directory] = current
+        return new_dirs
+
+    def scan(self, full: bool = False) -> None:
+        """
+        Ejecuta un ciclo de escaneo incremental sobre todos los directorios conocidos.
+
+        Args:
+            full (bool): Si es True, recorre todos los directorios y hace `stat` de todos los archivos.
+        """
+        pending = list(self._dir_mtimes) or [self.watch_dir]
+        while pending:
+            pending.extend(self._scan_dir(pending.pop(), full))
+
+    def settled(self) -> List[Path]:
+        """
+        Devuelve los candidatos cuyo tamaño y mtime no han cambiado durante `settle_seconds`.
+
+        Solo se hace `stat` de los candidatos, no de todo el directorio.
+
+        Returns:
+            List[Path]: Archivos listos para convertir, que dejan de ser candidatos.
+        """
+        now = time.monotonic()
+        ready = []
+        for file_path, candidate in list(self._candidates.items()):
+            try:
+                signature = self._signature(file_path.stat())
+            except OSError:
+                self._candidates.pop(file_path)
+                continue
+
+            if signature != candidate.signature:
+                # Sigue creciendo o cambiando: reiniciamos la espera
+                candidate.signature = signature
+                candidate.stable_since = now
+            elif now - candidate.stable_since >= self.settle_seconds:
+                ready.append(file_path)
+                self._candidates.pop(file_path)
+        return sorted(ready)
+
+    def mark_existing(self) -> int:
+        """
+        Da por procesados los archivos que ya están en el directorio, para convertir solo los que lleguen después.
+
+        Returns:
+            int: Número de archivos ignorados.
+        """
+        self.scan()
+        for file_path, candidate in self._candidates.items():
+            self._processed[file_path] = candidate.signature
+        count = len(self._candidates)
+        self._candidates.clear()
+        return count
+
+    def run(
+        self,
+        bitrate: Bitrate = Bitrate.B_64K,
+        channels: int = 1,
+        output_dir: Optional[Path] = AppSettings.OUTPUT_DIR,
+        jobs: int = 1,
+        single_pass_cover: bool = False,
+        event_callback: Optional[Callable[[str, Path, Optional[ConversionResult]], None]] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> List[ConversionResult]:
+        """
+        Vigila el directorio y convierte los archivos según se estabilizan, hasta Ctrl+C o `stop_event`.
+
+        Args:
+            bitrate (Bitrate): Bitrate objetivo. Por defecto Bitrate.B_64K.
+            channels (int): Número de canales. Por defecto 1 (mono).
+            output_dir (Optional[Path]): Directorio de salida. Por defecto AppSettings.OUTPUT_DIR.
+            jobs (int): Conversiones simultáneas; los núcleos se reparten como en process_directory. Por defecto 1.
+            single_pass_cover (bool): Si es True, la portada se copia desde el origen en el mismo proceso de conversión.
+            event_callback (Optional[Callable[[str, Path, Optional[ConversionResult]], None]]): Función que recibe `(tipo, archivo, resultado)` con tipo "queued" al enviar un archivo a convertir, "done" al completarlo o "failed" si falla.
+            stop_event (Optional[threading.Event]): Evento para detener la vigilancia desde otro hilo.
+
+        Returns:
+            List[ConversionResult]: Resultados de las conversiones completadas durante la vigilancia.
+
+        Note:
+            - Un archivo que cambia después de convertirse se vuelve a convertir.
+            - Al detenerse se cancelan las conversiones que aún no habían empezado y se espera a las que están en curso.
+        """
+        stop_event = stop_event or threading.Event()
+        jobs, threads = WorkflowManager.budget_threads(jobs)
+        options: Dict[str, Any] = {
+            "bitrate": bitrate,
+            "channels": channels,
+            "output_dir": output_dir,
+            "threads": threads,
+            "single_pass_cover": single_pass_cover
+        }
+        manager_config = {"use_probe_cache": self.use_probe_cache, "transcode": self.transcode}
+        results: List[ConversionResult] = []
+        futures: Dict[Future, Tuple[Path, Tuple[int, int]]] = {}
+
+        def notify(kind: str, file_path: Path, result: Optional[ConversionResult] = None) -> None:
+            if event_callback:
+                event_callback(kind, file_path, result)
+
+        self.logger.info(f"Vigilando {self.watch_dir} (cada {self.interval}s, estabilización {self.settle_seconds}s)")
+        # Ctrl+C lo gestiona el proceso principal; las conversiones en curso terminan antes de salir
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=signal.signal, initargs=(signal.SIGINT, signal.SIG_IGN))
+        tick = 0
+        try:
+            while not stop_event.is_set():
+                full = bool(self.full_rescan_every) and tick > 0 and tick % self.full_rescan_every == 0
+                self.scan(full=full)
+                tick += 1
+
+                for file_path in self.settled():
+                    try:
+                        signature = self._signature(file_path.stat())
+                    except OSError:
+                        continue
+                    self._in_flight.add(file_path)
+                    futures[pool.submit(_process_file_job, file_path, options, manager_config)] = (file_path, signature)
+                    notify("queued", file_path)
+
+                for future in [f for f in futures if f.done()]:
+                    file_path, signature = futures.pop(future)
+                    self._in_flight.discard(file_path)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.logger.critical(f"El trabajador falló procesando {file_path.name}: {e}")
+                        result = None
+                    # Se recuerda aunque falle, para no reintentarlo en bucle hasta que el archivo cambie
+                    self._processed[file_path] = signature
+                    if result:
+                        results.append(result)
+                        notify("done", file_path, result)
+                    else:
+                        notify("failed", file_path)
+
+                stop_event.wait(self.interval)
+        except KeyboardInterrupt:
+            self.logger.info("Vigilancia detenida por el usuario.")
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        return results
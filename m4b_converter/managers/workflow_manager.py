@@ -1,12 +1,18 @@
+import os
+import time
 import uuid
+import cProfile
+import asyncio
 import shutil
 import logging
+import multiprocessing
 from pathlib import Path
-from typing import Optional, Callable, List
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, Callable, List, Dict, Any, Set, Tuple, Union
 
-from m4b_converter.services import AudioAnalyzerService, ExtractCoverService, M4bConverterService
-from m4b_converter.schemas import ConversionResult, ConversionTask
-from m4b_converter.enums import Bitrate, Format
+from m4b_converter.services import AudioAnalyzerService, ExtractCoverService, M4bConverterService, MetricsService, TranscodePlannerService, EncoderProbeService, StagingService
+from m4b_converter.schemas import ConversionResult, ConversionTask, AudioFileSchema, ProgressEvent, SilenceChapterOptions, Rendition, RenditionPlan
+from m4b_converter.enums import Bitrate, Format, TranscodeMode, TranscodeDecision, AudioProfile, EncoderPreset, SampleRate, SampleRateMode
 from m4b_converter.settings import AppSettings
 
 
@@ -16,7 +22,7 @@ class WorkflowManager:
 
     Esta clase coordina todos los servicios necesarios para convertir un archivo de audio a formato M4B, ejecutando el flujo completo en el orden correcto:
 
-    1. Análisis del archivo de audio (AudioAnalyzerService)
+    1. Análisis del archivo de audio (AudioAnalyzerService) y decisión de recodificar, remuxar u omitir (TranscodePlannerService)
     2. Extracción de la portada si existe (ExtractCoverService)
     3. Conversión a M4B con parámetros optimizados (M4bConverterService)
     4. Persistencia de la portada y limpieza de archivos temporales
@@ -25,6 +31,12 @@ class WorkflowManager:
 
     Attributes:
         logger (logging.Logger): Logger para registrar eventos y errores durante todo el flujo de trabajo.
+        use_probe_cache (bool): Si el análisis consulta la caché persistente de ffprobe.
+        benchmark (bool): Si las conversiones adjuntan los tiempos internos de ffmpeg (`ConversionResult.ffmpeg_benchmark`).
+        profile_dir (Optional[Path]): Directorio donde cada trabajador del pool de process_directory guarda un perfil cProfile de sus conversiones.
+        transcode (TranscodeMode): Política de recodificación: siempre, remuxando el AAC que ya cumple el objetivo, u omitiendo además los MP3 de bitrate bajo.
+        encoder (Optional[AudioProfile]): Codificador AAC forzado, o None para elegir el más rápido disponible.
+        audio_profile (Optional[AudioProfile]): Perfil AAC forzado, o None para elegirlo según el bitrate.
 
     Example:
         >>> from pathlib import Path
@@ -52,13 +64,51 @@ class WorkflowManager:
         >>> print(f"✅ {len(results)} archivos convertidos")
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        use_probe_cache: bool = True,
+        benchmark: bool = False,
+        profile_dir: Optional[Path] = None,
+        transcode: TranscodeMode = TranscodeMode.AUTO,
+        encoder: Optional[AudioProfile] = None,
+        audio_profile: Optional[AudioProfile] = None
+    ):
         """
         Inicializa el orquestador de flujo de trabajo.
 
         Configura el logger para el seguimiento de todas las operaciones durante el proceso de conversión.
+
+        Args:
+            use_probe_cache (bool): Si es True, el análisis reutiliza los resultados de ffprobe guardados en la caché persistente. Por defecto True.
+            benchmark (bool): Si es True, ffmpeg se ejecuta con `-benchmark -benchmark_all` y sus tiempos por etapa se adjuntan al resultado. Por defecto False.
+            profile_dir (Optional[Path]): Si se indica, cada trabajador de un lote en paralelo perfila sus conversiones con cProfile y guarda un `.prof` en este directorio. Por defecto None.
+            transcode (TranscodeMode): Con TranscodeMode.AUTO los archivos AAC que ya cumplen el objetivo se remuxan y el resto se recodifica; TranscodeMode.SKIP además omite los MP3 por debajo del bitrate objetivo; con TranscodeMode.ALWAYS todo se recodifica. Por defecto TranscodeMode.AUTO.
+            encoder (Optional[AudioProfile]): Codificador AAC (AAC, LIBFDK_AAC o AAC_AT). None elige el más rápido de los que incluye el ffmpeg instalado (ver EncoderProbeService). Por defecto None.
+            audio_profile (Optional[AudioProfile]): Perfil AAC (AAC_LOW, AAC_HE o AAC_HE_V2). None usa HE-AAC a bitrates bajos si el codificador lo admite. Por defecto None.
         """
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.use_probe_cache = use_probe_cache
+        self.benchmark = benchmark
+        self.profile_dir = profile_dir
+        self.transcode = transcode
+        self.encoder = encoder
+        self.audio_profile = audio_profile
+
+    def _worker_config(self) -> Dict[str, Any]:
+        """
+        Configuración necesaria para reconstruir este orquestador en un proceso trabajador.
+
+        Returns:
+            Dict[str, Any]: Argumentos para `WorkflowManager(...)`.
+        """
+        return {
+            "use_probe_cache": self.use_probe_cache,
+            "benchmark": self.benchmark,
+            "profile_dir": self.profile_dir,
+            "transcode": self.transcode,
+            "encoder": self.encoder,
+            "audio_profile": self.audio_profile
+        }
 
     def process_file(
         self, 
@@ -66,7 +116,15 @@ class WorkflowManager:
         bitrate: Bitrate = Bitrate.B_64K,
         channels: int = 1,
         output_dir: Optional[Path] = AppSettings.OUTPUT_DIR,
-        progress_callback: Optional[Callable[[float], None]] = None
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        threads: int = 0,
+        single_pass_cover: bool = False,
+        segments: int = 1,
+        task: Optional[ConversionTask] = None,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        sample_rate: Union[SampleRate, SampleRateMode] = SampleRateMode.AUTO,
+        silence_chapters: Optional[SilenceChapterOptions] = None,
+        renditions: Optional[List[Rendition]] = None
     ) -> Optional[ConversionResult]:
         """
         Ejecuta el flujo completo de conversión para un solo archivo.
@@ -83,10 +141,18 @@ class WorkflowManager:
             bitrate (Bitrate): Bitrate objetivo para el archivo de salida. Por defecto Bitrate.B_64K (64 kbps), óptimo para voz.
             channels (int): Número de canales de audio (1=mono, 2=estéreo). Por defecto 1 (mono), recomendado para audiolibros.
             output_dir (Optional[Path]): Directorio donde se guardará el archivo convertido. Por defecto usa AppSettings.OUTPUT_DIR.
-            progress_callback (Optional[Callable[[float], None]]): Función callback que recibe el porcentaje de progreso (0-100) durante la conversión. Útil para interfaces de usuario.
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Función callback que recibe un ProgressEvent (porcentaje, velocidad, tamaño y ETA) durante la conversión. Útil para interfaces de usuario.
+            threads (int): Hilos que ffmpeg puede usar para esta conversión (0 = auto). Lo fija process_directory al repartir los núcleos entre trabajos paralelos.
+            single_pass_cover (bool): Si es True, la conversión copia la portada directamente desde el stream attached_pic del origen y escribe la imagen en el directorio de salida desde la misma invocación de ffmpeg, sin extracción previa ni archivos temporales. Por defecto False.
+            segments (int): Segmentos que se codifican en paralelo con M4bConverterService.convert_segmented (1 = sin segmentar, 0 = automático según núcleos y duración). Por defecto 1.
+            task (Optional[ConversionTask]): Tarea ya creada (por ejemplo, la de un trabajo de la cola persistente) para conservar su id. Si no se indica, se crea una nueva.
+            preset (EncoderPreset): Compromiso entre velocidad y calidad de la codificación (ver M4bConverterService.preset_args). EncoderPreset.FAST para ingestas masivas, EncoderPreset.QUALITY para másteres. Por defecto EncoderPreset.BALANCED.
+            sample_rate (Union[SampleRate, SampleRateMode]): Frecuencia de muestreo de salida. SampleRateMode.AUTO baja la voz a bitrates bajos a 22,05 o 24 kHz (ver TranscodePlannerService.sample_rate), SampleRateMode.SOURCE conserva la del origen y una SampleRate la fija. Por defecto SampleRateMode.AUTO.
+            silence_chapters (Optional[SilenceChapterOptions]): Si se indica, se generan capítulos a partir de los silencios detectados durante la propia conversión (ver M4bConverterService.convert). Por defecto None.
+            renditions (Optional[List[Rendition]]): Varias versiones del libro (bitrate, canales y frecuencia de muestreo) que se escriben desde una sola decodificación (ver M4bConverterService.convert_renditions). Si se indica, sustituye a `bitrate`, `channels` y `sample_rate`. Por defecto None.
 
         Returns:
-            Optional[ConversionResult]: Objeto con los resultados y métricas de la conversión. Retorna None si:
+            Optional[ConversionResult]: Objeto con los resultados y métricas de la conversión (con varias versiones, el de la primera, y el resto en `result.renditions`). Retorna None si:
                 - El archivo no pudo ser analizado correctamente.
                 - Ocurre un error durante cualquier etapa del proceso.
 
@@ -106,8 +172,8 @@ class WorkflowManager:
             ... )
             >>>
             >>> # Conversión con callback de progreso
-            >>> def mostrar_progreso(pct):
-            ...     print(f"Progreso: {pct:.1f}%")
+            >>> def mostrar_progreso(event):
+            ...     print(f"Progreso: {event.percent:.1f}% ({event.speed}x)")
             >>>
             >>> result = manager.process_file(
             ...     input_path=Path("mi_audio.mp3"),
@@ -117,13 +183,21 @@ class WorkflowManager:
             ... )
 
         Note:
-            - La portada extraída se guarda como JPG en el mismo directorio que el archivo convertido, con el nombre "{input_path.stem}.jpg"
+            - La portada extraída se guarda como JPG en el mismo directorio que el archivo convertido, con el nombre "{input_path.stem}.jpg" (en modo `single_pass_cover` la extensión depende del codec de la portada, p. ej. ".png").
             - Los archivos temporales de portada se eliminan automáticamente después de copiarlos al destino final.
             - El método maneja todas las excepciones internamente y retorna None en caso de error, registrando el problema en el log.
+            - La codificación segmentada no admite `single_pass_cover`: en ese caso la portada se extrae antes, como en el modo normal.
+            - El resultado incluye la duración de cada etapa (`analyze_seconds`, `cover_seconds`, `encode_seconds`, `finalize_seconds`); la finalización suma el movimiento del M4B y la copia de la portada.
+            - Tras el análisis, TranscodePlannerService decide según `self.transcode` si el audio se recodifica, se remuxa o se omite. `result.transcode_decision` recoge la decisión; un archivo omitido no genera M4B ni portada y su `output_path` es el propio origen.
+            - Si hay que codificar, EncoderProbeService elige el codificador y el perfil AAC (`result.encoder_final`, `result.profile_final`). Los perfiles HE-AAC se codifican sin segmentar.
+            - La frecuencia de muestreo elegida se guarda en `task.sample_rate_target` y en `result.sample_rate_final`.
+            - Con `silence_chapters` no se segmenta la codificación y un archivo que se omitiría se recodifica: sin M4B no hay dónde incrustar los capítulos.
+            - Con más de una versión el análisis, la portada y la decodificación se hacen una sola vez. Cada versión decide por separado si se recodifica, se remuxa o se omite, sale como `<origen>.<label>.m4b` (ver Rendition.label) y no se segmenta.
         """
+        output_dir = output_dir or AppSettings.OUTPUT_DIR
         output_dir.mkdir(parents=True, exist_ok=True)
         # 0. Creamos la tarea aquí (El "Ticket" de seguimiento)
-        task = ConversionTask(
+        task = task or ConversionTask(
             id=uuid.uuid4(),
             input_path=input_path,
             bitrate_target=bitrate.value,
@@ -134,32 +208,116 @@ class WorkflowManager:
         
         try:
             # 1. Analizar el archivo
-            analyzer = AudioAnalyzerService(input_path)
+            stage_start = time.perf_counter()
+            analyzer = AudioAnalyzerService(input_path, use_cache=self.use_probe_cache)
             audio_info = analyzer.analyze()
+            analyze_seconds = time.perf_counter() - stage_start
             
             if not audio_info:
                 self.logger.error(f"No se pudo analizar el archivo: {input_path}")
                 return None
 
+            converter = M4bConverterService(audio_info, output_dir=output_dir)
+            renditions = renditions or [Rendition(bitrate=bitrate, channels=channels, sample_rate=sample_rate)]
+            labelled = len(renditions) > 1
+            plans = [
+                self.plan_rendition(
+                    audio_info,
+                    rendition,
+                    task if index == 0 else None,
+                    silence_chapters=silence_chapters,
+                    label=rendition.label if labelled else None
+                )
+                for index, rendition in enumerate(renditions)
+            ]
+
+            skipped = {
+                plan.task.id: converter.skip(bitrate=Bitrate(plan.task.bitrate_target), channels=plan.task.channels_target, task=plan.task)
+                for plan in plans if plan.decision == TranscodeDecision.SKIP
+            }
+            active = [plan for plan in plans if plan.decision != TranscodeDecision.SKIP]
+            if not active:
+                return self._bundle_results([skipped[plan.task.id] for plan in plans], {"analyze_seconds": round(analyze_seconds, 3)})
+
+            plan = active[0]
+            segments = self._segment_count(plan, segments, labelled, silence_chapters is not None)
+
             # 2. Extraer portada (si existe)
             # Usamos el raw_data guardado en el analyzer
-            extractor = ExtractCoverService(input_path)
-            temp_cover_path = extractor.extract_cover(analyzer.raw_data, output_dir=AppSettings.TEMP_DIR)
-            
+            stage_start = time.perf_counter()
+            temp_cover_path = None
+            source_cover_stream = None
+            final_cover_path = None
+
+            if single_pass_cover and segments != 1:
+                self.logger.warning("La codificación segmentada no admite --single-pass-cover; la portada se extraerá antes.")
+                single_pass_cover = False
+
+            if single_pass_cover:
+                # La portada se copia desde el origen durante la propia conversión
+                cover_stream = ExtractCoverService.find_cover_stream(analyzer.raw_data)
+                if cover_stream:
+                    source_cover_stream = cover_stream["index"]
+                    extension = ExtractCoverService.cover_extension(cover_stream)
+                    final_cover_path = output_dir / f"{input_path.stem}.{extension}"
+            else:
+                extractor = ExtractCoverService(input_path)
+                # El id de la tarea evita que dos trabajos con el mismo nombre de origen compartan el temporal
+                temp_cover_path = extractor.extract_cover(analyzer.raw_data, output_dir=AppSettings.TEMP_DIR, output_name=f"{task.id}_cover.jpg")
+
             if temp_cover_path:
                 self.logger.info(f"Portada extraída en: {temp_cover_path}")
+            cover_seconds = time.perf_counter() - stage_start
 
             # 3. Convertir
-            converter = M4bConverterService(audio_info, output_dir=output_dir)
-            result = converter.convert(
-                bitrate=bitrate,
-                channels=channels,
-                cover_path=temp_cover_path,
-                progress_callback=progress_callback,
-                task=task
-            )
+            if labelled:
+                converted = converter.convert_renditions(
+                    active,
+                    cover_path=temp_cover_path,
+                    progress_callback=progress_callback,
+                    threads=threads,
+                    source_cover_stream=source_cover_stream,
+                    cover_output_path=final_cover_path,
+                    benchmark=self.benchmark,
+                    preset=preset,
+                    silence_chapters=silence_chapters
+                )
+            elif segments != 1:
+                converted = [converter.convert_segmented(
+                    bitrate=Bitrate(plan.task.bitrate_target),
+                    channels=plan.task.channels_target,
+                    cover_path=temp_cover_path,
+                    progress_callback=progress_callback,
+                    task=plan.task,
+                    segments=segments,
+                    threads=threads,
+                    benchmark=self.benchmark,
+                    encoder=plan.encoder,
+                    preset=preset
+                )]
+            else:
+                converted = [converter.convert(
+                    bitrate=Bitrate(plan.task.bitrate_target),
+                    channels=plan.task.channels_target,
+                    cover_path=temp_cover_path,
+                    progress_callback=progress_callback,
+                    task=plan.task,
+                    threads=threads,
+                    source_cover_stream=source_cover_stream,
+                    cover_output_path=final_cover_path,
+                    benchmark=self.benchmark,
+                    remux=plan.decision == TranscodeDecision.REMUX,
+                    encoder=plan.encoder,
+                    profile=plan.profile,
+                    preset=preset,
+                    silence_chapters=silence_chapters
+                )]
+
+            if final_cover_path:
+                self.logger.info(f"Portada guardada en: {final_cover_path}")
 
             # 4. Persistencia y Limpieza de Portada
+            stage_start = time.perf_counter()
             if temp_cover_path and temp_cover_path.exists():
                 # Definimos la ruta final de la imagen en el output_dir
                 final_cover_path = output_dir / f"{input_path.stem}.jpg"
@@ -172,17 +330,195 @@ class WorkflowManager:
                 temp_cover_path.unlink()
                 self.logger.debug("Limpieza de temporal de portada completada.")
 
-            self.logger.info(
-                f"Éxito: {result.output_path.name} | "
-                f"Reducción: {result.compression_ratio * 100}%"
-            )
-            
-            return result
+            cover_persist_seconds = time.perf_counter() - stage_start
+            results = {result.task_id: result for result in converted}
+            results.update(skipped)
+            for result in converted:
+                self.logger.info(
+                    f"Éxito: {result.output_path.name} | "
+                    f"Reducción: {result.compression_ratio * 100}%"
+                )
+
+            return self._bundle_results([results[plan.task.id] for plan in plans], {
+                "analyze_seconds": round(analyze_seconds, 3),
+                "cover_seconds": round(cover_seconds, 3)
+            }, finalize_extra=cover_persist_seconds)
 
         except Exception as e:
             self.logger.critical(f"Error en workflow para {input_path.name}: {e}")
             return None
         
+    def _segment_count(self, plan: RenditionPlan, segments: int, labelled: bool, silence_chapters: bool) -> int:
+        """
+        Segmentos con los que se codifica una versión: los pedidos, o 1 si la codificación segmentada no es posible.
+
+        Args:
+            plan (RenditionPlan): Plan de la versión.
+            segments (int): Segmentos pedidos (0 = automático).
+            labelled (bool): Si se escriben varias versiones a la vez.
+            silence_chapters (bool): Si se detectan capítulos por silencios.
+
+        Returns:
+            int: `segments`, o 1 si la versión debe codificarse en una sola pasada.
+        """
+        if segments == 1 or plan.decision == TranscodeDecision.REMUX:
+            # Copiar el stream ya es mucho más rápido que cualquier codificación en paralelo
+            return 1
+        if labelled:
+            self.logger.warning("Las versiones se escriben desde un único proceso ffmpeg; se codifican sin segmentar.")
+        elif silence_chapters:
+            self.logger.warning("La detección de capítulos por silencios necesita una sola pasada; se codifica sin segmentar.")
+        elif plan.profile != AudioProfile.AAC_LOW:
+            self.logger.warning(f"La codificación segmentada solo admite AAC-LC; {plan.profile} se codifica sin segmentar.")
+        elif plan.encoder != AudioProfile.AAC:
+            # El recorte de las uniones asume una sola trama de cebado, la del AAC nativo
+            self.logger.warning(f"La codificación segmentada solo admite el AAC nativo; con {plan.encoder} se codifica sin segmentar.")
+        else:
+            return segments
+        return 1
+
+    def plan_rendition(
+        self,
+        audio_info: AudioFileSchema,
+        rendition: Rendition,
+        task: Optional[ConversionTask] = None,
+        silence_chapters: Optional[SilenceChapterOptions] = None,
+        label: Optional[str] = None
+    ) -> RenditionPlan:
+        """
+        Decide el tratamiento, el codificador y la frecuencia de muestreo de una versión.
+
+        Es la única decisión de tratamiento del proyecto: AsyncWorkflowManager la reutiliza para que un mismo archivo dé la misma salida por las dos vías.
+
+        Args:
+            audio_info (AudioFileSchema): Archivo analizado.
+            rendition (Rendition): Versión pedida.
+            task (Optional[ConversionTask]): Tarea cuyo id se conserva (la del trabajo de la cola, en la primera versión). Si no se indica, se crea una nueva.
+            silence_chapters (Optional[SilenceChapterOptions]): Si se piden capítulos por silencios, una versión que se omitiría se recodifica.
+            label (Optional[str]): Sufijo del nombre de salida (ver Rendition.label).
+
+        Returns:
+            RenditionPlan: Plan de la versión; con TranscodeDecision.SKIP no se escribe ningún M4B.
+
+        Raises:
+            ValueError: Si el codificador o el perfil pedidos no están disponibles (ver EncoderProbeService.select).
+        """
+        bitrate, channels = rendition.bitrate, rendition.channels
+        task = (task or ConversionTask(input_path=audio_info.path, bitrate_target=bitrate.value, channels_target=channels)).model_copy(
+            update={"bitrate_target": bitrate.value, "channels_target": channels}
+        )
+        name = f"{audio_info.path.name} [{label}]" if label else audio_info.path.name
+
+        decision, reason = TranscodePlannerService.decide(audio_info, bitrate, channels, self.transcode, rendition.sample_rate)
+        if decision == TranscodeDecision.SKIP and silence_chapters:
+            decision, reason = TranscodeDecision.ENCODE, f"{reason}; se recodifica para añadir capítulos"
+        self.logger.info(f"Decisión para {name}: {decision} ({reason})")
+        if decision != TranscodeDecision.ENCODE:
+            return RenditionPlan(task=task, decision=decision, label=label)
+
+        encoder, profile = EncoderProbeService().select(bitrate, channels, self.encoder, self.audio_profile)
+        self.logger.info(f"Codificador: {encoder} ({profile})")
+        sample_rate_target = TranscodePlannerService.sample_rate(audio_info, bitrate, channels, profile, rendition.sample_rate)
+        if sample_rate_target:
+            self.logger.info(f"Remuestreo: {audio_info.sample_rate} Hz -> {sample_rate_target} Hz")
+            task = task.model_copy(update={"sample_rate_target": sample_rate_target})
+        return RenditionPlan(task=task, decision=decision, encoder=encoder, profile=profile, label=label)
+
+    @staticmethod
+    def _bundle_results(results: List[ConversionResult], update: Dict[str, Any], finalize_extra: float = 0.0) -> ConversionResult:
+        """
+        Aplica los tiempos comunes a los resultados de todas las versiones y devuelve el primero con los demás en `renditions`.
+        """
+        results = [
+            result.model_copy(update={**update, "finalize_seconds": round(result.finalize_seconds + finalize_extra, 3)})
+            for result in results
+        ]
+        return results[0].model_copy(update={"renditions": results[1:]})
+
+    @staticmethod
+    def budget_threads(jobs: int) -> Tuple[int, int]:
+        """
+        Reparte los núcleos disponibles entre los trabajos paralelos.
+
+        Args:
+            jobs (int): Número de trabajos simultáneos solicitados.
+
+        Returns:
+            Tuple[int, int]: Número de trabajos efectivo (nunca mayor que los núcleos disponibles) y número de hilos de ffmpeg por trabajo. Con un solo trabajo se devuelve 0 hilos (auto), como en la conversión individual.
+        """
+        cpu_count = os.cpu_count() or 1
+        jobs = max(1, min(jobs, cpu_count))
+        if jobs == 1:
+            return 1, 0
+        return jobs, max(1, cpu_count // jobs)
+
+    def _find_audio_files(self, input_dir: Path, recursive: bool) -> List[Path]:
+        """
+        Busca los archivos de audio compatibles en un directorio.
+
+        Args:
+            input_dir (Path): Directorio a escanear.
+            recursive (bool): Si es True, incluye subdirectorios.
+
+        Returns:
+            List[Path]: Archivos encontrados, ordenados por ruta.
+        """
+        # Extensiones válidas basadas en tu Enum Format
+        valid_extensions = {f".{fmt.value}" for fmt in Format if fmt != Format.M4B}
+
+        search_pattern = "**/*" if recursive else "*"
+        return sorted(
+            f for f in input_dir.glob(search_pattern)
+            if f.is_file() and f.suffix.lower() in valid_extensions
+        )
+
+    @staticmethod
+    def _split_duplicate_outputs(files: List[Path]) -> Tuple[List[Path], List[Tuple[Path, Path]]]:
+        """
+        Separa los archivos cuya salida coincidiría con la de otro anterior.
+
+        Todas las salidas de un lote van al mismo directorio como `<nombre>.m4b` y `<nombre>.jpg`, así que con `recursive` dos orígenes de carpetas distintas (`disco1/parte01.mp3` y `disco2/parte01.mp3`) se sobrescribirían, o se pisarían a mitad de escritura en paralelo. Los nombres se comparan sin distinguir mayúsculas, como en los sistemas de archivos de Windows y macOS.
+
+        Args:
+            files (List[Path]): Archivos del lote, en orden de búsqueda.
+
+        Returns:
+            Tuple[List[Path], List[Tuple[Path, Path]]]: Archivos que se procesan y, para cada archivo descartado, el anterior con el que coincide.
+        """
+        first_by_name: Dict[str, Path] = {}
+        unique: List[Path] = []
+        duplicates: List[Tuple[Path, Path]] = []
+        for file_path in files:
+            first = first_by_name.setdefault(file_path.stem.casefold(), file_path)
+            if first is file_path:
+                unique.append(file_path)
+            else:
+                duplicates.append((file_path, first))
+        return unique, duplicates
+
+    def probe_files(self, files: List[Path], concurrency: int = 16) -> Dict[Path, AudioFileSchema]:
+        """
+        Analiza un conjunto de archivos con ffprobe de forma concurrente.
+
+        Es la etapa previa a un lote: conocer la duración, el codec y el bitrate de cada entrada permite planificar los trabajos y estimar tiempos. Además deja la caché de ffprobe caliente para los trabajadores.
+
+        Args:
+            files (List[Path]): Archivos a analizar.
+            concurrency (int): Número máximo de procesos ffprobe simultáneos. Por defecto 16.
+
+        Returns:
+            Dict[Path, AudioFileSchema]: Esquema de cada archivo analizado correctamente.
+        """
+        async def collect() -> Dict[Path, AudioFileSchema]:
+            return {
+                info.path: info
+                async for info in AudioAnalyzerService.analyze_many(
+                    files, concurrency=concurrency, use_cache=self.use_probe_cache
+                )
+            }
+
+        return asyncio.run(collect())
+
     def process_directory(
         self,
         input_dir: Path,
@@ -190,12 +526,22 @@ class WorkflowManager:
         channels: int = 1,
         recursive: bool = False,
         output_dir: Optional[Path] = AppSettings.OUTPUT_DIR,
-        progress_callback: Optional[Callable[[float], None]] = None
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        jobs: int = 1,
+        file_progress_callback: Optional[Callable[[Path, ProgressEvent], None]] = None,
+        file_done_callback: Optional[Callable[[Path, Optional[ConversionResult]], None]] = None,
+        single_pass_cover: bool = False,
+        metrics: Optional[MetricsService] = None,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        sample_rate: Union[SampleRate, SampleRateMode] = SampleRateMode.AUTO,
+        silence_chapters: Optional[SilenceChapterOptions] = None,
+        renditions: Optional[List[Rendition]] = None,
+        min_free_bytes: int = AppSettings.MIN_FREE_BYTES
     ) -> List[ConversionResult]:
         """
         Escanea un directorio y procesa todos los archivos de audio compatibles.
 
-        Este método busca automáticamente todos los archivos de audio con extensiones compatibles (MP3, M4A, WAV, FLAC, OPUS, OGG) en el directorio especificado y los convierte uno por uno.
+        Este método busca automáticamente todos los archivos de audio con extensiones compatibles (MP3, M4A, WAV, FLAC, OPUS, OGG) en el directorio especificado y los convierte, uno por uno o en paralelo con un pool de procesos si `jobs` es mayor que 1.
 
         Args:
             input_dir (Path): Directorio que contiene los archivos de audioa procesar. Debe existir y ser accesible.
@@ -203,10 +549,20 @@ class WorkflowManager:
             channels (int): Número de canales para todos los archivos convertidos (1=mono, 2=estéreo). Por defecto 1.
             recursive (bool): Si es True, busca archivos recursivamente en subdirectorios. Por defecto False (solo nivel superior).
             output_dir (Optional[Path]): Directorio donde se guardarán los archivos convertidos. Por defecto usa AppSettings.OUTPUT_DIR.
-            progress_callback (Optional[Callable[[float], None]]): Función callback para el progreso global del proceso por lotes.
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Función callback que recibe los ProgressEvent de cada conversión individual.
+            jobs (int): Número de conversiones simultáneas. Cada trabajo corre en su propio proceso y recibe `núcleos // jobs` hilos de ffmpeg para no sobresuscribir la máquina. Por defecto 1 (secuencial).
+            file_progress_callback (Optional[Callable[[Path, ProgressEvent], None]]): Callback que recibe el archivo y su ProgressEvent. Permite mostrar una barra por trabajo activo.
+            file_done_callback (Optional[Callable[[Path, Optional[ConversionResult]], None]]): Callback invocado al terminar cada archivo con su resultado, o None si falló.
+            single_pass_cover (bool): Incrusta y guarda la portada desde la misma invocación de ffmpeg que convierte (ver `process_file`). Por defecto False.
+            metrics (Optional[MetricsService]): Exportador que recibe los archivos terminados y el estado de la cola. Su ciclo de vida (start/stop) lo gestiona quien lo crea.
+            preset (EncoderPreset): Preset de velocidad de todas las conversiones (ver `process_file`). Por defecto EncoderPreset.BALANCED.
+            sample_rate (Union[SampleRate, SampleRateMode]): Frecuencia de muestreo de salida (ver `process_file`). Por defecto SampleRateMode.AUTO.
+            silence_chapters (Optional[SilenceChapterOptions]): Capítulos por silencios en cada archivo (ver `process_file`). Por defecto None.
+            renditions (Optional[List[Rendition]]): Versiones que se escriben de cada archivo desde una sola decodificación (ver `process_file`). Por defecto None.
+            min_free_bytes (int): Espacio libre que debe quedar en los volúmenes de salida y temporal. Un archivo cuya salida estimada (bitrate × duración) lo rebasaría espera a que terminen otras conversiones, y se da por fallido si no cabe ni con el disco sin conversiones en curso. 0 desactiva la comprobación. Por defecto AppSettings.MIN_FREE_BYTES.
 
         Returns:
-            List[ConversionResult]: Lista de objetos ConversionResult para cada archivo procesado exitosamente. Los archivos que fallaron no se incluyen en la lista.
+            List[ConversionResult]: Lista de objetos ConversionResult para cada archivo procesado exitosamente (con varias versiones, el resto va en `result.renditions`). Los archivos que fallaron no se incluyen en la lista.
 
         Example:
             >>> from m4b_converter.managers import WorkflowManager
@@ -214,12 +570,13 @@ class WorkflowManager:
             >>>
             >>> manager = WorkflowManager()
             >>>
-            >>> # Procesar todos los MP3 en un directorio
+            >>> # Procesar todos los MP3 en un directorio, 4 a la vez
             >>> results = manager.process_directory(
             ...     input_dir=Path("./audiolibros/"),
             ...     bitrate=Bitrate.B_64K,
             ...     channels=1,
-            ...     recursive=True
+            ...     recursive=True,
+            ...     jobs=4
             ... )
             >>>
             >>> print(f"✅ {len(results)} archivos convertidos")
@@ -230,43 +587,264 @@ class WorkflowManager:
             - Solo se procesan archivos con extensiones definidas en el enum Format (excluyendo M4B para evitar reconversiones innecesarias).
             - Las extensiones se verifican en minúsculas para mayor flexibilidad.
             - Si no se encuentra ningún archivo compatible, retorna una lista vacía.
-            - El callback de progreso se pasa a cada conversión individual, pero no se utiliza para el progreso global del lote.
+            - Si dos archivos darían el mismo `<nombre>.m4b` (con `recursive`, en carpetas distintas), solo se convierte el primero en orden de ruta; los demás se dan por fallidos antes de empezar.
+            - En modo paralelo, o con la comprobación de espacio activa, se analizan antes todos los archivos de forma concurrente. En paralelo se lanzan primero los más largos y los resultados se devuelven en orden de finalización, no de búsqueda.
         """
         self.logger.info(f"Escaneando directorio: {input_dir}")
-        
-        # Extensiones válidas basadas en tu Enum Format
-        valid_extensions = {f".{fmt.value}" for fmt in Format if fmt != Format.M4B}
-        
-        # Búsqueda de archivos
-        search_pattern = "**/*" if recursive else "*"
-        files_to_process = [
-            f for f in input_dir.glob(search_pattern) 
-            if f.suffix.lower() in valid_extensions
-        ]
+
+        files_to_process = self._find_audio_files(input_dir, recursive)
 
         if not files_to_process:
             self.logger.warning(f"No se encontraron archivos compatibles en {input_dir}")
             return []
 
         self.logger.info(f"Se han encontrado {len(files_to_process)} archivos para procesar.")
-        
+
         results: List[ConversionResult] = []
+        files_to_process, duplicates = self._split_duplicate_outputs(files_to_process)
+        for file_path, first in duplicates:
+            self.logger.error(
+                f"{file_path} se guardaría como {file_path.stem}.m4b, igual que {first}; se omite para no sobrescribirlo"
+            )
+            self._collect_result(file_path, None, results, file_done_callback, metrics)
+
+        jobs, threads = self.budget_threads(jobs)
+        options: Dict[str, Any] = {
+            "bitrate": bitrate,
+            "channels": channels,
+            "output_dir": output_dir,
+            "threads": threads,
+            "single_pass_cover": single_pass_cover,
+            "preset": preset,
+            "sample_rate": sample_rate,
+            "silence_chapters": silence_chapters,
+            "renditions": renditions
+        }
+
+        disk_needs: Dict[Path, Dict[int, Tuple[Path, int]]] = {}
+        if jobs > 1 or min_free_bytes > 0:
+            # La duración de cada archivo sirve para planificar el pool y para estimar el tamaño de su salida
+            probed = self.probe_files(files_to_process)
+            total_hours = sum(info.duration_seconds for info in probed.values()) / 3600
+            self.logger.info(f"Análisis previo: {len(probed)} archivos, {total_hours:.1f} horas de audio")
+            if min_free_bytes > 0:
+                disk_needs = {file_path: self._disk_requirements(info, options) for file_path, info in probed.items()}
+
+        if jobs > 1:
+            # Planificamos primero los libros más largos para que ninguno arranque al final del lote
+            files_to_process.sort(key=lambda f: probed[f].duration_seconds if f in probed else 0, reverse=True)
+
+            results.extend(self._process_parallel(
+                files_to_process, options, jobs, progress_callback, file_progress_callback, file_done_callback, metrics,
+                disk_needs=disk_needs, min_free_bytes=min_free_bytes
+            ))
+            return results
+
+        staging = StagingService()
 
         for index, file_path in enumerate(files_to_process, 1):
             self.logger.info(f"Procesando [{index}/{len(files_to_process)}]: {file_path.name}")
-            
-            # Aquí podrías inyectar un callback de progreso que informe qué archivo está procesando
+            if metrics:
+                metrics.set_queue(queue_depth=len(files_to_process) - index, active=1)
+
+            if not staging.fits(disk_needs.get(file_path, {}), {}, min_free_bytes):
+                self.logger.error(f"Espacio en disco insuficiente para {file_path.name}; se omite para no agotar el disco")
+                self._collect_result(file_path, None, results, file_done_callback, metrics)
+                continue
+
+            def report_progress(event: ProgressEvent, file_path: Path = file_path) -> None:
+                if progress_callback:
+                    progress_callback(event)
+                if file_progress_callback:
+                    file_progress_callback(file_path, event)
+
             result = self.process_file(
                 input_path=file_path,
-                bitrate=bitrate,
-                channels=channels,
-                output_dir=output_dir,
-                progress_callback=progress_callback
+                progress_callback=report_progress,
+                **options
             )
-            
-            if result:
-                results.append(result)
-            else:
-                self.logger.error(f"Fallo al procesar: {file_path.name}")
 
-        return results
\ No newline at end of file
+            self._collect_result(file_path, result, results, file_done_callback, metrics)
+
+        return results
+
+    def _process_parallel(
+        self,
+        files_to_process: List[Path],
+        options: Dict[str, Any],
+        jobs: int,
+        progress_callback: Optional[Callable[[ProgressEvent], None]],
+        file_progress_callback: Optional[Callable[[Path, ProgressEvent], None]],
+        file_done_callback: Optional[Callable[[Path, Optional[ConversionResult]], None]],
+        metrics: Optional[MetricsService] = None,
+        disk_needs: Optional[Dict[Path, Dict[int, Tuple[Path, int]]]] = None,
+        min_free_bytes: int = 0
+    ) -> List[ConversionResult]:
+        """
+        Procesa los archivos en un pool de procesos.
+
+        Cada trabajador ejecuta `process_file` completo (análisis, portada, conversión y persistencia). El progreso de cada trabajador viaja por una cola compartida y se reenvía a los callbacks desde el proceso principal.
+
+        Los archivos se entregan al pool de uno en uno a medida que hay trabajadores libres y espacio en disco: cada conversión en curso reserva el tamaño estimado de su salida, y un archivo que no cabe espera a que otra termine mientras los siguientes, más cortos, pueden adelantarlo.
+
+        Args:
+            files_to_process (List[Path]): Archivos a convertir, en orden de preferencia.
+            options (Dict[str, Any]): Parámetros comunes para `process_file`.
+            jobs (int): Número de procesos trabajadores.
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Callback de progreso por conversión.
+            file_progress_callback (Optional[Callable[[Path, ProgressEvent], None]]): Callback de progreso por archivo.
+            file_done_callback (Optional[Callable[[Path, Optional[ConversionResult]], None]]): Callback al terminar cada archivo.
+            metrics (Optional[MetricsService]): Exportador de métricas del lote.
+            disk_needs (Optional[Dict[Path, Dict[int, Tuple[Path, int]]]]): Espacio que necesita cada archivo (ver StagingService.requirements). Los archivos sin entrada no se comprueban.
+            min_free_bytes (int): Espacio libre que debe quedar en cada volumen. Por defecto 0.
+
+        Returns:
+            List[ConversionResult]: Resultados exitosos en orden de finalización.
+        """
+        self.logger.info(f"Procesando en paralelo: {jobs} trabajos x {options['threads']} hilos")
+        results: List[ConversionResult] = []
+        report_progress = progress_callback is not None or file_progress_callback is not None
+        disk_needs = disk_needs or {}
+        staging = StagingService()
+        reserved: Dict[int, int] = {}
+        held: Set[Path] = set()
+
+        with multiprocessing.Manager() as mp_manager, ProcessPoolExecutor(max_workers=jobs) as pool:
+            progress_queue = mp_manager.Queue() if report_progress else None
+            waiting = list(files_to_process)
+            futures: Dict[Any, Path] = {}
+
+            while waiting or futures:
+                for file_path in list(waiting):
+                    if len(futures) >= jobs:
+                        break
+                    needs = disk_needs.get(file_path, {})
+                    if not staging.fits(needs, reserved, min_free_bytes):
+                        if not futures:
+                            # Ni con el disco sin conversiones en curso hay sitio para este archivo
+                            self.logger.error(f"Espacio en disco insuficiente para {file_path.name}; se omite para no agotar el disco")
+                            waiting.remove(file_path)
+                            self._collect_result(file_path, None, results, file_done_callback, metrics)
+                        elif file_path not in held:
+                            held.add(file_path)
+                            self.logger.info(f"{file_path.name} espera a que haya espacio en disco")
+                        continue
+                    waiting.remove(file_path)
+                    for device, (_, needed) in needs.items():
+                        reserved[device] = reserved.get(device, 0) + needed
+                    futures[pool.submit(_process_file_job, file_path, options, self._worker_config(), progress_queue)] = file_path
+
+                if not futures:
+                    continue
+                if metrics:
+                    metrics.set_queue(queue_depth=len(waiting), active=len(futures))
+                done, _ = wait(futures, timeout=0.2, return_when=FIRST_COMPLETED)
+                self._drain_progress(progress_queue, progress_callback, file_progress_callback)
+
+                for future in done:
+                    file_path = futures.pop(future)
+                    for device, (_, needed) in disk_needs.get(file_path, {}).items():
+                        reserved[device] -= needed
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.logger.critical(f"El trabajador falló procesando {file_path.name}: {e}")
+                        result = None
+                    self._collect_result(file_path, result, results, file_done_callback, metrics)
+
+            self._drain_progress(progress_queue, progress_callback, file_progress_callback)
+
+        return results
+
+    @staticmethod
+    def _disk_requirements(audio_info: AudioFileSchema, options: Dict[str, Any]) -> Dict[int, Tuple[Path, int]]:
+        """
+        Espacio en disco que necesita la conversión de un archivo analizado con las opciones del lote.
+
+        La estimación usa el bitrate objetivo aunque el archivo acabe remuxado u omitido, así que nunca se queda corta.
+        """
+        renditions = options["renditions"] or [Rendition(bitrate=options["bitrate"], channels=options["channels"])]
+        bitrate_kbps = sum(int(rendition.bitrate.value.rstrip("k")) for rendition in renditions)
+        output_bytes = StagingService.estimate_output_bytes(audio_info.duration_seconds, bitrate_kbps)
+        # Los capítulos por silencios se añaden con una copia completa del M4B temporal
+        temp_copies = 2 if options["silence_chapters"] else 1
+        return StagingService().requirements(options["output_dir"] or AppSettings.OUTPUT_DIR, output_bytes, temp_copies=temp_copies)
+
+    @staticmethod
+    def _drain_progress(
+        progress_queue: Optional[Any],
+        progress_callback: Optional[Callable[[ProgressEvent], None]],
+        file_progress_callback: Optional[Callable[[Path, ProgressEvent], None]]
+    ) -> None:
+        """
+        Reenvía a los callbacks el progreso acumulado en la cola de los trabajadores.
+        """
+        if progress_queue is None:
+            return
+        while not progress_queue.empty():
+            file_path, event = progress_queue.get_nowait()
+            if progress_callback:
+                progress_callback(event)
+            if file_progress_callback:
+                file_progress_callback(file_path, event)
+
+    def _collect_result(
+        self,
+        file_path: Path,
+        result: Optional[ConversionResult],
+        results: List[ConversionResult],
+        file_done_callback: Optional[Callable[[Path, Optional[ConversionResult]], None]],
+        metrics: Optional[MetricsService] = None
+    ) -> None:
+        """
+        Registra el resultado de un archivo y notifica al callback de finalización y al exportador de métricas.
+        """
+        if metrics:
+            # Cada versión es una conversión para las métricas
+            for recorded in result.all_renditions if result else [None]:
+                metrics.record(recorded)
+
+        if result:
+            results.append(result)
+        else:
+            self.logger.error(f"Fallo al procesar: {file_path.name}")
+
+        if file_done_callback:
+            file_done_callback(file_path, result)
+
+
+def _process_file_job(
+    input_path: Path,
+    options: Dict[str, Any],
+    manager_config: Dict[str, Any],
+    progress_queue: Optional[Any] = None
+) -> Optional[ConversionResult]:
+    """
+    Punto de entrada de cada trabajador del pool de procesos.
+
+    Debe ser una función de módulo para poder serializarse hacia los procesos hijos.
+
+    Args:
+        input_path (Path): Archivo a convertir.
+        options (Dict[str, Any]): Parámetros para `WorkflowManager.process_file`.
+        manager_config (Dict[str, Any]): Argumentos para construir el WorkflowManager del trabajador.
+        progress_queue (Optional[Any]): Cola compartida donde se publica `(input_path, ProgressEvent)`.
+
+    Returns:
+        Optional[ConversionResult]: Resultado de la conversión o None si falló.
+    """
+    progress_callback = None
+    if progress_queue is not None:
+        progress_callback = lambda event: progress_queue.put((input_path, event))
+
+    manager = WorkflowManager(**manager_config)
+    if not manager.profile_dir:
+        return manager.process_file(input_path=input_path, progress_callback=progress_callback, **options)
+
+    # Un perfil por archivo: el proceso principal solo ve la espera del pool
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(manager.process_file, input_path=input_path, progress_callback=progress_callback, **options)
+    finally:
+        manager.profile_dir.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(manager.profile_dir / f"{input_path.stem}-{os.getpid()}.prof")
@@ -6,11 +6,33 @@ Este paquete contiene los modelos de datos utilizados en toda la aplicación par
 from m4b_converter.schemas.audio_file_schema import AudioFileSchema
 from m4b_converter.schemas.audio_metadata_schema import AudioMetadata
 from m4b_converter.schemas.conversion_task_schema import ConversionTask
+from m4b_converter.schemas.resource_usage_schema import ResourceUsage
+from m4b_converter.schemas.ffmpeg_benchmark_schema import FfmpegBenchmark
+from m4b_converter.schemas.encoder_capabilities_schema import EncoderCapabilities
 from m4b_converter.schemas.conversion_result_schema import ConversionResult
+from m4b_converter.schemas.progress_event_schema import ProgressEvent
+from m4b_converter.schemas.queued_job_schema import QueuedJob
+from m4b_converter.schemas.chapter_schema import Chapter
+from m4b_converter.schemas.silence_chapters_schema import SilenceChapterOptions
+from m4b_converter.schemas.rendition_schema import Rendition
+from m4b_converter.schemas.rendition_plan_schema import RenditionPlan
+from m4b_converter.schemas.concat_run_schema import ConcatRun
+from m4b_converter.schemas.concat_plan_schema import ConcatPlan
 
 __all__ = [
     "AudioFileSchema",
     "AudioMetadata", 
     "ConversionTask",
-    "ConversionResult"
+    "ConversionResult",
+    "ResourceUsage",
+    "FfmpegBenchmark",
+    "EncoderCapabilities",
+    "ProgressEvent",
+    "QueuedJob",
+    "Chapter",
+    "SilenceChapterOptions",
+    "Rendition",
+    "RenditionPlan",
+    "ConcatRun",
+    "ConcatPlan"
 ]
\ No newline at end of file
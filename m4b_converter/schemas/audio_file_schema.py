@@ -1,6 +1,6 @@
 from typing import Any
 from pathlib import Path
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
 from m4b_converter.enums import Format, Bitrate
 from m4b_converter.schemas.audio_metadata_schema import AudioMetadata
@@ -94,14 +94,15 @@ class AudioFileSchema(BaseModel):
 
     @field_validator("bitrate_kbps", mode="before")
     @classmethod
-    def parse_bitrate(cls, v: Any) -> int:
+    def parse_bitrate(cls, v: Any, info: ValidationInfo) -> int:
         """
         Convierte el bitrate de bits por segundo a kilobits por segundo.
 
-        ffprobe devuelve el bitrate como un string en bps (ej: "128000"). Este validador convierte el valor a kbps dividiendo por 1000.
+        ffprobe devuelve el bitrate como un string en bps (ej: "128000"). Este validador convierte el valor a kbps dividiendo por 1000, salvo que el contexto de validación indique `bitrate_in_kbps` (esquemas ya normalizados, como los de la caché de ffprobe).
 
         Args:
             v (Any): Valor del campo 'bit_rate' proveniente de ffprobe.
+            info (ValidationInfo): Información de validación de Pydantic, incluido el contexto opcional.
 
         Returns:
             int: Bitrate en kilobits por segundo (kbps).
@@ -116,6 +117,8 @@ class AudioFileSchema(BaseModel):
         """
         # El bitrate viene como string en el JSON de ffprobe ("320000")
         try:
+            if info.context and info.context.get("bitrate_in_kbps"):
+                return int(v)
             return int(v) // 1000
         except (ValueError, TypeError):
             return 0
\ No newline at end of file
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+
+class Chapter(BaseModel):
+    """
+    Capítulo de un audiolibro, tal como se escribe en el archivo ffmetadata que ffmpeg incrusta en el M4B.
+
+    Attributes:
+        title (str): Título del capítulo.
+        start_seconds (float): Inicio del capítulo en segundos desde el principio del libro.
+        end_seconds (float): Final del capítulo en segundos (inicio del siguiente).
+
+    Example:
+        >>> from m4b_converter.schemas import Chapter
+        >>>
+        >>> chapter = Chapter(title="Capítulo 1", start_seconds=0.0, end_seconds=1834.5)
+        >>> print(chapter.duration_seconds)  # 1834.5
+    """
+    title: str
+    start_seconds: float
+    end_seconds: float
+
+    @property
+    def duration_seconds(self) -> float:
+        """
+        Duración del capítulo en segundos.
+        """
+        return self.end_seconds - self.start_seconds
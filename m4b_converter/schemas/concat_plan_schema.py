@@ -0,0 +1,46 @@
+from typing import List
+from pydantic import BaseModel
+
+from m4b_converter.enums import ConcatStrategy
+from m4b_converter.schemas.audio_file_schema import AudioFileSchema
+from m4b_converter.schemas.concat_run_schema import ConcatRun
+
+
+class ConcatPlan(BaseModel):
+    """
+    Plan de una fusión: la estrategia elegida, los parámetros de referencia y los tramos en que se dividen los archivos.
+
+    Attributes:
+        strategy (ConcatStrategy): Cómo se unen los archivos.
+        codec (str): Códec de referencia, el de los archivos que suman más duración.
+        sample_rate (int): Frecuencia de referencia en Hz.
+        channels (int): Canales de referencia.
+        runs (List[ConcatRun]): Tramos en orden de fusión; los que tienen `normalize` se convierten a la referencia.
+        reason (str): Motivo legible de la estrategia, para el log y `m4b merge --dry-run`.
+
+    Example:
+        >>> from m4b_converter.services import ConcatPlannerService
+        >>>
+        >>> plan = ConcatPlannerService.plan(infos, copy_output=False)
+        >>> print(plan.strategy, plan.reason)  # filtergraph "3 tramos: 2 de ellos se remuestrean en el grafo"
+    """
+    strategy: ConcatStrategy
+    codec: str
+    sample_rate: int
+    channels: int
+    runs: List[ConcatRun]
+    reason: str
+
+    @property
+    def outliers(self) -> List[AudioFileSchema]:
+        """
+        Archivos que no coinciden con la referencia, en orden de fusión.
+        """
+        return [info for run in self.runs if run.normalize for info in run.files]
+
+    @property
+    def duration_seconds(self) -> float:
+        """
+        Duración total de la fusión en segundos.
+        """
+        return sum(run.duration_seconds for run in self.runs)
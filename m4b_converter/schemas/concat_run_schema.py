@@ -0,0 +1,43 @@
+from typing import List, Tuple
+from pydantic import BaseModel
+
+from m4b_converter.schemas.audio_file_schema import AudioFileSchema
+
+
+class ConcatRun(BaseModel):
+    """
+    Tramo de archivos consecutivos de una fusión que comparten los parámetros de su stream de audio.
+
+    Attributes:
+        codec (str): Códec de audio de los archivos del tramo (ej: "mp3").
+        sample_rate (int): Frecuencia de muestreo en Hz.
+        channels (int): Número de canales.
+        files (List[AudioFileSchema]): Archivos del tramo, en orden de fusión.
+        normalize (bool): True si los parámetros difieren de la referencia del plan y el tramo se convierte a ella.
+
+    Example:
+        >>> from m4b_converter.services import ConcatPlannerService
+        >>>
+        >>> plan = ConcatPlannerService.plan(infos, copy_output=True)
+        >>> for run in plan.runs:
+        ...     print(run.sample_rate, run.channels, len(run.files), run.normalize)
+    """
+    codec: str
+    sample_rate: int
+    channels: int
+    files: List[AudioFileSchema]
+    normalize: bool = False
+
+    @property
+    def params(self) -> Tuple[str, int, int]:
+        """
+        Parámetros que deben coincidir para unir dos archivos sin recodificar: (códec, frecuencia, canales).
+        """
+        return self.codec, self.sample_rate, self.channels
+
+    @property
+    def duration_seconds(self) -> float:
+        """
+        Duración total del tramo en segundos.
+        """
+        return sum(info.duration_seconds for info in self.files)
@@ -1,8 +1,13 @@
 import uuid
 from pathlib import Path
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field, computed_field
 
+from m4b_converter.enums import TranscodeDecision
+from m4b_converter.schemas.resource_usage_schema import ResourceUsage
+from m4b_converter.schemas.ffmpeg_benchmark_schema import FfmpegBenchmark
+
 
 class ConversionResult(BaseModel):
     """
@@ -18,12 +23,27 @@ class ConversionResult(BaseModel):
         size_final_bytes (int): Tamaño del archivo convertido en bytes.
         bitrate_final (str): Bitrate final aplicado (ej: "64k", "128k").
         codec_final (str): Códec utilizado en el archivo final. Por defecto "aac" para M4B.
+        encoder_final (Optional[str]): Codificador de ffmpeg usado (ej: "aac", "libfdk_aac"). None si el audio no se recodificó.
+        profile_final (Optional[str]): Perfil AAC usado (ej: "aac_low", "aac_he"). None si el audio no se recodificó.
+        preset_final (Optional[str]): Preset de velocidad usado ("fast", "balanced" o "quality"). None si el audio no se recodificó.
+        sample_rate_final (Optional[int]): Frecuencia de muestreo del archivo final en Hz.
+        chapter_count (int): Capítulos detectados por silencios e incrustados en el M4B. 0 si no se pidió la detección o no se encontró ninguna frontera.
+        transcode_decision (TranscodeDecision): Tratamiento aplicado al audio: recodificado, remuxado sin recodificar u omitido. En un archivo omitido `output_path` es el propio origen.
         timestamp_start (datetime): Momento de inicio de la conversión.
         timestamp_end (datetime): Momento de finalización de la conversión.
+        analyze_seconds (float): Tiempo del análisis con ffprobe (o de la consulta a la caché).
+        cover_seconds (float): Tiempo de extracción de la portada a un archivo temporal.
+        encode_seconds (float): Tiempo de codificación con ffmpeg (incluida la unión en la codificación segmentada).
+        finalize_seconds (float): Tiempo de mover el M4B y copiar la portada a su destino final; puede ser alto si el destino es un disco de red.
+        child_usage (Optional[ResourceUsage]): CPU y memoria pico de los procesos ffmpeg de codificación. None si la plataforma no permite medirlo (sin `os.wait4`) o en la API asíncrona.
+        ffmpeg_benchmark (Optional[FfmpegBenchmark]): Tiempos internos de ffmpeg por etapa, solo en modo perfilado (`--profile`).
+        renditions (List[ConversionResult]): Resultados de las demás versiones del mismo libro cuando se piden varias (ver WorkflowManager.process_file). Este resultado es el de la primera versión.
 
     Computed Properties:
         compression_ratio (float): Ratio de compresión calculado como 1 - (tamaño_final / tamaño_original). Indica el porcentaje de reducción (0.0 = sin compresión, 1.0 = compresión total).
         space_saved_mb (float): Espacio ahorrado en megabytes, calculado como la diferencia entre el tamaño original y el final.
+        total_seconds (float): Suma de los tiempos de todas las etapas.
+        realtime_factor (Optional[float]): Segundos de audio convertidos por segundo de reloj (ej: 40.0 = 40 veces más rápido que el tiempo real).
 
     Example:
         >>> from datetime import datetime
@@ -49,6 +69,7 @@ class ConversionResult(BaseModel):
         - El ratio de compresión se redondea a 2 decimales para mayor claridad.
         - `codec_final` tiene "aac" como valor por defecto, que es el estándar para archivos M4B.
         - Si el tamaño original es 0, `compression_ratio` retorna 0.0 para evitar división por cero.
+        - Los tiempos por etapa se miden con un reloj monotónico; `total_seconds` puede diferir ligeramente de `timestamp_end - timestamp_start`, que solo cubre la codificación y la finalización.
     """
     task_id: uuid.UUID
     output_path: Path
@@ -57,8 +78,28 @@ class ConversionResult(BaseModel):
     size_final_bytes: int
     bitrate_final: str
     codec_final: str = "aac"
+    encoder_final: Optional[str] = None
+    profile_final: Optional[str] = None
+    preset_final: Optional[str] = None
+    sample_rate_final: Optional[int] = None
+    chapter_count: int = 0
+    transcode_decision: TranscodeDecision = TranscodeDecision.ENCODE
     timestamp_start: datetime = Field(default_factory=datetime.now)
     timestamp_end: datetime
+    analyze_seconds: float = 0.0
+    cover_seconds: float = 0.0
+    encode_seconds: float = 0.0
+    finalize_seconds: float = 0.0
+    child_usage: Optional[ResourceUsage] = None
+    ffmpeg_benchmark: Optional[FfmpegBenchmark] = None
+    renditions: List["ConversionResult"] = Field(default_factory=list)
+
+    @property
+    def all_renditions(self) -> List["ConversionResult"]:
+        """
+        Este resultado seguido de los de las demás versiones.
+        """
+        return [self, *self.renditions]
 
     @computed_field
     @property
@@ -91,4 +132,28 @@ class ConversionResult(BaseModel):
         Note:
             Si el archivo final es más grande que el original (por ejemplo, al convertir a un bitrate más alto), este valor sería negativo. En el contexto de esta aplicación, siempre se espera que sea positivo debido a la compresión.
         """
-        return round((self.size_original_bytes - self.size_final_bytes) / (1024 * 1024), 2)
\ No newline at end of file
+        return round((self.size_original_bytes - self.size_final_bytes) / (1024 * 1024), 2)
+
+    @computed_field
+    @property
+    def total_seconds(self) -> float:
+        """
+        Tiempo total del flujo como suma de las etapas medidas.
+
+        Retorna:
+            float: Segundos, redondeados a 3 decimales.
+        """
+        return round(self.analyze_seconds + self.cover_seconds + self.encode_seconds + self.finalize_seconds, 3)
+
+    @computed_field
+    @property
+    def realtime_factor(self) -> Optional[float]:
+        """
+        Segundos de audio convertidos por cada segundo de reloj.
+
+        Retorna:
+            Optional[float]: Factor redondeado a 2 decimales, o None si no hay tiempos medidos.
+        """
+        if self.total_seconds <= 0:
+            return None
+        return round(self.duration_seconds / self.total_seconds, 2)
@@ -1,5 +1,6 @@
 import uuid
 from pathlib import Path
+from typing import Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -16,6 +17,7 @@ class ConversionTask(BaseModel):
         timestamp_start (datetime): Momento en que se creó la tarea. Se establece automáticamente al momento de la instanciación.
         bitrate_target (str): Bitrate objetivo para la conversión (ej: "64k", "96k", "128k").
         channels_target (int): Número de canales de audio objetivo (1 = mono, 2 = estéreo).
+        sample_rate_target (Optional[int]): Frecuencia de muestreo de salida en Hz (`-ar`). None conserva la del origen.
 
     Example:
         >>> from pathlib import Path
@@ -46,4 +48,5 @@ class ConversionTask(BaseModel):
     input_path: Path
     timestamp_start: datetime = Field(default_factory=datetime.now)
     bitrate_target: str
-    channels_target: int
\ No newline at end of file
+    channels_target: int
+    sample_rate_target: Optional[int] = None
\ No newline at end of file
@@ -0,0 +1,39 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class EncoderCapabilities(BaseModel):
+    """
+    Versión y codificadores de audio del ffmpeg instalado, tal como los informan `ffmpeg -version` y `ffmpeg -encoders`.
+
+    Attributes:
+        ffmpeg_path (Optional[str]): Ruta absoluta del binario de ffmpeg, o None si no está en el PATH.
+        ffmpeg_mtime_ns (int): Fecha de modificación del binario en nanosegundos; junto con la ruta y el tamaño identifica la instalación.
+        ffmpeg_size (int): Tamaño del binario en bytes.
+        version (str): Primera línea de `ffmpeg -version`.
+        audio_encoders (List[str]): Nombres de los codificadores de audio disponibles (ej: "aac", "libfdk_aac", "libopus").
+
+    Example:
+        >>> from m4b_converter.services import EncoderProbeService
+        >>>
+        >>> caps = EncoderProbeService().capabilities()
+        >>> print(caps.version)             # "ffmpeg version 7.0.2 ..."
+        >>> print(caps.has("libfdk_aac"))   # False en la mayoría de builds por su licencia
+    """
+    ffmpeg_path: Optional[str] = None
+    ffmpeg_mtime_ns: int = 0
+    ffmpeg_size: int = 0
+    version: str = ""
+    audio_encoders: List[str] = Field(default_factory=list)
+
+    def has(self, encoder: str) -> bool:
+        """
+        Indica si el ffmpeg instalado incluye un codificador de audio.
+
+        Args:
+            encoder (str): Nombre del codificador, tal como se pasa a `-c:a`.
+
+        Returns:
+            bool: True si está disponible.
+        """
+        return encoder in self.audio_encoders
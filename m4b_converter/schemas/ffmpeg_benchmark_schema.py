@@ -0,0 +1,111 @@
+import re
+from typing import Dict, Iterable, Optional
+from pydantic import BaseModel, Field, computed_field
+
+# Línea por tarea de -benchmark_all: "bench:     12 user      0 sys     16 real encode_audio 0.0"
+_STAGE_LINE = re.compile(r"^bench:\s+(\d+) user\s+(\d+) sys\s+(\d+) real (\w+)")
+# Resumen de -benchmark: "bench: utime=0.319s stime=0.024s rtime=0.360s"
+_TOTAL_LINE = re.compile(r"^bench: utime=([\d.]+)s stime=([\d.]+)s rtime=([\d.]+)s")
+# Memoria de -benchmark: "bench: maxrss=38024KiB"
+_MAXRSS_LINE = re.compile(r"^bench: maxrss=(\d+)KiB")
+
+
+class FfmpegBenchmark(BaseModel):
+    """
+    Tiempos internos de ffmpeg obtenidos con `-benchmark` y `-benchmark_all`.
+
+    `-benchmark` informa al terminar del tiempo de CPU y de reloj del proceso; `-benchmark_all` añade una línea por cada trama decodificada o codificada con el tiempo que costó. Agregando estas últimas por etapa (decode_audio, encode_audio, flush_audio...) se separa el tiempo del códec del resto: lectura, muxing y la orquestación en Python.
+
+    Attributes:
+        utime_seconds (float): Tiempo de CPU en modo usuario de ffmpeg.
+        stime_seconds (float): Tiempo de CPU en modo sistema de ffmpeg.
+        rtime_seconds (float): Tiempo de reloj de ffmpeg, desde que arranca hasta que termina.
+        max_rss_bytes (int): Memoria residente máxima de ffmpeg.
+        stage_seconds (Dict[str, float]): Tiempo de reloj acumulado por etapa de `-benchmark_all`.
+
+    Computed Properties:
+        codec_seconds (float): Suma de las etapas de decodificación y codificación.
+
+    Example:
+        >>> from m4b_converter.schemas import FfmpegBenchmark
+        >>>
+        >>> bench = FfmpegBenchmark()
+        >>> for line in stderr_lines:
+        ...     bench.feed_line(line)
+        >>> print(bench.stage_seconds)  # {"decode_audio": 0.41, "encode_audio": 6.2, "flush_audio": 0.01}
+
+    Note:
+        - `-benchmark_all` escribe una línea por trama (millones en un libro de muchas horas), así que solo se activa en modo perfilado.
+    """
+    utime_seconds: float = 0.0
+    stime_seconds: float = 0.0
+    rtime_seconds: float = 0.0
+    max_rss_bytes: int = 0
+    stage_seconds: Dict[str, float] = Field(default_factory=dict)
+
+    @computed_field
+    @property
+    def codec_seconds(self) -> float:
+        """
+        Tiempo de reloj dedicado a decodificar y codificar tramas.
+        """
+        return round(sum(self.stage_seconds.values()), 3)
+
+    def feed_line(self, line: str) -> bool:
+        """
+        Acumula una línea de stderr si es de `-benchmark`.
+
+        Args:
+            line (str): Línea de stderr de ffmpeg.
+
+        Returns:
+            bool: True si la línea era de benchmark (y no debe tratarse como salida de error).
+        """
+        if not line.startswith("bench:"):
+            return False
+
+        match = _STAGE_LINE.match(line)
+        if match:
+            stage = match.group(4)
+            real_us = int(match.group(3))
+            # ffmpeg imprime como entero sin signo los intervalos negativos que surgen entre hilos
+            if real_us >= 2 ** 63:
+                real_us -= 2 ** 64
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + real_us / 1_000_000
+            return True
+
+        match = _TOTAL_LINE.match(line)
+        if match:
+            self.utime_seconds, self.stime_seconds, self.rtime_seconds = (float(value) for value in match.groups())
+            return True
+
+        match = _MAXRSS_LINE.match(line)
+        if match:
+            self.max_rss_bytes = int(match.group(1)) * 1024
+        return True
+
+    @classmethod
+    def combine(cls, benchmarks: Iterable[Optional["FfmpegBenchmark"]]) -> Optional["FfmpegBenchmark"]:
+        """
+        Agrega los tiempos de varios procesos ffmpeg que corrieron en paralelo (codificación segmentada).
+
+        Args:
+            benchmarks (Iterable[Optional[FfmpegBenchmark]]): Benchmarks de cada proceso; los None se ignoran.
+
+        Returns:
+            Optional[FfmpegBenchmark]: Tiempos de CPU y etapas sumados, tiempo de reloj y memoria como el máximo, o None si no había datos.
+        """
+        known = [bench for bench in benchmarks if bench]
+        if not known:
+            return None
+        stages: Dict[str, float] = {}
+        for bench in known:
+            for stage, seconds in bench.stage_seconds.items():
+                stages[stage] = stages.get(stage, 0.0) + seconds
+        return cls(
+            utime_seconds=round(sum(bench.utime_seconds for bench in known), 3),
+            stime_seconds=round(sum(bench.stime_seconds for bench in known), 3),
+            rtime_seconds=max(bench.rtime_seconds for bench in known),
+            max_rss_bytes=max(bench.max_rss_bytes for bench in known),
+            stage_seconds=stages
+        )
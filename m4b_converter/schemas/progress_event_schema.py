@@ -0,0 +1,104 @@
+from typing import Dict, Optional
+from pydantic import BaseModel, computed_field
+
+
+class ProgressEvent(BaseModel):
+    """
+    Evento de progreso tipado emitido durante una ejecución de ffmpeg.
+
+    Se construye a partir de cada bloque `clave=valor` que ffmpeg escribe por el canal `-progress` (un bloque termina con la línea `progress=continue` o `progress=end`), en lugar de extraer el tiempo de las líneas de estado de stderr.
+
+    Attributes:
+        out_time_us (int): Tiempo de audio ya procesado, en microsegundos.
+        total_size (int): Bytes escritos hasta ahora en la salida.
+        bitrate_kbps (Optional[float]): Bitrate medio de la salida en kbps, si ffmpeg lo conoce.
+        speed (Optional[float]): Velocidad de procesamiento respecto al tiempo real (ej: 45.0 = 45x).
+        duration_seconds (Optional[float]): Duración total esperada del audio, necesaria para `percent` y `eta_seconds`.
+        finished (bool): True en el último evento (`progress=end`).
+
+    Example:
+        >>> from m4b_converter.schemas import ProgressEvent
+        >>>
+        >>> event = ProgressEvent(out_time_us=30_000_000, speed=60.0, duration_seconds=120.0)
+        >>> print(event.percent)  # 25.0
+        >>> print(event.eta_seconds)  # 1.5
+
+    Note:
+        - `percent` se limita a 99.9 hasta el evento final, para que las barras de progreso no lleguen al 100% antes de que termine la conversión.
+        - `percent` y `eta_seconds` son None cuando no se conoce la duración total (o la velocidad, en el caso de la ETA).
+    """
+    out_time_us: int = 0
+    total_size: int = 0
+    bitrate_kbps: Optional[float] = None
+    speed: Optional[float] = None
+    duration_seconds: Optional[float] = None
+    finished: bool = False
+
+    @computed_field
+    @property
+    def out_time_seconds(self) -> float:
+        """
+        Tiempo de audio procesado en segundos.
+        """
+        return self.out_time_us / 1_000_000
+
+    @computed_field
+    @property
+    def percent(self) -> Optional[float]:
+        """
+        Porcentaje de progreso (0-100) respecto a `duration_seconds`.
+
+        Returns:
+            Optional[float]: Porcentaje redondeado a 2 decimales, o None si no se conoce la duración.
+        """
+        if not self.duration_seconds:
+            return None
+        if self.finished:
+            return 100.0
+        return min(round(self.out_time_seconds / self.duration_seconds * 100, 2), 99.9)
+
+    @computed_field
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """
+        Tiempo restante estimado en segundos, según la velocidad actual.
+
+        Returns:
+            Optional[float]: Segundos restantes, o None si no hay duración o velocidad.
+        """
+        if self.finished:
+            return 0.0
+        if not self.duration_seconds or not self.speed:
+            return None
+        remaining = max(self.duration_seconds - self.out_time_seconds, 0.0)
+        return round(remaining / self.speed, 1)
+
+    @classmethod
+    def from_progress_block(cls, block: Dict[str, str], duration_seconds: Optional[float] = None) -> "ProgressEvent":
+        """
+        Crea un evento a partir de un bloque del canal `-progress` de ffmpeg.
+
+        Args:
+            block (Dict[str, str]): Pares clave/valor del bloque (ej: {"out_time_us": "1500000", "speed": "42.1x", ...}).
+            duration_seconds (Optional[float]): Duración total esperada del audio.
+
+        Returns:
+            ProgressEvent: Evento con los valores que ffmpeg haya informado. Los campos "N/A" quedan con su valor por defecto.
+        """
+        def number(key: str, suffix: str = "") -> Optional[float]:
+            value = block.get(key, "").strip().removesuffix(suffix)
+            try:
+                return float(value)
+            except ValueError:
+                return None
+
+        out_time_us = number("out_time_us")
+        total_size = number("total_size")
+        return cls(
+            out_time_us=max(int(out_time_us), 0) if out_time_us is not None else 0,
+            total_size=int(total_size) if total_size is not None else 0,
+            bitrate_kbps=number("bitrate", "kbits/s"),
+            speed=number("speed", "x"),
+            duration_seconds=duration_seconds,
+            finished=block.get("progress") == "end"
+        )
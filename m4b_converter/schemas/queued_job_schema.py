@@ -0,0 +1,72 @@
+import uuid
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+from m4b_converter.enums import JobStatus
+from m4b_converter.schemas.conversion_task_schema import ConversionTask
+
+
+class QueuedJob(BaseModel):
+    """
+    Trabajo de conversión guardado en la cola persistente (JobQueueService).
+
+    Envuelve los parámetros de una ConversionTask junto con el estado de la cola: prioridad, intentos, worker que lo tiene tomado y hasta cuándo.
+
+    Attributes:
+        id (uuid.UUID): Identificador del trabajo; coincide con el id de la ConversionTask.
+        input_path (Path): Ruta al archivo de audio de origen.
+        bitrate_target (str): Bitrate objetivo (ej: "64k").
+        channels_target (int): Número de canales objetivo.
+        output_dir (Optional[Path]): Directorio de salida. None usa AppSettings.OUTPUT_DIR.
+        priority (int): Prioridad; los valores más altos se procesan antes.
+        status (JobStatus): Estado actual del trabajo.
+        attempts (int): Veces que algún worker ha tomado el trabajo.
+        max_attempts (int): Intentos permitidos antes de marcarlo como fallido.
+        worker_id (Optional[str]): Worker que tiene tomado el trabajo.
+        lease_expires_at (Optional[datetime]): Momento en que vence el lease si el worker no lo renueva.
+        error (Optional[str]): Último error registrado.
+        output_path (Optional[Path]): Ruta del M4B generado, al completarse.
+        created_at (datetime): Momento en que se encoló.
+        updated_at (datetime): Último cambio de estado.
+
+    Example:
+        >>> from m4b_converter.services import JobQueueService
+        >>>
+        >>> queue = JobQueueService()
+        >>> job = queue.lease(worker_id="host-1234")
+        >>> if job:
+        ...     task = job.to_task()
+        ...     print(task.id, task.input_path, job.attempts)
+    """
+    id: uuid.UUID
+    input_path: Path
+    bitrate_target: str
+    channels_target: int
+    output_dir: Optional[Path] = None
+    priority: int = 0
+    status: JobStatus = JobStatus.PENDING
+    attempts: int = 0
+    max_attempts: int = 3
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    error: Optional[str] = None
+    output_path: Optional[Path] = None
+    created_at: datetime
+    updated_at: datetime
+
+    def to_task(self) -> ConversionTask:
+        """
+        Reconstruye la ConversionTask del trabajo, conservando su id.
+
+        Returns:
+            ConversionTask: Tarea lista para WorkflowManager.process_file.
+        """
+        return ConversionTask(
+            id=self.id,
+            input_path=self.input_path,
+            timestamp_start=self.created_at,
+            bitrate_target=self.bitrate_target,
+            channels_target=self.channels_target
+        )
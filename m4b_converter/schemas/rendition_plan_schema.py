@@ -0,0 +1,31 @@
+from typing import Optional
+from pydantic import BaseModel
+
+from m4b_converter.enums import AudioProfile, TranscodeDecision
+from m4b_converter.schemas.conversion_task_schema import ConversionTask
+
+
+class RenditionPlan(BaseModel):
+    """
+    Cómo se produce una salida de M4bConverterService.convert_renditions, una vez decidido su tratamiento.
+
+    Attributes:
+        task (ConversionTask): Tarea de la salida, con su bitrate, canales y frecuencia de muestreo final.
+        decision (TranscodeDecision): ENCODE o REMUX (las versiones omitidas no llegan a ffmpeg).
+        encoder (AudioProfile): Codificador AAC. Se ignora en un remux.
+        profile (AudioProfile): Perfil AAC. Se ignora en un remux.
+        label (Optional[str]): Sufijo del nombre de salida (`<origen>.<label>.m4b`). None conserva `<origen>.m4b`.
+
+    Example:
+        >>> from pathlib import Path
+        >>> from m4b_converter.enums import TranscodeDecision
+        >>> from m4b_converter.schemas import ConversionTask, RenditionPlan
+        >>>
+        >>> task = ConversionTask(input_path=Path("libro.mp3"), bitrate_target="64k", channels_target=1, sample_rate_target=22050)
+        >>> plan = RenditionPlan(task=task, decision=TranscodeDecision.ENCODE, label="64k-1ch")
+    """
+    task: ConversionTask
+    decision: TranscodeDecision = TranscodeDecision.ENCODE
+    encoder: AudioProfile = AudioProfile.AAC
+    profile: AudioProfile = AudioProfile.AAC_LOW
+    label: Optional[str] = None
@@ -0,0 +1,39 @@
+from typing import Union
+from pydantic import BaseModel, Field
+
+from m4b_converter.enums import Bitrate, SampleRate, SampleRateMode
+
+
+class Rendition(BaseModel):
+    """
+    Una de las versiones de un libro que se escriben desde una única decodificación (ver WorkflowManager.process_file).
+
+    Attributes:
+        bitrate (Bitrate): Bitrate objetivo de la versión.
+        channels (int): Canales objetivo (1 = mono, 2 = estéreo).
+        sample_rate (Union[SampleRate, SampleRateMode]): Frecuencia de muestreo de salida, o la política para elegirla (ver TranscodePlannerService.sample_rate).
+
+    Computed Properties:
+        label (str): Sufijo del nombre del M4B de la versión (ej: "64k-1ch", "128k-2ch-44100").
+
+    Example:
+        >>> from m4b_converter.enums import Bitrate
+        >>> from m4b_converter.schemas import Rendition
+        >>>
+        >>> mobile = Rendition(bitrate=Bitrate.B_64K, channels=1)
+        >>> archive = Rendition(bitrate=Bitrate.B_128K, channels=2)
+        >>> print(mobile.label, archive.label)  # 64k-1ch 128k-2ch
+    """
+    bitrate: Bitrate
+    channels: int = Field(default=1, ge=1, le=2)
+    sample_rate: Union[SampleRate, SampleRateMode] = SampleRateMode.AUTO
+
+    @property
+    def label(self) -> str:
+        """
+        Sufijo que distingue el M4B de la versión; incluye la frecuencia solo si se fijó una concreta.
+        """
+        label = f"{self.bitrate}-{self.channels}ch"
+        if isinstance(self.sample_rate, SampleRate):
+            label += f"-{self.sample_rate}"
+        return label
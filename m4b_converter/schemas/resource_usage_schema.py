@@ -0,0 +1,75 @@
+import sys
+from typing import Any, Iterable, Optional
+from pydantic import BaseModel, computed_field
+
+
+class ResourceUsage(BaseModel):
+    """
+    Recursos consumidos por uno o varios procesos hijos (ffmpeg), tal como los informa el sistema al recogerlos con `os.wait4`.
+
+    Attributes:
+        user_seconds (float): Tiempo de CPU en modo usuario.
+        system_seconds (float): Tiempo de CPU en modo sistema.
+        max_rss_bytes (int): Memoria residente máxima (pico) del proceso que más usó.
+
+    Example:
+        >>> from m4b_converter.schemas import ResourceUsage
+        >>>
+        >>> total = ResourceUsage.combine([
+        ...     ResourceUsage(user_seconds=30.0, system_seconds=1.0, max_rss_bytes=40_000_000),
+        ...     ResourceUsage(user_seconds=28.5, system_seconds=0.8, max_rss_bytes=42_000_000)
+        ... ])
+        >>> print(total.cpu_seconds, total.max_rss_bytes)  # 60.3 42000000
+
+    Note:
+        - Al combinar varios procesos los tiempos se suman y la memoria se toma como el máximo, porque los picos de procesos paralelos no se pueden sumar con exactitud.
+    """
+    user_seconds: float = 0.0
+    system_seconds: float = 0.0
+    max_rss_bytes: int = 0
+
+    @computed_field
+    @property
+    def cpu_seconds(self) -> float:
+        """
+        Tiempo total de CPU (usuario + sistema).
+        """
+        return round(self.user_seconds + self.system_seconds, 3)
+
+    @classmethod
+    def from_rusage(cls, rusage: Any) -> "ResourceUsage":
+        """
+        Construye el esquema a partir de un `resource.struct_rusage`.
+
+        Args:
+            rusage (Any): Estructura devuelta por `os.wait4` o `resource.getrusage`.
+
+        Returns:
+            ResourceUsage: Recursos del proceso. `ru_maxrss` se convierte a bytes (Linux lo informa en KiB y macOS en bytes).
+        """
+        scale = 1 if sys.platform == "darwin" else 1024
+        return cls(
+            user_seconds=round(rusage.ru_utime, 3),
+            system_seconds=round(rusage.ru_stime, 3),
+            max_rss_bytes=rusage.ru_maxrss * scale
+        )
+
+    @classmethod
+    def combine(cls, usages: Iterable[Optional["ResourceUsage"]]) -> Optional["ResourceUsage"]:
+        """
+        Agrega los recursos de varios procesos.
+
+        Args:
+            usages (Iterable[Optional[ResourceUsage]]): Recursos de cada proceso; los None (sin datos) se ignoran.
+
+        Returns:
+            Optional[ResourceUsage]: Tiempos sumados y memoria máxima, o None si ningún proceso tenía datos.
+        """
+        known = [usage for usage in usages if usage]
+        if not known:
+            return None
+        return cls(
+            user_seconds=round(sum(usage.user_seconds for usage in known), 3),
+            system_seconds=round(sum(usage.system_seconds for usage in known), 3),
+            max_rss_bytes=max(usage.max_rss_bytes for usage in known)
+        )
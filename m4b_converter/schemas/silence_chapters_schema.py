@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+
+class SilenceChapterOptions(BaseModel):
+    """
+    Parámetros de la detección de capítulos por silencios (ver ChapterService.from_silences).
+
+    Attributes:
+        min_silence_seconds (float): Duración mínima de un silencio para considerarlo una posible frontera de capítulo (`silencedetect=duration`).
+        noise_db (float): Nivel en dBFS por debajo del cual el audio se considera silencio (`silencedetect=noise`).
+        min_chapter_seconds (float): Duración mínima de cada capítulo; los silencios más próximos entre sí (o al principio y al final del libro) se descartan.
+
+    Example:
+        >>> from m4b_converter.schemas import SilenceChapterOptions
+        >>>
+        >>> options = SilenceChapterOptions(min_silence_seconds=3.0, min_chapter_seconds=600)
+        >>> print(options.noise_db)  # -35.0
+    """
+    min_silence_seconds: float = Field(default=2.0, gt=0)
+    noise_db: float = Field(default=-35.0, lt=0)
+    min_chapter_seconds: float = Field(default=300.0, ge=0)
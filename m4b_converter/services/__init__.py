@@ -3,12 +3,30 @@ Servicios para el análisis, extracción y conversión de archivos de audio.
 
 Este paquete proporciona las clases de servicio que orquestan las operaciones principales de la aplicación: análisis de archivos, extracción de portadas y conversión a formato M4B.
 """
+from m4b_converter.services.probe_cache_service import ProbeCacheService
 from m4b_converter.services.audio_analyzer_service import AudioAnalyzerService
 from m4b_converter.services.extract_cover_service import ExtractCoverService
+from m4b_converter.services.ffmpeg_progress_service import FfmpegProgressService
+from m4b_converter.services.encoder_probe_service import EncoderProbeService
+from m4b_converter.services.staging_service import StagingService
 from m4b_converter.services.m4b_converter_service import M4bConverterService
+from m4b_converter.services.job_queue_service import JobQueueService
+from m4b_converter.services.metrics_service import MetricsService
+from m4b_converter.services.transcode_planner_service import TranscodePlannerService
+from m4b_converter.services.chapter_service import ChapterService
+from m4b_converter.services.concat_planner_service import ConcatPlannerService
 
 __all__ = [
     "AudioAnalyzerService",
+    "ChapterService",
+    "ConcatPlannerService",
+    "EncoderProbeService",
     "ExtractCoverService",
-    "M4bConverterService"
+    "FfmpegProgressService",
+    "JobQueueService",
+    "M4bConverterService",
+    "MetricsService",
+    "ProbeCacheService",
+    "StagingService",
+    "TranscodePlannerService"
 ]
\ No newline at end of file
@@ -1,10 +1,12 @@
 import json
+import asyncio
 import logging
 import subprocess
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable, AsyncIterator, Tuple
 
 from m4b_converter.schemas import AudioFileSchema
+from m4b_converter.services.probe_cache_service import ProbeCacheService
 
 class AudioAnalyzerService:
     """
@@ -17,6 +19,7 @@ class AudioAnalyzerService:
     Attributes:
         file_path (Path): Ruta al archivo de audio a analizar.
         logger (logging.Logger): Logger para registrar eventos y errores.
+        cache (Optional[ProbeCacheService]): Caché persistente de ffprobe, o None si está desactivada.
         _raw_data (Dict[str, Any]): Datos crudos obtenidos de ffprobe en formato JSON.
 
     Example:
@@ -26,19 +29,45 @@ class AudioAnalyzerService:
         >>> print(info.format_name)
         'mp3'
     """
-    def __init__(self, file_path: Path):
+    def __init__(self, file_path: Path, use_cache: bool = True):
         """
         Inicializa el servicio de análisis de audio.
 
         Args:
             file_path (Path): Ruta al archivo de audio que se desea analizar. El archivo debe existir y ser accesible.
+            use_cache (bool): Si es True, consulta la caché persistente de ffprobe antes de lanzar el proceso y guarda en ella el resultado. Por defecto True.
 
         Raises:
             FileNotFoundError: Si el archivo no existe en la ruta especificada.
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.file_path = file_path
-        self._raw_data = self.get_raw_info()
+        self.cache: Optional[ProbeCacheService] = ProbeCacheService() if use_cache else None
+        self._schema: Optional[AudioFileSchema] = None
+        self._raw_data = self._load_raw_info()
+
+    def _load_raw_info(self) -> Dict[str, Any]:
+        """
+        Obtiene los datos crudos desde la caché o, si no están, ejecutando ffprobe.
+
+        En un fallo de caché se valida el esquema inmediatamente y se guardan ambos, de modo que la siguiente ejecución no necesita ni ffprobe ni validación.
+
+        Returns:
+            Dict[str, Any]: Datos crudos de ffprobe. Diccionario vacío si ocurre un error.
+        """
+        if self.cache:
+            entry = self.cache.get(self.file_path)
+            if entry:
+                raw_data, self._schema = entry
+                return raw_data
+
+        raw_data = self.get_raw_info()
+
+        if self.cache and raw_data:
+            self._schema = self.build_schema(self.file_path, raw_data)
+            self.cache.put(self.file_path, raw_data, self._schema)
+
+        return raw_data
 
     def get_raw_info(self) -> Dict[str, any]:
         """
@@ -56,11 +85,7 @@ class AudioAnalyzerService:
         Note:
             Este método asume que ffprobe está instalado en el sistema y accesible desde la línea de comandos.
         """
-        cmd = [
-            "ffprobe", "-v", "error", 
-            "-show_format", "-show_streams", "-print_format", "json", 
-            str(self.file_path)
-        ]
+        cmd = self._build_ffprobe_command(self.file_path)
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             return json.loads(result.stdout)
@@ -68,6 +93,171 @@ class AudioAnalyzerService:
             self.logger.error(f"Error analizando archivo: {e}")
             return {}
 
+    @staticmethod
+    def _build_ffprobe_command(file_path: Path) -> List[str]:
+        """
+        Construye el comando ffprobe que vuelca formato y streams en JSON.
+
+        Args:
+            file_path (Path): Ruta al archivo de audio.
+
+        Returns:
+            List[str]: Comando listo para subprocess o asyncio.
+        """
+        return [
+            "ffprobe", "-v", "error", 
+            "-show_format", "-show_streams", "-print_format", "json", 
+            str(file_path)
+        ]
+
+    @classmethod
+    async def get_raw_info_async(cls, file_path: Path) -> Dict[str, Any]:
+        """
+        Versión asíncrona de `get_raw_info` basada en asyncio.create_subprocess_exec.
+
+        Args:
+            file_path (Path): Ruta al archivo de audio.
+
+        Returns:
+            Dict[str, Any]: Datos crudos de ffprobe. Diccionario vacío si ocurre un error.
+
+        Raises:
+            asyncio.CancelledError: Si se cancela la tarea. El proceso ffprobe se mata antes de propagarla.
+        """
+        logger = logging.getLogger(cls.__name__)
+        process = await asyncio.create_subprocess_exec(
+            *cls._build_ffprobe_command(file_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            # Cancelar la corrutina no detiene el proceso hijo
+            process.kill()
+            await process.wait()
+            raise
+
+        if process.returncode != 0:
+            logger.error(f"Error analizando archivo {file_path}: {stderr.decode(errors='replace').strip()}")
+            return {}
+        try:
+            return json.loads(stdout)
+        except json.JSONDecodeError as e:
+            logger.error(f"Error analizando archivo {file_path}: {e}")
+            return {}
+
+    @classmethod
+    async def probe_async(cls, file_path: Path, use_cache: bool = True) -> Tuple[Dict[str, Any], Optional[AudioFileSchema]]:
+        """
+        Obtiene de forma asíncrona los datos crudos y el esquema de un archivo, consultando antes la caché.
+
+        Es el equivalente de construir el servicio y llamar a `analyze`, sin bloquear el bucle de eventos mientras corre ffprobe.
+
+        Args:
+            file_path (Path): Ruta al archivo de audio.
+            use_cache (bool): Si es True, consulta y alimenta la caché persistente de ffprobe. Por defecto True.
+
+        Returns:
+            Tuple[Dict[str, Any], Optional[AudioFileSchema]]: Datos crudos de ffprobe (vacíos si falla) y el esquema validado, o None si no se pudo construir.
+        """
+        cache = ProbeCacheService() if use_cache else None
+        if cache:
+            entry = cache.get(file_path)
+            if entry and entry[1]:
+                return entry
+
+        raw_data = await cls.get_raw_info_async(file_path)
+        if not raw_data:
+            return raw_data, None
+
+        schema = cls.build_schema(file_path, raw_data)
+        if cache:
+            cache.put(file_path, raw_data, schema)
+        return raw_data, schema
+
+    @classmethod
+    async def analyze_many(
+        cls,
+        paths: Iterable[Path],
+        concurrency: int = 8,
+        use_cache: bool = True
+    ) -> AsyncIterator[AudioFileSchema]:
+        """
+        Analiza muchos archivos de forma concurrente y entrega cada esquema según termina.
+
+        Mantiene como máximo `concurrency` procesos ffprobe en vuelo. Las rutas se consumen de forma perezosa, así que `paths` puede ser un generador sobre un directorio enorme. Los aciertos de la caché persistente se entregan sin lanzar ningún proceso.
+
+        Args:
+            paths (Iterable[Path]): Archivos a analizar.
+            concurrency (int): Número máximo de procesos ffprobe simultáneos. Por defecto 8.
+            use_cache (bool): Si es True, consulta y alimenta la caché persistente de ffprobe. Por defecto True.
+
+        Yields:
+            AudioFileSchema: Esquema de cada archivo analizado correctamente, en orden de finalización (no de entrada). Los archivos que no se pueden analizar se registran en el log y se omiten.
+
+        Example:
+            >>> import asyncio
+            >>> from pathlib import Path
+            >>> from m4b_converter.services import AudioAnalyzerService
+            >>>
+            >>> async def main():
+            ...     files = Path("./audiolibros").glob("*.mp3")
+            ...     async for info in AudioAnalyzerService.analyze_many(files, concurrency=32):
+            ...         print(info.path.name, info.duration_seconds, info.codec)
+            >>>
+            >>> asyncio.run(main())
+        """
+        cache = ProbeCacheService() if use_cache else None
+        in_flight: Dict[asyncio.Task, Path] = {}
+        concurrency = max(1, concurrency)
+        logger = logging.getLogger(cls.__name__)
+
+        async def probe(file_path: Path) -> Optional[AudioFileSchema]:
+            raw_data = await cls.get_raw_info_async(file_path)
+            if not raw_data:
+                return None
+            schema = cls.build_schema(file_path, raw_data)
+            if cache:
+                cache.put(file_path, raw_data, schema)
+            return schema
+
+        async def finished() -> List[AudioFileSchema]:
+            # Un archivo que falla (esquema inválido, ffprobe ausente...) se registra sin detener el resto
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            schemas = []
+            for task in done:
+                file_path = in_flight.pop(task)
+                if task.exception():
+                    logger.error(f"Error analizando archivo {file_path}: {task.exception()}")
+                elif task.result():
+                    schemas.append(task.result())
+            return schemas
+
+        try:
+            for file_path in paths:
+                if cache:
+                    entry = cache.get(file_path)
+                    if entry and entry[1]:
+                        yield entry[1]
+                        continue
+
+                in_flight[asyncio.create_task(probe(file_path))] = file_path
+                if len(in_flight) < concurrency:
+                    continue
+
+                for schema in await finished():
+                    yield schema
+
+            while in_flight:
+                for schema in await finished():
+                    yield schema
+        finally:
+            # Si el consumidor abandona la iteración, cada tarea cancelada mata su ffprobe (ver get_raw_info_async)
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
     def _get_raw_format_info(self) -> Dict:
         """
         Obtiene la información de formato del archivo desde los datos crudos.
@@ -113,15 +303,31 @@ class AudioAnalyzerService:
         if not self._raw_data:
             return None
 
-        format_info = self._get_raw_format_info()
-        streams = self._get_raw_streams_info()
+        if self._schema is None:
+            self._schema = self.build_schema(self.file_path, self._raw_data)
+        return self._schema
+
+    @classmethod
+    def build_schema(cls, file_path: Path, raw_data: Dict[str, Any]) -> Optional[AudioFileSchema]:
+        """
+        Mapea los datos crudos de ffprobe al esquema Pydantic.
+
+        Args:
+            file_path (Path): Ruta al archivo de audio analizado.
+            raw_data (Dict[str, Any]): Salida JSON de ffprobe con las secciones 'format' y 'streams'.
+
+        Returns:
+            Optional[AudioFileSchema]: Esquema validado, o None si los datos no cumplen con el esquema.
+        """
+        format_info = raw_data.get("format", {})
+        streams = raw_data.get("streams", [])
         
         # Buscamos el primer stream de audio
         audio_stream = next((s for s in streams if s.get("codec_type") == "audio"), {})
         
         # Combinamos datos para el Schema
         data_for_schema = {
-            "path": self.file_path,
+            "path": file_path,
             "size": format_info.get("size"),
             "format_name": format_info.get("format_name"),
             "duration": format_info.get("duration"),
@@ -135,7 +341,7 @@ class AudioAnalyzerService:
         try:
             return AudioFileSchema(**data_for_schema)
         except Exception as e:
-            self.logger.error(f"Error validando datos con Pydantic: {e}")
+            logging.getLogger(cls.__name__).error(f"Error validando datos con Pydantic: {e}")
             return None
 
     @property
@@ -0,0 +1,192 @@
+import re
+import bisect
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from m4b_converter.schemas import AudioFileSchema, Chapter, SilenceChapterOptions
+
+
+class ChapterService:
+    """
+    Construye los capítulos de un audiolibro y los escribe en formato ffmetadata.
+
+    ffmpeg lee los capítulos de un archivo ffmetadata pasado como una entrada más (`-f ffmetadata -i capitulos.txt -map_chapters N`). Cuando se conocen antes de codificar, como los de `from_files` al unir varios MP3, se incrustan en la misma pasada que codifica o copia el audio, sin reescribir el M4B después.
+
+    Los capítulos de un archivo único sin capítulos se deducen de sus silencios: `silencedetect_filter` genera la rama de filtros que detecta los silencios durante la propia codificación y los escribe en un archivo de texto; `parse_silences` y `from_silences` convierten esas detecciones en capítulos. Esos capítulos solo existen al terminar la codificación, así que se añaden con una segunda pasada que copia el M4B sin recodificar (`-c copy`): no vuelve a decodificar el audio, pero lee y escribe el archivo una vez más.
+
+    Attributes:
+        TIMEBASE (int): Unidades por segundo de START y END en el archivo ffmetadata (milisegundos).
+        SILENCE_CHAPTER_TITLE (str): Plantilla del título de los capítulos detectados por silencios; recibe el número de capítulo.
+
+    Example:
+        >>> from m4b_converter.services import ChapterService
+        >>>
+        >>> chapters = ChapterService.from_files(infos)  # AudioFileSchema de cada MP3, en orden
+        >>> ChapterService.write_ffmetadata(chapters, Path("capitulos.txt"))
+    """
+
+    TIMEBASE = 1000
+    SILENCE_CHAPTER_TITLE = "Capítulo {}"
+
+    # Caracteres con significado en ffmetadata, que se escapan con una barra invertida
+    _SPECIAL_CHARS = re.compile(r"([=;#\\\n])")
+    # Líneas de `ametadata=mode=print` con las detecciones de silencedetect
+    _SILENCE_LINE = re.compile(r"^lavfi\.silence_(start|end)=(-?[\d.]+)")
+
+    @staticmethod
+    def chapter_title(info: AudioFileSchema, use_tags: bool = True) -> str:
+        """
+        Título del capítulo de un archivo: su etiqueta `title` o, si no tiene, el nombre del archivo sin extensión.
+
+        Args:
+            info (AudioFileSchema): Archivo analizado.
+            use_tags (bool): Si es False se usa siempre el nombre del archivo. Por defecto True.
+
+        Returns:
+            str: Título del capítulo.
+        """
+        title = (info.metadata.title or "").strip()
+        return title if use_tags and title else info.path.stem
+
+    @classmethod
+    def from_files(cls, infos: List[AudioFileSchema]) -> List[Chapter]:
+        """
+        Un capítulo por archivo, encadenando sus duraciones.
+
+        Si todos los archivos comparten el mismo título (rips en los que cada pista lleva el nombre del libro), se usan los nombres de archivo.
+
+        Args:
+            infos (List[AudioFileSchema]): Archivos en el orden en que se concatenan.
+
+        Returns:
+            List[Chapter]: Capítulos contiguos que cubren la duración total.
+        """
+        titles = {(info.metadata.title or "").strip() for info in infos}
+        use_tags = len(infos) < 2 or len(titles) > 1
+
+        chapters = []
+        start = 0.0
+        for info in infos:
+            end = start + info.duration_seconds
+            chapters.append(Chapter(title=cls.chapter_title(info, use_tags), start_seconds=start, end_seconds=end))
+            start = end
+        return chapters
+
+    @classmethod
+    def _escape(cls, value: str) -> str:
+        return cls._SPECIAL_CHARS.sub(r"\\\1", value)
+
+    @classmethod
+    def write_ffmetadata(cls, chapters: List[Chapter], path: Path, metadata: Optional[Dict[str, str]] = None) -> Path:
+        """
+        Escribe los capítulos (y, opcionalmente, metadatos globales) en un archivo ffmetadata.
+
+        Args:
+            chapters (List[Chapter]): Capítulos a escribir.
+            path (Path): Archivo de destino.
+            metadata (Optional[Dict[str, str]]): Metadatos globales (title, artist...). Por defecto ninguno: los del audio de origen se conservan.
+
+        Returns:
+            Path: La ruta escrita.
+        """
+        lines = [";FFMETADATA1"]
+        for key, value in (metadata or {}).items():
+            lines.append(f"{cls._escape(key)}={cls._escape(value)}")
+        for chapter in chapters:
+            lines.extend([
+                "",
+                "[CHAPTER]",
+                f"TIMEBASE=1/{cls.TIMEBASE}",
+                f"START={round(chapter.start_seconds * cls.TIMEBASE)}",
+                f"END={round(chapter.end_seconds * cls.TIMEBASE)}",
+                f"title={cls._escape(chapter.title)}",
+            ])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    @staticmethod
+    def _filter_path(path: Path) -> str:
+        """
+        Ruta escapada para una opción de filtro dentro de `-filter_complex`.
+
+        La opción se escapa para el parser de opciones del filtro (`:` y `\\` con barra invertida) y se entrecomilla para el parser del grafo, que de otro modo cortaría en `,`, `;` o `[`.
+        """
+        option = re.sub(r"([\\:'])", r"\\\1", path.as_posix())
+        return "'" + option.replace("'", "'\\''") + "'"
+
+    @classmethod
+    def silencedetect_filter(cls, options: SilenceChapterOptions, log_path: Path) -> str:
+        """
+        Cadena de filtros que detecta los silencios y escribe cada detección en un archivo.
+
+        `silencedetect` marca el inicio y el final de cada silencio en los metadatos de las tramas y `ametadata` los escribe en `log_path` a medida que ffmpeg avanza, sin pasar por stderr (que FfmpegProgressService solo conserva para los errores).
+
+        Args:
+            options (SilenceChapterOptions): Umbral de ruido y duración mínima del silencio.
+            log_path (Path): Archivo donde ffmpeg escribe las detecciones.
+
+        Returns:
+            str: Filtros encadenados, para colocar al final de una rama de `-filter_complex`.
+        """
+        return (
+            f"silencedetect=noise={options.noise_db}dB:duration={options.min_silence_seconds},"
+            f"ametadata=mode=print:file={cls._filter_path(log_path)}"
+        )
+
+    @classmethod
+    def parse_silences(cls, log_path: Path) -> List[Tuple[float, float]]:
+        """
+        Lee las detecciones escritas por `silencedetect_filter`.
+
+        Args:
+            log_path (Path): Archivo de detecciones.
+
+        Returns:
+            List[Tuple[float, float]]: (inicio, final) de cada silencio en segundos, en orden. Un silencio que llega hasta el final del audio no tiene final y se descarta.
+        """
+        silences = []
+        start = None
+        for line in log_path.read_text(encoding="utf-8", errors="replace").splitlines():
+            match = cls._SILENCE_LINE.match(line)
+            if not match:
+                continue
+            value = max(0.0, float(match.group(2)))
+            if match.group(1) == "start":
+                start = value
+            elif start is not None:
+                silences.append((start, value))
+                start = None
+        return silences
+
+    @classmethod
+    def from_silences(
+        cls,
+        silences: List[Tuple[float, float]],
+        duration_seconds: float,
+        min_chapter_seconds: float = 300.0
+    ) -> List[Chapter]:
+        """
+        Capítulos con fronteras en los silencios detectados.
+
+        Cada frontera se coloca en el centro de su silencio. Los silencios se consideran de más largo a más corto, porque las pausas entre capítulos suelen ser las más largas del libro, y se descarta cualquiera que deje un capítulo de menos de `min_chapter_seconds`.
+
+        Args:
+            silences (List[Tuple[float, float]]): (inicio, final) de cada silencio en segundos.
+            duration_seconds (float): Duración total del audio.
+            min_chapter_seconds (float): Duración mínima de cada capítulo. Por defecto 300 (5 minutos).
+
+        Returns:
+            List[Chapter]: Capítulos contiguos que cubren la duración total, titulados según SILENCE_CHAPTER_TITLE. Un único capítulo si no hay ninguna frontera válida.
+        """
+        boundaries = [0.0, duration_seconds]
+        for start, end in sorted(silences, key=lambda silence: silence[1] - silence[0], reverse=True):
+            point = (start + end) / 2
+            index = bisect.bisect(boundaries, point)
+            if point - boundaries[index - 1] >= min_chapter_seconds and boundaries[index] - point >= min_chapter_seconds:
+                boundaries.insert(index, point)
+
+        return [
+            Chapter(title=cls.SILENCE_CHAPTER_TITLE.format(number), start_seconds=start, end_seconds=end)
+            for number, (start, end) in enumerate(zip(boundaries, boundaries[1:]), 1)
+        ]
@@ -0,0 +1,160 @@
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from m4b_converter.enums import ConcatStrategy
+from m4b_converter.schemas import AudioFileSchema, ConcatPlan, ConcatRun
+
+
+class ConcatPlannerService:
+    """
+    Elige cómo fusionar archivos cuyos streams de audio pueden no coincidir.
+
+    El demuxer concat de ffmpeg da por hecho que todos los archivos tienen el mismo códec, frecuencia de muestreo y canales. Si no es así, con `-c copy` sale un MP3 que los reproductores leen a otra velocidad o con saltos, y al decodificar los parámetros cambian a mitad del stream y el audio deriva. El plan se hace con los esquemas de la pasada de ffprobe, sin leer el audio: los archivos consecutivos con los mismos parámetros forman un tramo (ConcatRun), y la referencia son los parámetros que más duración suman, para convertir lo menos posible.
+
+    - **DEMUXER**: un solo tramo. Es el caso habitual y el más barato: una lista concat copiada o decodificada una vez.
+    - **FILTERGRAPH**: la salida se recodifica (M4B) y hay como mucho MAX_GRAPH_INPUTS tramos. Cada tramo es una entrada concat propia y solo los atípicos pasan por `aresample`/`aformat` antes del filtro `concat`; como el audio se decodifica de todos modos, normalizar cuesta solo el filtro.
+    - **NORMALIZE**: la salida se copia (`m4b merge --mp3`) o hay demasiados tramos para abrirlos todos a la vez. Los archivos atípicos se recodifican a la referencia en temporales y el resto se sigue copiando.
+
+    Attributes:
+        MAX_GRAPH_INPUTS (int): Tramos máximos de FILTERGRAPH; cada uno es una entrada de ffmpeg abierta durante toda la fusión.
+        NORMALIZE_ENCODERS (Dict[str, str]): Codificador de ffmpeg con el que se normalizan los atípicos, según el códec de referencia.
+        DEFAULT_NORMALIZE_KBPS (int): Bitrate de un atípico normalizado cuyo bitrate de origen se desconoce.
+
+    Example:
+        >>> from m4b_converter.services import ConcatPlannerService
+        >>>
+        >>> plan = ConcatPlannerService.plan(infos, copy_output=True)  # AudioFileSchema de cada MP3, en orden
+        >>> print(plan.strategy, plan.reason)  # normalize "2 de 40 archivos no coinciden con mp3 a 44100 Hz y 2 canal(es)"
+    """
+
+    MAX_GRAPH_INPUTS = 64
+    NORMALIZE_ENCODERS: Dict[str, str] = {"mp3": "libmp3lame", "aac": "aac"}
+    DEFAULT_NORMALIZE_KBPS = 128
+
+    @staticmethod
+    def split_runs(infos: List[AudioFileSchema]) -> List[ConcatRun]:
+        """
+        Agrupa los archivos consecutivos que comparten códec, frecuencia y canales.
+
+        Args:
+            infos (List[AudioFileSchema]): Archivos en orden de fusión.
+
+        Returns:
+            List[ConcatRun]: Tramos en orden de fusión, aún sin marcar los atípicos.
+        """
+        runs: List[ConcatRun] = []
+        for info in infos:
+            params = (info.codec.lower(), info.sample_rate, info.channels)
+            if runs and runs[-1].params == params:
+                runs[-1].files.append(info)
+            else:
+                runs.append(ConcatRun(codec=params[0], sample_rate=params[1], channels=params[2], files=[info]))
+        return runs
+
+    @classmethod
+    def plan(cls, infos: List[AudioFileSchema], copy_output: bool) -> ConcatPlan:
+        """
+        Elige la estrategia más barata que produce una fusión correcta.
+
+        Args:
+            infos (List[AudioFileSchema]): Archivos en orden de fusión.
+            copy_output (bool): True si el audio fusionado se copia sin recodificar (MP3), False si se recodifica (M4B).
+
+        Returns:
+            ConcatPlan: Estrategia, referencia y tramos.
+
+        Raises:
+            ValueError: Si no hay archivos, o si hay que normalizar a un códec de referencia sin codificador en NORMALIZE_ENCODERS.
+        """
+        if not infos:
+            raise ValueError("No hay archivos que fusionar")
+
+        runs = cls.split_runs(infos)
+        totals: Dict[Tuple[str, int, int], float] = {}
+        for run in runs:
+            totals[run.params] = totals.get(run.params, 0.0) + run.duration_seconds
+        codec, sample_rate, channels = max(totals, key=totals.get)
+        for run in runs:
+            run.normalize = run.params != (codec, sample_rate, channels)
+        reference = f"{codec} a {sample_rate} Hz y {channels} canal(es)"
+
+        def build(strategy: ConcatStrategy, reason: str) -> ConcatPlan:
+            return ConcatPlan(strategy=strategy, codec=codec, sample_rate=sample_rate, channels=channels, runs=runs, reason=reason)
+
+        if len(runs) == 1:
+            return build(ConcatStrategy.DEMUXER, f"todos los archivos son {reference}")
+
+        outlier_count = sum(len(run.files) for run in runs if run.normalize)
+        if not copy_output and len(runs) <= cls.MAX_GRAPH_INPUTS:
+            return build(
+                ConcatStrategy.FILTERGRAPH,
+                f"{len(runs)} tramos; {outlier_count} archivo(s) se convierten a {reference} dentro del grafo"
+            )
+
+        if codec not in cls.NORMALIZE_ENCODERS:
+            raise ValueError(f"No se pueden normalizar archivos a {codec}; recodifica antes los que no coinciden")
+        reason = f"{outlier_count} de {len(infos)} archivos no coinciden con {reference} y se recodifican antes de unirlos"
+        if not copy_output:
+            reason += f" (hay {len(runs)} tramos, más de {cls.MAX_GRAPH_INPUTS} entradas para el grafo)"
+        return build(ConcatStrategy.NORMALIZE, reason)
+
+    @staticmethod
+    def normalize_filter(sample_rate: int, channels: int) -> str:
+        """
+        Filtro que lleva un audio a la frecuencia y los canales de referencia.
+
+        Args:
+            sample_rate (int): Frecuencia de referencia en Hz.
+            channels (int): Canales de referencia.
+
+        Returns:
+            str: Cadena `aresample=...,aformat=...` para `-af` o para un grafo.
+        """
+        layout = {1: "mono", 2: "stereo"}.get(channels, f"{channels}c")
+        return f"aresample={sample_rate},aformat=channel_layouts={layout}"
+
+    @classmethod
+    def normalize_command(cls, info: AudioFileSchema, plan: ConcatPlan, output_path: Path) -> List[str]:
+        """
+        Comando ffmpeg que recodifica un archivo atípico a los parámetros de referencia (estrategia NORMALIZE).
+
+        Se conserva el bitrate del origen, para no perder más calidad que la de una segunda compresión.
+
+        Args:
+            info (AudioFileSchema): Archivo atípico.
+            plan (ConcatPlan): Plan de la fusión.
+            output_path (Path): Temporal donde se escribe el archivo normalizado.
+
+        Returns:
+            List[str]: Comando ffmpeg, sin los argumentos de progreso (ver FfmpegProgressService).
+        """
+        kbps = info.bitrate_kbps if info.bitrate_kbps > 0 else cls.DEFAULT_NORMALIZE_KBPS
+        return [
+            "ffmpeg", "-hide_banner", "-y",
+            "-i", str(info.path),
+            "-map", "0:a",
+            "-af", cls.normalize_filter(plan.sample_rate, plan.channels),
+            "-c:a", cls.NORMALIZE_ENCODERS[plan.codec],
+            "-b:a", f"{kbps}k",
+            "-f", plan.codec if plan.codec == "mp3" else "adts",
+            str(output_path)
+        ]
+
+    @classmethod
+    def filtergraph(cls, plan: ConcatPlan, label: str) -> str:
+        """
+        Grafo que une los tramos de un plan FILTERGRAPH, con una entrada de ffmpeg por tramo en el mismo orden.
+
+        Args:
+            plan (ConcatPlan): Plan de la fusión.
+            label (str): Etiqueta de salida del grafo, sin corchetes.
+
+        Returns:
+            str: Grafo para `-filter_complex` (ej: `[0:a]anull[r0];[1:a]aresample=...[r1];[r0][r1]concat=n=2:v=0:a=1[joined]`).
+        """
+        branches = []
+        for index, run in enumerate(plan.runs):
+            convert = cls.normalize_filter(plan.sample_rate, plan.channels) if run.normalize else "anull"
+            branches.append(f"[{index}:a]{convert}[r{index}]")
+        inputs = "".join(f"[r{index}]" for index in range(len(plan.runs)))
+        return ";".join([*branches, f"{inputs}concat=n={len(plan.runs)}:v=0:a=1[{label}]"])
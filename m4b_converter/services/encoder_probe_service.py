@@ -0,0 +1,209 @@
+import os
+import shutil
+import logging
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from m4b_converter.enums import AudioProfile, Bitrate
+from m4b_converter.settings import AppSettings
+from m4b_converter.schemas import EncoderCapabilities
+
+
+class EncoderProbeService:
+    """
+    Detecta los codificadores AAC del ffmpeg instalado y elige el codificador y el perfil de cada conversión.
+
+    Consultar `ffmpeg -encoders` cuesta un proceso y unas decenas de milisegundos, así que el resultado se guarda en un JSON junto con la ruta, el tamaño y la fecha de modificación del binario: solo se vuelve a consultar si se instala otro ffmpeg. Dentro de un mismo proceso el resultado se memoriza, de modo que un lote no relee el JSON por cada archivo.
+
+    Selección automática (`select` sin codificador ni perfil):
+
+    - Codificador: el primero disponible de ENCODER_PREFERENCE. libfdk_aac y AudioToolbox son bastante más rápidos que el AAC nativo de ffmpeg y suenan mejor a bitrates bajos, pero solo existen en algunas builds.
+    - Perfil: HE-AAC si el bitrate objetivo es de como mucho HE_AAC_MAX_KBPS y el codificador lo soporta (el nativo no); AAC-LC en el resto de casos.
+
+    Attributes:
+        cache_path (Path): Archivo JSON de la caché.
+        logger (logging.Logger): Logger para registrar eventos y errores.
+        ENCODER_PREFERENCE (List[AudioProfile]): Codificadores AAC en orden de preferencia.
+        HE_AAC_ENCODERS (List[AudioProfile]): Codificadores que admiten los perfiles HE-AAC.
+        HE_AAC_MAX_KBPS (int): Bitrate máximo al que la selección automática usa HE-AAC.
+
+    Example:
+        >>> from m4b_converter.enums import Bitrate
+        >>> from m4b_converter.services import EncoderProbeService
+        >>>
+        >>> probe = EncoderProbeService()
+        >>> encoder, profile = probe.select(Bitrate.B_32K, channels=1)
+        >>> print(encoder, profile)  # libfdk_aac aac_he (o aac aac_low si no está disponible)
+
+    Note:
+        - Si la caché no se puede leer o escribir, se consulta ffmpeg igualmente y el error solo se registra en el log.
+        - Sin ffmpeg en el PATH, o si `ffmpeg -encoders` falla, la selección cae en el AAC nativo; la conversión fallará después con un error claro.
+    """
+
+    ENCODER_PREFERENCE = [AudioProfile.LIBFDK_AAC, AudioProfile.AAC_AT, AudioProfile.AAC]
+    HE_AAC_ENCODERS = [AudioProfile.LIBFDK_AAC, AudioProfile.AAC_AT]
+    HE_AAC_MAX_KBPS = 48
+
+    # Memoria por proceso: (ruta, mtime_ns, tamaño) -> capacidades
+    _memory: Dict[Tuple[str, int, int], EncoderCapabilities] = {}
+
+    def __init__(self, cache_path: Path = AppSettings.ENCODER_CACHE_PATH):
+        """
+        Inicializa el servicio.
+
+        Args:
+            cache_path (Path): Archivo JSON de la caché. Por defecto AppSettings.ENCODER_CACHE_PATH.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache_path = cache_path
+
+    def capabilities(self) -> EncoderCapabilities:
+        """
+        Capacidades del ffmpeg del PATH, desde la memoria, la caché en disco o consultando el binario.
+
+        Returns:
+            EncoderCapabilities: Versión y codificadores de audio. Sin ffmpeg en el PATH, o si no responde a la consulta, un esquema vacío.
+        """
+        ffmpeg_path = shutil.which("ffmpeg")
+        if not ffmpeg_path:
+            self.logger.warning("No se encontró ffmpeg en el PATH.")
+            return EncoderCapabilities()
+
+        stat = os.stat(ffmpeg_path)
+        key = (ffmpeg_path, stat.st_mtime_ns, stat.st_size)
+        if key in self._memory:
+            return self._memory[key]
+
+        caps = self._load(key)
+        if caps is None:
+            caps = self._probe(*key)
+            if caps is None:
+                # No se memoriza: el siguiente intento vuelve a consultar ffmpeg
+                return EncoderCapabilities()
+            self._store(caps)
+        self._memory[key] = caps
+        return caps
+
+    def _load(self, key: Tuple[str, int, int]) -> Optional[EncoderCapabilities]:
+        """
+        Lee la caché en disco si corresponde al mismo binario.
+        """
+        try:
+            caps = EncoderCapabilities.model_validate_json(self.cache_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as e:
+            self.logger.warning(f"Caché de codificadores ilegible, se vuelve a consultar ffmpeg: {e}")
+            return None
+        if (caps.ffmpeg_path, caps.ffmpeg_mtime_ns, caps.ffmpeg_size) != key:
+            return None
+        return caps
+
+    def _store(self, caps: EncoderCapabilities) -> None:
+        """
+        Guarda la caché en disco de forma atómica (varios trabajadores pueden escribirla a la vez).
+        """
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.cache_path.parent, prefix=f".{self.cache_path.name}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(caps.model_dump_json(indent=2))
+            os.replace(temp_name, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"No se pudo guardar la caché de codificadores: {e}")
+
+    def _probe(self, ffmpeg_path: str, mtime_ns: int, size: int) -> Optional[EncoderCapabilities]:
+        """
+        Ejecuta `ffmpeg -version` y `ffmpeg -encoders` y extrae la versión y los codificadores de audio. Devuelve None si ffmpeg falla o no se puede ejecutar.
+        """
+        def run(*args: str) -> str:
+            return subprocess.run(
+                [ffmpeg_path, "-hide_banner", *args],
+                capture_output=True, text=True, stdin=subprocess.DEVNULL, check=True
+            ).stdout
+
+        self.logger.info(f"Consultando los codificadores de {ffmpeg_path}")
+        try:
+            version_output = run("-version")
+            encoders_output = run("-encoders")
+        except (subprocess.CalledProcessError, OSError) as e:
+            self.logger.warning(f"No se pudieron consultar los codificadores de {ffmpeg_path}; se usará el AAC nativo: {e}")
+            return None
+        return EncoderCapabilities(
+            ffmpeg_path=ffmpeg_path,
+            ffmpeg_mtime_ns=mtime_ns,
+            ffmpeg_size=size,
+            version=version_output.splitlines()[0] if version_output else "",
+            audio_encoders=self.parse_encoders(encoders_output)
+        )
+
+    @staticmethod
+    def parse_encoders(output: str) -> List[str]:
+        """
+        Extrae los codificadores de audio de la salida de `ffmpeg -encoders`.
+
+        Args:
+            output (str): Salida del comando. Tras la leyenda y la línea " ------", cada línea es " A....D aac    AAC (Advanced Audio Coding)".
+
+        Returns:
+            List[str]: Nombres de los codificadores cuyo tipo es audio ("A").
+        """
+        encoders = []
+        in_list = False
+        for line in output.splitlines():
+            parts = line.split(None, 2)
+            if not in_list:
+                in_list = parts[:1] == ["------"]
+                continue
+            if len(parts) >= 2 and parts[0].startswith("A"):
+                encoders.append(parts[1])
+        return encoders
+
+    def select(
+        self,
+        bitrate: Bitrate,
+        channels: int,
+        encoder: Optional[AudioProfile] = None,
+        profile: Optional[AudioProfile] = None
+    ) -> Tuple[AudioProfile, AudioProfile]:
+        """
+        Elige el codificador y el perfil AAC de una conversión.
+
+        Args:
+            bitrate (Bitrate): Bitrate objetivo.
+            channels (int): Canales objetivo.
+            encoder (Optional[AudioProfile]): Codificador pedido (AAC, LIBFDK_AAC o AAC_AT). None para elegir el más rápido disponible.
+            profile (Optional[AudioProfile]): Perfil pedido (AAC_LOW, AAC_HE o AAC_HE_V2). None para elegirlo según el bitrate.
+
+        Returns:
+            Tuple[AudioProfile, AudioProfile]: Codificador y perfil.
+
+        Raises:
+            ValueError: Si el codificador pedido no está en este ffmpeg, si no admite el perfil pedido, o si se pide HE-AAC v2 con una salida mono.
+        """
+        caps = self.capabilities()
+
+        if encoder is None:
+            encoder = next((e for e in self.ENCODER_PREFERENCE if caps.has(e.value)), AudioProfile.AAC)
+        elif encoder not in self.ENCODER_PREFERENCE:
+            raise ValueError(f"{encoder} no es un codificador AAC")
+        elif caps.audio_encoders and not caps.has(encoder.value):
+            raise ValueError(f"El ffmpeg instalado no incluye el codificador {encoder} ({caps.version})")
+
+        he_capable = encoder in self.HE_AAC_ENCODERS
+        if profile is None:
+            use_he = he_capable and int(bitrate.value.rstrip("k")) <= self.HE_AAC_MAX_KBPS
+            profile = AudioProfile.AAC_HE if use_he else AudioProfile.AAC_LOW
+        elif profile not in (AudioProfile.AAC_LOW, AudioProfile.AAC_HE, AudioProfile.AAC_HE_V2):
+            raise ValueError(f"{profile} no es un perfil AAC")
+        elif profile != AudioProfile.AAC_LOW and not he_capable:
+            raise ValueError(f"El codificador {encoder} no admite el perfil {profile}")
+
+        if profile == AudioProfile.AAC_HE_V2 and channels != 2:
+            raise ValueError("HE-AAC v2 solo admite salida estéreo (--channels 2)")
+
+        return encoder, profile
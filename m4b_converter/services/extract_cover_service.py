@@ -1,7 +1,8 @@
+import asyncio
 import logging
 import subprocess
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 class ExtractCoverService:
     """
@@ -44,7 +45,42 @@ class ExtractCoverService:
         self.file_path = file_path
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def extract_cover(self, raw_data: Dict[str, Any], output_dir: Optional[Path] = None) -> Optional[Path]:
+    # Extensión de la imagen según el codec del stream attached_pic
+    COVER_EXTENSIONS: Dict[str, str] = {
+        "mjpeg": "jpg",
+        "png": "png",
+        "bmp": "bmp",
+        "gif": "gif"
+    }
+
+    @staticmethod
+    def find_cover_stream(raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Busca el stream de portada (attached_pic) en los datos crudos de ffprobe.
+
+        Args:
+            raw_data (Dict[str, Any]): Diccionario con la información cruda del archivo (usualmente AudioAnalyzerService.raw_data).
+
+        Returns:
+            Optional[Dict[str, Any]]: Stream de la portada tal como lo devuelve ffprobe (incluye 'index' y 'codec_name'), o None si el archivo no tiene portada.
+        """
+        streams = raw_data.get("streams", [])
+        return next((s for s in streams if s.get("disposition", {}).get("attached_pic")), None)
+
+    @classmethod
+    def cover_extension(cls, cover_stream: Dict[str, Any]) -> str:
+        """
+        Devuelve la extensión de archivo adecuada para copiar la portada sin recodificar.
+
+        Args:
+            cover_stream (Dict[str, Any]): Stream de portada devuelto por `find_cover_stream`.
+
+        Returns:
+            str: Extensión sin punto (por defecto "jpg").
+        """
+        return cls.COVER_EXTENSIONS.get(cover_stream.get("codec_name"), "jpg")
+
+    def extract_cover(self, raw_data: Dict[str, Any], output_dir: Optional[Path] = None, output_name: Optional[str] = None) -> Optional[Path]:
         """
         Extrae la imagen incrustada del archivo de audio.
 
@@ -53,6 +89,7 @@ class ExtractCoverService:
         Args:
             raw_data (Dict[str, Any]): Diccionario con la información cruda del archivo obtenida mediante ffprobe (usualmente de AudioAnalyzerService.raw_data). Contiene la sección 'streams' necesaria para detectar la presencia de la portada.
             output_dir (Optional[Path]): Directorio donde se guardará la imagen extraída. Si no se especifica, la imagen se guarda en el mismo directorio que el archivo de origen.
+            output_name (Optional[str]): Nombre de la imagen. Los temporales de conversiones simultáneas deben llevar un nombre único (ej: "<id de tarea>_cover.jpg"), porque dos orígenes de carpetas distintas pueden compartir nombre. Por defecto "<nombre>_cover.jpg".
 
         Returns:
             Optional[Path]: Ruta al archivo de imagen extraído en formato JPEG. Retorna None si:
@@ -60,7 +97,7 @@ class ExtractCoverService:
                 - Ocurre un error durante la extracción.
 
         Note:
-            - La imagen se guarda con el nombre del archivo original seguido de "_cover.jpg" (ej: "mi_audiolibro_cover.jpg").
+            - Sin `output_name`, la imagen se guarda con el nombre del archivo original seguido de "_cover.jpg" (ej: "mi_audiolibro_cover.jpg").
             - El formato de salida es siempre JPEG.
             - Se utiliza el flag "-y" en ffmpeg para sobrescribir si ya existe un archivo con el mismo nombre.
 
@@ -82,25 +119,69 @@ class ExtractCoverService:
             ... else:
             ...     print("No se encontró portada en el archivo.")
         """
-        if not output_dir:
-            output_dir = self.file_path.parent
-        
-        output_path = output_dir / f"{self.file_path.stem}_cover.jpg"
-        
-        # Comando: selecciona el stream de video (portada) y lo copia tal cual
-        cmd = [
-            "ffmpeg", "-i", str(self.file_path),
-            "-an", "-vcodec", "copy",
-            str(output_path), "-y"
-        ]
+        output_path = self._cover_output_path(output_dir, output_name)
+        cmd = self._build_extract_command(output_path)
         
         try:
             # Solo ejecutamos si detectamos que hay un attached_pic en el análisis previo
-            streams = raw_data.get("streams", [])
-            if any(s.get("disposition", {}).get("attached_pic") for s in streams):
+            if self.find_cover_stream(raw_data):
+                output_path.parent.mkdir(parents=True, exist_ok=True)
                 subprocess.run(cmd, capture_output=True, check=True)
                 return output_path
         except subprocess.CalledProcessError:
             self.logger.error("No se pudo extraer la portada.")
         
-        return None
\ No newline at end of file
+        return None
+
+    def _cover_output_path(self, output_dir: Optional[Path] = None, output_name: Optional[str] = None) -> Path:
+        """
+        Ruta de la portada extraída: `output_name` o "<nombre>_cover.jpg", en `output_dir` o junto al origen. No crea el directorio: eso se hace solo si hay portada que escribir.
+        """
+        if not output_dir:
+            output_dir = self.file_path.parent
+        return output_dir / (output_name or f"{self.file_path.stem}_cover.jpg")
+
+    def _build_extract_command(self, output_path: Path) -> List[str]:
+        """
+        Construye el comando ffmpeg que copia el stream de portada tal cual.
+        """
+        return [
+            "ffmpeg", "-i", str(self.file_path),
+            "-an", "-vcodec", "copy",
+            str(output_path), "-y"
+        ]
+
+    async def extract_cover_async(self, raw_data: Dict[str, Any], output_dir: Optional[Path] = None, output_name: Optional[str] = None) -> Optional[Path]:
+        """
+        Versión asíncrona de `extract_cover` basada en asyncio.create_subprocess_exec.
+
+        Args:
+            raw_data (Dict[str, Any]): Datos crudos de ffprobe del archivo.
+            output_dir (Optional[Path]): Directorio donde guardar la imagen. Por defecto, el del archivo de origen.
+            output_name (Optional[str]): Nombre de la imagen (ver `extract_cover`). Por defecto "<nombre>_cover.jpg".
+
+        Returns:
+            Optional[Path]: Ruta a la imagen extraída, o None si no hay portada o falla la extracción.
+        """
+        if not self.find_cover_stream(raw_data):
+            return None
+
+        output_path = self._cover_output_path(output_dir, output_name)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        process = await asyncio.create_subprocess_exec(
+            *self._build_extract_command(output_path),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            returncode = await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+        if returncode != 0:
+            self.logger.error("No se pudo extraer la portada.")
+            return None
+        return output_path
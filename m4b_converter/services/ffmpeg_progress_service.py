@@ -0,0 +1,246 @@
+import os
+import asyncio
+import logging
+import threading
+import subprocess
+from collections import deque
+from typing import Optional, Callable, List, Dict, AsyncIterator, Tuple, Iterable
+
+from m4b_converter.schemas import ProgressEvent, ResourceUsage, FfmpegBenchmark
+
+
+class FfmpegProgressService:
+    """
+    Ejecuta ffmpeg leyendo el progreso desde su canal estructurado `-progress`.
+
+    ffmpeg escribe por stdout bloques `clave=valor` (out_time_us, total_size, bitrate, speed...) que terminan con `progress=continue` o `progress=end`. Este servicio convierte cada bloque en un ProgressEvent y se lo entrega al callback. Las líneas de estado de stderr se desactivan con `-nostats`; stderr se lee en un hilo aparte solo para informar del error si ffmpeg falla.
+
+    `run_async` ofrece lo mismo sobre asyncio.create_subprocess_exec, entregando los eventos como un iterador asíncrono.
+
+    Con `benchmark=True` se añaden `-benchmark -benchmark_all` y las líneas `bench:` de stderr se agregan en `last_benchmark` en lugar de tratarse como salida de error.
+
+    Attributes:
+        duration_seconds (Optional[float]): Duración total esperada del audio, para calcular porcentaje y ETA.
+        benchmark (bool): Si se piden a ffmpeg sus tiempos internos.
+        last_benchmark (Optional[FfmpegBenchmark]): Tiempos de la última ejecución con `benchmark=True`.
+        logger (logging.Logger): Logger para registrar eventos y errores.
+        PROGRESS_ARGS (List[str]): Argumentos que activan el canal de progreso.
+        BENCHMARK_ARGS (List[str]): Argumentos que activan los tiempos internos de ffmpeg.
+        STDERR_TAIL_LINES (int): Líneas finales de stderr que se conservan para el mensaje de error.
+
+    Example:
+        >>> from m4b_converter.services import FfmpegProgressService
+        >>>
+        >>> runner = FfmpegProgressService(duration_seconds=3600)
+        >>> runner.run(
+        ...     ["ffmpeg", "-y", "-i", "libro.mp3", "-c:a", "aac", "libro.m4a"],
+        ...     progress_callback=lambda event: print(event.percent, event.speed, event.eta_seconds)
+        ... )
+    """
+
+    PROGRESS_ARGS = ["-progress", "pipe:1", "-nostats"]
+    BENCHMARK_ARGS = ["-benchmark", "-benchmark_all"]
+    STDERR_TAIL_LINES = 20
+
+    def __init__(self, duration_seconds: Optional[float] = None, benchmark: bool = False):
+        """
+        Inicializa el servicio.
+
+        Args:
+            duration_seconds (Optional[float]): Duración total esperada del audio. Si es None, los eventos no incluyen porcentaje ni ETA.
+            benchmark (bool): Si es True, ffmpeg informa de sus tiempos internos (ver `last_benchmark`). Por defecto False.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.duration_seconds = duration_seconds
+        self.benchmark = benchmark
+        self.last_benchmark: Optional[FfmpegBenchmark] = None
+
+    def build_command(self, cmd: List[str]) -> List[str]:
+        """
+        Añade los argumentos del canal de progreso a un comando ffmpeg.
+
+        Args:
+            cmd (List[str]): Comando que empieza por el ejecutable de ffmpeg.
+
+        Returns:
+            List[str]: El mismo comando con `-progress pipe:1 -nostats` (y `-benchmark -benchmark_all` si se piden) como opciones globales.
+        """
+        extra = self.BENCHMARK_ARGS if self.benchmark else []
+        return [cmd[0], *self.PROGRESS_ARGS, *extra, *cmd[1:]]
+
+    def run(
+        self,
+        cmd: List[str],
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        on_start: Optional[Callable[[subprocess.Popen], None]] = None
+    ) -> Optional[ResourceUsage]:
+        """
+        Ejecuta ffmpeg y emite un ProgressEvent por cada bloque de progreso.
+
+        Args:
+            cmd (List[str]): Comando ffmpeg (sin los argumentos de progreso, que se añaden aquí).
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Función que recibe cada evento.
+            on_start (Optional[Callable[[subprocess.Popen], None]]): Función que recibe el proceso recién lanzado, por ejemplo para poder detenerlo desde otro hilo.
+
+        Returns:
+            Optional[ResourceUsage]: CPU y memoria pico consumidas por ffmpeg, o None si no se pudieron medir (ver `wait`).
+
+        Raises:
+            RuntimeError: Si ffmpeg termina con error. El mensaje incluye las últimas líneas de stderr.
+            Exception: Cualquier excepción de `progress_callback`, que se propaga después de matar ffmpeg y esperar su final.
+        """
+        process = subprocess.Popen(
+            self.build_command(cmd),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            encoding="utf-8",
+            errors="replace"
+        )
+        if on_start:
+            on_start(process)
+
+        # stderr se drena en paralelo para que ffmpeg no se bloquee con el buffer lleno
+        stderr_tail = deque(maxlen=self.STDERR_TAIL_LINES)
+        self.last_benchmark = FfmpegBenchmark() if self.benchmark else None
+        stderr_thread = threading.Thread(target=self._drain_stderr, args=(process.stderr, stderr_tail), daemon=True)
+        stderr_thread.start()
+
+        block: Dict[str, str] = {}
+        last_event: Optional[ProgressEvent] = None
+        try:
+            for line in process.stdout:
+                event = self._feed_line(block, line, last_event)
+                if event:
+                    last_event = event
+                    if progress_callback:
+                        progress_callback(event)
+        except BaseException:
+            # Un fallo del callback (o un Ctrl+C) no puede dejar a ffmpeg escribiendo el temporal
+            process.kill()
+            process.wait()
+            stderr_thread.join()
+            raise
+
+        returncode, usage = self.wait(process)
+        stderr_thread.join()
+        self._check_returncode(returncode, stderr_tail)
+        return usage
+
+    @staticmethod
+    def wait(process: subprocess.Popen) -> Tuple[int, Optional[ResourceUsage]]:
+        """
+        Espera a que termine un proceso y recoge los recursos que consumió.
+
+        Usa `os.wait4`, que devuelve el `rusage` de ese proceso concreto; a diferencia de `resource.getrusage(RUSAGE_CHILDREN)`, la medida es correcta aunque haya otros ffmpeg corriendo en paralelo desde el mismo proceso.
+
+        Args:
+            process (subprocess.Popen): Proceso lanzado por este proceso.
+
+        Returns:
+            Tuple[int, Optional[ResourceUsage]]: Código de salida y recursos consumidos. Los recursos son None en plataformas sin `os.wait4` (Windows) o si otro hilo ya recogió el proceso.
+        """
+        if not hasattr(os, "wait4") or process.returncode is not None:
+            return process.wait(), None
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            return process.wait(), None
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return process.returncode, ResourceUsage.from_rusage(rusage)
+
+    async def run_async(self, cmd: List[str]) -> AsyncIterator[ProgressEvent]:
+        """
+        Versión asíncrona de `run`: ejecuta ffmpeg con asyncio y entrega cada ProgressEvent según llega.
+
+        Si el consumidor deja de iterar o la tarea que itera se cancela, el proceso ffmpeg se mata y se espera su final antes de propagar la cancelación, de modo que no quedan procesos huérfanos.
+
+        Args:
+            cmd (List[str]): Comando ffmpeg (sin los argumentos de progreso, que se añaden aquí).
+
+        Yields:
+            ProgressEvent: Un evento por cada bloque del canal de progreso.
+
+        Raises:
+            RuntimeError: Si ffmpeg termina con error.
+
+        Example:
+            >>> async for event in FfmpegProgressService(3600).run_async(cmd):
+            ...     print(event.percent)
+        """
+        process = await asyncio.create_subprocess_exec(
+            *self.build_command(cmd),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stderr_tail = deque(maxlen=self.STDERR_TAIL_LINES)
+        self.last_benchmark = FfmpegBenchmark() if self.benchmark else None
+
+        async def drain_stderr() -> None:
+            async for raw_line in process.stderr:
+                self._drain_stderr([raw_line.decode("utf-8", errors="replace")], stderr_tail)
+
+        stderr_task = asyncio.create_task(drain_stderr())
+        try:
+            block: Dict[str, str] = {}
+            last_event: Optional[ProgressEvent] = None
+            async for raw_line in process.stdout:
+                event = self._feed_line(block, raw_line.decode("utf-8", errors="replace"), last_event)
+                if event:
+                    last_event = event
+                    yield event
+
+            returncode = await process.wait()
+            await stderr_task
+            self._check_returncode(returncode, stderr_tail)
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            stderr_task.cancel()
+
+    def _drain_stderr(self, lines: Iterable[str], stderr_tail: deque) -> None:
+        """
+        Guarda el final de stderr para los mensajes de error, apartando las líneas de benchmark.
+        """
+        for line in lines:
+            if self.last_benchmark is not None and self.last_benchmark.feed_line(line):
+                continue
+            stderr_tail.append(line)
+
+    def _feed_line(self, block: Dict[str, str], line: str, last_event: Optional[ProgressEvent]) -> Optional[ProgressEvent]:
+        """
+        Acumula una línea del canal de progreso y crea el evento al cerrar un bloque.
+
+        Args:
+            block (Dict[str, str]): Bloque en construcción; se vacía al cerrarse.
+            line (str): Línea `clave=valor` leída de stdout.
+            last_event (Optional[ProgressEvent]): Evento anterior, para que el tiempo nunca retroceda.
+
+        Returns:
+            Optional[ProgressEvent]: El evento si la línea cierra un bloque (`progress=...`), o None.
+        """
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return None
+        block[key] = value
+        if key != "progress":
+            return None
+
+        event = ProgressEvent.from_progress_block(block, self.duration_seconds)
+        block.clear()
+        # Con una portada adjunta, el bloque final informa del tiempo del stream de imagen
+        if last_event and event.out_time_us < last_event.out_time_us:
+            event = event.model_copy(update={"out_time_us": last_event.out_time_us, "speed": last_event.speed})
+        return event
+
+    def _check_returncode(self, returncode: int, stderr_tail: deque) -> None:
+        """
+        Lanza RuntimeError con el final de stderr si ffmpeg terminó con error.
+        """
+        if returncode != 0:
+            details = "".join(stderr_tail).strip()
+            self.logger.debug(f"Salida de error de ffmpeg: {details}")
+            raise RuntimeError(f"FFmpeg falló en la ejecución (código {returncode}): {details.splitlines()[-1] if details else ''}")
@@ -0,0 +1,383 @@
+import time
+import uuid
+import logging
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Optional, Iterable, List
+
+from m4b_converter.enums import Bitrate, JobStatus
+from m4b_converter.settings import AppSettings
+from m4b_converter.schemas import QueuedJob
+
+
+class JobQueueService:
+    """
+    Cola persistente de trabajos de conversión respaldada por SQLite.
+
+    Guarda los trabajos en una base SQLite bajo AppSettings.APP_DIR para que sobrevivan a la invocación de la CLI que los creó. Varios procesos worker del mismo equipo pueden consumir la cola a la vez: la toma de un trabajo se hace dentro de una transacción `BEGIN IMMEDIATE`, de modo que dos workers nunca reciben el mismo trabajo.
+
+    Ciclo de vida de un trabajo:
+
+    1. `enqueue` / `enqueue_many` lo crea como PENDING.
+    2. `lease` lo pasa a LEASED para un worker durante `lease_seconds`; el worker debe llamar a `heartbeat` antes de que venza.
+    3. `complete` lo marca como DONE; `fail` lo devuelve a PENDING o, si agotó sus intentos, lo marca como FAILED.
+
+    Si un worker muere sin completar ni fallar, su lease vence y otro worker puede retomar el trabajo.
+
+    Attributes:
+        db_path (Path): Ruta a la base de datos SQLite.
+        logger (logging.Logger): Logger para registrar eventos y errores.
+
+    Example:
+        >>> from pathlib import Path
+        >>> from m4b_converter.services import JobQueueService
+        >>> from m4b_converter.enums import Bitrate
+        >>>
+        >>> queue = JobQueueService()
+        >>> queue.enqueue(Path("libro.mp3"), Bitrate.B_64K, channels=1, priority=10)
+        >>>
+        >>> job = queue.lease(worker_id="worker-1")
+        >>> if job:
+        ...     queue.heartbeat(job.id, "worker-1")
+        ...     queue.complete(job.id, "worker-1", Path("libro.m4b"))
+        >>> print(queue.counts())
+
+    Note:
+        - A diferencia de la caché de ffprobe, los errores de SQLite se propagan: perder un trabajo en silencio es peor que fallar.
+        - Los trabajos con mayor `priority` se toman antes; a igual prioridad, por orden de llegada.
+    """
+
+    def __init__(self, db_path: Path = AppSettings.JOB_QUEUE_PATH):
+        """
+        Inicializa la cola y crea las tablas si no existen.
+
+        Args:
+            db_path (Path): Ruta a la base de datos SQLite. Por defecto AppSettings.JOB_QUEUE_PATH.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre una conexión en modo autocommit, para controlar las transacciones explícitamente.
+
+        Returns:
+            sqlite3.Connection: Conexión con timeout amplio para tolerar varios workers concurrentes.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        """
+        Crea la tabla de trabajos y sus índices si no existen.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    input_path TEXT NOT NULL,
+                    bitrate_target TEXT NOT NULL,
+                    channels_target INTEGER NOT NULL,
+                    output_dir TEXT,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 3,
+                    worker_id TEXT,
+                    lease_expires_at REAL,
+                    error TEXT,
+                    output_path TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, priority DESC, created_at)")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> QueuedJob:
+        """
+        Convierte una fila de la tabla en un QueuedJob.
+        """
+        data = dict(row)
+        for key in ("lease_expires_at", "created_at", "updated_at"):
+            if data[key] is not None:
+                data[key] = datetime.fromtimestamp(data[key])
+        return QueuedJob(**data)
+
+    def enqueue(
+        self,
+        input_path: Path,
+        bitrate: Bitrate = Bitrate.B_64K,
+        channels: int = 1,
+        output_dir: Optional[Path] = None,
+        priority: int = 0,
+        max_attempts: int = 3
+    ) -> uuid.UUID:
+        """
+        Encola una conversión.
+
+        Args:
+            input_path (Path): Archivo de audio a convertir.
+            bitrate (Bitrate): Bitrate objetivo. Por defecto Bitrate.B_64K.
+            channels (int): Número de canales. Por defecto 1 (mono).
+            output_dir (Optional[Path]): Directorio de salida. None usa AppSettings.OUTPUT_DIR al procesarlo.
+            priority (int): Prioridad del trabajo; mayor se procesa antes. Por defecto 0.
+            max_attempts (int): Intentos antes de marcarlo como fallido. Por defecto 3.
+
+        Returns:
+            uuid.UUID: Identificador del trabajo (y de su ConversionTask).
+        """
+        job_ids = self.enqueue_many([input_path], bitrate, channels, output_dir, priority, max_attempts)
+        return job_ids[0]
+
+    def enqueue_many(
+        self,
+        input_paths: Iterable[Path],
+        bitrate: Bitrate = Bitrate.B_64K,
+        channels: int = 1,
+        output_dir: Optional[Path] = None,
+        priority: int = 0,
+        max_attempts: int = 3
+    ) -> List[uuid.UUID]:
+        """
+        Encola muchas conversiones en una sola transacción.
+
+        Args:
+            input_paths (Iterable[Path]): Archivos de audio a convertir.
+            bitrate (Bitrate): Bitrate objetivo. Por defecto Bitrate.B_64K.
+            channels (int): Número de canales. Por defecto 1 (mono).
+            output_dir (Optional[Path]): Directorio de salida común.
+            priority (int): Prioridad de todos los trabajos. Por defecto 0.
+            max_attempts (int): Intentos antes de marcar cada trabajo como fallido. Por defecto 3.
+
+        Returns:
+            List[uuid.UUID]: Identificadores de los trabajos creados, en el orden de entrada.
+        """
+        now = time.time()
+        rows = []
+        for input_path in input_paths:
+            job_id = uuid.uuid4()
+            rows.append((
+                str(job_id), str(Path(input_path).resolve()), bitrate.value, channels,
+                str(output_dir.resolve()) if output_dir else None,
+                priority, JobStatus.PENDING.value, max(1, max_attempts),
+                # Mismo instante para todo el lote, desempatado por orden de inserción
+                now + len(rows) * 1e-6, now
+            ))
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                """
+                INSERT INTO jobs (id, input_path, bitrate_target, channels_target, output_dir,
+                                  priority, status, max_attempts, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        self.logger.info(f"{len(rows)} trabajos encolados (prioridad {priority})")
+        return [uuid.UUID(row[0]) for row in rows]
+
+    def lease(self, worker_id: str, lease_seconds: int = AppSettings.JOB_LEASE_SECONDS) -> Optional[QueuedJob]:
+        """
+        Toma el siguiente trabajo disponible para un worker.
+
+        Un trabajo está disponible si está PENDING o si es LEASED con el lease vencido (su worker dejó de renovarlo). Los trabajos con lease vencido que ya agotaron sus intentos se marcan como FAILED.
+
+        Args:
+            worker_id (str): Identificador único del worker.
+            lease_seconds (int): Segundos de validez del lease. Por defecto AppSettings.JOB_LEASE_SECONDS.
+
+        Returns:
+            Optional[QueuedJob]: El trabajo tomado, o None si la cola no tiene trabajos disponibles.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE toma el bloqueo de escritura antes de leer: dos workers no pueden elegir el mismo trabajo
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, worker_id = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts
+                """,
+                (JobStatus.FAILED.value, "Lease vencido sin completar", now, JobStatus.LEASED.value, now)
+            )
+            row = conn.execute(
+                """
+                SELECT id FROM jobs
+                WHERE status = ? OR (status = ? AND lease_expires_at < ?)
+                ORDER BY priority DESC, created_at
+                LIMIT 1
+                """,
+                (JobStatus.PENDING.value, JobStatus.LEASED.value, now)
+            ).fetchone()
+
+            if not row:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, worker_id = ?, lease_expires_at = ?, attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+                """,
+                (JobStatus.LEASED.value, worker_id, now + lease_seconds, now, row["id"])
+            )
+            job_row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        job = self._row_to_job(job_row)
+        self.logger.debug(f"Trabajo {job.id} tomado por {worker_id} (intento {job.attempts})")
+        return job
+
+    def _update_owned(self, job_id: uuid.UUID, worker_id: str, assignments: str, params: tuple) -> bool:
+        """
+        Actualiza un trabajo solo si sigue tomado por `worker_id`.
+
+        Returns:
+            bool: True si el worker seguía siendo el dueño del trabajo.
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (*params, time.time(), str(job_id), worker_id, JobStatus.LEASED.value)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: uuid.UUID, worker_id: str, lease_seconds: int = AppSettings.JOB_LEASE_SECONDS) -> bool:
+        """
+        Renueva el lease de un trabajo en curso.
+
+        Args:
+            job_id (uuid.UUID): Trabajo a renovar.
+            worker_id (str): Worker que lo tiene tomado.
+            lease_seconds (int): Nueva validez del lease desde ahora.
+
+        Returns:
+            bool: False si el worker ya no es el dueño (su lease venció y otro worker lo tomó).
+        """
+        return self._update_owned(job_id, worker_id, "lease_expires_at = ?", (time.time() + lease_seconds,))
+
+    def complete(self, job_id: uuid.UUID, worker_id: str, output_path: Optional[Path] = None) -> bool:
+        """
+        Marca un trabajo como completado.
+
+        Args:
+            job_id (uuid.UUID): Trabajo completado.
+            worker_id (str): Worker que lo tiene tomado.
+            output_path (Optional[Path]): Ruta del M4B generado.
+
+        Returns:
+            bool: False si el worker ya no era el dueño del trabajo.
+        """
+        return self._update_owned(
+            job_id, worker_id,
+            "status = ?, output_path = ?, error = NULL, lease_expires_at = NULL",
+            (JobStatus.DONE.value, str(output_path) if output_path else None)
+        )
+
+    def fail(self, job_id: uuid.UUID, worker_id: str, error: str) -> Optional[JobStatus]:
+        """
+        Registra el fallo de un trabajo.
+
+        Si le quedan intentos vuelve a PENDING para que otro worker lo reintente; si no, queda como FAILED.
+
+        Args:
+            job_id (uuid.UUID): Trabajo fallido.
+            worker_id (str): Worker que lo tiene tomado.
+            error (str): Descripción del error.
+
+        Returns:
+            Optional[JobStatus]: Nuevo estado del trabajo, o None si el worker ya no era su dueño.
+        """
+        updated = self._update_owned(
+            job_id, worker_id,
+            "status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, error = ?, worker_id = NULL, lease_expires_at = NULL",
+            (JobStatus.FAILED.value, JobStatus.PENDING.value, error)
+        )
+        if not updated:
+            return None
+        job = self.get(job_id)
+        return job.status if job else None
+
+    def get(self, job_id: uuid.UUID) -> Optional[QueuedJob]:
+        """
+        Busca un trabajo por su id.
+
+        Args:
+            job_id (uuid.UUID): Identificador del trabajo.
+
+        Returns:
+            Optional[QueuedJob]: El trabajo, o None si no existe.
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (str(job_id),)).fetchone()
+        finally:
+            conn.close()
+        return self._row_to_job(row) if row else None
+
+    def counts(self) -> Dict[JobStatus, int]:
+        """
+        Cuenta los trabajos por estado.
+
+        Returns:
+            Dict[JobStatus, int]: Número de trabajos en cada estado (todos los estados presentes, aunque sea con 0).
+        """
+        counts = {status: 0 for status in JobStatus}
+        conn = self._connect()
+        try:
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+                counts[JobStatus(row["status"])] = row["n"]
+        finally:
+            conn.close()
+        return counts
+
+    def purge(self, statuses: Iterable[JobStatus] = (JobStatus.DONE,)) -> int:
+        """
+        Elimina los trabajos en los estados indicados.
+
+        Args:
+            statuses (Iterable[JobStatus]): Estados a eliminar. Por defecto solo los completados.
+
+        Returns:
+            int: Número de trabajos eliminados.
+        """
+        values = [JobStatus(status).value for status in statuses]
+        if not values:
+            return 0
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' for _ in values)})", values
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
@@ -1,12 +1,21 @@
+import os
+import math
+import time
+import shutil
+import threading
 import subprocess
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Callable, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Callable, Dict, List, Tuple, Iterator, AsyncIterator, Union
 
 from m4b_converter.settings import AppSettings
-from m4b_converter.enums import Bitrate, AudioProfile
-from m4b_converter.schemas import AudioFileSchema, ConversionTask, ConversionResult
+from m4b_converter.enums import Bitrate, AudioProfile, TranscodeDecision, EncoderPreset
+from m4b_converter.schemas import AudioFileSchema, ConversionTask, ConversionResult, ProgressEvent, ResourceUsage, FfmpegBenchmark, SilenceChapterOptions, RenditionPlan
+from m4b_converter.services.ffmpeg_progress_service import FfmpegProgressService
+from m4b_converter.services.chapter_service import ChapterService
+from m4b_converter.services.staging_service import StagingService
 
 
 class M4bConverterService:
@@ -22,6 +31,15 @@ class M4bConverterService:
         output_dir (Path): Directorio donde se guardará el archivo convertido.
         logger (logging.Logger): Logger para registrar eventos y errores.
         current_task (Optional[ConversionTask]): Tarea de conversión actual en ejecución.
+        staging (StagingService): Ubica los M4B temporales y los mueve a output_dir.
+        AAC_FRAME_SAMPLES (int): Muestras por canal de cada trama AAC-LC.
+        SEGMENT_PREROLL_FRAMES (int): Tramas que cada segmento codifica antes de su frontera y que luego se descartan.
+        SEGMENT_POSTROLL_FRAMES (int): Tramas que cada segmento codifica después de su frontera y que luego se descartan.
+        MIN_SEGMENT_SECONDS (float): Duración mínima de un segmento en la división automática.
+        PRESET_ENCODER_OPTIONS (Dict[AudioProfile, Dict[EncoderPreset, List[str]]]): Opciones propias de cada codificador según el preset.
+        PRESET_CUTOFF_HZ (Dict[EncoderPreset, int]): Frecuencia de corte (`-cutoff`) de cada preset en AAC-LC. Sin entrada, la elige el codificador según el bitrate.
+        PRESET_RESAMPLER (Dict[EncoderPreset, str]): Opciones del filtro `aresample` de cada preset. Solo se usan si la tarea cambia la frecuencia de muestreo.
+        INPUT_GRAPH_LABEL (str): Etiqueta de salida de `input_graph`.
 
     Example:
         >>> from pathlib import Path
@@ -42,10 +60,39 @@ class M4bConverterService:
         >>> print(f"Archivo convertido: {result.output_path}")
     """
 
+    AAC_FRAME_SAMPLES = 1024
+    SEGMENT_PREROLL_FRAMES = 4
+    SEGMENT_POSTROLL_FRAMES = 4
+    MIN_SEGMENT_SECONDS = 300.0
+    INPUT_GRAPH_LABEL = "joined"
+
+    PRESET_ENCODER_OPTIONS: Dict[AudioProfile, Dict[EncoderPreset, List[str]]] = {
+        # "fast" cuantiza sin búsqueda iterativa: la mitad de tiempo que "twoloop" (el default)
+        AudioProfile.AAC: {
+            EncoderPreset.FAST: ["-aac_coder", "fast"],
+            EncoderPreset.QUALITY: ["-aac_coder", "twoloop"],
+        },
+        AudioProfile.LIBFDK_AAC: {
+            EncoderPreset.FAST: ["-afterburner", "0"],
+            EncoderPreset.QUALITY: ["-afterburner", "1"],
+        },
+    }
+    PRESET_CUTOFF_HZ: Dict[EncoderPreset, int] = {
+        # La voz apenas tiene energía por encima de 12 kHz
+        EncoderPreset.FAST: 12000,
+    }
+    PRESET_RESAMPLER: Dict[EncoderPreset, str] = {
+        EncoderPreset.FAST: "filter_size=8:phase_shift=6",
+        EncoderPreset.BALANCED: "filter_size=64:phase_shift=14",
+        EncoderPreset.QUALITY: "filter_size=128:phase_shift=16",
+    }
+
     def __init__(
         self, 
         audio_info: AudioFileSchema,
-        output_dir: Optional[Path] = AppSettings.OUTPUT_DIR
+        output_dir: Optional[Path] = AppSettings.OUTPUT_DIR,
+        input_args: Optional[List[str]] = None,
+        input_graph: Optional[str] = None
     ):
         """
         Inicializa el servicio de conversión a M4B.
@@ -53,11 +100,16 @@ class M4bConverterService:
         Args:
             audio_info (AudioFileSchema): Información del archivo de audio a convertir, obtenida mediante AudioAnalyzerService. Contiene metadatos, duración, bitrate y demás características técnicas.
             output_dir (Optional[Path]): Directorio donde se guardará el archivo convertido. Por defecto usa AppSettings.OUTPUT_DIR.
+            input_args (Optional[List[str]]): Argumentos de entrada de ffmpeg que sustituyen a `-i <audio_info.path>`, por ejemplo el demuxer concat de una lista de archivos. En ese caso `audio_info` describe el audio resultante (duración total, metadatos) y su `path` solo determina el nombre de salida.
+            input_graph (Optional[str]): Grafo de filtros que une varias entradas de `input_args` en la etiqueta `[INPUT_GRAPH_LABEL]`, que pasa a ser el audio de la conversión (ver ConcatPlannerService.filtergraph). La portada y los capítulos se añaden como entradas siguientes.
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.audio_info = audio_info
         self.output_dir = output_dir
+        self.input_args = input_args or ["-i", str(audio_info.path)]
+        self.input_graph = input_graph
         self.current_task: Optional[ConversionTask] = None
+        self.staging = StagingService()
 
     def _build_ffmpeg_command(
         self,
@@ -65,23 +117,39 @@ class M4bConverterService:
         output_path: Path,
         profile: AudioProfile,
         threads: int,
-        cover_path: Optional[Path] = None
+        cover_path: Optional[Path] = None,
+        source_cover_stream: Optional[int] = None,
+        cover_output_path: Optional[Path] = None,
+        remux: bool = False,
+        encoder: AudioProfile = AudioProfile.AAC,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        chapters_path: Optional[Path] = None,
+        silence_chapters: Optional[SilenceChapterOptions] = None,
+        silence_log_path: Optional[Path] = None
     ) -> List[str]:
         """
         Construye el comando ffmpeg para la conversión optimizada a audiolibros.
 
         Este método genera el comando completo de ffmpeg incluyendo:
         - Mapeo de audio y video (portada)
-        - Configuración de codec AAC con perfil y bitrate específicos
+        - Configuración del codificador AAC con perfil y bitrate específicos
         - Inyección de metadatos (título, artista, álbum)
-        - Configuración de canales y threads
+        - Configuración de canales, frecuencia de muestreo y threads
 
         Args:
-            task (ConversionTask): Tarea de conversión que contiene los parámetros de destino (bitrate, canales).
+            task (ConversionTask): Tarea de conversión que contiene los parámetros de destino (bitrate, canales y frecuencia de muestreo).
             output_path (Path): Ruta donde se guardará el archivo temporal.
-            profile (AudioProfile): Perfil de audio AAC a utilizar.
+            profile (AudioProfile): Perfil AAC a utilizar (`-profile:a`): AAC_LOW, AAC_HE o AAC_HE_V2.
             threads (int): Número de hilos para la codificación (0 = auto).
             cover_path (Optional[Path]): Ruta a la imagen de portada a incrustar. Si se proporciona y existe, se incluye como attached_pic.
+            source_cover_stream (Optional[int]): Índice del stream attached_pic del archivo de origen. Si se indica, la portada se copia directamente desde el origen y se ignora `cover_path`.
+            cover_output_path (Optional[Path]): Ruta donde escribir la portada como archivo independiente, como segunda salida de la misma invocación. Solo se usa junto con `source_cover_stream`.
+            remux (bool): Si es True, el audio se copia sin recodificar (`-c:a copy`) y se ignoran el bitrate, los canales, la frecuencia de muestreo, los hilos, el codificador y el perfil.
+            encoder (AudioProfile): Codificador AAC de ffmpeg (`-c:a`): AAC, LIBFDK_AAC o AAC_AT. Por defecto el nativo.
+            preset (EncoderPreset): Preset de velocidad; añade las opciones de `preset_args`. Por defecto EncoderPreset.BALANCED.
+            chapters_path (Optional[Path]): Archivo ffmetadata con los capítulos (ver ChapterService). Se añade como última entrada y se mapea con `-map_chapters`.
+            silence_chapters (Optional[SilenceChapterOptions]): Si se indica, el audio decodificado se divide con `asplit` dentro del mismo grafo: una rama va al codificador y la otra a `silencedetect`, que escribe sus detecciones en `silence_log_path`. En un remux el audio se copia y la detección decodifica el origen hacia una salida nula.
+            silence_log_path (Optional[Path]): Archivo de detecciones de silencio. Obligatorio con `silence_chapters`.
 
         Returns:
             List[str]: Lista con el comando ffmpeg y sus argumentos, listo para
@@ -89,76 +157,324 @@ class M4bConverterService:
 
         Note:
             - Si se incluye portada, se usa el segundo input y se mapea como 'attached_pic' para compatibilidad con M4B.
+            - Con `source_cover_stream` no hay segundo input: se mapea el stream `0:<índice>` del origen y, si se pide, la misma invocación escribe la portada en disco. Así se evita un proceso ffmpeg y dos escrituras temporales por libro.
             - El formato de salida es MP4 (que es el contenedor de M4B).
         """
         # Base: audio mapping
-        cmd = [
-            "ffmpeg", "-i", str(self.audio_info.path)
-        ]
+        cmd = ["ffmpeg", "-y", *self.input_args]
 
-        # Si hay portada, la incluimos como segundo input
-        if cover_path and cover_path.exists():
+        # Si hay portada, la incluimos como input siguiente a los del audio
+        input_count = self.input_args.count("-i")
+        cover_input = source_cover_stream is None and cover_path is not None and cover_path.exists()
+        if cover_input:
             cmd.extend(["-i", str(cover_path)])
-            # Mapeamos audio del primer input y video del segundo
-            cmd.extend(["-map", "0:a", "-map", "1:v"])
+
+        # Los capítulos van como última entrada: las opciones de salida no pueden preceder a un -i
+        chapters_input = None
+        if chapters_path:
+            chapters_input = input_count + 1 if cover_input else input_count
+            cmd.extend(["-f", "ffmetadata", "-i", str(chapters_path)])
+
+        # Detección de silencios en el mismo grafo que alimenta al codificador
+        graph = [self.input_graph] if self.input_graph else []
+        source = f"[{self.INPUT_GRAPH_LABEL}]" if self.input_graph else "[0:a]"
+        audio_map = source if self.input_graph else "0:a"
+        resample_filter = None if remux else self.resample_filter(preset, task.sample_rate_target)
+        if silence_chapters:
+            detect = ChapterService.silencedetect_filter(silence_chapters, silence_log_path)
+            if remux:
+                graph.append(f"{source}{detect}[silences]")
+            else:
+                # El remuestreo va en la rama del codificador: antes del asplit, ffmpeg 7.0 aborta al cerrar la rama de anullsink
+                encode_branch = f"[encode]{resample_filter}[audio];" if resample_filter else ""
+                split_label = "[encode]" if resample_filter else "[audio]"
+                graph.append(f"{source}asplit=2{split_label}[silences];{encode_branch}[silences]{detect},anullsink")
+                audio_map = "[audio]"
+        elif resample_filter and graph:
+            graph.append(f"{source}{resample_filter}[audio]")
+            audio_map = "[audio]"
+        elif resample_filter:
+            cmd.extend(["-af", resample_filter])
+        if graph:
+            cmd.extend(["-filter_complex", ";".join(graph)])
+
+        if source_cover_stream is not None:
+            # Portada tomada del propio origen, sin pasar por un JPEG temporal
+            cmd.extend(["-map", audio_map, "-map", f"0:{source_cover_stream}"])
+            cmd.extend(["-c:v", "copy", "-disposition:v", "attached_pic"])
+        elif cover_input:
+            # Mapeamos el audio y el video de la portada
+            cmd.extend(["-map", audio_map, "-map", f"{input_count}:v"])
             # Configuramos el stream de video como 'attached_pic' para m4b
             cmd.extend(["-c:v", "copy", "-disposition:v", "attached_pic"])
         else:
+            if graph:
+                # Con -filter_complex el audio del M4B se mapea de forma explícita
+                cmd.extend(["-map", audio_map])
             cmd.extend(["-vn"])  # No video si no hay portada
 
         # Parámetros de audio
-        cmd.extend([
-            "-c:a", "aac",
+        cmd.extend(self._audio_args(task, threads, remux, encoder, profile, preset))
+        if chapters_input is not None:
+            cmd.extend(["-map_chapters", str(chapters_input)])
+        cmd.extend(["-f", "mp4"])  # m4b es técnicamente un wrapper mp4
+
+        # Inyectar metadatos desde nuestro schema
+        cmd.extend(self._metadata_args())
+
+        cmd.append(str(output_path))
+
+        # Segunda salida: la portada como archivo independiente
+        if source_cover_stream is not None and cover_output_path:
+            cmd.extend([
+                "-map", f"0:{source_cover_stream}",
+                "-c:v", "copy",
+                "-frames:v", "1",
+                "-update", "1",
+                "-f", "image2",
+                str(cover_output_path)
+            ])
+
+        # En un remux la rama de detección necesita su propia salida
+        if silence_chapters and remux:
+            cmd.extend(["-map", "[silences]", "-f", "null", "-"])
+
+        return cmd
+
+    def _audio_args(
+        self,
+        task: ConversionTask,
+        threads: int,
+        remux: bool,
+        encoder: AudioProfile,
+        profile: AudioProfile,
+        preset: EncoderPreset
+    ) -> List[str]:
+        """
+        Opciones de audio de una salida: copia del stream o codificador, perfil, bitrate, canales, frecuencia, hilos y opciones del preset. No incluye el filtro de remuestreo.
+        """
+        if remux:
+            return ["-c:a", "copy"]
+        return [
+            "-c:a", encoder.value,
+            "-profile:a", profile.value,
             "-b:a", task.bitrate_target,
             "-ac", str(task.channels_target),
+            *self._sample_rate_args(task),
             "-threads", str(threads),
-            "-f", "mp4",  # m4b es técnicamente un wrapper mp4
-        ])
+            *self.preset_args(preset, encoder, profile),
+        ]
 
-        # Inyectar metadatos desde nuestro schema
+    @staticmethod
+    def _sample_rate_args(task: ConversionTask) -> List[str]:
+        """
+        Argumento `-ar` de la tarea, vacío si conserva la frecuencia del origen.
+        """
+        return ["-ar", str(task.sample_rate_target)] if task.sample_rate_target else []
+
+    @classmethod
+    def preset_args(
+        cls,
+        preset: EncoderPreset,
+        encoder: AudioProfile,
+        profile: AudioProfile,
+        sample_rate: Optional[int] = None
+    ) -> List[str]:
+        """
+        Opciones de ffmpeg que aplica un preset de velocidad con un codificador y perfil concretos.
+
+        Args:
+            preset (EncoderPreset): Preset pedido.
+            encoder (AudioProfile): Codificador AAC.
+            profile (AudioProfile): Perfil AAC.
+            sample_rate (Optional[int]): Frecuencia de salida si la conversión remuestrea; selecciona el filtro `aresample` del preset.
+
+        Returns:
+            List[str]: Argumentos para añadir tras los de audio. Vacía con EncoderPreset.BALANCED sin remuestreo, que conserva los valores por defecto de ffmpeg.
+
+        Note:
+            - La frecuencia de corte solo se fija en AAC-LC: en HE-AAC la banda alta la reconstruye SBR.
+            - AudioToolbox no tiene opciones de velocidad propias; con él solo cambian el corte y el remuestreo.
+        """
+        args = list(cls.PRESET_ENCODER_OPTIONS.get(encoder, {}).get(preset, []))
+        if preset in cls.PRESET_CUTOFF_HZ and profile == AudioProfile.AAC_LOW:
+            args.extend(["-cutoff", str(cls.PRESET_CUTOFF_HZ[preset])])
+        resample_filter = cls.resample_filter(preset, sample_rate)
+        if resample_filter:
+            args.extend(["-af", resample_filter])
+        return args
+
+    @classmethod
+    def resample_filter(cls, preset: EncoderPreset, sample_rate: Optional[int]) -> Optional[str]:
+        """
+        Filtro `aresample` del preset para la frecuencia de salida, o None si la conversión no remuestrea.
+        """
+        return f"aresample={sample_rate}:{cls.PRESET_RESAMPLER[preset]}" if sample_rate else None
+
+    def _output_paths(self, label: Optional[str] = None) -> Tuple[Path, Path]:
+        """
+        Rutas de salida final y temporal de la tarea actual. Crea el directorio temporal si aún no existe.
+
+        Args:
+            label (Optional[str]): Sufijo de la versión (ver Rendition.label). El M4B se llama `<origen>.<label>.m4b`; sin sufijo, `<origen>.m4b`.
+
+        Returns:
+            Tuple[Path, Path]: (ruta final en output_dir, ruta temporal elegida por StagingService.staging_path).
+        """
+        name = f"{self.audio_info.path.stem}.{label}" if label else self.audio_info.path.stem
+        output_path = self.output_dir / f"{name}.m4b"
+        temp_path = self.staging.staging_path(self.output_dir, f"{self.current_task.id}.m4b")
+        return output_path, temp_path
+
+    def _build_result(
+        self,
+        bitrate: Bitrate,
+        output_path: Path,
+        timestamp_start: datetime,
+        encode_seconds: float = 0.0,
+        finalize_seconds: float = 0.0,
+        child_usage: Optional[ResourceUsage] = None,
+        ffmpeg_benchmark: Optional[FfmpegBenchmark] = None,
+        decision: TranscodeDecision = TranscodeDecision.ENCODE,
+        encoder: AudioProfile = AudioProfile.AAC,
+        profile: AudioProfile = AudioProfile.AAC_LOW,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        chapter_count: int = 0
+    ) -> ConversionResult:
+        """
+        Construye el ConversionResult de la tarea actual una vez movido el archivo final.
+
+        Args:
+            bitrate (Bitrate): Bitrate de la conversión.
+            output_path (Path): Ruta final del M4B.
+            timestamp_start (datetime): Momento de inicio de la conversión.
+            encode_seconds (float): Duración de la codificación.
+            finalize_seconds (float): Duración del movimiento al destino final.
+            child_usage (Optional[ResourceUsage]): Recursos consumidos por los procesos ffmpeg.
+            ffmpeg_benchmark (Optional[FfmpegBenchmark]): Tiempos internos de ffmpeg, si se pidieron.
+            decision (TranscodeDecision): Tratamiento aplicado al audio. En un remux el bitrate y el códec finales son los del origen.
+            encoder (AudioProfile): Codificador usado. Se ignora si el audio no se recodificó.
+            profile (AudioProfile): Perfil AAC usado. Se ignora si el audio no se recodificó.
+            preset (EncoderPreset): Preset de velocidad usado. Se ignora si el audio no se recodificó.
+            chapter_count (int): Capítulos detectados por silencios e incrustados.
+
+        Returns:
+            ConversionResult: Resultado con tamaños, tiempos y rutas.
+        """
+        copied = decision != TranscodeDecision.ENCODE
+        return ConversionResult(
+            task_id=self.current_task.id,
+            output_path=output_path,
+            duration_seconds=self.audio_info.duration_seconds,
+            size_original_bytes=self.audio_info.size_bytes,
+            size_final_bytes=output_path.stat().st_size,
+            bitrate_final=f"{self.audio_info.bitrate_kbps}k" if copied else bitrate.value,
+            codec_final=self.audio_info.codec if copied else "aac",
+            transcode_decision=decision,
+            encoder_final=None if copied else encoder.value,
+            profile_final=None if copied else profile.value,
+            preset_final=None if copied else preset.value,
+            sample_rate_final=self._output_sample_rate() if not copied else self.audio_info.sample_rate,
+            timestamp_start=timestamp_start,
+            timestamp_end=datetime.now(),
+            encode_seconds=round(encode_seconds, 3),
+            finalize_seconds=round(finalize_seconds, 3),
+            child_usage=child_usage,
+            ffmpeg_benchmark=ffmpeg_benchmark,
+            chapter_count=chapter_count
+        )
+
+    def _metadata_args(self) -> List[str]:
+        """
+        Argumentos `-metadata` de ffmpeg con el título, artista y álbum del schema.
+
+        Returns:
+            List[str]: Argumentos listos para añadir al comando.
+        """
+        args = []
         meta = self.audio_info.metadata
         if meta.title:
-            cmd.extend(["-metadata", f"title={meta.title}"])
+            args.extend(["-metadata", f"title={meta.title}"])
         if meta.artist:
-            cmd.extend(["-metadata", f"artist={meta.artist}"])
+            args.extend(["-metadata", f"artist={meta.artist}"])
         if meta.album:
-            cmd.extend(["-metadata", f"album={meta.album}"])
+            args.extend(["-metadata", f"album={meta.album}"])
+        return args
 
-        cmd.append(str(output_path))
-        return cmd
+    @staticmethod
+    def _build_chapters_command(input_path: Path, chapters_path: Path, output_path: Path) -> List[str]:
+        """
+        Comando que copia un M4B ya codificado añadiéndole los capítulos de un archivo ffmetadata.
+
+        Args:
+            input_path (Path): M4B sin capítulos.
+            chapters_path (Path): Archivo ffmetadata con los capítulos.
+            output_path (Path): M4B resultante.
+
+        Returns:
+            List[str]: Comando ffmpeg. Copia el audio y la portada (si la hay) sin recodificar; los metadatos globales se conservan.
+        """
+        return [
+            "ffmpeg", "-y",
+            "-i", str(input_path),
+            "-f", "ffmetadata", "-i", str(chapters_path),
+            "-map", "0:a", "-map", "0:v?",
+            "-map_chapters", "1",
+            "-c", "copy",
+            "-f", "mp4",
+            str(output_path)
+        ]
 
-    def _parse_ffmpeg_time(self, line: str) -> float:
+    def _add_silence_chapters(self, temp_path: Path, silence_log_path: Path, options: SilenceChapterOptions) -> int:
         """
-        Extrae los segundos transcurridos de una línea de progreso de FFmpeg.
+        Convierte las detecciones de silencio de la codificación en capítulos y los incrusta en el M4B temporal.
 
-        Este método analiza la salida de ffmpeg para extraer el tiempo actual de procesamiento, que se utiliza para calcular el porcentaje de progreso durante la conversión.
+        Los capítulos de un MP4 se escriben al abrir la salida, antes de que la codificación haya visto ningún silencio, así que se añaden con una copia del M4B ya codificado (`-c copy`): solo cuesta leer y escribir el archivo, sin volver a decodificar el audio.
 
         Args:
-            line (str): Línea de salida de ffmpeg que contiene "time=".
+            temp_path (Path): M4B temporal recién codificado. Se sustituye por la versión con capítulos.
+            silence_log_path (Path): Archivo de detecciones escrito por ffmpeg.
+            options (SilenceChapterOptions): Parámetros de la detección.
 
         Returns:
-            float: Segundos transcurridos del procesamiento. Retorna 0.0 si no se puede parsear el tiempo.
-
-        Example:
-            >>> line = "frame=1234 time=00:15:30.45 bitrate=128k"
-            >>> converter._parse_ffmpeg_time(line)
-            930.45
+            int: Capítulos incrustados; 0 si no se encontró ninguna frontera que respete `min_chapter_seconds`.
         """
+        silences = ChapterService.parse_silences(silence_log_path) if silence_log_path.exists() else []
+        chapters = ChapterService.from_silences(silences, self.audio_info.duration_seconds, options.min_chapter_seconds)
+        self.logger.info(f"Silencios detectados: {len(silences)}; capítulos: {len(chapters)}")
+        if len(chapters) < 2:
+            return 0
+
+        chapters_path = silence_log_path.with_suffix(".chapters.txt")
+        chaptered_path = temp_path.with_suffix(".chapters.m4b")
         try:
-            # ffprobe time=00:00:00.00
-            time_str = line.split("time=")[1].split()[0]
-            h, m, s = time_str.split(':')
-            return int(h) * 3600 + int(m) * 60 + float(s)
-        except:
-            return 0.0
+            ChapterService.write_ffmetadata(chapters, chapters_path)
+            FfmpegProgressService().run(self._build_chapters_command(temp_path, chapters_path, chaptered_path))
+            chaptered_path.replace(temp_path)
+        finally:
+            for path in (chapters_path, chaptered_path):
+                if path.exists():
+                    path.unlink()
+        return len(chapters)
 
     def convert(
         self,
         bitrate: Bitrate = Bitrate.B_64K,
         channels: int = 1,
         cover_path: Optional[Path] = None,
-        progress_callback: Optional[Callable[[float], None]] = None,
-        task: Optional[ConversionTask] = None
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        task: Optional[ConversionTask] = None,
+        threads: int = 0,
+        source_cover_stream: Optional[int] = None,
+        cover_output_path: Optional[Path] = None,
+        benchmark: bool = False,
+        remux: bool = False,
+        encoder: AudioProfile = AudioProfile.AAC,
+        profile: AudioProfile = AudioProfile.AAC_LOW,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        sample_rate: Optional[int] = None,
+        chapters_path: Optional[Path] = None,
+        silence_chapters: Optional[SilenceChapterOptions] = None
     ) -> ConversionResult:
         """
         Ejecuta la conversión del archivo de audio a formato M4B.
@@ -174,13 +490,25 @@ class M4bConverterService:
             bitrate (Bitrate): Bitrate objetivo para el archivo convertido. Por defecto Bitrate.B_64K (64 kbps), óptimo para voz.
             channels (int): Número de canales de audio (1=mono, 2=estéreo). Por defecto 1 (mono), recomendado para audiolibros.
             cover_path (Optional[Path]): Ruta a la imagen de portada a incrustar. Si se proporciona, se incluye como attached_pic en el M4B.
-            progress_callback (Optional[Callable[[float], None]]): Función callbackque recibe el porcentaje de progreso (0-100) durante la conversión. Útil para interfaces de usuario o barras de progreso.
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Función callback que recibe un ProgressEvent (tiempo procesado, porcentaje, velocidad, tamaño y ETA) durante la conversión. Útil para interfaces de usuario o barras de progreso.
             task (Optional[ConversionTask]): Tarea de conversión preconfigurada. Si no se proporciona, se crea una nueva con los parámetros dados.
+            threads (int): Número de hilos que ffmpeg puede usar (0 = auto). En procesamiento paralelo se reparte el total de núcleos entre los trabajos.
+            source_cover_stream (Optional[int]): Índice del stream attached_pic del origen para incrustar la portada directamente, sin imagen intermedia.
+            cover_output_path (Optional[Path]): Ruta donde la misma invocación de ffmpeg escribe la portada como archivo independiente (requiere `source_cover_stream`).
+            benchmark (bool): Si es True, ejecuta ffmpeg con `-benchmark -benchmark_all` y adjunta sus tiempos internos al resultado (`ffmpeg_benchmark`). Por defecto False.
+            remux (bool): Si es True, copia el stream de audio al M4B sin recodificarlo (ver TranscodePlannerService). Por defecto False.
+            encoder (AudioProfile): Codificador AAC (ver EncoderProbeService.select). Por defecto AudioProfile.AAC, el nativo de ffmpeg.
+            profile (AudioProfile): Perfil AAC. Por defecto AudioProfile.AAC_LOW.
+            preset (EncoderPreset): Compromiso entre velocidad y calidad (ver `preset_args`). Por defecto EncoderPreset.BALANCED.
+            sample_rate (Optional[int]): Frecuencia de muestreo de salida en Hz, si se crea la tarea aquí (ver TranscodePlannerService.sample_rate). None conserva la del origen.
+            chapters_path (Optional[Path]): Archivo ffmetadata con capítulos que se incrustan en la misma pasada (ver ChapterService). Por defecto ninguno.
+            silence_chapters (Optional[SilenceChapterOptions]): Si se indica, los silencios se detectan durante la misma invocación de ffmpeg que codifica (ver `_build_ffmpeg_command`) y se convierten en capítulos (`result.chapter_count`). No se combina con `chapters_path`. Por defecto None.
 
         Returns:
             ConversionResult: Objeto con todas las métricas y resultados de la conversión, incluyendo IDs, tiempos, tamaños y rutas.
 
         Raises:
+            ValueError: Si se piden a la vez `chapters_path` y `silence_chapters`.
             RuntimeError: Si ffmpeg falla durante la ejecución.
             Exception: Cualquier otro error durante la conversión (se maneja limpiando archivos temporales antes de relanzar).
 
@@ -189,8 +517,8 @@ class M4bConverterService:
             >>> from m4b_converter.enums import Bitrate
             >>>
             >>> # Función para mostrar progreso
-            >>> def mostrar_progreso(pct):
-            ...     print(f"Progreso: {pct:.1f}%")
+            >>> def mostrar_progreso(event):
+            ...     print(f"Progreso: {event.percent:.1f}% a {event.speed}x, quedan {event.eta_seconds} s")
             >>>
             >>> # Convertir con portada y callback
             >>> result = converter.convert(
@@ -206,63 +534,741 @@ class M4bConverterService:
             >>> print(f"Compresión: {result.compression_ratio*100:.1f}%")
 
         Note:
-            - La conversión se realiza primero en un archivo temporal en AppSettings.TEMP_DIR para evitar archivos corruptos en caso de error.
+            - La conversión se realiza primero en un archivo temporal para evitar archivos corruptos en caso de error. Se escribe en el mismo sistema de archivos que la salida, o en AppSettings.SCRATCH_DIR, para que moverlo no obligue a copiarlo (ver StagingService).
             - Si el proceso falla, se limpia automáticamente el archivo temporal.
-            - El progreso se calcula comparando el tiempo procesado con la duración total del archivo (máximo 99.9% hasta finalizar).
+            - El progreso se lee del canal `-progress` de ffmpeg (ver FfmpegProgressService) y el porcentaje se calcula con la duración total del archivo (máximo 99.9% hasta finalizar). stderr solo se usa para informar de errores.
+            - Con `silence_chapters` los capítulos se añaden tras la codificación con una copia del M4B, incluida en `encode_seconds` (ver `_add_silence_chapters`).
         """
+        if chapters_path and silence_chapters:
+            raise ValueError("Los capítulos por silencios no se combinan con un archivo de capítulos")
+
         # 1. Crear la tarea
         self.current_task = task or ConversionTask(
             input_path=self.audio_info.path,
             bitrate_target=bitrate.value,
-            channels_target=channels
+            channels_target=channels,
+            sample_rate_target=sample_rate
         )
 
-        output_path = self.output_dir / f"{self.audio_info.path.stem}.m4b"
-        temp_path = AppSettings.TEMP_DIR / f"{self.current_task.id}.m4b"
+        output_path, temp_path = self._output_paths()
+        silence_log_path = StagingService.work_dir() / f"{self.current_task.id}.silences.txt" if silence_chapters else None
 
         cmd = self._build_ffmpeg_command(
-            self.current_task, temp_path, AudioProfile.AAC_LOW, threads=0, cover_path=cover_path
+            self.current_task,
+            temp_path,
+            profile,
+            threads=threads,
+            cover_path=cover_path,
+            source_cover_stream=source_cover_stream,
+            cover_output_path=cover_output_path,
+            remux=remux,
+            encoder=encoder,
+            preset=preset,
+            chapters_path=chapters_path,
+            silence_chapters=silence_chapters,
+            silence_log_path=silence_log_path
         )
 
-        self.logger.info(f"Iniciando conversión ID: {self.current_task.id}")
+        self.logger.info(f"Iniciando {'remux' if remux else 'conversión'} ID: {self.current_task.id}")
 
         try:
             # Definimos el tiempo de inicio de la tarea
             timestamp_start = datetime.now()
             
-            # Ejecución con captura de progreso
-            process = subprocess.Popen(
-                cmd, stderr=subprocess.PIPE, universal_newlines=True, encoding="utf-8"
-            )
-
-            for line in process.stderr:
-                if progress_callback and "time=" in line:
-                    # Cálculo de progreso simple basado en tiempo/duración total
-                    current_time = self._parse_ffmpeg_time(line)
-                    percent = (current_time / self.audio_info.duration_seconds) * 100
-                    progress_callback(min(round(percent, 2), 99.9))
-
-            if process.wait() != 0:
-                raise RuntimeError("FFmpeg falló en la ejecución.")
+            # Ejecución con progreso estructurado
+            encode_start = time.perf_counter()
+            runner = FfmpegProgressService(self.audio_info.duration_seconds, benchmark=benchmark)
+            usage = runner.run(cmd, progress_callback)
+            chapter_count = self._add_silence_chapters(temp_path, silence_log_path, silence_chapters) if silence_chapters else 0
+            encode_seconds = time.perf_counter() - encode_start
 
             # 2. Finalizar y mover
+            finalize_start = time.perf_counter()
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            temp_path.replace(output_path)
+            self.staging.move(temp_path, output_path)
+            finalize_seconds = time.perf_counter() - finalize_start
 
             # 3. Retornar objeto de resultado
-            return ConversionResult(
-                task_id=self.current_task.id,
-                output_path=output_path,
-                duration_seconds=self.audio_info.duration_seconds,
-                size_original_bytes=self.audio_info.size_bytes,
-                size_final_bytes=output_path.stat().st_size,
-                bitrate_final=bitrate.value,
-                timestamp_start=timestamp_start,
-                timestamp_end=datetime.now()
+            return self._build_result(
+                bitrate, output_path, timestamp_start, encode_seconds, finalize_seconds, usage, runner.last_benchmark,
+                decision=TranscodeDecision.REMUX if remux else TranscodeDecision.ENCODE,
+                encoder=encoder,
+                profile=profile,
+                preset=preset,
+                chapter_count=chapter_count
             )
 
         except Exception as e:
             if temp_path.exists():
                 temp_path.unlink()
+            if cover_output_path and cover_output_path.exists():
+                cover_output_path.unlink()
             self.logger.error(f"Error en conversión {self.current_task.id}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+        finally:
+            if silence_log_path and silence_log_path.exists():
+                silence_log_path.unlink()
+
+    def _build_renditions_command(
+        self,
+        plans: List[RenditionPlan],
+        temp_paths: List[Path],
+        threads: int,
+        cover_path: Optional[Path] = None,
+        source_cover_stream: Optional[int] = None,
+        cover_output_path: Optional[Path] = None,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        silence_chapters: Optional[SilenceChapterOptions] = None,
+        silence_log_path: Optional[Path] = None
+    ) -> List[str]:
+        """
+        Construye un comando ffmpeg con una salida M4B por versión.
+
+        ffmpeg decodifica cada stream de entrada una sola vez y reparte las tramas entre todas las salidas que lo mapean, así que cada versión solo añade su propio codificador (y su remuestreo, con `-af`). Las opciones de portada, metadatos y detección de silencios son las de `_build_ffmpeg_command`.
+
+        Args:
+            plans (List[RenditionPlan]): Versiones a escribir, con su tratamiento (ENCODE o REMUX), codificador y perfil.
+            temp_paths (List[Path]): Ruta temporal de cada versión, en el mismo orden.
+            threads (int): Hilos de cada codificador (0 = auto).
+            cover_path (Optional[Path]): Imagen de portada a incrustar en todas las versiones.
+            source_cover_stream (Optional[int]): Índice del stream attached_pic del origen; si se indica, se ignora `cover_path`.
+            cover_output_path (Optional[Path]): Ruta donde escribir la portada como salida adicional (requiere `source_cover_stream`).
+            preset (EncoderPreset): Preset de velocidad de todas las versiones codificadas.
+            silence_chapters (Optional[SilenceChapterOptions]): Si se indica, una rama `silencedetect` sobre el audio decodificado escribe sus detecciones en `silence_log_path`, hacia una salida nula.
+            silence_log_path (Optional[Path]): Archivo de detecciones de silencio. Obligatorio con `silence_chapters`.
+
+        Returns:
+            List[str]: Comando ffmpeg listo para ejecutar.
+        """
+        cmd = ["ffmpeg", "-y", *self.input_args]
+
+        cover_input = source_cover_stream is None and cover_path is not None and cover_path.exists()
+        if cover_input:
+            cmd.extend(["-i", str(cover_path)])
+        if silence_chapters:
+            detect = ChapterService.silencedetect_filter(silence_chapters, silence_log_path)
+            cmd.extend(["-filter_complex", f"[0:a]{detect}[silences]"])
+
+        for plan, temp_path in zip(plans, temp_paths):
+            remux = plan.decision == TranscodeDecision.REMUX
+            cmd.extend(["-map", "0:a"])
+            if source_cover_stream is not None:
+                cmd.extend(["-map", f"0:{source_cover_stream}", "-c:v", "copy", "-disposition:v", "attached_pic"])
+            elif cover_input:
+                cmd.extend(["-map", "1:v", "-c:v", "copy", "-disposition:v", "attached_pic"])
+            cmd.extend(self._audio_args(plan.task, threads, remux, plan.encoder, plan.profile, preset))
+            resample_filter = None if remux else self.resample_filter(preset, plan.task.sample_rate_target)
+            if resample_filter:
+                cmd.extend(["-af", resample_filter])
+            cmd.extend(["-f", "mp4", *self._metadata_args(), str(temp_path)])
+
+        if source_cover_stream is not None and cover_output_path:
+            cmd.extend([
+                "-map", f"0:{source_cover_stream}",
+                "-c:v", "copy",
+                "-frames:v", "1",
+                "-update", "1",
+                "-f", "image2",
+                str(cover_output_path)
+            ])
+        if silence_chapters:
+            cmd.extend(["-map", "[silences]", "-f", "null", "-"])
+
+        return cmd
+
+    def convert_renditions(
+        self,
+        plans: List[RenditionPlan],
+        cover_path: Optional[Path] = None,
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        threads: int = 0,
+        source_cover_stream: Optional[int] = None,
+        cover_output_path: Optional[Path] = None,
+        benchmark: bool = False,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        silence_chapters: Optional[SilenceChapterOptions] = None
+    ) -> List[ConversionResult]:
+        """
+        Escribe varias versiones del libro (p. ej. 64k mono y 128k estéreo) desde un único proceso ffmpeg.
+
+        Frente a llamar a `convert` una vez por versión, el origen se lee y se decodifica una sola vez, y el análisis y la portada se comparten.
+
+        Args:
+            plans (List[RenditionPlan]): Versiones a escribir. Cada una sale como `<origen>.<label>.m4b` en `output_dir`.
+            cover_path (Optional[Path]): Imagen de portada a incrustar en todas las versiones.
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Recibe el progreso del proceso común (todas las versiones avanzan a la vez).
+            threads (int): Hilos de cada codificador (0 = auto).
+            source_cover_stream (Optional[int]): Índice del stream attached_pic del origen para incrustar la portada sin imagen intermedia.
+            cover_output_path (Optional[Path]): Ruta donde la misma invocación escribe la portada como archivo independiente (requiere `source_cover_stream`).
+            benchmark (bool): Si es True, adjunta los tiempos internos de ffmpeg a cada resultado.
+            preset (EncoderPreset): Preset de velocidad de las versiones que se codifican. Por defecto EncoderPreset.BALANCED.
+            silence_chapters (Optional[SilenceChapterOptions]): Si se indica, los silencios se detectan una vez durante la misma invocación y los capítulos se incrustan en todas las versiones.
+
+        Returns:
+            List[ConversionResult]: Un resultado por versión, en el orden de `plans`. Los tiempos de codificación, `child_usage` y `ffmpeg_benchmark` son los del proceso compartido.
+
+        Raises:
+            ValueError: Si dos versiones escribirían el mismo archivo.
+            RuntimeError: Si ffmpeg falla. Se eliminan los temporales de todas las versiones.
+        """
+        outputs = []
+        for plan in plans:
+            self.current_task = plan.task
+            outputs.append(self._output_paths(plan.label))
+        if len({output_path for output_path, _ in outputs}) != len(outputs):
+            raise ValueError("Dos versiones escribirían el mismo archivo; usa bitrates, canales o frecuencias distintos")
+
+        silence_log_path = StagingService.work_dir() / f"{plans[0].task.id}.silences.txt" if silence_chapters else None
+        cmd = self._build_renditions_command(
+            plans,
+            [temp_path for _, temp_path in outputs],
+            threads,
+            cover_path=cover_path,
+            source_cover_stream=source_cover_stream,
+            cover_output_path=cover_output_path,
+            preset=preset,
+            silence_chapters=silence_chapters,
+            silence_log_path=silence_log_path
+        )
+
+        self.logger.info(f"Iniciando {len(plans)} versiones en un solo proceso: {', '.join(plan.label or '-' for plan in plans)}")
+
+        try:
+            timestamp_start = datetime.now()
+
+            encode_start = time.perf_counter()
+            runner = FfmpegProgressService(self.audio_info.duration_seconds, benchmark=benchmark)
+            usage = runner.run(cmd, progress_callback)
+            chapter_counts = [
+                self._add_silence_chapters(temp_path, silence_log_path, silence_chapters) if silence_chapters else 0
+                for _, temp_path in outputs
+            ]
+            encode_seconds = time.perf_counter() - encode_start
+
+            results = []
+            for plan, (output_path, temp_path), chapter_count in zip(plans, outputs, chapter_counts):
+                finalize_start = time.perf_counter()
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                self.staging.move(temp_path, output_path)
+                finalize_seconds = time.perf_counter() - finalize_start
+
+                self.current_task = plan.task
+                results.append(self._build_result(
+                    Bitrate(plan.task.bitrate_target), output_path, timestamp_start, encode_seconds, finalize_seconds, usage, runner.last_benchmark,
+                    decision=plan.decision,
+                    encoder=plan.encoder,
+                    profile=plan.profile,
+                    preset=preset,
+                    chapter_count=chapter_count
+                ))
+            return results
+
+        except Exception as e:
+            for _, temp_path in outputs:
+                if temp_path.exists():
+                    temp_path.unlink()
+            if cover_output_path and cover_output_path.exists():
+                cover_output_path.unlink()
+            self.logger.error(f"Error en la conversión de versiones {plans[0].task.id}: {e}")
+            raise
+
+        finally:
+            if silence_log_path and silence_log_path.exists():
+                silence_log_path.unlink()
+
+    def skip(self, bitrate: Bitrate = Bitrate.B_64K, channels: int = 1, task: Optional[ConversionTask] = None) -> ConversionResult:
+        """
+        Registra un archivo que no se convierte porque recodificarlo no aporta nada (ver TranscodePlannerService).
+
+        Args:
+            bitrate (Bitrate): Bitrate objetivo que se descartó.
+            channels (int): Canales objetivo que se descartaron.
+            task (Optional[ConversionTask]): Tarea de conversión preconfigurada.
+
+        Returns:
+            ConversionResult: Resultado cuyo `output_path` es el propio origen, sin reducción de tamaño y con `transcode_decision` SKIP.
+        """
+        self.current_task = task or ConversionTask(
+            input_path=self.audio_info.path,
+            bitrate_target=bitrate.value,
+            channels_target=channels
+        )
+        self.logger.info(f"Conversión omitida ID: {self.current_task.id}")
+        return self._build_result(bitrate, self.audio_info.path, datetime.now(), decision=TranscodeDecision.SKIP)
+
+    async def convert_async(
+        self,
+        bitrate: Bitrate = Bitrate.B_64K,
+        channels: int = 1,
+        cover_path: Optional[Path] = None,
+        task: Optional[ConversionTask] = None,
+        threads: int = 0,
+        source_cover_stream: Optional[int] = None,
+        cover_output_path: Optional[Path] = None,
+        encoder: AudioProfile = AudioProfile.AAC,
+        profile: AudioProfile = AudioProfile.AAC_LOW,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        sample_rate: Optional[int] = None,
+        remux: bool = False
+    ) -> AsyncIterator[Union[ProgressEvent, ConversionResult]]:
+        """
+        Versión asíncrona de `convert` basada en asyncio.create_subprocess_exec.
+
+        En lugar de un callback, entrega los ProgressEvent como un iterador asíncrono y termina entregando el ConversionResult. No bloquea el bucle de eventos, así que un solo bucle puede supervisar cientos de conversiones.
+
+        Args:
+            bitrate (Bitrate): Bitrate objetivo. Por defecto Bitrate.B_64K.
+            channels (int): Número de canales de audio. Por defecto 1 (mono).
+            cover_path (Optional[Path]): Ruta a la imagen de portada a incrustar.
+            task (Optional[ConversionTask]): Tarea de conversión preconfigurada.
+            threads (int): Número de hilos que ffmpeg puede usar (0 = auto).
+            source_cover_stream (Optional[int]): Índice del stream attached_pic del origen para incrustar la portada directamente.
+            cover_output_path (Optional[Path]): Ruta donde la misma invocación de ffmpeg escribe la portada (requiere `source_cover_stream`).
+            encoder (AudioProfile): Codificador AAC. Por defecto AudioProfile.AAC.
+            profile (AudioProfile): Perfil AAC. Por defecto AudioProfile.AAC_LOW.
+            preset (EncoderPreset): Preset de velocidad. Por defecto EncoderPreset.BALANCED.
+            sample_rate (Optional[int]): Frecuencia de muestreo de salida en Hz. None conserva la del origen.
+            remux (bool): Si es True, copia el stream de audio al M4B sin recodificarlo (ver `convert`). Por defecto False.
+
+        Yields:
+            Union[ProgressEvent, ConversionResult]: Eventos de progreso y, como último elemento, el resultado de la conversión.
+
+        Raises:
+            RuntimeError: Si ffmpeg falla durante la ejecución.
+            asyncio.CancelledError: Si la tarea que consume el iterador se cancela.
+
+        Example:
+            >>> async for item in converter.convert_async(bitrate=Bitrate.B_64K):
+            ...     if isinstance(item, ProgressEvent):
+            ...         print(f"{item.percent}%")
+            ...     else:
+            ...         print(f"Listo: {item.output_path}")
+
+        Note:
+            - Si la iteración se cancela o se abandona antes de terminar, el proceso ffmpeg se mata y se eliminan el archivo temporal y la portada de salida.
+        """
+        self.current_task = task or ConversionTask(
+            input_path=self.audio_info.path,
+            bitrate_target=bitrate.value,
+            channels_target=channels,
+            sample_rate_target=sample_rate
+        )
+
+        output_path, temp_path = self._output_paths()
+
+        cmd = self._build_ffmpeg_command(
+            self.current_task,
+            temp_path,
+            profile,
+            threads=threads,
+            cover_path=cover_path,
+            source_cover_stream=source_cover_stream,
+            cover_output_path=cover_output_path,
+            remux=remux,
+            encoder=encoder,
+            preset=preset
+        )
+
+        self.logger.info(f"Iniciando {'remux' if remux else 'conversión'} asíncrona ID: {self.current_task.id}")
+
+        timestamp_start = datetime.now()
+        completed = False
+        try:
+            encode_start = time.perf_counter()
+            async for event in FfmpegProgressService(self.audio_info.duration_seconds).run_async(cmd):
+                yield event
+            encode_seconds = time.perf_counter() - encode_start
+
+            finalize_start = time.perf_counter()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self.staging.move(temp_path, output_path)
+            finalize_seconds = time.perf_counter() - finalize_start
+            completed = True
+
+        except Exception as e:
+            self.logger.error(f"Error en conversión {self.current_task.id}: {e}")
+            raise
+
+        finally:
+            # También cubre la cancelación (CancelledError) y el abandono del iterador
+            if not completed:
+                if temp_path.exists():
+                    temp_path.unlink()
+                if cover_output_path and cover_output_path.exists():
+                    cover_output_path.unlink()
+
+        yield self._build_result(
+            bitrate, output_path, timestamp_start, encode_seconds, finalize_seconds,
+            decision=TranscodeDecision.REMUX if remux else TranscodeDecision.ENCODE,
+            encoder=encoder,
+            profile=profile,
+            preset=preset
+        )
+
+    def auto_segments(self) -> int:
+        """
+        Calcula cuántos segmentos usar en la codificación segmentada.
+
+        Returns:
+            int: Un segmento por núcleo, sin bajar de MIN_SEGMENT_SECONDS por segmento. 1 significa que no compensa segmentar.
+        """
+        by_length = int(self.audio_info.duration_seconds // self.MIN_SEGMENT_SECONDS)
+        return max(1, min(os.cpu_count() or 1, by_length))
+
+    def _plan_segments(self, segments: int) -> List[Tuple[int, int]]:
+        """
+        Divide la duración del audio en rangos alineados a tramas AAC.
+
+        Args:
+            segments (int): Número de segmentos.
+
+        Returns:
+            List[Tuple[int, int]]: Rangos `(trama_inicial, trama_final)` contiguos que cubren todo el audio.
+        """
+        total_frames = math.ceil(
+            self.audio_info.duration_seconds * self._output_sample_rate() / self.AAC_FRAME_SAMPLES
+        )
+        bounds = [round(i * total_frames / segments) for i in range(segments + 1)]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _output_sample_rate(self) -> int:
+        """
+        Frecuencia de muestreo del audio codificado: la de la tarea actual o, si no remuestrea, la del origen.
+        """
+        return self.current_task.sample_rate_target or self.audio_info.sample_rate
+
+    def _frames_to_seconds(self, frames: int) -> str:
+        """
+        Convierte un número de tramas AAC (a la frecuencia de salida) en segundos para ffmpeg.
+        """
+        return f"{frames * self.AAC_FRAME_SAMPLES / self._output_sample_rate():.6f}"
+
+    def _build_segment_command(
+        self,
+        task: ConversionTask,
+        start_frame: int,
+        end_frame: int,
+        is_last: bool,
+        segment_path: Path,
+        threads: int,
+        encoder: AudioProfile = AudioProfile.AAC,
+        preset: EncoderPreset = EncoderPreset.BALANCED
+    ) -> List[str]:
+        """
+        Construye el comando ffmpeg que codifica un segmento a AAC en ADTS.
+
+        El segmento empieza `SEGMENT_PREROLL_FRAMES` tramas antes de su frontera y termina `SEGMENT_POSTROLL_FRAMES` después, para que el codificador tenga contexto a ambos lados; esas tramas extra se descartan al unir.
+
+        Args:
+            task (ConversionTask): Tarea con el bitrate y los canales de destino.
+            start_frame (int): Primera trama del rango que aporta el segmento.
+            end_frame (int): Trama (exclusiva) donde termina el rango.
+            is_last (bool): Si es el último segmento (se codifica hasta el final del origen).
+            segment_path (Path): Archivo .aac de salida.
+            threads (int): Hilos para ffmpeg (0 = auto).
+            encoder (AudioProfile): Codificador AAC. Siempre el AAC nativo con perfil AAC-LC: la división asume tramas de 1024 muestras y una sola trama de cebado.
+            preset (EncoderPreset): Preset de velocidad (ver `preset_args`).
+
+        Returns:
+            List[str]: Comando listo para subprocess.
+        """
+        cmd = ["ffmpeg", "-y"]
+        seek_frame = max(0, start_frame - self.SEGMENT_PREROLL_FRAMES)
+        if seek_frame:
+            cmd.extend(["-ss", self._frames_to_seconds(seek_frame)])
+        if not is_last:
+            cmd.extend(["-t", self._frames_to_seconds(end_frame - seek_frame + self.SEGMENT_POSTROLL_FRAMES)])
+
+        cmd.extend([
+            *self.input_args,
+            "-vn",
+            "-c:a", encoder.value,
+            "-profile:a", AudioProfile.AAC_LOW.value,
+            "-b:a", task.bitrate_target,
+            "-ac", str(task.channels_target),
+            *self._sample_rate_args(task),
+            "-threads", str(threads),
+            *self.preset_args(preset, encoder, AudioProfile.AAC_LOW, task.sample_rate_target),
+            "-f", "adts",
+            str(segment_path)
+        ])
+        return cmd
+
+    def _build_stitch_command(self, output_path: Path, cover_path: Optional[Path] = None) -> List[str]:
+        """
+        Construye el comando que empaqueta en MP4, sin recodificar, el flujo ADTS unido que llega por stdin.
+
+        Args:
+            output_path (Path): Archivo M4B temporal de salida.
+            cover_path (Optional[Path]): Portada a incrustar como attached_pic.
+
+        Returns:
+            List[str]: Comando listo para subprocess.
+        """
+        cmd = ["ffmpeg", "-y", "-v", "error", "-f", "aac", "-i", "pipe:0"]
+
+        if cover_path and cover_path.exists():
+            cmd.extend(["-i", str(cover_path), "-map", "0:a", "-map", "1:v"])
+            cmd.extend(["-c:v", "copy", "-disposition:v", "attached_pic"])
+        else:
+            cmd.extend(["-vn"])
+
+        cmd.extend(["-c:a", "copy", "-f", "mp4"])
+        cmd.extend(self._metadata_args())
+        cmd.append(str(output_path))
+        return cmd
+
+    @staticmethod
+    def _iter_adts_frames(segment_path: Path) -> Iterator[bytes]:
+        """
+        Recorre las tramas de un archivo AAC en formato ADTS.
+
+        Args:
+            segment_path (Path): Archivo .aac generado por ffmpeg.
+
+        Yields:
+            bytes: Cada trama completa, cabecera incluida.
+
+        Raises:
+            RuntimeError: Si el archivo no es un flujo ADTS válido.
+        """
+        with open(segment_path, "rb") as f:
+            while True:
+                header = f.read(7)
+                if len(header) < 7:
+                    return
+                if header[0] != 0xFF or header[1] & 0xF0 != 0xF0:
+                    raise RuntimeError(f"Cabecera ADTS inválida en {segment_path.name}")
+                # frame_length: 13 bits repartidos entre los bytes 3, 4 y 5
+                length = ((header[3] & 0x03) << 11) | (header[4] << 3) | (header[5] >> 5)
+                yield header + f.read(length - 7)
+
+    def _stitch_segments(
+        self,
+        segment_paths: List[Path],
+        plan: List[Tuple[int, int]],
+        output_path: Path,
+        cover_path: Optional[Path] = None
+    ) -> Optional[ResourceUsage]:
+        """
+        Une los segmentos recortando el pre-roll y el post-roll a nivel de trama y los empaqueta en MP4 por copia de stream.
+
+        La primera trama de cada segmento es el cebado (priming) del codificador, por lo que la trama `j` del segmento `i` corresponde a la trama `seek_i + j - 1` del origen. El primer segmento conserva su cebado para que el decodificador arranque limpio; los demás empiezan justo en su frontera. El resultado es un único flujo AAC continuo, sin huecos ni tramas duplicadas.
+
+        Args:
+            segment_paths (List[Path]): Archivos .aac en orden.
+            plan (List[Tuple[int, int]]): Rangos de tramas de cada segmento.
+            output_path (Path): Archivo M4B temporal de salida.
+            cover_path (Optional[Path]): Portada a incrustar.
+
+        Returns:
+            Optional[ResourceUsage]: Recursos consumidos por el proceso ffmpeg de empaquetado.
+
+        Raises:
+            RuntimeError: Si ffmpeg falla al empaquetar.
+        """
+        process = subprocess.Popen(
+            self._build_stitch_command(output_path, cover_path),
+            stdin=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        try:
+            for index, (segment_path, (start, end)) in enumerate(zip(segment_paths, plan)):
+                first = 0 if index == 0 else start - max(0, start - self.SEGMENT_PREROLL_FRAMES) + 1
+                last = None if index == len(plan) - 1 else first + end - start + (1 if index == 0 else 0)
+                for position, frame in enumerate(self._iter_adts_frames(segment_path)):
+                    if last is not None and position >= last:
+                        break
+                    if position >= first:
+                        process.stdin.write(frame)
+        except BrokenPipeError:
+            pass
+        finally:
+            process.stdin.close()
+
+        stderr = process.stderr.read().decode("utf-8", errors="replace")
+        process.stderr.close()
+        returncode, usage = FfmpegProgressService.wait(process)
+        if returncode != 0:
+            raise RuntimeError(f"FFmpeg falló al unir los segmentos: {stderr.strip()}")
+        return usage
+
+    def convert_segmented(
+        self,
+        bitrate: Bitrate = Bitrate.B_64K,
+        channels: int = 1,
+        cover_path: Optional[Path] = None,
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        task: Optional[ConversionTask] = None,
+        segments: int = 0,
+        threads: int = 0,
+        benchmark: bool = False,
+        encoder: AudioProfile = AudioProfile.AAC,
+        preset: EncoderPreset = EncoderPreset.BALANCED,
+        sample_rate: Optional[int] = None
+    ) -> ConversionResult:
+        """
+        Convierte a M4B dividiendo el audio en segmentos que se codifican en paralelo.
+
+        El codificador AAC de ffmpeg usa un solo núcleo, así que un libro de muchas horas deja el resto de la máquina ociosa. Este método reparte la duración en `segments` rangos alineados a tramas AAC, lanza un proceso ffmpeg por rango y une los resultados en un único M4B copiando el stream, sin segunda codificación.
+
+        Para que las uniones no tengan huecos ni clics, cada segmento se codifica con unas tramas de margen a cada lado de su frontera (pre-roll y post-roll) y al unir se descartan por tramas completas, de modo que cada frontera la decodifica un codificador que ya venía "caliente".
+
+        Args:
+            bitrate (Bitrate): Bitrate objetivo. Por defecto Bitrate.B_64K.
+            channels (int): Número de canales de audio. Por defecto 1 (mono).
+            cover_path (Optional[Path]): Ruta a la imagen de portada a incrustar.
+            progress_callback (Optional[Callable[[ProgressEvent], None]]): Función que recibe un ProgressEvent agregado de todos los segmentos (tiempo y tamaño sumados, velocidad conjunta).
+            task (Optional[ConversionTask]): Tarea de conversión preconfigurada.
+            segments (int): Número de segmentos (0 = automático, ver `auto_segments`). Si resulta 1 o menos se usa `convert`.
+            threads (int): Hilos que puede usar cada proceso ffmpeg (0 = auto).
+            benchmark (bool): Si es True, adjunta al resultado los tiempos internos agregados de los ffmpeg de cada segmento.
+            encoder (AudioProfile): Codificador AAC de cada segmento. Por defecto AudioProfile.AAC.
+            preset (EncoderPreset): Preset de velocidad de cada segmento. Por defecto EncoderPreset.BALANCED.
+            sample_rate (Optional[int]): Frecuencia de muestreo de salida en Hz. Las tramas de la división se cuentan a esta frecuencia. None conserva la del origen.
+
+        Returns:
+            ConversionResult: Objeto con las métricas de la conversión.
+
+        Raises:
+            RuntimeError: Si falla la codificación de algún segmento o la unión.
+
+        Example:
+            >>> result = converter.convert_segmented(
+            ...     bitrate=Bitrate.B_64K,
+            ...     channels=1,
+            ...     segments=4
+            ... )
+
+        Note:
+            - Los segmentos se escriben en <StagingService.work_dir()>/<id de tarea>_segments/ y se eliminan siempre al terminar.
+            - Si un segmento falla, se detienen los demás procesos ffmpeg.
+            - El audio resultante conserva las 1024 muestras de cebado del codificador (~23 ms a 44,1 kHz) al principio.
+            - No admite `source_cover_stream`: la portada se pasa como imagen con `cover_path`.
+            - Siempre usa el perfil AAC-LC: las tramas HE-AAC no encajan con la alineación de 1024 muestras de los segmentos.
+            - Solo segmenta con el AAC nativo de ffmpeg, que ceba exactamente una trama. libfdk_aac (~2048 muestras) y AudioToolbox (2112, que no es un número entero de tramas) descuadrarían cada unión, así que con ellos se usa `convert`.
+        """
+        segments = segments or self.auto_segments()
+        if segments > 1 and encoder != AudioProfile.AAC:
+            self.logger.warning(f"La codificación segmentada solo admite el AAC nativo; con {encoder} se codifica sin segmentar.")
+            segments = 1
+        if segments <= 1:
+            return self.convert(
+                bitrate=bitrate,
+                channels=channels,
+                cover_path=cover_path,
+                progress_callback=progress_callback,
+                task=task,
+                threads=threads,
+                benchmark=benchmark,
+                encoder=encoder,
+                preset=preset,
+                sample_rate=sample_rate
+            )
+
+        self.current_task = task or ConversionTask(
+            input_path=self.audio_info.path,
+            bitrate_target=bitrate.value,
+            channels_target=channels,
+            sample_rate_target=sample_rate
+        )
+
+        output_path, temp_path = self._output_paths()
+        segments_dir = StagingService.work_dir() / f"{self.current_task.id}_segments"
+        segments_dir.mkdir(parents=True, exist_ok=True)
+
+        plan = self._plan_segments(segments)
+        segment_paths = [segments_dir / f"{index:04d}.aac" for index in range(len(plan))]
+        frame_seconds = self.AAC_FRAME_SAMPLES / self._output_sample_rate()
+        segment_seconds = [(end - start) * frame_seconds for start, end in plan]
+        latest: List[Optional[ProgressEvent]] = [None] * len(plan)
+        usages: List[Optional[ResourceUsage]] = [None] * len(plan)
+        benchmarks: List[Optional[FfmpegBenchmark]] = [None] * len(plan)
+
+        lock = threading.Lock()
+        cancelled = threading.Event()
+        processes: List[subprocess.Popen] = []
+
+        def register(process: subprocess.Popen) -> None:
+            with lock:
+                processes.append(process)
+                if cancelled.is_set():
+                    process.kill()
+
+        def report(index: int, event: ProgressEvent) -> None:
+            with lock:
+                latest[index] = event
+                events = [e for e in latest if e]
+                done_us = sum(
+                    min(e.out_time_us, int(segment_seconds[i] * 1_000_000))
+                    for i, e in enumerate(latest) if e
+                )
+                speeds = [e.speed for e in events if e.speed and not e.finished]
+                aggregate = ProgressEvent(
+                    out_time_us=done_us,
+                    total_size=sum(e.total_size for e in events),
+                    speed=sum(speeds) if speeds else None,
+                    duration_seconds=self.audio_info.duration_seconds
+                )
+            progress_callback(aggregate)
+
+        def encode_segment(index: int) -> None:
+            if cancelled.is_set():
+                return
+            start, end = plan[index]
+            cmd = self._build_segment_command(
+                self.current_task, start, end, index == len(plan) - 1, segment_paths[index], threads, encoder, preset
+            )
+            runner = FfmpegProgressService(segment_seconds[index], benchmark=benchmark)
+            try:
+                usages[index] = runner.run(
+                    cmd,
+                    (lambda event: report(index, event)) if progress_callback else None,
+                    on_start=register
+                )
+                benchmarks[index] = runner.last_benchmark
+            except RuntimeError as e:
+                if not cancelled.is_set():
+                    raise RuntimeError(f"FFmpeg falló en el segmento {index}: {e}")
+
+        self.logger.info(f"Iniciando conversión segmentada ID: {self.current_task.id} ({len(plan)} segmentos)")
+
+        try:
+            timestamp_start = datetime.now()
+            encode_start = time.perf_counter()
+
+            with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+                futures = [executor.submit(encode_segment, index) for index in range(len(plan))]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except Exception:
+                    # Un segmento falló: detenemos el resto antes de salir
+                    with lock:
+                        cancelled.set()
+                        for process in processes:
+                            if process.poll() is None:
+                                process.kill()
+                    raise
+
+            usages.append(self._stitch_segments(segment_paths, plan, temp_path, cover_path))
+            encode_seconds = time.perf_counter() - encode_start
+
+            finalize_start = time.perf_counter()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self.staging.move(temp_path, output_path)
+            finalize_seconds = time.perf_counter() - finalize_start
+
+            return self._build_result(
+                bitrate, output_path, timestamp_start, encode_seconds, finalize_seconds,
+                ResourceUsage.combine(usages), FfmpegBenchmark.combine(benchmarks), encoder=encoder, preset=preset
+            )
+
+        except Exception as e:
+            if temp_path.exists():
+                temp_path.unlink()
+            self.logger.error(f"Error en conversión segmentada {self.current_task.id}: {e}")
+            raise
+
+        finally:
+            shutil.rmtree(segments_dir, ignore_errors=True)
@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from m4b_converter.enums import TranscodeDecision
+from m4b_converter.schemas import ConversionResult
+
+
+class MetricsService:
+    """
+    Contadores e histogramas de un lote de conversiones, exportados periódicamente a archivos.
+
+    Pensado para lotes desatendidos: un hilo escribe cada `interval` segundos un archivo de texto en el formato de exposición de Prometheus (el que lee el textfile collector de node_exporter) y/o un archivo JSON de estado. Cada escritura es atómica (archivo temporal en el mismo directorio + `os.replace`), así que un lector nunca ve un archivo a medias.
+
+    Métricas exportadas:
+
+    - `m4b_converter_files_converted_total` / `m4b_converter_files_failed_total` (counter).
+    - `m4b_converter_files_skipped_total` (counter): archivos que no se recodificaron porque no aportaba nada (TranscodeDecision.SKIP).
+    - `m4b_converter_audio_seconds_total` (counter): audio convertido con éxito.
+    - `m4b_converter_input_bytes_total` / `m4b_converter_output_bytes_total` (counter).
+    - `m4b_converter_encode_seconds` (histogram): duración de la etapa de codificación por archivo.
+    - `m4b_converter_queue_depth` (gauge): archivos pendientes que aún no han empezado.
+    - `m4b_converter_active_ffmpeg` (gauge): conversiones en curso.
+    - `m4b_converter_last_update_timestamp_seconds` (gauge): momento de la última escritura, para alertar si el lote se cuelga.
+
+    Attributes:
+        textfile_path (Optional[Path]): Archivo de métricas en formato Prometheus (normalmente con extensión `.prom`).
+        json_path (Optional[Path]): Archivo JSON de estado.
+        interval (float): Segundos entre escrituras.
+        logger (logging.Logger): Logger para registrar eventos y errores.
+        PREFIX (str): Prefijo común de los nombres de las métricas.
+        ENCODE_BUCKETS (List[float]): Límites superiores de las cubetas del histograma de codificación, en segundos.
+
+    Example:
+        >>> from pathlib import Path
+        >>> from m4b_converter.managers import WorkflowManager
+        >>> from m4b_converter.services import MetricsService
+        >>>
+        >>> with MetricsService(textfile_path=Path("/var/lib/node_exporter/m4b.prom"), interval=15) as metrics:
+        ...     WorkflowManager().process_directory(Path("./audiolibros"), jobs=4, metrics=metrics)
+
+    Note:
+        - Los errores al escribir los archivos se registran en el log pero no interrumpen el lote.
+        - Los contadores empiezan en cero con cada instancia; el textfile collector los expone tal cual, así que conviene usar `increase()` sobre series que se reinician por lote.
+    """
+
+    ENCODE_BUCKETS = [1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0]
+    PREFIX = "m4b_converter"
+
+    def __init__(
+        self,
+        textfile_path: Optional[Path] = None,
+        json_path: Optional[Path] = None,
+        interval: float = 15.0
+    ):
+        """
+        Inicializa los contadores a cero.
+
+        Args:
+            textfile_path (Optional[Path]): Destino del archivo en formato Prometheus. None para no escribirlo.
+            json_path (Optional[Path]): Destino del archivo JSON de estado. None para no escribirlo.
+            interval (float): Segundos entre escrituras periódicas. Por defecto 15.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.textfile_path = textfile_path
+        self.json_path = json_path
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = datetime.now()
+        self._finished = False
+
+        self.files_converted = 0
+        self.files_failed = 0
+        self.files_skipped = 0
+        self.audio_seconds = 0.0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.queue_depth = 0
+        self.active = 0
+        self._encode_counts = [0] * len(self.ENCODE_BUCKETS)
+        self._encode_sum = 0.0
+        self._encode_count = 0
+
+    def __enter__(self) -> "MetricsService":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Escribe los archivos por primera vez y lanza el hilo de escritura periódica.
+        """
+        self.write()
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Detiene el hilo y escribe el estado final.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._finished = True
+            self.active = 0
+            self.queue_depth = 0
+        self.write()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def set_queue(self, queue_depth: int, active: int) -> None:
+        """
+        Actualiza los gauges de archivos pendientes y conversiones en curso.
+
+        Args:
+            queue_depth (int): Archivos que aún no han empezado.
+            active (int): Conversiones (procesos ffmpeg) en curso.
+        """
+        with self._lock:
+            self.queue_depth = queue_depth
+            self.active = active
+
+    def record(self, result: Optional[ConversionResult]) -> None:
+        """
+        Registra el final de un archivo.
+
+        Args:
+            result (Optional[ConversionResult]): Resultado de la conversión, o None si falló.
+        """
+        with self._lock:
+            if not result:
+                self.files_failed += 1
+                return
+            if result.transcode_decision == TranscodeDecision.SKIP:
+                self.files_skipped += 1
+                return
+            self.files_converted += 1
+            self.audio_seconds += result.duration_seconds
+            self.input_bytes += result.size_original_bytes
+            self.output_bytes += result.size_final_bytes
+            self._encode_sum += result.encode_seconds
+            self._encode_count += 1
+            for index, bound in enumerate(self.ENCODE_BUCKETS):
+                if result.encode_seconds <= bound:
+                    self._encode_counts[index] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Estado actual de las métricas.
+
+        Returns:
+            Dict[str, Any]: Diccionario serializable a JSON con los contadores, los gauges, el histograma y el throughput medio.
+        """
+        with self._lock:
+            elapsed = (datetime.now() - self._started_at).total_seconds()
+            return {
+                "started_at": self._started_at.isoformat(),
+                "updated_at": datetime.now().isoformat(),
+                "finished": self._finished,
+                "files_converted": self.files_converted,
+                "files_failed": self.files_failed,
+                "files_skipped": self.files_skipped,
+                "queue_depth": self.queue_depth,
+                "active_ffmpeg": self.active,
+                "audio_hours": round(self.audio_seconds / 3600, 3),
+                "input_bytes": self.input_bytes,
+                "output_bytes": self.output_bytes,
+                "encode_seconds": {
+                    "sum": round(self._encode_sum, 3),
+                    "count": self._encode_count,
+                    "buckets": {str(bound): count for bound, count in zip(self.ENCODE_BUCKETS, self._encode_counts)},
+                },
+                "realtime_factor": round(self.audio_seconds / elapsed, 2) if elapsed > 0 else None,
+            }
+
+    def render_textfile(self) -> str:
+        """
+        Genera el contenido del archivo de métricas en formato de exposición de Prometheus.
+
+        Returns:
+            str: Texto con las líneas `# HELP`, `# TYPE` y las muestras.
+        """
+        p = self.PREFIX
+        with self._lock:
+            lines: List[str] = []
+
+            def metric(name: str, kind: str, help_text: str, value: float) -> None:
+                lines.extend([f"# HELP {p}_{name} {help_text}", f"# TYPE {p}_{name} {kind}", f"{p}_{name} {value}"])
+
+            metric("files_converted_total", "counter", "Archivos convertidos con éxito.", self.files_converted)
+            metric("files_failed_total", "counter", "Archivos cuya conversión falló.", self.files_failed)
+            metric("files_skipped_total", "counter", "Archivos omitidos porque recodificarlos no aportaba nada.", self.files_skipped)
+            metric("audio_seconds_total", "counter", "Segundos de audio convertidos.", round(self.audio_seconds, 3))
+            metric("input_bytes_total", "counter", "Bytes de los archivos de origen convertidos.", self.input_bytes)
+            metric("output_bytes_total", "counter", "Bytes de los M4B generados.", self.output_bytes)
+            metric("queue_depth", "gauge", "Archivos pendientes que aún no han empezado.", self.queue_depth)
+            metric("active_ffmpeg", "gauge", "Conversiones en curso.", self.active)
+
+            lines.append(f"# HELP {p}_encode_seconds Duración de la codificación por archivo.")
+            lines.append(f"# TYPE {p}_encode_seconds histogram")
+            for bound, count in zip(self.ENCODE_BUCKETS, self._encode_counts):
+                lines.append(f'{p}_encode_seconds_bucket{{le="{bound}"}} {count}')
+            lines.append(f'{p}_encode_seconds_bucket{{le="+Inf"}} {self._encode_count}')
+            lines.append(f"{p}_encode_seconds_sum {round(self._encode_sum, 3)}")
+            lines.append(f"{p}_encode_seconds_count {self._encode_count}")
+
+            metric("last_update_timestamp_seconds", "gauge", "Momento de la última escritura de métricas.", round(time.time(), 3))
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """
+        Escribe los archivos configurados de forma atómica.
+        """
+        if self.textfile_path:
+            self._write_atomic(self.textfile_path, self.render_textfile())
+        if self.json_path:
+            self._write_atomic(self.json_path, json.dumps(self.snapshot(), indent=2, ensure_ascii=False))
+
+    def _write_atomic(self, path: Path, content: str) -> None:
+        """
+        Escribe `content` en un temporal del mismo directorio y lo renombra sobre `path`.
+
+        El textfile collector ignora los archivos que no terminan en `.prom`, así que el temporal nunca se lee a medias.
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(content)
+                # mkstemp crea el archivo con 0600; el collector suele correr con otro usuario
+                os.chmod(temp_name, 0o644)
+                os.replace(temp_name, path)
+            except BaseException:
+                os.unlink(temp_name)
+                raise
+        except OSError as e:
+            self.logger.warning(f"No se pudieron escribir las métricas en {path}: {e}")
@@ -0,0 +1,259 @@
+import json
+import time
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional, Any, Tuple
+
+from m4b_converter.settings import AppSettings
+from m4b_converter.schemas import AudioFileSchema
+
+
+class ProbeCacheService:
+    """
+    Caché persistente en disco de los resultados de ffprobe.
+
+    Guarda en una base SQLite bajo AppSettings.APP_DIR el JSON crudo de ffprobe y el AudioFileSchema validado de cada archivo analizado, de modo que volver a procesar una biblioteca que no ha cambiado no vuelve a lanzar ffprobe ni a leer el archivo remoto.
+
+    Cada entrada se identifica por (ruta, tamaño, mtime_ns, inodo): si cualquiera de esos valores cambia, la entrada se considera obsoleta y se trata como un fallo. Cuando la caché supera `max_bytes` se expulsan las entradas menos usadas recientemente (LRU).
+
+    Attributes:
+        db_path (Path): Ruta a la base de datos SQLite.
+        max_bytes (int): Tamaño máximo de los datos almacenados antes de expulsar entradas.
+        hits (int): Aciertos de caché en esta instancia.
+        misses (int): Fallos de caché en esta instancia.
+        logger (logging.Logger): Logger para registrar eventos y errores.
+
+    Example:
+        >>> from pathlib import Path
+        >>> from m4b_converter.services import ProbeCacheService
+        >>>
+        >>> cache = ProbeCacheService()
+        >>> entry = cache.get(Path("audiolibro.mp3"))
+        >>> if entry is None:
+        ...     print("No está en caché, hay que ejecutar ffprobe")
+        >>> print(cache.stats())
+
+    Note:
+        - Los errores de SQLite nunca interrumpen el análisis: se registran y la caché se comporta como vacía.
+        - Los contadores acumulados se guardan en la propia base de datos, por lo que incluyen los aciertos y fallos de todos los procesos que la comparten.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = AppSettings.PROBE_CACHE_PATH,
+        max_bytes: int = AppSettings.PROBE_CACHE_MAX_BYTES
+    ):
+        """
+        Inicializa la caché y crea las tablas si no existen.
+
+        Args:
+            db_path (Path): Ruta a la base de datos SQLite. Por defecto AppSettings.PROBE_CACHE_PATH.
+            max_bytes (int): Tamaño máximo de la caché en bytes. Por defecto AppSettings.PROBE_CACHE_MAX_BYTES.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre una conexión a la base de datos de la caché.
+
+        Returns:
+            sqlite3.Connection: Conexión con timeout amplio para tolerar varios procesos concurrentes.
+        """
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self) -> None:
+        """
+        Crea las tablas de entradas y contadores si no existen.
+        """
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS probe_cache (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        inode INTEGER NOT NULL,
+                        raw_json TEXT NOT NULL,
+                        schema_json TEXT,
+                        nbytes INTEGER NOT NULL,
+                        last_access REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_probe_cache_access ON probe_cache (last_access)")
+                conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        except sqlite3.Error as e:
+            self.logger.warning(f"No se pudo inicializar la caché de ffprobe: {e}")
+
+    @staticmethod
+    def file_key(file_path: Path) -> Optional[Tuple[str, int, int, int]]:
+        """
+        Calcula la clave de caché de un archivo.
+
+        Args:
+            file_path (Path): Ruta al archivo de audio.
+
+        Returns:
+            Optional[Tuple[str, int, int, int]]: Tupla (ruta absoluta, tamaño, mtime_ns, inodo), o None si el archivo no existe.
+        """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        return str(file_path.resolve()), stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def get(self, file_path: Path) -> Optional[Tuple[Dict[str, Any], Optional[AudioFileSchema]]]:
+        """
+        Busca un archivo en la caché.
+
+        Args:
+            file_path (Path): Ruta al archivo de audio.
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], Optional[AudioFileSchema]]]: El JSON crudo de ffprobe y el esquema validado (si se guardó), o None si no hay una entrada vigente.
+        """
+        key = self.file_key(file_path)
+        entry = None
+
+        if key:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT raw_json, schema_json FROM probe_cache WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                        key
+                    ).fetchone()
+                    if row:
+                        conn.execute("UPDATE probe_cache SET last_access = ? WHERE path = ?", (time.time(), key[0]))
+                    self._increment(conn, "hits" if row else "misses")
+                if row:
+                    entry = (json.loads(row[0]), self._load_schema(row[1], file_path))
+            except (sqlite3.Error, json.JSONDecodeError) as e:
+                self.logger.warning(f"Error leyendo la caché de ffprobe: {e}")
+
+        if entry:
+            self.hits += 1
+            self.logger.debug(f"Caché de ffprobe: acierto para {file_path.name}")
+        else:
+            self.misses += 1
+            self.logger.debug(f"Caché de ffprobe: fallo para {file_path.name}")
+        return entry
+
+    def _load_schema(self, schema_json: Optional[str], file_path: Path) -> Optional[AudioFileSchema]:
+        """
+        Reconstruye el AudioFileSchema guardado.
+
+        Args:
+            schema_json (Optional[str]): Esquema serializado con sus alias.
+            file_path (Path): Ruta con la que se consultó la caché.
+
+        Returns:
+            Optional[AudioFileSchema]: Esquema validado, o None si no se guardó o ya no es válido para la versión actual.
+        """
+        if not schema_json:
+            return None
+        try:
+            schema = AudioFileSchema.model_validate_json(schema_json, context={"bitrate_in_kbps": True})
+        except ValueError as e:
+            self.logger.debug(f"Esquema en caché descartado para {file_path.name}: {e}")
+            return None
+        return schema.model_copy(update={"path": file_path})
+
+    def put(self, file_path: Path, raw_data: Dict[str, Any], schema: Optional[AudioFileSchema] = None) -> None:
+        """
+        Guarda o reemplaza la entrada de un archivo.
+
+        Args:
+            file_path (Path): Ruta al archivo de audio.
+            raw_data (Dict[str, Any]): Salida JSON de ffprobe ya decodificada.
+            schema (Optional[AudioFileSchema]): Esquema validado del archivo, si se pudo construir.
+        """
+        key = self.file_key(file_path)
+        if not key or not raw_data:
+            return
+
+        raw_json = json.dumps(raw_data)
+        schema_json = schema.model_dump_json(by_alias=True) if schema else None
+        nbytes = len(raw_json) + len(schema_json or "")
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO probe_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, raw_json, schema_json, nbytes, time.time())
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error escribiendo en la caché de ffprobe: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Expulsa las entradas menos usadas hasta quedar por debajo de `max_bytes`.
+
+        Args:
+            conn (sqlite3.Connection): Conexión abierta dentro de la transacción de escritura.
+        """
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM probe_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Liberamos hasta el 90% para no expulsar en cada inserción
+        excess = total - int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for path, nbytes in conn.execute("SELECT path, nbytes FROM probe_cache ORDER BY last_access"):
+            victims.append((path,))
+            freed += nbytes
+            if freed >= excess:
+                break
+
+        conn.executemany("DELETE FROM probe_cache WHERE path = ?", victims)
+        self.logger.debug(f"Caché de ffprobe: {len(victims)} entradas expulsadas ({freed} bytes)")
+
+    @staticmethod
+    def _increment(conn: sqlite3.Connection, name: str) -> None:
+        """
+        Incrementa un contador acumulado en la base de datos.
+        """
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            Dict[str, int]: Aciertos y fallos de esta instancia, totales acumulados, número de entradas y bytes ocupados.
+        """
+        stats = {"hits": self.hits, "misses": self.misses, "total_hits": 0, "total_misses": 0, "entries": 0, "bytes": 0}
+        try:
+            with self._connect() as conn:
+                for name, value in conn.execute("SELECT name, value FROM counters"):
+                    stats[f"total_{name}"] = value
+                stats["entries"], stats["bytes"] = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM probe_cache"
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error leyendo estadísticas de la caché de ffprobe: {e}")
+        return stats
+
+    def clear(self) -> None:
+        """
+        Elimina todas las entradas y reinicia los contadores.
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM probe_cache")
+                conn.execute("DELETE FROM counters")
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error limpiando la caché de ffprobe: {e}")
@@ -0,0 +1,191 @@
+import os
+import errno
+import shutil
+import logging
+from pathlib import Path
+from typing import Dict, Tuple
+
+from m4b_converter.settings import AppSettings
+
+
+class StagingService:
+    """
+    Decide dónde se escriben los M4B mientras se codifican, los mueve a su destino y estima el espacio en disco de cada conversión.
+
+    Un M4B se codifica en un archivo temporal y solo se mueve al directorio de salida cuando está completo, para no dejar archivos a medias. Si el temporal y la salida están en el mismo sistema de archivos, el movimiento es un `rename` instantáneo; si no, el kernel devuelve EXDEV y hay que copiar el libro entero. Por eso el temporal se sitúa así:
+
+    - En AppSettings.SCRATCH_DIR si está configurado (un SSD o un tmpfs). Mover a la salida puede implicar una copia, pero la codificación y la reescritura de capítulos ocurren en el volumen rápido.
+    - En AppSettings.TEMP_DIR si está en el mismo sistema de archivos que la salida.
+    - Si no, como archivo oculto (`.<id>.m4b`) dentro del propio directorio de salida, de modo que mover sea siempre un `rename`.
+
+    Cuando la copia es inevitable, `move` la hace con `shutil.copyfile` (que en Linux usa `sendfile` sin pasar los datos por Python) a un `.part` junto al destino, y lo renombra al terminar: el destino nunca queda a medio escribir.
+
+    Attributes:
+        logger (logging.Logger): Logger para registrar eventos y errores.
+        CONTAINER_OVERHEAD (float): Margen sobre bitrate × duración para el contenedor MP4, los metadatos y la portada incrustada.
+
+    Example:
+        >>> from pathlib import Path
+        >>> from m4b_converter.services import StagingService
+        >>>
+        >>> staging = StagingService()
+        >>> temp_path = staging.staging_path(Path("/mnt/nas/libros"), "tarea.m4b")
+        >>> # ... codificar en temp_path ...
+        >>> staging.move(temp_path, Path("/mnt/nas/libros/libro.m4b"))
+    """
+
+    CONTAINER_OVERHEAD = 1.02
+
+    def __init__(self):
+        """
+        Inicializa el servicio.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @staticmethod
+    def _existing(path: Path) -> Path:
+        """
+        El propio `path` o su ancestro más cercano que exista (los directorios de salida se crean al escribir en ellos).
+        """
+        path = path.absolute()
+        while not path.exists() and path != path.parent:
+            path = path.parent
+        return path
+
+    @classmethod
+    def device(cls, path: Path) -> int:
+        """
+        Identificador del sistema de archivos que contiene (o contendrá) una ruta.
+
+        Args:
+            path (Path): Ruta, exista o no.
+
+        Returns:
+            int: `st_dev` del ancestro existente más cercano.
+        """
+        return cls._existing(path).stat().st_dev
+
+    @staticmethod
+    def work_dir() -> Path:
+        """
+        Directorio de los temporales intermedios que no se mueven a la salida (segmentos, registros de silencios).
+
+        Returns:
+            Path: AppSettings.SCRATCH_DIR si está configurado; si no, AppSettings.TEMP_DIR. Se crea si aún no existe.
+        """
+        directory = AppSettings.SCRATCH_DIR or AppSettings.TEMP_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def staging_dir(self, output_dir: Path) -> Path:
+        """
+        Directorio donde se escribe el M4B en curso de una salida, sin crearlo.
+
+        Args:
+            output_dir (Path): Directorio de salida.
+
+        Returns:
+            Path: AppSettings.SCRATCH_DIR, AppSettings.TEMP_DIR o `output_dir` (ver la descripción de la clase).
+        """
+        if AppSettings.SCRATCH_DIR:
+            return AppSettings.SCRATCH_DIR
+        if self.device(AppSettings.TEMP_DIR) == self.device(output_dir):
+            return AppSettings.TEMP_DIR
+        return output_dir
+
+    def staging_path(self, output_dir: Path, name: str) -> Path:
+        """
+        Ruta del M4B temporal de una salida. Crea su directorio si aún no existe.
+
+        Args:
+            output_dir (Path): Directorio de salida.
+            name (str): Nombre del temporal (ej: "<id de tarea>.m4b").
+
+        Returns:
+            Path: Ruta temporal; dentro de `output_dir` el nombre lleva un punto delante para que no lo recojan `m4b watch` ni los exploradores de archivos.
+        """
+        directory = self.staging_dir(output_dir)
+        if directory == output_dir:
+            name = f".{name}"
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / name
+
+    def move(self, source: Path, destination: Path) -> None:
+        """
+        Mueve un temporal terminado a su destino, sustituyendo el archivo que hubiera.
+
+        Args:
+            source (Path): Archivo temporal.
+            destination (Path): Ruta final.
+
+        Raises:
+            OSError: Si el archivo no se puede renombrar ni copiar. En la copia entre volúmenes se elimina el `.part` y el temporal se conserva.
+        """
+        try:
+            os.replace(source, destination)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+        self.logger.info(f"{destination.parent} está en otro sistema de archivos; copiando {source.name}")
+        part_path = destination.with_name(f".{destination.name}.part")
+        try:
+            shutil.copyfile(source, part_path)
+            os.replace(part_path, destination)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+        source.unlink()
+
+    @classmethod
+    def estimate_output_bytes(cls, duration_seconds: float, bitrate_kbps: int) -> int:
+        """
+        Tamaño previsto de un M4B a partir de su bitrate objetivo.
+
+        Args:
+            duration_seconds (float): Duración del audio.
+            bitrate_kbps (int): Bitrate objetivo en kbps; con varias versiones, la suma de todas.
+
+        Returns:
+            int: Bytes estimados, con el margen de CONTAINER_OVERHEAD.
+        """
+        return int(duration_seconds * bitrate_kbps * 1000 / 8 * cls.CONTAINER_OVERHEAD)
+
+    def requirements(self, output_dir: Path, output_bytes: int, temp_copies: int = 1) -> Dict[int, Tuple[Path, int]]:
+        """
+        Espacio que necesita una conversión en cada sistema de archivos que toca.
+
+        Args:
+            output_dir (Path): Directorio de salida.
+            output_bytes (int): Tamaño estimado de las salidas (ver estimate_output_bytes).
+            temp_copies (int): Copias del audio que coinciden en el volumen temporal: 2 si los capítulos se añaden con una copia del M4B o si los segmentos conviven con el archivo unido. Por defecto 1.
+
+        Returns:
+            Dict[int, Tuple[Path, int]]: Por cada `st_dev`, una ruta del volumen y los bytes que necesita.
+        """
+        staging_dir = self.staging_dir(output_dir)
+        staging_bytes = output_bytes * temp_copies
+        output_device, staging_device = self.device(output_dir), self.device(staging_dir)
+        if output_device == staging_device:
+            return {output_device: (output_dir, max(output_bytes, staging_bytes))}
+        return {output_device: (output_dir, output_bytes), staging_device: (staging_dir, staging_bytes)}
+
+    def fits(self, requirements: Dict[int, Tuple[Path, int]], reserved: Dict[int, int], min_free_bytes: int) -> bool:
+        """
+        Indica si una conversión cabe en disco sin bajar de `min_free_bytes` libres en ningún volumen.
+
+        Args:
+            requirements (Dict[int, Tuple[Path, int]]): Espacio que necesita (ver requirements).
+            reserved (Dict[int, int]): Bytes por `st_dev` ya comprometidos por las conversiones en curso. Como estas ya han escrito parte de su salida, la comprobación es conservadora.
+            min_free_bytes (int): Espacio libre que debe quedar en cada volumen.
+
+        Returns:
+            bool: True si hay espacio en todos los volúmenes.
+        """
+        for device, (path, needed) in requirements.items():
+            free = shutil.disk_usage(self._existing(path)).free - reserved.get(device, 0)
+            if free - needed < min_free_bytes:
+                self.logger.debug(f"Sin espacio en {path}: {free} bytes libres, {needed} necesarios, {min_free_bytes} de reserva")
+                return False
+        return True
@@ -0,0 +1,124 @@
+from typing import Dict, Optional, Tuple, Union
+
+from m4b_converter.enums import AudioProfile, Bitrate, SampleRate, SampleRateMode, TranscodeDecision, TranscodeMode
+from m4b_converter.schemas import AudioFileSchema
+
+
+class TranscodePlannerService:
+    """
+    Decide si un archivo se recodifica, se remuxa o se deja como está.
+
+    Recodificar a AAC un audio que ya cumple el objetivo solo gasta CPU y pierde calidad (es una segunda compresión con pérdida), y en un MP3 de bitrate bajo puede incluso agrandar el archivo. La decisión se toma con los campos del AudioFileSchema (`codec`, `bitrate_kbps`, `channels`, `sample_rate`), sin leer el audio:
+
+    - **REMUX**: el origen ya es AAC, con un bitrate y unos canales que no superan el objetivo y una frecuencia de muestreo habitual. El stream se copia a un contenedor M4B (`-c:a copy`): un m4a de 1 GB se remuxa en segundos en lugar de recodificarse durante decenas de minutos.
+    - **SKIP**: solo con `TranscodeMode.SKIP`, el origen es MP3 con un bitrate por debajo del objetivo y sin canales que reducir. Recodificarlo produciría un archivo más grande sin ganar calidad, así que no se genera M4B. No es el comportamiento por defecto porque deja el libro sin M4B, y el MP3 no se puede remuxar: el muxer ipod de ffmpeg no admite streams MP3.
+    - **ENCODE**: el resto de casos, y todos con `TranscodeMode.ALWAYS` o con una frecuencia de muestreo pedida distinta de la del origen.
+
+    Además, `sample_rate` elige la frecuencia de muestreo de salida de los archivos que se recodifican.
+
+    Attributes:
+        BITRATE_TOLERANCE (float): Margen sobre el bitrate objetivo que se sigue considerando "no mayor": los codificadores VBR y ffprobe informan bitrates medios algo por encima del nominal.
+        MAX_REMUX_SAMPLE_RATE (int): Frecuencia de muestreo máxima que se remuxa tal cual; por encima se recodifica para no arrastrar un stream innecesariamente pesado.
+        SPEECH_MAX_KBPS (Dict[int, int]): Bitrate máximo, por número de canales, al que `sample_rate` baja la salida a 22,05 o 24 kHz.
+
+    Example:
+        >>> from m4b_converter.enums import Bitrate, TranscodeMode
+        >>> from m4b_converter.services import TranscodePlannerService
+        >>>
+        >>> decision, reason = TranscodePlannerService.decide(audio_info, Bitrate.B_64K, channels=1, mode=TranscodeMode.AUTO)
+        >>> print(decision, reason)  # remux "ya es AAC a 64 kbps y 1 canal(es)"
+    """
+
+    BITRATE_TOLERANCE = 1.05
+    MAX_REMUX_SAMPLE_RATE = 48000
+    SPEECH_MAX_KBPS: Dict[int, int] = {1: 64, 2: 96}
+
+    @classmethod
+    def decide(
+        cls,
+        audio_info: AudioFileSchema,
+        bitrate: Bitrate,
+        channels: int,
+        mode: TranscodeMode = TranscodeMode.AUTO,
+        sample_rate: Union[SampleRate, SampleRateMode] = SampleRateMode.AUTO
+    ) -> Tuple[TranscodeDecision, str]:
+        """
+        Elige el tratamiento del archivo.
+
+        Args:
+            audio_info (AudioFileSchema): Archivo analizado.
+            bitrate (Bitrate): Bitrate objetivo.
+            channels (int): Canales objetivo.
+            mode (TranscodeMode): Política de recodificación. Por defecto TranscodeMode.AUTO.
+            sample_rate (Union[SampleRate, SampleRateMode]): Frecuencia de muestreo pedida. Una SampleRate distinta de la del origen obliga a recodificar; la política automática nunca impide un remux. Por defecto SampleRateMode.AUTO.
+
+        Returns:
+            Tuple[TranscodeDecision, str]: Decisión y motivo legible para el log y la CLI.
+        """
+        if mode == TranscodeMode.ALWAYS:
+            return TranscodeDecision.ENCODE, "recodificación forzada"
+        if isinstance(sample_rate, SampleRate) and sample_rate != audio_info.sample_rate:
+            return TranscodeDecision.ENCODE, f"remuestreo de {audio_info.sample_rate} Hz a {sample_rate} Hz"
+
+        target_kbps = int(bitrate.value.rstrip("k"))
+        source_kbps = audio_info.bitrate_kbps
+
+        # Sin bitrate conocido no se puede garantizar que copiar el stream cumpla el objetivo
+        if source_kbps <= 0:
+            return TranscodeDecision.ENCODE, "bitrate de origen desconocido"
+        if audio_info.channels > channels:
+            return TranscodeDecision.ENCODE, f"hay que reducir {audio_info.channels} canales a {channels}"
+
+        codec = audio_info.codec.lower()
+        within_target = source_kbps <= target_kbps * cls.BITRATE_TOLERANCE
+
+        if codec == "aac" and within_target:
+            if audio_info.sample_rate > cls.MAX_REMUX_SAMPLE_RATE:
+                return TranscodeDecision.ENCODE, f"AAC a {audio_info.sample_rate} Hz"
+            return TranscodeDecision.REMUX, f"ya es AAC a {source_kbps} kbps y {audio_info.channels} canal(es)"
+
+        if mode == TranscodeMode.SKIP and codec == "mp3" and source_kbps < target_kbps:
+            return TranscodeDecision.SKIP, f"MP3 a {source_kbps} kbps, por debajo del objetivo de {target_kbps} kbps"
+
+        return TranscodeDecision.ENCODE, f"{codec} a {source_kbps} kbps"
+
+    @classmethod
+    def sample_rate(
+        cls,
+        audio_info: AudioFileSchema,
+        bitrate: Bitrate,
+        channels: int,
+        profile: AudioProfile = AudioProfile.AAC_LOW,
+        requested: Union[SampleRate, SampleRateMode] = SampleRateMode.AUTO
+    ) -> Optional[int]:
+        """
+        Elige la frecuencia de muestreo de salida de un archivo que se recodifica.
+
+        A 64 kbps en mono (o 96 kbps en estéreo) el codificador AAC no conserva nada por encima de unos 11 kHz, así que codificar a 44,1 o 48 kHz solo duplica el trabajo por segundo de audio y reparte los bits entre bandas que se acaban descartando. Con SampleRateMode.AUTO:
+
+        - Hasta SPEECH_MAX_KBPS se baja a 22,05 kHz (orígenes de la familia de 44,1 kHz) o a 24 kHz (el resto), para que la conversión sea de razón 2:1 siempre que se pueda.
+        - Por encima se baja a 44,1 o 48 kHz los orígenes de más de 48 kHz.
+        - Nunca se sube la frecuencia del origen, y los perfiles HE-AAC se dejan al codificador, que ya codifica la banda base a la mitad de frecuencia.
+
+        Args:
+            audio_info (AudioFileSchema): Archivo analizado.
+            bitrate (Bitrate): Bitrate objetivo.
+            channels (int): Canales objetivo.
+            profile (AudioProfile): Perfil AAC elegido. Por defecto AudioProfile.AAC_LOW.
+            requested (Union[SampleRate, SampleRateMode]): Frecuencia pedida, o la política a aplicar. Por defecto SampleRateMode.AUTO.
+
+        Returns:
+            Optional[int]: Frecuencia de salida en Hz, o None para conservar la del origen.
+        """
+        source = audio_info.sample_rate
+        if isinstance(requested, SampleRate):
+            return None if requested == source else int(requested)
+        if requested == SampleRateMode.SOURCE or profile != AudioProfile.AAC_LOW:
+            return None
+
+        is_44k_family = source % 11025 == 0
+        if int(bitrate.value.rstrip("k")) <= cls.SPEECH_MAX_KBPS.get(channels, cls.SPEECH_MAX_KBPS[1]):
+            target = SampleRate.SR_22050 if is_44k_family else SampleRate.SR_24000
+        else:
+            target = SampleRate.SR_44100 if is_44k_family else SampleRate.SR_48000
+        return int(target) if source > target else None
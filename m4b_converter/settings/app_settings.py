@@ -1,4 +1,6 @@
+import os
 from pathlib import Path
+from typing import Optional
 
 __version__ = "1.1.1"
 
@@ -8,13 +10,23 @@ class AppSettings:
 
     Esta clase maneja la configuración global de la aplicación, incluyendo el nombre, versión y estructura de directorios necesarios para el funcionamiento del conversor de audiolibros a formato M4B.
 
+    Importar la configuración no toca el disco: cada directorio se crea en el momento en que se escribe en él, de modo que comandos como `m4b version` o `m4b analyze` arrancan sin efectos secundarios.
+
     Attributes:
         NAME (str): Nombre de la aplicación.
         VERSION (str): Versión actual de la aplicación.
         APP_DIR (Path): Directorio raíz de la aplicación en el home del usuario.
         TEMP_DIR (Path): Directorio para archivos temporales durante la conversión.
+        SCRATCH_DIR (Optional[Path]): Volumen rápido (SSD, tmpfs) donde se escriben los M4B en curso, tomado de la variable de entorno `M4B_SCRATCH_DIR`. None para usar TEMP_DIR, o el propio directorio de salida si está en otro sistema de archivos (ver StagingService).
+        MIN_FREE_BYTES (int): Espacio libre que un lote deja siempre en los volúmenes de salida y de trabajo; los archivos que lo rebasarían esperan a que terminen otros.
         OUTPUT_DIR (Path): Directorio donde se guardan los archivos M4B convertidos.
         LOGS_DIR (Path): Directorio para almacenar los archivos de registro (logs).
+        PROFILES_DIR (Path): Directorio por defecto de los perfiles `.prof` generados con `--profile`. Se crea al usarlo.
+        PROBE_CACHE_PATH (Path): Base de datos SQLite con la caché de resultados de ffprobe.
+        PROBE_CACHE_MAX_BYTES (int): Tamaño máximo de la caché de ffprobe antes de expulsar las entradas menos usadas.
+        ENCODER_CACHE_PATH (Path): JSON con los codificadores y la versión del ffmpeg instalado, invalidado si cambia el binario.
+        JOB_QUEUE_PATH (Path): Base de datos SQLite con la cola persistente de conversiones.
+        JOB_LEASE_SECONDS (int): Segundos que un worker retiene un trabajo sin renovar su lease antes de que otro pueda tomarlo.
     """
     # Datos de la app
     NAME: str = "M4B Converter"
@@ -25,9 +37,17 @@ class AppSettings:
     TEMP_DIR: Path = APP_DIR / "temp"
     OUTPUT_DIR: Path = APP_DIR / "output"
     LOGS_DIR: Path = APP_DIR / "logs"
+    PROFILES_DIR: Path = APP_DIR / "profiles"
+    SCRATCH_DIR: Optional[Path] = Path(os.environ["M4B_SCRATCH_DIR"]).expanduser() if os.environ.get("M4B_SCRATCH_DIR") else None
+    MIN_FREE_BYTES: int = 1024 * 1024 * 1024
+
+    # Caché de ffprobe
+    PROBE_CACHE_PATH: Path = APP_DIR / "probe_cache.sqlite3"
+    PROBE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Caché de las capacidades de ffmpeg
+    ENCODER_CACHE_PATH: Path = APP_DIR / "encoders.json"
 
-    # Crear directorios si no existen
-    APP_DIR.mkdir(parents=True, exist_ok=True)
-    TEMP_DIR.mkdir(parents=True, exist_ok=True)
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    LOGS_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+    # Cola persistente de trabajos
+    JOB_QUEUE_PATH: Path = APP_DIR / "jobs.sqlite3"
+    JOB_LEASE_SECONDS: int = 300
\ No newline at end of file
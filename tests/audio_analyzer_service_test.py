@@ -0,0 +1,53 @@
+import sys
+import asyncio
+from pathlib import Path
+
+from m4b_converter.services import AudioAnalyzerService
+
+RAW = {"format": {"format_name": "mp3", "duration": "60.0", "size": "480000", "bit_rate": "64000"}, "streams": [{"codec_type": "audio", "codec_name": "mp3", "sample_rate": "44100", "channels": 1}]}
+
+
+def _collect(paths, concurrency=2):
+    async def collect():
+        return [info async for info in AudioAnalyzerService.analyze_many(paths, concurrency=concurrency, use_cache=False)]
+    return asyncio.run(collect())
+
+
+def test_analyze_many_skips_files_that_fail(monkeypatch):
+    async def fake_raw_info(file_path):
+        if file_path.name == "sin_ffprobe.mp3":
+            raise FileNotFoundError("ffprobe")
+        return {} if file_path.name == "corrupto.mp3" else RAW
+
+    monkeypatch.setattr(AudioAnalyzerService, "get_raw_info_async", staticmethod(fake_raw_info))
+    paths = [Path("uno.mp3"), Path("corrupto.mp3"), Path("sin_ffprobe.mp3"), Path("dos.mp3")]
+
+    infos = _collect(paths)
+
+    assert sorted(info.path.name for info in infos) == ["dos.mp3", "uno.mp3"]
+
+
+def test_cancelled_probe_kills_ffprobe(monkeypatch):
+    monkeypatch.setattr(AudioAnalyzerService, "_build_ffprobe_command", staticmethod(lambda file_path: [sys.executable, "-c", "import time; time.sleep(30)"]))
+    spawned = []
+    create = asyncio.create_subprocess_exec
+
+    async def tracked(*args, **kwargs):
+        process = await create(*args, **kwargs)
+        spawned.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", tracked)
+
+    async def run():
+        task = asyncio.create_task(AudioAnalyzerService.get_raw_info_async(Path("lento.mp3")))
+        while not spawned:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return spawned[0].returncode
+
+    assert asyncio.run(run()) is not None
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+from m4b_converter.schemas import AudioFileSchema, Chapter
+from m4b_converter.services import ChapterService
+
+
+def _info(name: str, duration: float, title: str = "") -> AudioFileSchema:
+    return AudioFileSchema(
+        path=Path(name),
+        size=1000,
+        format_name="mp3",
+        duration=duration,
+        codec_name="mp3",
+        bit_rate="64000",
+        sample_rate=44100,
+        channels=1,
+        metadata={"title": title} if title else {}
+    )
+
+
+def _bounds(chapters):
+    return [(chapter.start_seconds, chapter.end_seconds) for chapter in chapters]
+
+
+def test_from_silences_puts_boundaries_in_silence_centers():
+    chapters = ChapterService.from_silences([(590, 610), (1195, 1205)], duration_seconds=1800, min_chapter_seconds=300)
+
+    assert _bounds(chapters) == [(0, 600), (600, 1200), (1200, 1800)]
+    assert [chapter.title for chapter in chapters] == ["Capítulo 1", "Capítulo 2", "Capítulo 3"]
+
+
+def test_from_silences_prefers_longest_silence_within_min_spacing():
+    # Las dos pausas están a 100 s: solo cabe una, y gana la más larga aunque llegue después
+    silences = [(599, 601), (695, 705)]
+
+    chapters = ChapterService.from_silences(silences, duration_seconds=1800, min_chapter_seconds=300)
+
+    assert _bounds(chapters) == [(0, 700), (700, 1800)]
+
+
+def test_from_silences_drops_boundaries_near_the_edges():
+    chapters = ChapterService.from_silences([(10, 20), (1790, 1799)], duration_seconds=1800, min_chapter_seconds=300)
+
+    assert _bounds(chapters) == [(0, 1800)]
+
+
+def test_from_files_chains_durations_and_falls_back_to_file_names():
+    same_title = [_info("01.mp3", 60.5, "Libro"), _info("02.mp3", 30, "Libro")]
+    own_titles = [_info("01.mp3", 60.5, "Prólogo"), _info("02.mp3", 30)]
+
+    chapters = ChapterService.from_files(same_title)
+    assert _bounds(chapters) == [(0, 60.5), (60.5, 90.5)]
+    assert [chapter.title for chapter in chapters] == ["01", "02"]
+    assert [chapter.title for chapter in ChapterService.from_files(own_titles)] == ["Prólogo", "02"]
+
+
+def test_write_ffmetadata_uses_milliseconds_and_escapes(tmp_path):
+    chapters = [
+        Chapter(title="Uno; el principio", start_seconds=0, end_seconds=61.234),
+        Chapter(title="Dos = #2", start_seconds=61.234, end_seconds=120),
+    ]
+
+    path = ChapterService.write_ffmetadata(chapters, tmp_path / "sub" / "capitulos.txt", {"title": "A\\B"})
+
+    assert path.read_text(encoding="utf-8") == (
+        ";FFMETADATA1\n"
+        "title=A\\\\B\n"
+        "\n[CHAPTER]\nTIMEBASE=1/1000\nSTART=0\nEND=61234\ntitle=Uno\\; el principio\n"
+        "\n[CHAPTER]\nTIMEBASE=1/1000\nSTART=61234\nEND=120000\ntitle=Dos \\= \\#2\n"
+    )
+
+
+def test_parse_silences_pairs_start_and_end(tmp_path):
+    log = tmp_path / "silencios.txt"
+    log.write_text(
+        "frame:10 pts:441000 pts_time:10\n"
+        "lavfi.silence_start=-0.01\n"
+        "lavfi.silence_end=2.5\n"
+        "lavfi.silence_duration=2.51\n"
+        "lavfi.silence_start=600.25\n"
+        "lavfi.silence_end=602\n"
+        "lavfi.silence_start=1790\n",  # llega hasta el final: sin fin, se descarta
+        encoding="utf-8"
+    )
+
+    assert ChapterService.parse_silences(log) == [(0.0, 2.5), (600.25, 602.0)]
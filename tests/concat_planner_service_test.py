@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import pytest
+
+from m4b_converter.enums import ConcatStrategy
+from m4b_converter.schemas import AudioFileSchema
+from m4b_converter.services import ConcatPlannerService
+
+
+def _info(name: str, sample_rate: int = 44100, channels: int = 2, duration: float = 600, codec: str = "mp3", kbps: int = 128) -> AudioFileSchema:
+    return AudioFileSchema(
+        path=Path(name),
+        size=1000,
+        format_name="mp3",
+        duration=duration,
+        codec_name=codec,
+        bit_rate=str(kbps * 1000),
+        sample_rate=sample_rate,
+        channels=channels,
+        metadata={}
+    )
+
+
+def test_matching_files_use_the_demuxer():
+    plan = ConcatPlannerService.plan([_info("01.mp3"), _info("02.mp3")], copy_output=True)
+
+    assert plan.strategy == ConcatStrategy.DEMUXER
+    assert (plan.codec, plan.sample_rate, plan.channels) == ("mp3", 44100, 2)
+    assert plan.outliers == []
+    assert plan.duration_seconds == 1200
+
+
+def test_reference_is_the_longest_parameter_set():
+    # Dos archivos cortos a 22050 Hz frente a uno largo a 44100 Hz: la referencia es la del largo
+    infos = [_info("01.mp3", 22050, duration=100), _info("02.mp3", duration=1000), _info("03.mp3", 22050, duration=100)]
+
+    plan = ConcatPlannerService.plan(infos, copy_output=False)
+
+    assert plan.strategy == ConcatStrategy.FILTERGRAPH
+    assert plan.sample_rate == 44100
+    assert [len(run.files) for run in plan.runs] == [1, 1, 1]
+    assert [run.normalize for run in plan.runs] == [True, False, True]
+    assert [info.path.name for info in plan.outliers] == ["01.mp3", "03.mp3"]
+
+
+def test_copied_output_normalizes_outliers():
+    infos = [_info("01.mp3"), _info("02.mp3", channels=1, duration=60), _info("03.mp3")]
+
+    plan = ConcatPlannerService.plan(infos, copy_output=True)
+
+    assert plan.strategy == ConcatStrategy.NORMALIZE
+    assert [info.path.name for info in plan.outliers] == ["02.mp3"]
+    assert plan.reason.startswith("1 de 3 archivos")
+
+
+def test_too_many_runs_fall_back_to_normalize():
+    count = ConcatPlannerService.MAX_GRAPH_INPUTS + 1
+    infos = [_info(f"{index:03}.mp3", 22050 if index % 2 else 44100) for index in range(count)]
+
+    plan = ConcatPlannerService.plan(infos, copy_output=False)
+
+    assert len(plan.runs) == count
+    assert plan.strategy == ConcatStrategy.NORMALIZE
+    assert f"más de {ConcatPlannerService.MAX_GRAPH_INPUTS}" in plan.reason
+
+
+def test_rejects_empty_input_and_unknown_reference_codec():
+    with pytest.raises(ValueError):
+        ConcatPlannerService.plan([], copy_output=True)
+
+    infos = [_info("01.mp3", codec="opus", duration=1000), _info("02.mp3", 22050)]
+    with pytest.raises(ValueError, match="opus"):
+        ConcatPlannerService.plan(infos, copy_output=True)
+
+
+def test_filtergraph_converts_only_outlier_runs():
+    infos = [_info("01.mp3"), _info("02.mp3", 48000, channels=1, duration=60)]
+    plan = ConcatPlannerService.plan(infos, copy_output=False)
+
+    assert ConcatPlannerService.filtergraph(plan, "joined") == (
+        "[0:a]anull[r0];"
+        "[1:a]aresample=44100,aformat=channel_layouts=stereo[r1];"
+        "[r0][r1]concat=n=2:v=0:a=1[joined]"
+    )
+
+
+def test_normalize_command_keeps_source_bitrate(tmp_path):
+    infos = [_info("01.mp3", duration=1000), _info("02.mp3", 22050, channels=1, kbps=0)]
+    plan = ConcatPlannerService.plan(infos, copy_output=True)
+
+    command = ConcatPlannerService.normalize_command(plan.outliers[0], plan, tmp_path / "02.mp3")
+
+    assert command[command.index("-af") + 1] == "aresample=44100,aformat=channel_layouts=stereo"
+    assert command[command.index("-c:a") + 1] == "libmp3lame"
+    # Bitrate de origen desconocido: se usa DEFAULT_NORMALIZE_KBPS
+    assert command[command.index("-b:a") + 1] == f"{ConcatPlannerService.DEFAULT_NORMALIZE_KBPS}k"
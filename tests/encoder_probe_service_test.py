@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from m4b_converter.enums import AudioProfile, Bitrate
+from m4b_converter.schemas import EncoderCapabilities
+from m4b_converter.services import EncoderProbeService
+
+# Salida de `ffmpeg -hide_banner -encoders` de una build con libfdk_aac (recortada)
+ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ A..... = Audio
+ S..... = Subtitle
+ .F.... = Frame-level multithreading
+ ..S... = Slice-level multithreading
+ ...X.. = Codec is experimental
+ ....B. = Supports draw_horiz_band
+ .....D = Supports direct rendering method 1
+ ------
+ V....D a64multi             Multicolor charset for Commodore 64 (codec a64_multi)
+ A....D aac                  AAC (Advanced Audio Coding)
+ A....D libfdk_aac           Fraunhofer FDK AAC (codec aac)
+ A....D libmp3lame           libmp3lame MP3 (MPEG audio layer 3) (codec mp3)
+ S..... ass                  ASS (Advanced SubStation Alpha) subtitle
+"""
+
+
+def _probe(monkeypatch, tmp_path, *encoders: str) -> EncoderProbeService:
+    probe = EncoderProbeService(cache_path=tmp_path / "encoders.json")
+    monkeypatch.setattr(probe, "capabilities", lambda: EncoderCapabilities(version="ffmpeg 7.0", audio_encoders=list(encoders)))
+    return probe
+
+
+def test_parse_encoders_keeps_only_audio_after_legend():
+    assert EncoderProbeService.parse_encoders(ENCODERS_OUTPUT) == ["aac", "libfdk_aac", "libmp3lame"]
+
+
+def test_auto_prefers_fastest_available_encoder(monkeypatch, tmp_path):
+    assert _probe(monkeypatch, tmp_path, "aac", "libfdk_aac").select(Bitrate.B_64K, 1) == (AudioProfile.LIBFDK_AAC, AudioProfile.AAC_LOW)
+    assert _probe(monkeypatch, tmp_path, "aac", "aac_at").select(Bitrate.B_64K, 1) == (AudioProfile.AAC_AT, AudioProfile.AAC_LOW)
+    assert _probe(monkeypatch, tmp_path, "aac").select(Bitrate.B_64K, 1) == (AudioProfile.AAC, AudioProfile.AAC_LOW)
+
+
+def test_auto_profile_uses_he_aac_at_low_bitrates_only(monkeypatch, tmp_path):
+    probe = _probe(monkeypatch, tmp_path, "aac", "libfdk_aac")
+
+    assert probe.select(Bitrate.B_48K, 1) == (AudioProfile.LIBFDK_AAC, AudioProfile.AAC_HE)
+    assert probe.select(Bitrate.B_64K, 1)[1] == AudioProfile.AAC_LOW
+    # El AAC nativo no tiene HE-AAC: a 32k sigue con AAC-LC
+    assert probe.select(Bitrate.B_32K, 1, encoder=AudioProfile.AAC) == (AudioProfile.AAC, AudioProfile.AAC_LOW)
+
+
+def test_rejects_he_aac_with_native_encoder(monkeypatch, tmp_path):
+    probe = _probe(monkeypatch, tmp_path, "aac", "libfdk_aac")
+
+    with pytest.raises(ValueError, match="no admite el perfil"):
+        probe.select(Bitrate.B_32K, 1, encoder=AudioProfile.AAC, profile=AudioProfile.AAC_HE)
+
+
+def test_rejects_he_aac_v2_with_mono_output(monkeypatch, tmp_path):
+    probe = _probe(monkeypatch, tmp_path, "libfdk_aac")
+
+    with pytest.raises(ValueError, match="estéreo"):
+        probe.select(Bitrate.B_32K, 1, profile=AudioProfile.AAC_HE_V2)
+    assert probe.select(Bitrate.B_32K, 2, profile=AudioProfile.AAC_HE_V2) == (AudioProfile.LIBFDK_AAC, AudioProfile.AAC_HE_V2)
+
+
+def test_rejects_missing_or_non_aac_encoder(monkeypatch, tmp_path):
+    probe = _probe(monkeypatch, tmp_path, "aac")
+
+    with pytest.raises(ValueError, match="no incluye el codificador libfdk_aac"):
+        probe.select(Bitrate.B_64K, 1, encoder=AudioProfile.LIBFDK_AAC)
+    with pytest.raises(ValueError, match="no es un codificador AAC"):
+        probe.select(Bitrate.B_64K, 1, encoder=AudioProfile.LIBOPUS)
+
+
+def test_failing_ffmpeg_falls_back_to_native_aac(monkeypatch, tmp_path):
+    fake_ffmpeg = tmp_path / "bin" / "ffmpeg"
+    fake_ffmpeg.parent.mkdir()
+    fake_ffmpeg.write_text("#!/bin/sh\necho 'error al cargar' >&2\nexit 1\n")
+    fake_ffmpeg.chmod(0o755)
+    monkeypatch.setenv("PATH", str(fake_ffmpeg.parent) + os.pathsep + os.environ.get("PATH", ""))
+    monkeypatch.setattr(EncoderProbeService, "_memory", {})
+    probe = EncoderProbeService(cache_path=tmp_path / "encoders.json")
+
+    assert probe.select(Bitrate.B_64K, 1) == (AudioProfile.AAC, AudioProfile.AAC_LOW)
+    # El fallo no se guarda en la caché: el próximo intento vuelve a consultar ffmpeg
+    assert not probe.cache_path.exists()
+    assert EncoderProbeService._memory == {}
@@ -0,0 +1,23 @@
+import asyncio
+from pathlib import Path
+
+from m4b_converter.services import ExtractCoverService
+
+# Análisis de ffprobe de un archivo sin portada
+RAW_WITHOUT_COVER = {"streams": [{"codec_type": "audio", "codec_name": "mp3", "disposition": {"attached_pic": 0}}]}
+
+
+def test_no_cover_does_not_create_output_dir(tmp_path):
+    output_dir = tmp_path / "portadas"
+    service = ExtractCoverService(Path("libro.mp3"))
+
+    assert service.extract_cover(RAW_WITHOUT_COVER, output_dir=output_dir) is None
+    assert asyncio.run(service.extract_cover_async(RAW_WITHOUT_COVER, output_dir=output_dir)) is None
+    assert not output_dir.exists()
+
+
+def test_cover_output_path_defaults_next_to_source(tmp_path):
+    service = ExtractCoverService(tmp_path / "libro.mp3")
+
+    assert service._cover_output_path() == tmp_path / "libro_cover.jpg"
+    assert service._cover_output_path(tmp_path / "out", "tarea_cover.jpg") == tmp_path / "out" / "tarea_cover.jpg"
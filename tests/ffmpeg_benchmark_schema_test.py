@@ -0,0 +1,56 @@
+import pytest
+
+from m4b_converter.schemas import FfmpegBenchmark
+
+# stderr de `ffmpeg -benchmark -benchmark_all` (7.0.2) al codificar un segundo de MP3 a AAC
+STDERR = """Input #0, mp3, from 'libro.mp3':
+bench:        2 user        0 sys        1 real decode_audio 0:0 
+bench:        2 user        0 sys        3 real decode_audio 0:0 
+bench:       12 user        0 sys       12 real encode_audio 0.0 
+bench:       10 user        0 sys       15 real encode_audio 0.0 
+bench:       22 user        0 sys       44 real flush_audio 0.0 
+bench: utime=0.038s stime=0.015s rtime=0.055s
+bench: maxrss=37768KiB
+[aac @ 0x1f0c4c0] Qavg: 1420.917
+"""
+
+
+def test_feed_line_accumulates_stages_and_totals():
+    bench = FfmpegBenchmark()
+
+    consumed = [bench.feed_line(line) for line in STDERR.splitlines()]
+
+    assert consumed == [False, True, True, True, True, True, True, True, False]
+    assert bench.stage_seconds == pytest.approx({"decode_audio": 4e-6, "encode_audio": 27e-6, "flush_audio": 44e-6})
+    assert (bench.utime_seconds, bench.stime_seconds, bench.rtime_seconds) == (0.038, 0.015, 0.055)
+    assert bench.max_rss_bytes == 37768 * 1024
+    assert bench.codec_seconds == 0.0  # 75 µs, redondeado a milisegundos
+
+
+def test_negative_intervals_printed_unsigned_are_wrapped():
+    bench = FfmpegBenchmark()
+
+    bench.feed_line(f"bench:        5 user        0 sys  {2 ** 64 - 250} real encode_audio 0.0 ")
+    bench.feed_line("bench:        5 user        0 sys     1000 real encode_audio 0.0 ")
+
+    assert bench.stage_seconds["encode_audio"] == pytest.approx(750e-6)
+
+
+def test_unknown_bench_lines_are_consumed_without_effect():
+    bench = FfmpegBenchmark()
+
+    assert bench.feed_line("bench: formato nuevo=1")
+    assert bench == FfmpegBenchmark()
+
+
+def test_combine_sums_cpu_and_stages_and_keeps_max_wall_and_memory():
+    first = FfmpegBenchmark(utime_seconds=1.0, stime_seconds=0.1, rtime_seconds=2.0, max_rss_bytes=100, stage_seconds={"encode_audio": 1.5})
+    second = FfmpegBenchmark(utime_seconds=2.0, stime_seconds=0.2, rtime_seconds=3.0, max_rss_bytes=50, stage_seconds={"encode_audio": 2.5, "decode_audio": 0.5})
+
+    combined = FfmpegBenchmark.combine([first, None, second])
+
+    assert (combined.utime_seconds, combined.stime_seconds) == (3.0, 0.3)
+    assert (combined.rtime_seconds, combined.max_rss_bytes) == (3.0, 100)
+    assert combined.stage_seconds == {"encode_audio": 4.0, "decode_audio": 0.5}
+    assert combined.codec_seconds == 4.5
+    assert FfmpegBenchmark.combine([None]) is None
@@ -0,0 +1,96 @@
+import os
+import stat
+
+import pytest
+
+from m4b_converter.schemas import ProgressEvent
+from m4b_converter.services import FfmpegProgressService
+
+
+def test_from_progress_block_parses_units():
+    block = {"out_time_us": "30000000", "total_size": "240000", "bitrate": "64.0kbits/s", "speed": "60x", "progress": "continue"}
+
+    event = ProgressEvent.from_progress_block(block, duration_seconds=120.0)
+
+    assert event.out_time_seconds == 30.0
+    assert event.total_size == 240000
+    assert event.bitrate_kbps == 64.0
+    assert event.speed == 60.0
+    assert event.percent == 25.0
+    assert event.eta_seconds == 1.5
+    assert not event.finished
+
+
+def test_from_progress_block_tolerates_missing_values():
+    block = {"out_time_us": "-9223372036854775807", "total_size": "N/A", "bitrate": "N/A", "speed": "N/A", "progress": "continue"}
+
+    event = ProgressEvent.from_progress_block(block)
+
+    assert (event.out_time_us, event.total_size, event.bitrate_kbps, event.speed) == (0, 0, None, None)
+    assert event.percent is None
+    assert event.eta_seconds is None
+
+
+def test_percent_stays_below_100_until_end():
+    block = {"out_time_us": "120500000", "speed": "50x"}
+
+    running = ProgressEvent.from_progress_block({**block, "progress": "continue"}, duration_seconds=120.0)
+    finished = ProgressEvent.from_progress_block({**block, "progress": "end"}, duration_seconds=120.0)
+
+    assert running.percent == 99.9
+    assert finished.percent == 100.0
+    assert finished.eta_seconds == 0.0
+
+
+def test_feed_line_emits_one_event_per_block():
+    service = FfmpegProgressService(duration_seconds=10.0)
+    block = {}
+
+    events = [service._feed_line(block, line, None) for line in ["out_time_us=5000000\n", "speed=2.0x\n", "basura\n", "progress=continue\n"]]
+
+    assert events[:3] == [None, None, None]
+    assert events[3].out_time_seconds == 5.0
+    assert events[3].speed == 2.0
+    assert block == {}
+
+
+def test_feed_line_never_goes_back_in_time():
+    service = FfmpegProgressService(duration_seconds=10.0)
+    block = {}
+    previous = [service._feed_line(block, line, None) for line in ["out_time_us=8000000", "speed=4x", "progress=continue"]][-1]
+
+    # Con una portada adjunta, el último bloque informa del tiempo del stream de imagen
+    for line in ["out_time_us=40000", "speed=0.1x"]:
+        service._feed_line(block, line, previous)
+    final = service._feed_line(block, "progress=end", previous)
+
+    assert final.out_time_us == 8_000_000
+    assert final.speed == 4.0
+    assert final.finished
+
+
+@pytest.mark.skipif(os.name == "nt", reason="usa un script de shell como ffmpeg")
+def test_run_kills_ffmpeg_when_callback_raises(tmp_path):
+    # Un "ffmpeg" que informa de progreso y luego se queda trabajando
+    fake_ffmpeg = tmp_path / "ffmpeg"
+    fake_ffmpeg.write_text("#!/bin/sh\nprintf 'out_time_us=1000000\\nprogress=continue\\n'\nexec sleep 30\n")
+    fake_ffmpeg.chmod(fake_ffmpeg.stat().st_mode | stat.S_IXUSR)
+    started = []
+
+    def failing_callback(event: ProgressEvent) -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        FfmpegProgressService(duration_seconds=10.0).run([str(fake_ffmpeg)], failing_callback, on_start=started.append)
+
+    assert started[0].returncode is not None
+
+
+@pytest.mark.skipif(os.name == "nt", reason="usa un script de shell como ffmpeg")
+def test_run_reports_exit_code_and_stderr_tail(tmp_path):
+    fake_ffmpeg = tmp_path / "ffmpeg"
+    fake_ffmpeg.write_text("#!/bin/sh\necho 'primera linea' >&2\necho 'Invalid data found' >&2\nexit 3\n")
+    fake_ffmpeg.chmod(fake_ffmpeg.stat().st_mode | stat.S_IXUSR)
+
+    with pytest.raises(RuntimeError, match=r"código 3\).*Invalid data found"):
+        FfmpegProgressService().run([str(fake_ffmpeg)])
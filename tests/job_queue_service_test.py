@@ -0,0 +1,122 @@
+from pathlib import Path
+
+from m4b_converter.enums import Bitrate, JobStatus
+from m4b_converter.services import JobQueueService
+
+
+class _Clock:
+    """Reloj manual para vencer leases sin dormir."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _queue(tmp_path, monkeypatch) -> tuple:
+    clock = _Clock()
+    monkeypatch.setattr("m4b_converter.services.job_queue_service.time.time", clock)
+    return JobQueueService(db_path=tmp_path / "jobs.sqlite3"), clock
+
+
+def test_enqueue_creates_pending_job(tmp_path, monkeypatch):
+    queue, _ = _queue(tmp_path, monkeypatch)
+
+    job_id = queue.enqueue(Path("libro.mp3"), Bitrate.B_96K, channels=2, output_dir=tmp_path, priority=5)
+
+    job = queue.get(job_id)
+    assert job.status == JobStatus.PENDING
+    assert job.input_path == Path("libro.mp3").resolve()
+    assert (job.bitrate_target, job.channels_target, job.priority, job.attempts) == ("96k", 2, 5, 0)
+    assert queue.counts()[JobStatus.PENDING] == 1
+
+
+def test_lease_takes_highest_priority_then_fifo(tmp_path, monkeypatch):
+    queue, _ = _queue(tmp_path, monkeypatch)
+    first, second = queue.enqueue_many([Path("uno.mp3"), Path("dos.mp3")])
+    urgent = queue.enqueue(Path("tres.mp3"), priority=10)
+
+    leased = [queue.lease("worker-1").id for _ in range(3)]
+
+    assert leased == [urgent, first, second]
+    assert queue.lease("worker-1") is None
+
+
+def test_lease_is_exclusive_until_it_expires(tmp_path, monkeypatch):
+    queue, clock = _queue(tmp_path, monkeypatch)
+    job_id = queue.enqueue(Path("libro.mp3"))
+
+    job = queue.lease("worker-1", lease_seconds=60)
+    assert (job.id, job.status, job.worker_id, job.attempts) == (job_id, JobStatus.LEASED, "worker-1", 1)
+    assert queue.lease("worker-2") is None
+
+    clock.now += 61
+    retaken = queue.lease("worker-2", lease_seconds=60)
+
+    assert (retaken.id, retaken.worker_id, retaken.attempts) == (job_id, "worker-2", 2)
+    # El primer worker perdió el trabajo: ya no puede renovarlo ni completarlo
+    assert not queue.heartbeat(job_id, "worker-1")
+    assert not queue.complete(job_id, "worker-1", Path("libro.m4b"))
+    assert queue.complete(job_id, "worker-2", Path("libro.m4b"))
+    assert queue.get(job_id).status == JobStatus.DONE
+
+
+def test_heartbeat_extends_lease(tmp_path, monkeypatch):
+    queue, clock = _queue(tmp_path, monkeypatch)
+    queue.enqueue(Path("libro.mp3"))
+    job = queue.lease("worker-1", lease_seconds=60)
+
+    clock.now += 50
+    assert queue.heartbeat(job.id, "worker-1", lease_seconds=60)
+    clock.now += 50
+
+    assert queue.lease("worker-2") is None
+
+
+def test_fail_retries_until_attempts_run_out(tmp_path, monkeypatch):
+    queue, _ = _queue(tmp_path, monkeypatch)
+    job_id = queue.enqueue(Path("libro.mp3"), max_attempts=2)
+
+    queue.lease("worker-1")
+    assert queue.fail(job_id, "worker-1", "ffmpeg falló") == JobStatus.PENDING
+
+    queue.lease("worker-1")
+    assert queue.fail(job_id, "worker-1", "ffmpeg falló otra vez") == JobStatus.FAILED
+
+    job = queue.get(job_id)
+    assert (job.attempts, job.error, job.worker_id) == (2, "ffmpeg falló otra vez", None)
+    assert queue.lease("worker-1") is None
+
+
+def test_fail_from_stale_worker_is_ignored(tmp_path, monkeypatch):
+    queue, _ = _queue(tmp_path, monkeypatch)
+    job_id = queue.enqueue(Path("libro.mp3"))
+    queue.lease("worker-1")
+
+    assert queue.fail(job_id, "worker-2", "no es suyo") is None
+    assert queue.get(job_id).status == JobStatus.LEASED
+
+
+def test_expired_lease_without_attempts_left_is_failed(tmp_path, monkeypatch):
+    queue, clock = _queue(tmp_path, monkeypatch)
+    job_id = queue.enqueue(Path("libro.mp3"), max_attempts=1)
+    queue.lease("worker-1", lease_seconds=60)
+
+    clock.now += 61
+
+    assert queue.lease("worker-2") is None
+    job = queue.get(job_id)
+    assert job.status == JobStatus.FAILED
+    assert job.error == "Lease vencido sin completar"
+
+
+def test_purge_removes_only_requested_statuses(tmp_path, monkeypatch):
+    queue, _ = _queue(tmp_path, monkeypatch)
+    done, pending = queue.enqueue_many([Path("uno.mp3"), Path("dos.mp3")])
+    queue.lease("worker-1")
+    queue.complete(done, "worker-1")
+
+    assert queue.purge() == 1
+    assert queue.get(done) is None
+    assert queue.get(pending).status == JobStatus.PENDING
@@ -0,0 +1,102 @@
+import os
+import json
+import stat
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from m4b_converter.enums import TranscodeDecision
+from m4b_converter.schemas import ConversionResult
+from m4b_converter.services import MetricsService
+
+
+def _result(encode_seconds: float, decision: TranscodeDecision = TranscodeDecision.ENCODE) -> ConversionResult:
+    return ConversionResult(
+        task_id=uuid.uuid4(),
+        output_path=Path("libro.m4b"),
+        duration_seconds=3600,
+        size_original_bytes=1000,
+        size_final_bytes=400,
+        bitrate_final="64k",
+        transcode_decision=decision,
+        timestamp_end=datetime.now(),
+        encode_seconds=encode_seconds
+    )
+
+
+def _samples(text: str) -> dict:
+    """Muestras del formato de exposición: nombre (con etiquetas) -> valor."""
+    return {
+        name: float(value)
+        for name, value in (line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+    }
+
+
+def test_histogram_buckets_are_cumulative_and_inf_matches_count():
+    metrics = MetricsService()
+    for seconds in (0.5, 3, 3, 45, 7200):
+        metrics.record(_result(seconds))
+
+    samples = _samples(metrics.render_textfile())
+
+    def bucket(le: str) -> float:
+        return samples[f'm4b_converter_encode_seconds_bucket{{le="{le}"}}']
+
+    assert [bucket(le) for le in ("1.0", "5.0", "15.0", "30.0", "60.0", "3600.0")] == [1, 3, 3, 3, 4, 4]
+    assert bucket("+Inf") == samples["m4b_converter_encode_seconds_count"] == 5
+    assert samples["m4b_converter_encode_seconds_sum"] == 7251.5
+    buckets = [bucket(le) for le in map(str, MetricsService.ENCODE_BUCKETS)] + [bucket("+Inf")]
+    assert buckets == sorted(buckets)
+
+
+def test_skipped_and_failed_files_add_no_bytes():
+    metrics = MetricsService()
+    metrics.record(_result(10))
+    metrics.record(_result(0, TranscodeDecision.SKIP))
+    metrics.record(None)
+
+    samples = _samples(metrics.render_textfile())
+
+    assert samples["m4b_converter_files_converted_total"] == 1
+    assert samples["m4b_converter_files_skipped_total"] == 1
+    assert samples["m4b_converter_files_failed_total"] == 1
+    assert samples["m4b_converter_input_bytes_total"] == 1000
+    assert samples["m4b_converter_output_bytes_total"] == 400
+    assert samples["m4b_converter_audio_seconds_total"] == 3600
+    assert samples['m4b_converter_encode_seconds_bucket{le="+Inf"}'] == 1
+
+
+def test_every_sample_has_help_and_type():
+    text = MetricsService().render_textfile()
+    declared = {line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")}
+
+    for name in _samples(text):
+        base = name.split("{")[0]
+        assert base in declared or base.rsplit("_", 1)[0] in declared
+
+
+def test_write_atomic_replaces_file_with_readable_mode(tmp_path):
+    textfile = tmp_path / "node_exporter" / "m4b.prom"
+    status = tmp_path / "status.json"
+    textfile.parent.mkdir()
+    textfile.write_text("viejo")
+    metrics = MetricsService(textfile_path=textfile, json_path=status)
+    metrics.record(_result(10))
+
+    metrics.write()
+
+    assert _samples(textfile.read_text(encoding="utf-8"))["m4b_converter_files_converted_total"] == 1
+    assert stat.S_IMODE(os.stat(textfile).st_mode) == 0o644
+    assert json.loads(status.read_text(encoding="utf-8"))["files_converted"] == 1
+    # Ningún temporal queda junto al archivo que lee el collector
+    assert sorted(p.name for p in textfile.parent.iterdir()) == ["m4b.prom"]
+
+
+def test_write_errors_do_not_raise(tmp_path):
+    blocker = tmp_path / "no-es-un-directorio"
+    blocker.write_text("")
+    metrics = MetricsService(textfile_path=blocker / "m4b.prom")
+
+    metrics.write()
+
+    assert not (blocker / "m4b.prom").exists()
@@ -0,0 +1,23 @@
+from m4b_converter.core.mp3_merger import Mp3Merger
+
+
+def test_natural_key_compares_numbers_by_value():
+    names = ["Pista 10.mp3", "pista 2.mp3", "Pista 1.mp3", "Intro.mp3"]
+
+    assert sorted(names, key=Mp3Merger.natural_key) == ["Intro.mp3", "Pista 1.mp3", "pista 2.mp3", "Pista 10.mp3"]
+
+
+def test_natural_key_handles_leading_zeros_and_mixed_chunks():
+    assert Mp3Merger.natural_key("CD02-track007.mp3") == ["cd", 2, "-track", 7, ".mp", 3, ""]
+    assert Mp3Merger.natural_key("007") < Mp3Merger.natural_key("10")
+
+
+def test_iter_mp3_files_walks_subdirectories_in_natural_order(tmp_path):
+    for relative in ("CD 10/01.mp3", "CD 2/10.MP3", "CD 2/9.mp3", "CD 2/portada.jpg", "00 intro.mp3"):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+
+    files = [path.relative_to(tmp_path).as_posix() for path in Mp3Merger.iter_mp3_files(tmp_path)]
+
+    assert files == ["00 intro.mp3", "CD 2/9.mp3", "CD 2/10.MP3", "CD 10/01.mp3"]
@@ -0,0 +1,94 @@
+import os
+import json
+import itertools
+from pathlib import Path
+
+from m4b_converter.services import ProbeCacheService
+
+RAW = {"format": {"filename": "libro.mp3", "padding": "x" * 100}}
+
+
+def _write(path: Path, content: bytes) -> Path:
+    path.write_bytes(content)
+    return path
+
+
+def test_get_returns_stored_entry(tmp_path):
+    cache = ProbeCacheService(db_path=tmp_path / "cache.sqlite3")
+    audio = _write(tmp_path / "libro.mp3", b"audio")
+
+    assert cache.get(audio) is None
+    cache.put(audio, RAW)
+
+    raw, schema = cache.get(audio)
+    assert raw == RAW
+    assert schema is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_size_change_invalidates_entry(tmp_path):
+    cache = ProbeCacheService(db_path=tmp_path / "cache.sqlite3")
+    audio = _write(tmp_path / "libro.mp3", b"audio")
+    cache.put(audio, RAW)
+    stat = audio.stat()
+
+    _write(audio, b"audio mas largo")
+    os.utime(audio, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert cache.get(audio) is None
+
+
+def test_mtime_change_invalidates_entry(tmp_path):
+    cache = ProbeCacheService(db_path=tmp_path / "cache.sqlite3")
+    audio = _write(tmp_path / "libro.mp3", b"audio")
+    cache.put(audio, RAW)
+    stat = audio.stat()
+
+    os.utime(audio, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(audio) is None
+
+
+def test_inode_change_invalidates_entry(tmp_path):
+    cache = ProbeCacheService(db_path=tmp_path / "cache.sqlite3")
+    audio = _write(tmp_path / "libro.mp3", b"audio")
+    cache.put(audio, RAW)
+    stat = audio.stat()
+
+    # Mismo tamaño y mtime, pero otro archivo (como al sustituirlo con un rename)
+    replacement = _write(tmp_path / "nuevo.mp3", b"AUDIO")
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, audio)
+
+    assert audio.stat().st_ino != stat.st_ino
+    assert cache.get(audio) is None
+
+
+def test_eviction_removes_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr("m4b_converter.services.probe_cache_service.time.time", lambda: next(clock))
+    entry_bytes = len(json.dumps(RAW))
+    cache = ProbeCacheService(db_path=tmp_path / "cache.sqlite3", max_bytes=int(entry_bytes * 2.5))
+    first, second, third = (_write(tmp_path / f"{name}.mp3", name.encode()) for name in ("uno", "dos", "tres"))
+
+    cache.put(first, RAW)
+    cache.put(second, RAW)
+    assert cache.get(first) is not None  # "uno" pasa a ser el más reciente
+    cache.put(third, RAW)
+
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.get(third) is not None
+    assert cache.stats()["entries"] == 2
+
+
+def test_clear_resets_entries_and_counters(tmp_path):
+    cache = ProbeCacheService(db_path=tmp_path / "cache.sqlite3")
+    audio = _write(tmp_path / "libro.mp3", b"audio")
+    cache.put(audio, RAW)
+    cache.get(audio)
+
+    cache.clear()
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["total_hits"], stats["total_misses"]) == (0, 0, 0)
@@ -0,0 +1,39 @@
+import pytest
+
+from m4b_converter.cli.utils import parse_renditions
+from m4b_converter.enums import Bitrate, SampleRate, SampleRateMode
+
+
+def test_no_renditions_returns_none():
+    assert parse_renditions(None) is None
+    assert parse_renditions([]) is None
+
+
+def test_parses_in_order_with_optional_sample_rate():
+    renditions = parse_renditions(["64k:1", "128k:2:44100", "96k:2:source"])
+
+    assert [(r.bitrate, r.channels, r.sample_rate) for r in renditions] == [
+        (Bitrate.B_64K, 1, SampleRateMode.AUTO),
+        (Bitrate.B_128K, 2, SampleRate.SR_44100),
+        (Bitrate.B_96K, 2, SampleRateMode.SOURCE),
+    ]
+    assert [r.label for r in renditions] == ["64k-1ch", "128k-2ch-44100", "96k-2ch"]
+
+
+@pytest.mark.parametrize("value, message", [
+    ("64k", "BITRATE:CANALES"),
+    ("64k:1:44100:x", "BITRATE:CANALES"),
+    ("64k:3", "canales deben ser 1 o 2"),
+    ("65k:1", "Versión no válida '65k:1'"),
+    ("64k:1:12345", "Versión no válida '64k:1:12345'"),
+    ("64k:1:rapido", "Versión no válida '64k:1:rapido'"),
+])
+def test_rejects_malformed_values(value, message):
+    with pytest.raises(ValueError, match=message):
+        parse_renditions([value])
+
+
+def test_rejects_repeated_rendition():
+    # "auto" y "source" no cambian el nombre del archivo: escribirían el mismo M4B
+    with pytest.raises(ValueError, match="repetida"):
+        parse_renditions(["64k:1", "64k:1:source"])
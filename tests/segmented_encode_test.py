@@ -0,0 +1,122 @@
+import io
+import struct
+from pathlib import Path
+
+import pytest
+
+from m4b_converter.enums import AudioProfile
+from m4b_converter.schemas import AudioFileSchema, ConversionTask
+from m4b_converter.services import M4bConverterService, FfmpegProgressService
+
+
+def _converter(duration_seconds: float, sample_rate: int = 44100, sample_rate_target=None) -> M4bConverterService:
+    audio_info = AudioFileSchema(
+        path=Path("libro.mp3"), size=1000, format_name="mp3", duration=duration_seconds,
+        codec_name="mp3", bit_rate="64000", sample_rate=sample_rate, channels=1, metadata={}
+    )
+    converter = M4bConverterService(audio_info, output_dir=Path("salida"))
+    converter.current_task = ConversionTask(
+        input_path=audio_info.path, bitrate_target="64k", channels_target=1, sample_rate_target=sample_rate_target
+    )
+    return converter
+
+
+def _adts_frame(value: int) -> bytes:
+    """Trama ADTS mínima cuya carga útil es un entero con signo."""
+    payload = struct.pack(">i", value)
+    length = 7 + len(payload)
+    header = bytes([0xFF, 0xF1, 0x50, (length >> 11) & 0x03, (length >> 3) & 0xFF, ((length & 0x07) << 5) | 0x1F, 0xFC])
+    return header + payload
+
+
+class _Recorder:
+    """stdin del proceso falso: acumula lo escrito y sobrevive al close()."""
+
+    def __init__(self, buffer: io.BytesIO):
+        self.buffer = buffer
+
+    def write(self, data: bytes) -> None:
+        self.buffer.write(data)
+
+    def close(self) -> None:
+        pass
+
+
+def test_plan_segments_covers_every_frame_contiguously():
+    converter = _converter(duration_seconds=100.0)
+    total_frames = -(-100 * 44100 // 1024)
+
+    plan = converter._plan_segments(3)
+
+    assert plan[0][0] == 0
+    assert plan[-1][1] == total_frames
+    assert all(previous[1] == current[0] for previous, current in zip(plan, plan[1:]))
+    assert max(end - start for start, end in plan) - min(end - start for start, end in plan) <= 1
+
+
+def test_plan_segments_counts_frames_at_target_sample_rate():
+    converter = _converter(duration_seconds=100.0, sample_rate_target=22050)
+
+    assert converter._plan_segments(1) == [(0, -(-100 * 22050 // 1024))]
+
+
+def test_iter_adts_frames_splits_by_header_length(tmp_path):
+    segment = tmp_path / "segmento.aac"
+    segment.write_bytes(b"".join(_adts_frame(value) for value in (7, 8, 9)))
+
+    frames = list(M4bConverterService._iter_adts_frames(segment))
+
+    assert [struct.unpack(">i", frame[7:])[0] for frame in frames] == [7, 8, 9]
+
+
+def test_iter_adts_frames_rejects_invalid_header(tmp_path):
+    segment = tmp_path / "segmento.aac"
+    segment.write_bytes(_adts_frame(1) + b"\x00" * 11)
+
+    with pytest.raises(RuntimeError):
+        list(M4bConverterService._iter_adts_frames(segment))
+
+
+@pytest.mark.parametrize("duration_seconds, segments", [(30.0, 2), (30.0, 3), (30.0, 8), (0.2, 3)])
+def test_stitch_segments_drops_preroll_postroll_and_keeps_one_priming(tmp_path, monkeypatch, duration_seconds, segments):
+    converter = _converter(duration_seconds=duration_seconds)
+    plan = converter._plan_segments(segments)
+    preroll, postroll = converter.SEGMENT_PREROLL_FRAMES, converter.SEGMENT_POSTROLL_FRAMES
+    total_frames = plan[-1][1]
+
+    # La trama j del segmento i es la trama seek_i + j - 1 del origen; la trama 0 es el cebado (negativa)
+    segment_paths = []
+    for index, (start, end) in enumerate(plan):
+        seek = max(0, start - preroll)
+        last = total_frames if index == len(plan) - 1 else end + postroll
+        path = tmp_path / f"segmento_{index}.aac"
+        path.write_bytes(_adts_frame(-(index + 1)) + b"".join(_adts_frame(frame) for frame in range(seek, last)))
+        segment_paths.append(path)
+
+    written = io.BytesIO()
+
+    class FakeProcess:
+        def __init__(self, *args, **kwargs):
+            self.stdin = _Recorder(written)
+            self.stderr = io.BytesIO()
+
+    monkeypatch.setattr("m4b_converter.services.m4b_converter_service.subprocess.Popen", FakeProcess)
+    monkeypatch.setattr(FfmpegProgressService, "wait", staticmethod(lambda process: (0, None)))
+
+    converter._stitch_segments(segment_paths, plan, tmp_path / "libro.m4b")
+
+    stitched = tmp_path / "unido.aac"
+    stitched.write_bytes(written.getvalue())
+    values = [struct.unpack(">i", frame[7:])[0] for frame in M4bConverterService._iter_adts_frames(stitched)]
+    assert values == [-1, *range(total_frames)]
+
+
+def test_convert_segmented_uses_single_pass_with_other_encoders(monkeypatch):
+    converter = _converter(duration_seconds=3600.0)
+    calls = []
+    monkeypatch.setattr(converter, "convert", lambda **kwargs: calls.append(kwargs) or "resultado")
+
+    result = converter.convert_segmented(segments=4, encoder=AudioProfile.LIBFDK_AAC)
+
+    assert result == "resultado"
+    assert calls[0]["encoder"] == AudioProfile.LIBFDK_AAC
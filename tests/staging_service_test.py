@@ -0,0 +1,94 @@
+import os
+import errno
+import shutil
+from collections import namedtuple
+from pathlib import Path
+
+import pytest
+
+from m4b_converter.services import StagingService
+from m4b_converter.settings import AppSettings
+
+DiskUsage = namedtuple("DiskUsage", "total used free")
+
+
+def _staging(monkeypatch, tmp_path, devices: dict) -> StagingService:
+    """Servicio con TEMP_DIR en `tmp_path/temp` y `st_dev` simulados por nombre de directorio."""
+    monkeypatch.setattr(AppSettings, "SCRATCH_DIR", None)
+    monkeypatch.setattr(AppSettings, "TEMP_DIR", tmp_path / "temp")
+    monkeypatch.setattr(StagingService, "device", classmethod(lambda cls, path: devices[Path(path).name]))
+    return StagingService()
+
+
+def test_requirements_same_volume_takes_the_larger_need(monkeypatch, tmp_path):
+    staging = _staging(monkeypatch, tmp_path, {"temp": 1, "out": 1})
+
+    # El temporal y la salida no coinciden en el tiempo: basta con el mayor de los dos
+    assert staging.requirements(tmp_path / "out", 1000, temp_copies=2) == {1: (tmp_path / "out", 2000)}
+
+
+def test_requirements_split_per_volume(monkeypatch, tmp_path):
+    staging = _staging(monkeypatch, tmp_path, {"temp": 1, "out": 2, "scratch": 3})
+    monkeypatch.setattr(AppSettings, "SCRATCH_DIR", tmp_path / "scratch")
+
+    assert staging.requirements(tmp_path / "out", 1000, temp_copies=2) == {
+        2: (tmp_path / "out", 1000),
+        3: (tmp_path / "scratch", 2000),
+    }
+
+
+def test_fits_subtracts_reserved_and_keeps_min_free(monkeypatch, tmp_path):
+    staging = _staging(monkeypatch, tmp_path, {})
+    monkeypatch.setattr(shutil, "disk_usage", lambda path: DiskUsage(10_000, 5_000, 5_000))
+    requirements = {1: (tmp_path, 3_000)}
+
+    assert staging.fits(requirements, reserved={}, min_free_bytes=2_000)
+    assert not staging.fits(requirements, reserved={1: 1}, min_free_bytes=2_000)
+    # Lo reservado en otro volumen no cuenta
+    assert staging.fits(requirements, reserved={2: 4_000}, min_free_bytes=2_000)
+
+
+def test_fits_requires_every_volume(monkeypatch, tmp_path):
+    staging = _staging(monkeypatch, tmp_path, {})
+    free = {"out": 10_000, "scratch": 1_000}
+    monkeypatch.setattr(shutil, "disk_usage", lambda path: DiskUsage(0, 0, free[Path(path).name]))
+    (tmp_path / "out").mkdir()
+    (tmp_path / "scratch").mkdir()
+
+    requirements = {1: (tmp_path / "out", 500), 2: (tmp_path / "scratch", 2_000)}
+
+    assert not staging.fits(requirements, reserved={}, min_free_bytes=0)
+    free["scratch"] = 2_000
+    assert staging.fits(requirements, reserved={}, min_free_bytes=0)
+
+
+def test_estimate_output_bytes_adds_container_overhead():
+    # 1 hora a 64 kbps: 28,8 MB de audio más el margen del contenedor
+    assert StagingService.estimate_output_bytes(3600, 64) == int(28_800_000 * StagingService.CONTAINER_OVERHEAD)
+
+
+def test_move_copies_across_volumes(monkeypatch, tmp_path):
+    source = tmp_path / "temp.m4b"
+    source.write_bytes(b"m4b")
+    destination = tmp_path / "salida" / "libro.m4b"
+    destination.parent.mkdir()
+    real_replace = os.replace
+
+    def replace(src, dst):
+        # Simula un rename entre sistemas de archivos; el rename del .part sí funciona
+        if Path(src) == source:
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        real_replace(src, dst)
+
+    monkeypatch.setattr("m4b_converter.services.staging_service.os.replace", replace)
+
+    StagingService().move(source, destination)
+
+    assert destination.read_bytes() == b"m4b"
+    assert not source.exists()
+    assert list(destination.parent.iterdir()) == [destination]
+
+
+def test_move_propagates_other_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        StagingService().move(tmp_path / "no-existe.m4b", tmp_path / "libro.m4b")
@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import pytest
+
+from m4b_converter.enums import AudioProfile, Bitrate, SampleRate, SampleRateMode, TranscodeDecision, TranscodeMode
+from m4b_converter.schemas import AudioFileSchema
+from m4b_converter.services import TranscodePlannerService
+
+
+def _audio(codec: str = "mp3", kbps: int = 64, channels: int = 1, sample_rate: int = 44100) -> AudioFileSchema:
+    return AudioFileSchema(
+        path=Path(f"libro.{'m4a' if codec == 'aac' else 'mp3'}"),
+        size=1000,
+        format_name="mov,mp4,m4a,3gp,3g2,mj2" if codec == "aac" else "mp3",
+        duration=3600,
+        codec_name=codec,
+        bit_rate=str(kbps * 1000),
+        sample_rate=sample_rate,
+        channels=channels,
+        metadata={}
+    )
+
+
+def test_auto_encodes_low_bitrate_mp3():
+    # AUTO nunca deja un libro sin M4B: un MP3 por debajo del objetivo se recodifica
+    decision, _ = TranscodePlannerService.decide(_audio(kbps=48), Bitrate.B_64K, channels=1)
+
+    assert decision == TranscodeDecision.ENCODE
+
+
+def test_skip_mode_omits_low_bitrate_mp3():
+    decision, reason = TranscodePlannerService.decide(_audio(kbps=48), Bitrate.B_64K, channels=1, mode=TranscodeMode.SKIP)
+
+    assert decision == TranscodeDecision.SKIP
+    assert "48 kbps" in reason
+
+
+@pytest.mark.parametrize("audio", [
+    _audio(kbps=128),              # por encima del objetivo
+    _audio(kbps=48, channels=2),   # hay canales que reducir
+    _audio(kbps=0),                # bitrate desconocido
+])
+def test_skip_mode_encodes_mp3_that_gains_from_it(audio):
+    decision, _ = TranscodePlannerService.decide(audio, Bitrate.B_64K, channels=1, mode=TranscodeMode.SKIP)
+
+    assert decision == TranscodeDecision.ENCODE
+
+
+@pytest.mark.parametrize("mode", [TranscodeMode.AUTO, TranscodeMode.SKIP])
+def test_aac_within_target_is_remuxed(mode):
+    # 66 kbps entra en la tolerancia VBR de un objetivo de 64k
+    decision, _ = TranscodePlannerService.decide(_audio("aac", kbps=66), Bitrate.B_64K, channels=1, mode=mode)
+
+    assert decision == TranscodeDecision.REMUX
+
+
+@pytest.mark.parametrize("audio, sample_rate", [
+    (_audio("aac", kbps=80), SampleRateMode.AUTO),                   # por encima del objetivo
+    (_audio("aac", kbps=64, sample_rate=96000), SampleRateMode.AUTO),  # frecuencia demasiado alta
+    (_audio("aac", kbps=64), SampleRate.SR_22050),                   # remuestreo pedido
+])
+def test_aac_that_misses_target_is_encoded(audio, sample_rate):
+    decision, _ = TranscodePlannerService.decide(audio, Bitrate.B_64K, channels=1, sample_rate=sample_rate)
+
+    assert decision == TranscodeDecision.ENCODE
+
+
+def test_always_encodes_everything():
+    for audio in (_audio("aac", kbps=64), _audio(kbps=48)):
+        decision, _ = TranscodePlannerService.decide(audio, Bitrate.B_64K, channels=1, mode=TranscodeMode.ALWAYS)
+        assert decision == TranscodeDecision.ENCODE
+
+
+@pytest.mark.parametrize("source, bitrate, channels, expected", [
+    (44100, Bitrate.B_64K, 1, 22050),   # voz: razón 2:1 dentro de la familia de 44,1 kHz
+    (48000, Bitrate.B_64K, 1, 24000),
+    (48000, Bitrate.B_96K, 2, 24000),
+    (22050, Bitrate.B_64K, 1, None),    # nunca se sube la frecuencia
+    (44100, Bitrate.B_128K, 2, None),   # bitrate alto: se conserva hasta 44,1/48 kHz
+    (96000, Bitrate.B_128K, 2, 48000),
+    (88200, Bitrate.B_128K, 2, 44100),
+])
+def test_auto_sample_rate_policy(source, bitrate, channels, expected):
+    audio = _audio(kbps=128, channels=channels, sample_rate=source)
+
+    assert TranscodePlannerService.sample_rate(audio, bitrate, channels) == expected
+
+
+def test_sample_rate_respects_request_and_he_profiles():
+    audio = _audio(sample_rate=44100)
+
+    assert TranscodePlannerService.sample_rate(audio, Bitrate.B_64K, 1, requested=SampleRateMode.SOURCE) is None
+    assert TranscodePlannerService.sample_rate(audio, Bitrate.B_64K, 1, requested=SampleRate.SR_48000) == 48000
+    assert TranscodePlannerService.sample_rate(audio, Bitrate.B_64K, 1, requested=SampleRate.SR_44100) is None
+    assert TranscodePlannerService.sample_rate(audio, Bitrate.B_32K, 1, profile=AudioProfile.AAC_HE) is None
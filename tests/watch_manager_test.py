@@ -0,0 +1,159 @@
+import os
+import time
+from pathlib import Path
+
+from m4b_converter.managers import WatchManager
+
+
+class _Clock:
+    """Reloj monotónico manual: la espera de estabilización avanza sin dormir."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _watcher(tmp_path: Path, monkeypatch) -> tuple:
+    clock = _Clock()
+    monkeypatch.setattr("m4b_converter.managers.watch_manager.time.monotonic", clock)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    return WatchManager(inbox, settle_seconds=5), clock
+
+
+def _age(*paths: Path) -> None:
+    """Lleva el mtime una hora atrás, fuera de la ventana de mtime "racy"."""
+    old = time.time() - 3600
+    for path in paths:
+        os.utime(path, (old, old))
+
+
+def _count_scandir(monkeypatch) -> list:
+    calls = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        calls.append(Path(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr("m4b_converter.managers.watch_manager.os.scandir", scandir)
+    return calls
+
+
+def test_growing_file_waits_until_it_stops_changing(tmp_path, monkeypatch):
+    watcher, clock = _watcher(tmp_path, monkeypatch)
+    book = watcher.watch_dir / "libro.mp3"
+    book.write_bytes(b"a" * 10)
+    watcher.scan()
+
+    clock.now = 3
+    with book.open("ab") as f:
+        f.write(b"b" * 10)  # la copia sigue en curso
+    assert watcher.settled() == []
+
+    clock.now = 7  # solo 4 s desde el último cambio
+    assert watcher.settled() == []
+
+    clock.now = 8
+    assert watcher.settled() == [book]
+    assert watcher.settled() == []
+
+
+def test_only_audio_files_are_tracked(tmp_path, monkeypatch):
+    watcher, clock = _watcher(tmp_path, monkeypatch)
+    for name in ("libro.MP3", "libro.m4b", ".oculto.mp3", "portada.jpg"):
+        (watcher.watch_dir / name).write_bytes(b"x")
+    watcher.scan()
+
+    clock.now = 10
+    assert watcher.settled() == [watcher.watch_dir / "libro.MP3"]
+
+
+def test_unchanged_directory_is_not_relisted(tmp_path, monkeypatch):
+    watcher, _ = _watcher(tmp_path, monkeypatch)
+    book = watcher.watch_dir / "libro.mp3"
+    book.write_bytes(b"x")
+    _age(book, watcher.watch_dir)
+    calls = _count_scandir(monkeypatch)
+
+    watcher.scan()
+    watcher.scan()
+    assert len(calls) == 1
+
+    # Una entrada nueva deja un mtime reciente: se vuelve a recorrer mientras pueda faltar algún cambio
+    (watcher.watch_dir / "otro.mp3").write_bytes(b"y")
+    watcher.scan()
+    watcher.scan()
+    assert len(calls) == 3
+    assert watcher.watch_dir / "otro.mp3" in watcher._candidates
+
+    _age(watcher.watch_dir)
+    watcher.scan()
+    watcher.scan()
+    assert len(calls) == 4
+
+
+def test_full_rescan_detects_in_place_rewrites(tmp_path, monkeypatch):
+    watcher, _ = _watcher(tmp_path, monkeypatch)
+    book = watcher.watch_dir / "libro.mp3"
+    book.write_bytes(b"x")
+    _age(book, watcher.watch_dir)
+    watcher.mark_existing()
+
+    book.write_bytes(b"reescrito")
+    _age(watcher.watch_dir)  # reescribir no cambia el mtime del directorio
+    watcher.scan()
+    assert book not in watcher._candidates
+
+    watcher.scan(full=True)
+    assert book in watcher._candidates
+
+
+def test_mark_existing_suppresses_files_already_present(tmp_path, monkeypatch):
+    watcher, clock = _watcher(tmp_path, monkeypatch)
+    for name in ("uno.mp3", "dos.mp3"):
+        (watcher.watch_dir / name).write_bytes(b"x")
+
+    assert watcher.mark_existing() == 2
+
+    new_book = watcher.watch_dir / "tres.mp3"
+    new_book.write_bytes(b"x")
+    watcher.scan()
+    clock.now = 10
+    assert watcher.settled() == [new_book]
+
+
+def test_deleted_entries_are_forgotten(tmp_path, monkeypatch):
+    watcher, _ = _watcher(tmp_path, monkeypatch)
+    book = watcher.watch_dir / "libro.mp3"
+    book.write_bytes(b"x")
+    _age(book)
+    signature = (book.stat().st_size, book.stat().st_mtime_ns)
+    watcher.mark_existing()
+    assert watcher._processed == {book: signature}
+
+    book.unlink()
+    watcher.scan()
+    assert watcher._processed == {}
+
+    # Si vuelve el mismo archivo, se convierte como uno nuevo
+    book.write_bytes(b"x")
+    _age(book)
+    watcher.scan()
+    assert book in watcher._candidates
+
+
+def test_missing_directory_forgets_its_files(tmp_path, monkeypatch):
+    watcher, _ = _watcher(tmp_path, monkeypatch)
+    book = watcher.watch_dir / "libro.mp3"
+    book.write_bytes(b"x")
+    watcher.scan()
+
+    book.unlink()
+    watcher.watch_dir.rmdir()
+    watcher.scan()
+
+    assert watcher._candidates == {}
+    assert watcher._dir_mtimes == {}
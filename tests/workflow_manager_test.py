@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from m4b_converter.enums import AudioProfile, TranscodeDecision
+from m4b_converter.managers import WorkflowManager
+from m4b_converter.schemas import ConversionTask, RenditionPlan
+
+TASK = ConversionTask(input_path=Path("libro.mp3"), bitrate_target="64k", channels_target=1)
+
+
+def test_split_duplicate_outputs_keeps_first_per_name():
+    files = [
+        Path("disco1/parte01.mp3"),
+        Path("disco1/parte02.mp3"),
+        Path("disco2/Parte01.flac"),
+        Path("disco2/parte03.mp3"),
+    ]
+
+    unique, duplicates = WorkflowManager._split_duplicate_outputs(files)
+
+    assert unique == [Path("disco1/parte01.mp3"), Path("disco1/parte02.mp3"), Path("disco2/parte03.mp3")]
+    assert duplicates == [(Path("disco2/Parte01.flac"), Path("disco1/parte01.mp3"))]
+
+
+def test_budget_threads_never_exceeds_cores(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+
+    assert WorkflowManager.budget_threads(1) == (1, 0)
+    assert WorkflowManager.budget_threads(4) == (4, 2)
+    assert WorkflowManager.budget_threads(32) == (8, 1)
+
+
+@pytest.mark.parametrize("plan, expected", [
+    (RenditionPlan(task=TASK), 4),
+    # libfdk_aac y AudioToolbox ceban más de una trama: las uniones se descuadrarían
+    (RenditionPlan(task=TASK, encoder=AudioProfile.LIBFDK_AAC), 1),
+    (RenditionPlan(task=TASK, encoder=AudioProfile.AAC_AT), 1),
+    (RenditionPlan(task=TASK, encoder=AudioProfile.LIBFDK_AAC, profile=AudioProfile.AAC_HE), 1),
+    (RenditionPlan(task=TASK, decision=TranscodeDecision.REMUX), 1),
+])
+def test_segment_count_only_segments_native_aac_lc(plan, expected):
+    assert WorkflowManager()._segment_count(plan, 4, labelled=False, silence_chapters=False) == expected
+
+
+def test_segment_count_falls_back_for_renditions_and_silence_chapters():
+    plan = RenditionPlan(task=TASK)
+
+    assert WorkflowManager()._segment_count(plan, 4, labelled=True, silence_chapters=False) == 1
+    assert WorkflowManager()._segment_count(plan, 4, labelled=False, silence_chapters=True) == 1